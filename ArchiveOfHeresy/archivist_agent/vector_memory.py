@@ -9,6 +9,8 @@ from pathlib import Path
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+from embedding_cache import EMBEDDING_TURN_TTL_SECONDS, cached_embedding
+
 
 VECTOR_DIMENSIONS = int(os.environ.get("ARCHIVE_VECTOR_DIMENSIONS", "384"))
 SPARSE_EMBEDDING_VERSION = os.environ.get("ARCHIVE_SPARSE_EMBEDDING_VERSION", "hashed-token-chargram-v2")
@@ -99,7 +101,23 @@ def normalize_dense(values):
     return [value / norm for value in dense]
 
 
-def embed_openai_text(text, base_url=VECTOR_EMBEDDING_BASE_URL, model=VECTOR_EMBEDDING_MODEL, timeout=60):
+def embed_openai_text(
+    text,
+    base_url=VECTOR_EMBEDDING_BASE_URL,
+    model=VECTOR_EMBEDDING_MODEL,
+    timeout=60,
+    ttl=EMBEDDING_TURN_TTL_SECONDS,
+):
+    """Read through the shared embedding cache; ``ttl=None`` keeps the entry."""
+    return cached_embedding(
+        model,
+        str(text or ""),
+        lambda value: request_openai_embedding(value, base_url=base_url, model=model, timeout=timeout),
+        ttl=ttl,
+    )
+
+
+def request_openai_embedding(text, base_url=VECTOR_EMBEDDING_BASE_URL, model=VECTOR_EMBEDDING_MODEL, timeout=60):
     payload = {"model": model, "input": str(text or "")}
     request = Request(
         f"{base_url}/v1/embeddings",
@@ -348,7 +366,7 @@ class VectorMemory:
             return self.resolved_embedding_version
         if VECTOR_EMBEDDING_BACKEND == "openai":
             try:
-                embed_openai_text("ArchiveOfHeresy embedding backend probe", timeout=20)
+                request_openai_embedding("ArchiveOfHeresy embedding backend probe", timeout=20)
                 self.last_backend = "openai"
                 self.resolved_embedding_version = openai_embedding_version()
             except Exception as exc:
@@ -0,0 +1,243 @@
+"""Shared embedding cache for the Archive memory layers and Vox.
+
+One chat turn used to embed the same user text once per memory layer (vector,
+wiki, focus, graph, Magos) and once more in Vox. Every embedder call now reads
+through a sidecar SQLite store keyed by (model, hash of the exact input sent
+to the embedder), with a small in-process LRU in front of it. Query text is
+stored with a short TTL (one turn's worth); content that is embedded for
+ranking (wiki pages, graph nodes) is stored without expiry and bounded by
+count, least recently used first. Entries are only ever shared between callers
+that name the same model and send the same string.
+
+Stdlib only: Vox imports this module as ``ArchiveOfHeresy.embedding_cache``
+from its own process, so both services share one file on disk.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable
+
+EMBEDDING_CACHE_PATH = Path(
+    os.environ.get("ARCHIVE_EMBEDDING_CACHE_PATH", Path(__file__).resolve().parent / "semantic" / "embeddings.sqlite3")
+)
+EMBEDDING_TURN_TTL_SECONDS = float(os.environ.get("ARCHIVE_EMBEDDING_TURN_TTL_SECONDS", "300"))
+EMBEDDING_MEMORY_ENTRIES = int(os.environ.get("ARCHIVE_EMBEDDING_MEMORY_ENTRIES", "256"))
+# Entries stored without expiry (pages, nodes) beyond this count are dropped
+# least recently used first; 0 keeps them all.
+EMBEDDING_KEPT_MAX_ENTRIES = int(os.environ.get("ARCHIVE_EMBEDDING_KEPT_MAX_ENTRIES", "20000"))
+PRUNE_EVERY_WRITES = 64
+
+
+def text_key(model: str, text) -> str:
+    """Key for exactly the string the embedder receives: a vector is only
+    reused for input that would have produced it."""
+    return hashlib.blake2b(f"{model}\0{str(text or '')}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(
+        self,
+        path: Path,
+        memory_entries: int = EMBEDDING_MEMORY_ENTRIES,
+        kept_max_entries: int = EMBEDDING_KEPT_MAX_ENTRIES,
+    ):
+        self.path = Path(path)
+        self.memory_entries = max(0, int(memory_entries))
+        self.kept_max_entries = max(0, int(kept_max_entries))
+        self._memory: OrderedDict[str, tuple[list[float], float | None]] = OrderedDict()
+        self._inflight: dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._writes = 0
+        self.hits = {"memory": 0, "disk": 0}
+        self.misses = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._schema_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=10)
+        db.execute("PRAGMA busy_timeout = 10000")
+        if not self._schema_ready:
+            db.execute("PRAGMA journal_mode = WAL")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model TEXT NOT NULL,
+                    text_hash TEXT NOT NULL,
+                    dimensions INTEGER NOT NULL,
+                    vector BLOB NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL,
+                    used_at REAL,
+                    PRIMARY KEY (model, text_hash)
+                )
+                """
+            )
+            columns = {row[1] for row in db.execute("PRAGMA table_info(embeddings)")}
+            if "used_at" not in columns:
+                db.execute("ALTER TABLE embeddings ADD COLUMN used_at REAL")
+            db.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_expiry ON embeddings (expires_at)")
+            db.commit()
+            self._schema_ready = True
+        return db
+
+    def _remember(self, key: str, vector: list[float], expires_at: float | None) -> None:
+        if not self.memory_entries:
+            return
+        self._memory[key] = (vector, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, model: str, text) -> list[float] | None:
+        key = text_key(model, text)
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                self._memory.move_to_end(key)
+                self.hits["memory"] += 1
+                return list(entry[0])
+        db = self._connect()
+        try:
+            row = db.execute(
+                "SELECT vector, expires_at FROM embeddings WHERE model = ? AND text_hash = ? "
+                "AND (expires_at IS NULL OR expires_at > ?)",
+                (model, key, now),
+            ).fetchone()
+            if row is not None and row[1] is None:
+                db.execute("UPDATE embeddings SET used_at = ? WHERE model = ? AND text_hash = ?", (now, model, key))
+                db.commit()
+        finally:
+            db.close()
+        if row is None:
+            return None
+        vector = array("d", row[0]).tolist()
+        with self._lock:
+            self._remember(key, vector, row[1])
+            self.hits["disk"] += 1
+        return list(vector)
+
+    def put(self, model: str, text, vector: list[float], ttl: float | None = EMBEDDING_TURN_TTL_SECONDS) -> None:
+        """Store a vector; an entry without expiry is never downgraded to a TTL."""
+        key = text_key(model, text)
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else None
+        values = [float(value) for value in vector]
+        db = self._connect()
+        try:
+            db.execute(
+                """
+                INSERT INTO embeddings (model, text_hash, dimensions, vector, created_at, expires_at, used_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (model, text_hash) DO UPDATE SET
+                    dimensions = excluded.dimensions,
+                    vector = excluded.vector,
+                    created_at = excluded.created_at,
+                    used_at = excluded.used_at,
+                    expires_at = CASE
+                        WHEN embeddings.expires_at IS NULL OR excluded.expires_at IS NULL THEN NULL
+                        ELSE max(embeddings.expires_at, excluded.expires_at)
+                    END
+                """,
+                (model, key, len(values), array("d", values).tobytes(), now, expires_at, now),
+            )
+            stored = db.execute(
+                "SELECT expires_at FROM embeddings WHERE model = ? AND text_hash = ?",
+                (model, key),
+            ).fetchone()
+            # The first write of a process also prunes, so a store left over its
+            # budget is trimmed without a scan at import time.
+            if self._writes % PRUNE_EVERY_WRITES == 0:
+                self._prune(db, now)
+            self._writes += 1
+            db.commit()
+        finally:
+            db.close()
+        with self._lock:
+            self._remember(key, values, stored[0] if stored else expires_at)
+
+    def _prune(self, db: sqlite3.Connection, now: float) -> None:
+        db.execute("DELETE FROM embeddings WHERE expires_at IS NOT NULL AND expires_at <= ?", (now,))
+        if self.kept_max_entries:
+            db.execute(
+                """
+                DELETE FROM embeddings WHERE rowid IN (
+                    SELECT rowid FROM embeddings WHERE expires_at IS NULL
+                    ORDER BY coalesce(used_at, created_at) DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.kept_max_entries,),
+            )
+
+    def embed(
+        self,
+        model: str,
+        text,
+        compute: Callable[[str], list[float]],
+        ttl: float | None = EMBEDDING_TURN_TTL_SECONDS,
+    ) -> list[float]:
+        """Read-through: concurrent callers in one process share a single
+        computation per key; failures are not cached and propagate."""
+        key = text_key(model, text)
+        while True:
+            cached = self.get(model, text)
+            if cached is not None:
+                return cached
+            with self._lock:
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self._inflight[key] = threading.Event()
+                    break
+            waiter.wait(60)
+        try:
+            vector = compute(text)
+            with self._lock:
+                self.misses += 1
+            if vector:
+                self.put(model, text, vector, ttl=ttl)
+            return vector
+        finally:
+            with self._lock:
+                done = self._inflight.pop(key, None)
+            if done is not None:
+                done.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "path": str(self.path),
+                "memory_entries": len(self._memory),
+                "hits": dict(self.hits),
+                "misses": self.misses,
+            }
+
+
+_CACHES: dict[str, EmbeddingCache] = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def shared_cache() -> EmbeddingCache:
+    key = str(EMBEDDING_CACHE_PATH)
+    with _CACHES_LOCK:
+        cache = _CACHES.get(key)
+        if cache is None:
+            cache = _CACHES[key] = EmbeddingCache(EMBEDDING_CACHE_PATH)
+        return cache
+
+
+def cached_embedding(
+    model: str,
+    text,
+    compute: Callable[[str], list[float]],
+    ttl: float | None = EMBEDDING_TURN_TTL_SECONDS,
+) -> list[float]:
+    return shared_cache().embed(model, text, compute, ttl=ttl)
@@ -0,0 +1,98 @@
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import embedding_cache
+import semantic_memory
+from archivist_agent import vector_memory
+
+
+class EmbeddingCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp.name) / "embeddings.sqlite3"
+        self.calls = []
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def compute(self, text):
+        self.calls.append(text)
+        return [float(len(text)), 1.0]
+
+    def test_one_turn_pays_for_one_embedding_across_layers_and_processes(self):
+        archive = embedding_cache.EmbeddingCache(self.path)
+        vox = embedding_cache.EmbeddingCache(self.path)  # another process on the same file
+        first = archive.embed("e5", "как там дела", self.compute)
+        second = archive.embed("e5", "как там дела", self.compute)
+        third = vox.embed("e5", "как там дела", self.compute)
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(first, second)
+        self.assertEqual(first, third)
+        self.assertEqual(vox.stats()["hits"]["disk"], 1)
+        vox.embed("other-model", "как там дела", self.compute)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_only_the_exact_embedder_input_is_shared(self):
+        cache = embedding_cache.EmbeddingCache(self.path)
+        cache.embed("e5", "как там дела", self.compute)
+        cache.embed("e5", "как там  дела\n", self.compute)
+        cache.embed("e5", "query: как там дела", self.compute)
+        self.assertEqual(self.calls, ["как там дела", "как там  дела\n", "query: как там дела"])
+
+    def test_kept_entries_are_bounded_least_recently_used_first(self):
+        cache = embedding_cache.EmbeddingCache(self.path, memory_entries=0, kept_max_entries=3)
+        clock = [1000.0]
+        with patch.object(embedding_cache.time, "time", side_effect=lambda: clock[0]):
+            for name in ("a", "b", "c", "d"):
+                clock[0] += 1
+                cache.embed("e5", f"page {name}", self.compute, ttl=None)
+            clock[0] += 1
+            cache.get("e5", "page a")
+            with patch.object(embedding_cache, "PRUNE_EVERY_WRITES", 1):
+                clock[0] += 1
+                cache.embed("e5", "page e", self.compute, ttl=None)
+                cache.embed("e5", "turn", self.compute, ttl=60)
+            kept = [name for name in "abcde" if cache.get("e5", f"page {name}") is not None]
+            self.assertIsNotNone(cache.get("e5", "turn"))
+        self.assertEqual(kept, ["a", "d", "e"])
+
+    def test_turn_entries_expire_but_content_entries_do_not(self):
+        cache = embedding_cache.EmbeddingCache(self.path, memory_entries=0)
+        cache.embed("e5", "query", self.compute, ttl=60)
+        cache.embed("e5", "page", self.compute, ttl=None)
+        cache.embed("e5", "page", self.compute, ttl=60)  # must not downgrade to a TTL
+        with patch.object(embedding_cache.time, "time", return_value=embedding_cache.time.time() + 3600):
+            self.assertIsNone(cache.get("e5", "query"))
+            self.assertIsNotNone(cache.get("e5", "page"))
+        with sqlite3.connect(self.path) as db:
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0], 2)
+
+    def test_failed_embedding_is_not_cached(self):
+        cache = embedding_cache.EmbeddingCache(self.path)
+
+        def broken(_text):
+            raise RuntimeError("embedder down")
+
+        with self.assertRaises(RuntimeError):
+            cache.embed("e5", "query", broken)
+        self.assertEqual(cache.embed("e5", "query", self.compute), [5.0, 1.0])
+
+    def test_semantic_layers_share_the_query_embedding(self):
+        cache = embedding_cache.EmbeddingCache(self.path)
+        with patch.dict(embedding_cache._CACHES, {str(embedding_cache.EMBEDDING_CACHE_PATH): cache}), patch.object(
+            vector_memory, "request_openai_embedding", side_effect=lambda text, **_kwargs: self.compute(text)
+        ):
+            for _layer in ("wiki", "focus", "graph"):
+                semantic_memory.semantic_scores("что с погодой", [("a", "погода"), ("b", "машина")])
+            vector_memory.embed_openai_text("что с погодой")
+        self.assertEqual(sorted(self.calls), ["машина", "погода", "что с погодой"])
+
+
+if __name__ == "__main__":
+    unittest.main()
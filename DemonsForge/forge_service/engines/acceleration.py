@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+import contextlib
+import functools
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from EyeOfTerror.Pictorium.Moriana.forge_runtime import config
+from .base import EngineError
+
+
+@dataclass(frozen=True)
+class AccelProfile:
+    name: str
+    dtype: str = "float32"
+    autocast_bf16: bool = False
+    int8_dynamic: bool = False
+    channels_last: bool = False
+    attention_slicing: bool = False
+    compile: bool = False
+
+
+# fp32 is the historical behaviour and stays the default; the others are opt-in
+# per engine (FORGE_ACCEL_PROFILE_<ENGINE>) or per job (JobSpec.accel_profile)
+# until benches/quality_bench.py --accel-profiles accepts them on numbers.
+ACCEL_PROFILES: dict[str, AccelProfile] = {
+    "fp32": AccelProfile("fp32"),
+    "fp32-tuned": AccelProfile("fp32-tuned", channels_last=True, attention_slicing=True),
+    "bf16": AccelProfile("bf16", dtype="bfloat16", autocast_bf16=True, channels_last=True, attention_slicing=True),
+    "int8": AccelProfile("int8", int8_dynamic=True, channels_last=True, attention_slicing=True),
+    "bf16-compiled": AccelProfile(
+        "bf16-compiled",
+        dtype="bfloat16",
+        autocast_bf16=True,
+        channels_last=True,
+        attention_slicing=True,
+        compile=True,
+    ),
+}
+
+
+def resolve_profile(engine_name: str, requested: str | None = None) -> AccelProfile:
+    name = config.accel_profile_for(engine_name, requested)
+    profile = ACCEL_PROFILES.get(name)
+    if profile is None:
+        raise EngineError(f"unknown acceleration profile: {name}; expected one of {', '.join(ACCEL_PROFILES)}")
+    return profile
+
+
+@functools.lru_cache(maxsize=1)
+def cpu_supports_bf16() -> bool:
+    """True when the CPU has native bf16 matmul (AVX512-BF16 or AMX); emulated bf16 is slower than fp32."""
+    try:
+        import torch
+
+        probe = getattr(torch.ops.mkldnn, "_is_mkldnn_bf16_supported", None)
+        if probe is not None:
+            return bool(probe())
+    except Exception:
+        pass
+    try:
+        flags = Path("/proc/cpuinfo").read_text(encoding="utf-8", errors="replace")
+    except OSError:
+        return False
+    return "avx512_bf16" in flags or "amx_bf16" in flags
+
+
+def effective_dtype(profile: AccelProfile) -> str:
+    if profile.dtype == "bfloat16" and not cpu_supports_bf16():
+        return "float32"
+    return profile.dtype
+
+
+def torch_dtype(profile: AccelProfile) -> Any:
+    import torch
+
+    return getattr(torch, effective_dtype(profile))
+
+
+def attention_slice_size() -> int:
+    """Heads per attention slice.
+
+    Slicing bounds the attention score tensor (heads x tokens^2), but each slice
+    is one batched matmul, so slices narrower than the thread pool leave cores
+    idle. Four threads per head keeps a 1024px SDXL slice saturated.
+    """
+    override = os.environ.get("FORGE_ATTENTION_SLICE_SIZE", "").strip()
+    if override:
+        return max(1, int(override))
+    return max(1, config.TORCH_ACTIVE_THREADS // 4)
+
+
+def compile_cache_dir(engine_name: str, model_dir: Path, profile: AccelProfile) -> Path:
+    return config.COMPILE_CACHE_DIR / f"{engine_name}-{model_dir.name}-{profile.name}"
+
+
+def _denoiser(pipe: Any) -> tuple[str, Any]:
+    for attribute in ("unet", "transformer"):
+        module = getattr(pipe, attribute, None)
+        if module is not None:
+            return attribute, module
+    raise EngineError("pipeline has neither unet nor transformer")
+
+
+def apply_profile(pipe: Any, profile: AccelProfile, engine_name: str, model_dir: Path) -> dict[str, object]:
+    """Apply ``profile`` to a freshly loaded pipeline in place and describe what took effect."""
+    import torch
+
+    started = time.monotonic()
+    attribute, denoiser = _denoiser(pipe)
+    state: dict[str, object] = {
+        "profile": profile.name,
+        "requested": asdict(profile),
+        "dtype": effective_dtype(profile),
+        "bf16_native": cpu_supports_bf16(),
+        "denoiser": attribute,
+    }
+    if profile.dtype == "bfloat16" and state["dtype"] != "bfloat16":
+        state["fallback"] = "cpu has no native bf16; loaded float32"
+    if profile.channels_last:
+        converted = []
+        for name in ("unet", "vae"):
+            module = getattr(pipe, name, None)
+            if module is not None:
+                module.to(memory_format=torch.channels_last)
+                converted.append(name)
+        state["channels_last"] = converted
+    if profile.int8_dynamic:
+        # Linear layers dominate the attention/FF cost on CPU; convs stay float.
+        torch.ao.quantization.quantize_dynamic(denoiser, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+        state["int8_dynamic"] = [attribute]
+    if profile.attention_slicing and hasattr(pipe, "enable_attention_slicing"):
+        slice_size = attention_slice_size()
+        pipe.enable_attention_slicing(slice_size)
+        state["attention_slice_size"] = slice_size
+    if profile.compile:
+        state["compile"] = _compile_denoiser(pipe, attribute, denoiser, compile_cache_dir(engine_name, model_dir, profile))
+    state["apply_seconds"] = round(time.monotonic() - started, 3)
+    return state
+
+
+def _compile_denoiser(pipe: Any, attribute: str, denoiser: Any, cache_dir: Path) -> dict[str, object]:
+    import torch
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    # Inductor's FX graph cache keys on graph + inputs, so a restart with the same
+    # model/profile/resolution reuses the generated kernels instead of recompiling.
+    os.environ["TORCHINDUCTOR_CACHE_DIR"] = str(cache_dir)
+    os.environ.setdefault("TORCHINDUCTOR_FX_GRAPH_CACHE", "1")
+    state: dict[str, object] = {"cache_dir": str(cache_dir), "artifact_loaded": False, "artifact_saved": False}
+    artifact = cache_dir / "cache_artifacts.bin"
+    loader = getattr(torch.compiler, "load_cache_artifacts", None)
+    if loader is not None and artifact.exists():
+        try:
+            loader(artifact.read_bytes())
+            state["artifact_loaded"] = True
+        except Exception as exc:
+            state["artifact_error"] = str(exc)
+    if hasattr(denoiser, "compile"):
+        # Module.compile keeps the UNet/transformer class, so from_pipe and LoRA
+        # loading still recognise the component.
+        denoiser.compile(fullgraph=False, dynamic=False)
+    else:
+        setattr(pipe, attribute, torch.compile(denoiser, fullgraph=False, dynamic=False))
+    return state
+
+
+def persist_compile_cache(state: dict[str, object]) -> None:
+    """Save the portable compile cache once the first generation has triggered compilation."""
+    compile_state = state.get("compile")
+    if not isinstance(compile_state, dict) or compile_state.get("artifact_saved"):
+        return
+    compile_state["artifact_saved"] = True
+    try:
+        import torch
+
+        saver = getattr(torch.compiler, "save_cache_artifacts", None)
+        if saver is None:
+            return
+        saved = saver()
+        if not saved:
+            return
+        payload = saved[0]
+        artifact = Path(str(compile_state["cache_dir"])) / "cache_artifacts.bin"
+        tmp_path = artifact.with_suffix(".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, artifact)
+        compile_state["artifact_bytes"] = len(payload)
+    except Exception as exc:
+        compile_state["artifact_error"] = str(exc)
+
+
+def inference_context(profile: AccelProfile) -> contextlib.AbstractContextManager:
+    if not profile.autocast_bf16 or not cpu_supports_bf16():
+        return contextlib.nullcontext()
+    import torch
+
+    return torch.autocast("cpu", dtype=torch.bfloat16)
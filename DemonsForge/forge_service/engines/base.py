@@ -13,6 +13,13 @@ class EngineError(RuntimeError):
     pass
 
 
+def candidate_seeds(spec: JobSpec) -> list[int | None]:
+    """Seed of each image in a batch: the job seed for the first, then consecutive seeds."""
+    if spec.seed is None or spec.seed < 0:
+        return [None] * spec.batch_size
+    return [(spec.seed + index) % 2**32 for index in range(spec.batch_size)]
+
+
 class BaseEngine(ABC):
     name: str
 
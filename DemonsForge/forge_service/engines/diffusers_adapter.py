@@ -3,15 +3,21 @@ from __future__ import annotations
 import os
 import gc
 import inspect
+import math
+import resource
 import time
 import re
 from pathlib import Path
 from typing import Any
 
+import psutil
+
 from EyeOfTerror.Pictorium.Moriana.forge_runtime import config
 from EyeOfTerror.Pictorium.Moriana.moriana_core.asset_catalog import ENGINE_MODELS, find_lora
 from EyeOfTerror.Pictorium.Moriana.forge_runtime.schemas import JobSpec
-from .base import BaseEngine, EngineError, ProgressCallback
+from .acceleration import AccelProfile, apply_profile, inference_context, persist_compile_cache, resolve_profile, torch_dtype
+from .base import BaseEngine, EngineError, ProgressCallback, candidate_seeds
+from .previews import LatentPreviewDecoder, PreviewHook
 
 
 class DiffusersEngine(BaseEngine):
@@ -24,34 +30,52 @@ class DiffusersEngine(BaseEngine):
         self._img2img_pipe: Any = None
         self._inpaint_pipe: Any = None
         self.loaded_model: str | None = None
+        self.accel_profile: AccelProfile | None = None
+        self.accel_state: dict[str, object] = {}
         self.last_used = 0.0
-        self._loaded_loras: dict[int, set[str]] = {}
+        # img2img/inpaint pipes share the txt2img UNet and text encoders, so one
+        # adapter registry covers every pipe of this engine.
+        self._lora_adapters: set[str] = set()
+        self.memory_state: dict[str, object] = {}
+        self.preview_decoder = LatentPreviewDecoder(engine_name)
+        self.pipeline_loads = 0
+        self.load_seconds = 0.0
+        self.last_load_seconds: float | None = None
 
     def _model_dir(self, spec: JobSpec) -> Path:
         model_name = spec.model or self.meta["default_model"]
         return config.MODELS_DIR / model_name
 
-    def _pipeline_kwargs(self) -> dict[str, Any]:
-        import torch
-
+    def _pipeline_kwargs(self, profile: AccelProfile) -> dict[str, Any]:
         kwargs: dict[str, Any] = {
-            "torch_dtype": torch.float32,
+            "torch_dtype": torch_dtype(profile),
             "low_cpu_mem_usage": True,
         }
         if self.name == "sdxl":
             kwargs["use_safetensors"] = True
         return kwargs
 
+    def _is_loaded(self, spec: JobSpec, pipe: Any) -> bool:
+        return (
+            pipe is not None
+            and self.loaded_model == str(self._model_dir(spec))
+            and self.accel_profile == resolve_profile(self.name, spec.accel_profile)
+        )
+
     def _load_pipeline(self, spec: JobSpec) -> Any:
         model_dir = self._model_dir(spec)
-        if self._pipe is not None and self.loaded_model == str(model_dir):
+        profile = resolve_profile(self.name, spec.accel_profile)
+        if self._is_loaded(spec, self._pipe):
             self.last_used = time.monotonic()
             return self._pipe
         if not (model_dir / "model_index.json").exists():
             raise EngineError(f"Model is not available locally: {model_dir}")
+        # Derived pipes and adapters belong to the old components; release them first.
+        self.unload()
 
         config.force_cpu_runtime()
         config.boost_torch_threads()
+        started = time.monotonic()
 
         from diffusers import FluxPipeline, StableDiffusion3Pipeline, StableDiffusionXLPipeline
 
@@ -60,12 +84,22 @@ class DiffusersEngine(BaseEngine):
             "StableDiffusionXLPipeline": StableDiffusionXLPipeline,
             "FluxPipeline": FluxPipeline,
         }[self.meta["pipeline"]]
-        self._pipe = pipeline_cls.from_pretrained(model_dir, **self._pipeline_kwargs())
-        self._pipe.set_progress_bar_config(disable=False)
+        pipe = pipeline_cls.from_pretrained(model_dir, **self._pipeline_kwargs(profile))
+        pipe.set_progress_bar_config(disable=False)
+        self.accel_state = apply_profile(pipe, profile, self.name, model_dir)
+        self._pipe = pipe
+        self.accel_profile = profile
         self.loaded_model = str(model_dir)
-        self.last_used = time.monotonic()
+        self._record_load(started)
+        self._account_memory()
         return self._pipe
 
+    def _record_load(self, started: float) -> None:
+        self.last_used = time.monotonic()
+        self.last_load_seconds = self.last_used - started
+        self.pipeline_loads += 1
+        self.load_seconds += self.last_load_seconds
+
     def unload(self) -> bool:
         if self._pipe is None and self._img2img_pipe is None and self._inpaint_pipe is None:
             return False
@@ -73,7 +107,10 @@ class DiffusersEngine(BaseEngine):
         self._img2img_pipe = None
         self._inpaint_pipe = None
         self.loaded_model = None
-        self._loaded_loras.clear()
+        self.accel_profile = None
+        self.accel_state = {}
+        self._lora_adapters.clear()
+        self.memory_state = {}
         gc.collect()
         try:
             import torch
@@ -103,53 +140,65 @@ class DiffusersEngine(BaseEngine):
                 "img2img": self._img2img_pipe is not None,
                 "inpaint": self._inpaint_pipe is not None,
             },
-            "loaded_loras": sorted({name for names in self._loaded_loras.values() for name in names}),
+            "loaded_loras": sorted(self._lora_adapters),
             "idle_seconds": round(time.monotonic() - self.last_used, 1) if loaded else None,
+            "pipeline_loads": self.pipeline_loads,
+            "load_seconds": round(self.load_seconds, 2),
+            "last_load_seconds": round(self.last_load_seconds, 2) if self.last_load_seconds is not None else None,
+            "memory": dict(self.memory_state),
+            "accel_profile": self.accel_profile.name if self.accel_profile else None,
+            "acceleration": dict(self.accel_state),
         }
 
     def _load_sdxl_img2img_pipeline(self, spec: JobSpec) -> Any:
-        if self.name != "sdxl":
-            raise EngineError(f"{self.name} does not support img2img yet")
-        model_dir = self._model_dir(spec)
-        if self._img2img_pipe is not None and self.loaded_model == str(model_dir):
-            self.last_used = time.monotonic()
-            return self._img2img_pipe
-        if not (model_dir / "model_index.json").exists():
-            raise EngineError(f"Model is not available locally: {model_dir}")
-        config.force_cpu_runtime()
-        config.boost_torch_threads()
-        from diffusers import StableDiffusionXLImg2ImgPipeline
-
-        self._img2img_pipe = StableDiffusionXLImg2ImgPipeline.from_pretrained(
-            model_dir,
-            **self._pipeline_kwargs(),
-        )
-        self._img2img_pipe.set_progress_bar_config(disable=False)
-        self.loaded_model = str(model_dir)
-        self.last_used = time.monotonic()
-        return self._img2img_pipe
+        return self._derived_pipeline(spec, "img2img")
 
     def _load_sdxl_inpaint_pipeline(self, spec: JobSpec) -> Any:
+        return self._derived_pipeline(spec, "inpaint")
+
+    def _derived_pipeline(self, spec: JobSpec, kind: str) -> Any:
+        """Build an img2img/inpaint pipe around the already loaded txt2img components."""
         if self.name != "sdxl":
-            raise EngineError(f"{self.name} does not support inpaint yet")
-        model_dir = self._model_dir(spec)
-        if self._inpaint_pipe is not None and self.loaded_model == str(model_dir):
+            raise EngineError(f"{self.name} does not support {kind} yet")
+        attribute = "_img2img_pipe" if kind == "img2img" else "_inpaint_pipe"
+        current = getattr(self, attribute)
+        if self._is_loaded(spec, current):
             self.last_used = time.monotonic()
-            return self._inpaint_pipe
-        if not (model_dir / "model_index.json").exists():
-            raise EngineError(f"Model is not available locally: {model_dir}")
-        config.force_cpu_runtime()
-        config.boost_torch_threads()
-        from diffusers import StableDiffusionXLInpaintPipeline
+            return current
+        base = self._load_pipeline(spec)
+        from diffusers import StableDiffusionXLImg2ImgPipeline, StableDiffusionXLInpaintPipeline
 
-        self._inpaint_pipe = StableDiffusionXLInpaintPipeline.from_pretrained(
-            model_dir,
-            **self._pipeline_kwargs(),
-        )
-        self._inpaint_pipe.set_progress_bar_config(disable=False)
-        self.loaded_model = str(model_dir)
+        pipeline_cls = StableDiffusionXLImg2ImgPipeline if kind == "img2img" else StableDiffusionXLInpaintPipeline
+        if hasattr(pipeline_cls, "from_pipe"):
+            pipe = pipeline_cls.from_pipe(base)
+        else:
+            pipe = pipeline_cls(**base.components)
+        pipe.set_progress_bar_config(disable=False)
+        setattr(self, attribute, pipe)
         self.last_used = time.monotonic()
-        return self._inpaint_pipe
+        self._account_memory()
+        return pipe
+
+    def _account_memory(self) -> None:
+        seen: set[int] = set()
+        component_bytes = 0
+        for pipe in (self._pipe, self._img2img_pipe, self._inpaint_pipe):
+            if pipe is None:
+                continue
+            for component in getattr(pipe, "components", {}).values():
+                if component is None or id(component) in seen or not hasattr(component, "parameters"):
+                    continue
+                seen.add(id(component))
+                tensors = [*component.parameters(), *component.buffers()]
+                component_bytes += sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+        rss_bytes = psutil.Process().memory_info().rss
+        self.memory_state = {
+            "component_bytes": component_bytes,
+            "component_gb": round(component_bytes / 1024**3, 2),
+            "shared_modules": len(seen),
+            "rss_gb": round(rss_bytes / 1024**3, 2),
+            "process_peak_rss_gb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024**2, 2),
+        }
 
     def _apply_scheduler(self, pipe: Any, scheduler_name: str | None) -> None:
         if not scheduler_name or scheduler_name == "native":
@@ -169,26 +218,37 @@ class DiffusersEngine(BaseEngine):
 
     def _apply_loras(self, pipe: Any, spec: JobSpec) -> None:
         if not spec.loras:
+            # Adapters live in the shared UNet; keep an earlier LoRA job from leaking in.
+            if self._lora_adapters and hasattr(pipe, "disable_lora"):
+                pipe.disable_lora()
             return
         if self.name != "sdxl":
             raise EngineError(f"{self.name} adapter does not support LoRA loading yet")
+        if self.accel_profile is not None and (self.accel_profile.int8_dynamic or self.accel_profile.compile):
+            raise EngineError(f"LoRA is not supported with the {self.accel_profile.name} acceleration profile")
         adapter_names = []
         adapter_weights = []
-        loaded_for_pipe = self._loaded_loras.setdefault(id(pipe), set())
         for item in spec.loras:
             local = find_lora(item.name)
             if not local:
                 raise EngineError(f"LoRA is not available locally: {item.name}")
             adapter_name = re.sub(r"[^A-Za-z0-9_]", "_", f"lora_{item.name}")
-            if adapter_name not in loaded_for_pipe:
+            if adapter_name not in self._lora_adapters:
                 pipe.load_lora_weights(local["path"], adapter_name=adapter_name)
-                loaded_for_pipe.add(adapter_name)
+                self._lora_adapters.add(adapter_name)
             adapter_names.append(adapter_name)
             adapter_weights.append(item.weight)
+        if hasattr(pipe, "enable_lora"):
+            pipe.enable_lora()
         if hasattr(pipe, "set_adapters"):
             pipe.set_adapters(adapter_names, adapter_weights=adapter_weights)
 
-    def generate_txt2img(self, spec: JobSpec, progress: ProgressCallback) -> list[object]:
+    def generate_txt2img(
+        self,
+        spec: JobSpec,
+        progress: ProgressCallback,
+        preview: PreviewHook | None = None,
+    ) -> list[object]:
         if spec.type.value != "txt2img":
             raise EngineError(f"{self.name} does not support job type {spec.type.value}")
         if spec.control:
@@ -199,19 +259,12 @@ class DiffusersEngine(BaseEngine):
         self._apply_scheduler(pipe, spec.scheduler)
         self._apply_loras(pipe, spec)
 
-        import torch
-
-        seed = spec.seed
-        generator = None
-        if seed is not None and seed >= 0:
-            generator = torch.Generator(device="cpu").manual_seed(seed)
-
         kwargs: dict[str, Any] = {
             "prompt": (spec.prompt or "").strip(),
             "width": spec.width,
             "height": spec.height,
             "num_inference_steps": spec.steps,
-            "generator": generator,
+            **self._seed_kwargs(spec),
         }
         if self.meta.get("supports_negative_prompt"):
             kwargs["negative_prompt"] = (spec.negative_prompt or "").strip() or None
@@ -222,24 +275,21 @@ class DiffusersEngine(BaseEngine):
             if kwargs["guidance_scale"] is None:
                 kwargs["guidance_scale"] = self.meta["guidance_default"]
 
-        signature = inspect.signature(pipe.__call__)
-        if "callback_on_step_end" in signature.parameters:
-            total_steps = max(spec.steps, 1)
-
-            def on_step_end(_pipeline: Any, step: int, _timestep: Any, callback_kwargs: dict[str, Any]):
-                progress_value = 0.15 + (0.7 * min(step + 1, total_steps) / total_steps)
-                progress(progress_value, f"generation step {step + 1}/{total_steps}")
-                return callback_kwargs
-
-            kwargs["callback_on_step_end"] = on_step_end
+        kwargs.update(self._callback_kwargs(pipe, spec, progress, preview))
 
         progress(0.15, "generating image")
-        result = pipe(**kwargs)
+        result = self._run_pipe(pipe, kwargs)
         progress(0.9, "image generated")
         self.last_used = time.monotonic()
         return list(result.images)
 
-    def generate_img2img(self, spec: JobSpec, source_image: Path, progress: ProgressCallback) -> list[object]:
+    def generate_img2img(
+        self,
+        spec: JobSpec,
+        source_image: Path,
+        progress: ProgressCallback,
+        preview: PreviewHook | None = None,
+    ) -> list[object]:
         if spec.type.value != "img2img":
             raise EngineError(f"{self.name} does not support job type {spec.type.value}")
         progress(0.05, "loading img2img pipeline")
@@ -250,9 +300,9 @@ class DiffusersEngine(BaseEngine):
         kwargs = self._image_job_kwargs(spec)
         kwargs["image"] = image
         kwargs["strength"] = spec.strength
-        kwargs.update(self._callback_kwargs(pipe, spec.steps, progress))
+        kwargs.update(self._callback_kwargs(pipe, spec, progress, preview))
         progress(0.15, "generating img2img")
-        result = pipe(**kwargs)
+        result = self._run_pipe(pipe, kwargs)
         progress(0.9, "image generated")
         self.last_used = time.monotonic()
         return list(result.images)
@@ -263,6 +313,7 @@ class DiffusersEngine(BaseEngine):
         source_image: Path,
         mask_image: Path,
         progress: ProgressCallback,
+        preview: PreviewHook | None = None,
     ) -> list[object]:
         if spec.type.value != "inpaint":
             raise EngineError(f"{self.name} does not support job type {spec.type.value}")
@@ -276,19 +327,36 @@ class DiffusersEngine(BaseEngine):
         kwargs["image"] = image
         kwargs["mask_image"] = mask
         kwargs["strength"] = spec.strength
-        kwargs.update(self._callback_kwargs(pipe, spec.steps, progress))
+        kwargs.update(self._callback_kwargs(pipe, spec, progress, preview))
         progress(0.15, "generating inpaint")
-        result = pipe(**kwargs)
+        result = self._run_pipe(pipe, kwargs)
         progress(0.9, "image generated")
         self.last_used = time.monotonic()
         return list(result.images)
 
-    def _image_job_kwargs(self, spec: JobSpec) -> dict[str, Any]:
+    def _run_pipe(self, pipe: Any, kwargs: dict[str, Any]) -> Any:
+        profile = self.accel_profile or resolve_profile(self.name)
+        with inference_context(profile):
+            result = pipe(**kwargs)
+        persist_compile_cache(self.accel_state)
+        return result
+
+    def _seed_kwargs(self, spec: JobSpec) -> dict[str, Any]:
+        """Generate the whole batch in one call, one generator per candidate seed.
+
+        Prompt encoding, scheduler setup and the per-step UNet launch are shared
+        by the batch; each image still reproduces from its own seed alone.
+        """
         import torch
 
-        generator = None
-        if spec.seed is not None and spec.seed >= 0:
-            generator = torch.Generator(device="cpu").manual_seed(spec.seed)
+        seeds = candidate_seeds(spec)
+        generators = [torch.Generator(device="cpu").manual_seed(seed) for seed in seeds if seed is not None]
+        generator: Any = None
+        if generators:
+            generator = generators[0] if len(generators) == 1 else generators
+        return {"generator": generator, "num_images_per_prompt": spec.batch_size}
+
+    def _image_job_kwargs(self, spec: JobSpec) -> dict[str, Any]:
         kwargs: dict[str, Any] = {
             "prompt": (spec.prompt or "").strip(),
             "negative_prompt": (spec.negative_prompt or "").strip() or None,
@@ -296,19 +364,50 @@ class DiffusersEngine(BaseEngine):
             "height": spec.height,
             "num_inference_steps": spec.steps,
             "guidance_scale": spec.guidance if spec.guidance is not None else spec.cfg or self.meta["guidance_default"],
-            "generator": generator,
+            **self._seed_kwargs(spec),
         }
         return kwargs
 
-    def _callback_kwargs(self, pipe: Any, steps: int, progress: ProgressCallback) -> dict[str, Any]:
+    def _callback_kwargs(
+        self,
+        pipe: Any,
+        spec: JobSpec,
+        progress: ProgressCallback,
+        preview: PreviewHook | None = None,
+    ) -> dict[str, Any]:
         signature = inspect.signature(pipe.__call__)
         if "callback_on_step_end" not in signature.parameters:
             return {}
-        total_steps = max(steps, 1)
-
-        def on_step_end(_pipeline: Any, step: int, _timestep: Any, callback_kwargs: dict[str, Any]):
+        total_steps = max(spec.steps, 1)
+        check = spec.preview_check
+        if preview is not None and check is not None and not self.preview_decoder.available():
+            progress(0.15, f"latent preview unavailable for {self.name}; running to completion")
+            preview = None
+        pending_preview = [preview is not None and check is not None]
+        started = time.monotonic()
+        cpu_started = time.process_time()
+
+        def on_step_end(pipeline: Any, step: int, _timestep: Any, callback_kwargs: dict[str, Any]):
             progress_value = 0.15 + (0.7 * min(step + 1, total_steps) / total_steps)
             progress(progress_value, f"generation step {step + 1}/{total_steps}")
+            if not pending_preview[0]:
+                return callback_kwargs
+            # img2img/inpaint only run steps * strength denoising steps.
+            denoise_steps = int(getattr(pipeline, "num_timesteps", 0) or total_steps)
+            if step + 1 < max(1, math.ceil(denoise_steps * check.at_fraction)) or step + 1 >= denoise_steps:
+                return callback_kwargs
+            pending_preview[0] = False
+            image = self.preview_decoder.decode(pipeline, callback_kwargs["latents"], spec.width, spec.height)
+            preview(
+                image,
+                {
+                    "step": step + 1,
+                    "total_steps": denoise_steps,
+                    "elapsed_seconds": round(time.monotonic() - started, 3),
+                    "cpu_seconds": round(time.process_time() - cpu_started, 3),
+                    "decoder": self.preview_decoder.method(),
+                },
+            )
             return callback_kwargs
 
         return {"callback_on_step_end": on_step_end}
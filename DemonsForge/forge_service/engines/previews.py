@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable
+
+from EyeOfTerror.Pictorium.Moriana.forge_runtime import config
+from .base import EngineError
+
+# Called once per job with the preview image and step/timing context; raise
+# PreviewAbort to stop the pipeline before the remaining steps and VAE decode.
+PreviewHook = Callable[[Any, dict[str, object]], None]
+
+PREVIEW_MAX_SIDE = 512
+# Tiny autoencoders (madebyollin/taesdxl, taesd3, taef1) are optional; drop them
+# under models/ to get sharp previews. Without one, SDXL falls back to a linear
+# latent->RGB projection and the other engines skip the preview.
+TINY_DECODER_DIRS = {
+    "sdxl": "taesdxl",
+    "stable_diffusion": "taesd3",
+    "flux": "taef1",
+}
+# Least-squares fit of SDXL VAE latents to RGB, as used for sampler previews.
+SDXL_LATENT_RGB_FACTORS = (
+    (0.3651, 0.4232, 0.4341),
+    (-0.2533, -0.0042, 0.1068),
+    (0.1076, 0.1111, -0.0362),
+    (-0.3165, -0.2492, -0.2188),
+)
+SDXL_LATENT_RGB_BIAS = (0.1084, -0.0175, -0.0011)
+
+
+class PreviewAbort(EngineError):
+    def __init__(self, report: dict[str, object]):
+        super().__init__(f"aborted by preview judge: {report.get('reason') or 'rejected'}")
+        self.report = report
+
+
+class LatentPreviewDecoder:
+    def __init__(self, engine_name: str):
+        self.engine_name = engine_name
+        self._tiny: Any = None
+        self._tiny_checked = False
+
+    def available(self) -> bool:
+        return self._tiny_decoder() is not None or self.engine_name == "sdxl"
+
+    def method(self) -> str:
+        return "tiny_vae" if self._tiny_decoder() is not None else "linear_rgb"
+
+    def _tiny_decoder(self) -> Any:
+        if self._tiny_checked:
+            return self._tiny
+        self._tiny_checked = True
+        name = TINY_DECODER_DIRS.get(self.engine_name)
+        path = config.MODELS_DIR / name if name else None
+        if path is None or not (path / "config.json").exists():
+            return None
+        import torch
+        from diffusers import AutoencoderTiny
+
+        self._tiny = AutoencoderTiny.from_pretrained(path, torch_dtype=torch.float32)
+        self._tiny.eval()
+        return self._tiny
+
+    def decode(self, pipe: Any, latents: Any, width: int, height: int) -> Any:
+        import torch
+        from PIL import Image
+
+        with torch.no_grad():
+            latents = latents[:1].detach().float()
+            if latents.ndim == 3 and hasattr(pipe, "_unpack_latents"):
+                # Flux keeps latents packed as (batch, patches, channels * 4).
+                latents = pipe._unpack_latents(latents, height, width, pipe.vae_scale_factor)
+            tiny = self._tiny_decoder()
+            if tiny is not None:
+                scaled = latents / tiny.config.scaling_factor + float(getattr(tiny.config, "shift_factor", 0.0) or 0.0)
+                pixels = tiny.decode(scaled).sample[0].clamp(-1, 1)
+            elif self.engine_name == "sdxl" and latents.shape[1] == len(SDXL_LATENT_RGB_FACTORS):
+                factors = torch.tensor(SDXL_LATENT_RGB_FACTORS, dtype=latents.dtype)
+                bias = torch.tensor(SDXL_LATENT_RGB_BIAS, dtype=latents.dtype)
+                pixels = (torch.einsum("chw,cr->rhw", latents[0], factors) + bias[:, None, None]).clamp(-1, 1)
+            else:
+                raise EngineError(f"no preview decoder for {self.engine_name}")
+            array = ((pixels + 1) * 127.5).round().to(torch.uint8).permute(1, 2, 0).cpu().numpy()
+        image = Image.fromarray(array)
+        scale = PREVIEW_MAX_SIDE / max(width, height)
+        target = (max(1, round(width * scale)), max(1, round(height * scale)))
+        return image.resize(target, Image.Resampling.BICUBIC)
+
+
+def save_preview(image: Any, job_id: str) -> Path:
+    path = config.ARTIFACTS_DIR / "previews" / f"{job_id}.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    image.save(path)
+    return path
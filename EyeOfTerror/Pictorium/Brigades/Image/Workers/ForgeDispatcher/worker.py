@@ -24,8 +24,8 @@ def worker_contract() -> dict[str, Any]:
         name=WORKER,
         role="ForgeRuntime dry-run validator and job submitter",
         capabilities=["job_validation", "dry_run", "queued_submit", "structured_runtime_blockers"],
-        inputs=["job_spec", "submit", "db_path"],
-        outputs=["dispatch", "job_record", "blockers"],
+        inputs=["job_spec", "submit", "db_path", "max_wait_sec"],
+        outputs=["dispatch", "job_record", "job_result", "blockers"],
     )
 
 
@@ -101,8 +101,14 @@ def prepare_dispatch(payload: dict[str, Any] | None) -> dict[str, Any]:
             ok=False,
         )
     job_record = None
+    job_result = None
     if submit:
         job_record = queue.submit(spec)
+        # Optional: hand back the finished job and its artifacts as soon as the
+        # forge completes it instead of leaving the caller to poll.
+        max_wait_sec = float(data.get("max_wait_sec") or 0.0)
+        if max_wait_sec > 0:
+            job_result = queue.job_result(job_record.id, timeout=max_wait_sec)
     return response(
         WORKER,
         with_model_guidance(
@@ -115,7 +121,8 @@ def prepare_dispatch(payload: dict[str, Any] | None) -> dict[str, Any]:
                     "queue_state": queue.queue_state(),
                 },
                 "job_spec": model_dump(spec),
-                "job_record": model_dump(job_record) if job_record else None,
+                "job_record": (job_result or {}).get("job") or (model_dump(job_record) if job_record else None),
+                "job_result": job_result,
                 "blockers": model_blockers,
                 "execution_packet": execution_packet(
                     worker=WORKER,
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""Peak RSS and load time of the SDXL txt2img/img2img/inpaint pipeline set.
+
+``separate`` reproduces the pre-sharing engine (one ``from_pretrained`` per
+pipeline kind); ``shared`` goes through ``DiffusersEngine``, which derives
+img2img/inpaint from the txt2img components. Each mode runs in its own
+interpreter so ``ru_maxrss`` is not polluted by the other.
+"""
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import resource
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[4]
+ROOT = PROJECT_ROOT / "DemonsForge"
+TESTS_ROOT = PROJECT_ROOT / "EyeOfTerror" / "Pictorium" / "Moriana" / "forge_tests"
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(TESTS_ROOT))
+
+from EyeOfTerror.Pictorium.Moriana.moriana_core.forge_reports import prune_reports
+from forge_test_lock import forge_test_lock
+
+REPORTS_DIR = ROOT / "runtime" / "test-reports"
+DEFAULT_MODEL = "stable-diffusion-xl-base-1.0"
+MODES = ("separate", "shared")
+
+
+def utc_now() -> str:
+    return dt.datetime.now(dt.UTC).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+
+
+def peak_rss_gb() -> float:
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024**2, 3)
+
+
+def current_rss_gb() -> float:
+    import psutil
+
+    return round(psutil.Process().memory_info().rss / 1024**3, 3)
+
+
+def unique_component_gb(pipes: list[Any]) -> float:
+    seen: set[int] = set()
+    total = 0
+    for pipe in pipes:
+        for component in pipe.components.values():
+            if component is None or id(component) in seen or not hasattr(component, "parameters"):
+                continue
+            seen.add(id(component))
+            total += sum(tensor.numel() * tensor.element_size() for tensor in [*component.parameters(), *component.buffers()])
+    return round(total / 1024**3, 3)
+
+
+def run_separate(model: str, lora: str | None) -> dict[str, Any]:
+    import torch
+    from diffusers import StableDiffusionXLImg2ImgPipeline, StableDiffusionXLInpaintPipeline, StableDiffusionXLPipeline
+
+    from EyeOfTerror.Pictorium.Moriana.forge_runtime import config
+    from EyeOfTerror.Pictorium.Moriana.moriana_core.asset_catalog import find_lora
+
+    config.force_cpu_runtime()
+    model_dir = config.MODELS_DIR / model
+    kwargs = {"torch_dtype": torch.float32, "low_cpu_mem_usage": True, "use_safetensors": True}
+    stages = []
+    pipes = []
+    for kind, pipeline_cls in (
+        ("txt2img", StableDiffusionXLPipeline),
+        ("img2img", StableDiffusionXLImg2ImgPipeline),
+        ("inpaint", StableDiffusionXLInpaintPipeline),
+    ):
+        started = time.monotonic()
+        pipes.append(pipeline_cls.from_pretrained(model_dir, **kwargs))
+        stages.append({"pipeline": kind, "load_sec": round(time.monotonic() - started, 3), "rss_gb": current_rss_gb()})
+    if lora:
+        local = find_lora(lora)
+        if not local:
+            raise SystemExit(f"LoRA is not available locally: {lora}")
+        started = time.monotonic()
+        for pipe in pipes:
+            pipe.load_lora_weights(local["path"], adapter_name="bench")
+        stages.append({"pipeline": "lora", "load_sec": round(time.monotonic() - started, 3), "rss_gb": current_rss_gb()})
+    return {"stages": stages, "component_gb": unique_component_gb(pipes)}
+
+
+def run_shared(model: str, lora: str | None) -> dict[str, Any]:
+    from DemonsForge.forge_service.engines.diffusers_adapter import DiffusersEngine
+    from EyeOfTerror.Pictorium.Moriana.forge_runtime.schemas import JobSpec, LoraRef
+
+    engine = DiffusersEngine("sdxl")
+    loras = [LoraRef(name=lora, weight=0.7)] if lora else []
+    spec = JobSpec(engine="sdxl", model=model, type="txt2img", prompt="bench", loras=loras)
+    stages = []
+    pipes = []
+    for kind, loader in (
+        ("txt2img", engine._load_pipeline),
+        ("img2img", engine._load_sdxl_img2img_pipeline),
+        ("inpaint", engine._load_sdxl_inpaint_pipeline),
+    ):
+        started = time.monotonic()
+        pipes.append(loader(spec))
+        stages.append({"pipeline": kind, "load_sec": round(time.monotonic() - started, 3), "rss_gb": current_rss_gb()})
+    if lora:
+        started = time.monotonic()
+        for pipe in pipes:
+            engine._apply_loras(pipe, spec)
+        stages.append({"pipeline": "lora", "load_sec": round(time.monotonic() - started, 3), "rss_gb": current_rss_gb()})
+    return {"stages": stages, "component_gb": unique_component_gb(pipes), "engine": engine.runtime_state()}
+
+
+def run_child(mode: str, model: str, lora: str | None) -> int:
+    started = time.monotonic()
+    result = run_separate(model, lora) if mode == "separate" else run_shared(model, lora)
+    result.update({"mode": mode, "total_load_sec": round(time.monotonic() - started, 3), "peak_rss_gb": peak_rss_gb()})
+    print(json.dumps(result, ensure_ascii=False))
+    return 0
+
+
+def measure(mode: str, model: str, lora: str | None) -> dict[str, Any]:
+    command = [sys.executable, __file__, "--child", mode, "--model", model]
+    if lora:
+        command.extend(["--lora", lora])
+    completed = subprocess.run(command, capture_output=True, text=True, check=False)
+    if completed.returncode != 0:
+        return {"mode": mode, "ok": False, "error": completed.stderr.strip()[-2000:]}
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if not lines:
+        return {"mode": mode, "ok": False, "error": "child produced no JSON result"}
+    return {"ok": True, **json.loads(lines[-1])}
+
+
+def write_summary(report: dict[str, Any], path: Path) -> str:
+    lines = [
+        "# DemonsForge Pipeline Memory Bench",
+        "",
+        f"- run_id: `{report['run_id']}`",
+        f"- model: `{report['model']}`",
+        f"- lora: `{report.get('lora') or ''}`",
+        f"- ok: `{report['ok']}`",
+        "",
+        "| mode | peak RSS GB | unique weights GB | total load s |",
+        "| --- | --- | --- | --- |",
+    ]
+    for result in report["results"]:
+        if not result.get("ok"):
+            lines.append(f"| {result['mode']} | error | | |")
+            continue
+        lines.append(f"| {result['mode']} | {result['peak_rss_gb']} | {result['component_gb']} | {result['total_load_sec']} |")
+    if report.get("delta"):
+        lines.extend(["", f"- delta: `{json.dumps(report['delta'])}`"])
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--lora", default="", help="optional local LoRA applied to every pipeline kind")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    parser.add_argument("--report-json", default="")
+    args = parser.parse_args()
+    if args.child:
+        return run_child(args.child, args.model, args.lora or None)
+    with forge_test_lock():
+        return _main(args)
+
+
+def _main(args: argparse.Namespace) -> int:
+    run_id = dt.datetime.now(dt.UTC).strftime("%Y%m%d-%H%M%S-forge-pipeline-memory")
+    modes = [mode for mode in args.modes.split(",") if mode in MODES]
+    report: dict[str, Any] = {
+        "run_id": run_id,
+        "started_at": utc_now(),
+        "model": args.model,
+        "lora": args.lora,
+        "results": [],
+    }
+    for mode in modes:
+        result = measure(mode, args.model, args.lora or None)
+        report["results"].append(result)
+        print(f"{mode}: ok={result.get('ok')} peak_rss_gb={result.get('peak_rss_gb')} load_sec={result.get('total_load_sec')}", flush=True)
+    by_mode = {result["mode"]: result for result in report["results"] if result.get("ok")}
+    if {"separate", "shared"} <= set(by_mode):
+        report["delta"] = {
+            "peak_rss_gb_saved": round(by_mode["separate"]["peak_rss_gb"] - by_mode["shared"]["peak_rss_gb"], 3),
+            "weights_gb_saved": round(by_mode["separate"]["component_gb"] - by_mode["shared"]["component_gb"], 3),
+            "load_sec_saved": round(by_mode["separate"]["total_load_sec"] - by_mode["shared"]["total_load_sec"], 3),
+        }
+    report["finished_at"] = utc_now()
+    report["ok"] = bool(report["results"]) and all(result.get("ok") for result in report["results"])
+    REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    report_path = Path(args.report_json) if args.report_json else REPORTS_DIR / f"{run_id}.json"
+    if not report_path.is_absolute():
+        report_path = ROOT / report_path
+    report_path.parent.mkdir(parents=True, exist_ok=True)
+    report["summary_path"] = write_summary(report, report_path.with_suffix(".md"))
+    report_path.write_text(json.dumps(report, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    prune_reports()
+    print(f"report: {report_path}", flush=True)
+    return 0 if report["ok"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
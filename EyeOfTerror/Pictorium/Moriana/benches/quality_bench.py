@@ -2,15 +2,17 @@
 from __future__ import annotations
 
 import argparse
+import copy
 import datetime as dt
 import json
+import math
 import sys
 import time
 from pathlib import Path
 from typing import Any
 
 import requests
-from PIL import Image, ImageDraw
+from PIL import Image, ImageChops, ImageDraw, ImageStat
 
 
 PROJECT_ROOT = Path(__file__).resolve().parents[4]
@@ -28,6 +30,10 @@ QUALITY_ASSETS = ROOT / "quality_assets"
 EXPECTED_NOTES = QUALITY_ASSETS / "expected_notes.json"
 GENERATED_ASSETS = QUALITY_ASSETS / "generated"
 REPORTS_DIR = ROOT / "runtime" / "test-reports"
+# A profile is accepted only if it is clearly faster than the baseline and its
+# images stay close to the baseline's for the same seed.
+PROFILE_MIN_SPEEDUP = 1.1
+PROFILE_MIN_PSNR_DB = 22.0
 
 
 def utc_now() -> str:
@@ -258,12 +264,91 @@ def write_summary(report: dict[str, Any], path: Path) -> str:
             if notes.get(key):
                 lines.append(f"- {key}: {', '.join(notes[key])}")
         lines.append("")
+    comparison = report.get("profile_comparison")
+    if comparison:
+        lines.extend(
+            [
+                "## Acceleration Profiles",
+                "",
+                f"baseline: `{comparison['baseline']}`",
+                "",
+                "| profile | verdict | speedup | generation s | warmup s | min PSNR dB |",
+                "| --- | --- | --- | --- | --- | --- |",
+            ]
+        )
+        for profile, entry in comparison["profiles"].items():
+            psnr_values = [value for value in entry["psnr_db"].values() if isinstance(value, (int, float))]
+            min_psnr = min(psnr_values) if psnr_values else ""
+            lines.append(
+                f"| {profile} | {entry['verdict']} | {entry['speedup']} | {entry['generation_sec']} | "
+                f"{entry['warmup_sec'] if entry['warmup_sec'] is not None else ''} | {min_psnr} |"
+            )
+        for profile, entry in comparison["profiles"].items():
+            if entry["reasons"]:
+                lines.append(f"- {profile}: {'; '.join(entry['reasons'])}")
+        lines.append("")
     if report.get("contact_sheet"):
         lines.extend(["## Contact Sheet", "", f"`{report['contact_sheet']}`", ""])
     path.write_text("\n".join(lines) + "\n", encoding="utf-8")
     return str(path)
 
 
+def image_psnr(reference_path: str, candidate_path: str) -> float | None:
+    with Image.open(reference_path) as reference, Image.open(candidate_path) as candidate:
+        reference = reference.convert("RGB")
+        candidate = candidate.convert("RGB")
+        if reference.size != candidate.size:
+            return None
+        rms = ImageStat.Stat(ImageChops.difference(reference, candidate)).rms
+    mse = sum(value * value for value in rms) / len(rms)
+    if mse == 0:
+        return float("inf")
+    return round(10 * math.log10(255.0**2 / mse), 2)
+
+
+def profile_comparison(report: dict[str, Any], baseline: str) -> dict[str, Any]:
+    by_profile: dict[str, dict[str, dict[str, Any]]] = {}
+    for scenario in report["scenarios"]:
+        by_profile.setdefault(scenario["accel_profile"], {})[scenario["base_name"]] = scenario
+    reference = by_profile.get(baseline, {})
+    reference_seconds = sum(item.get("duration_sec") or 0.0 for item in reference.values())
+    comparison: dict[str, Any] = {"baseline": baseline, "profiles": {}}
+    for profile, scenarios in by_profile.items():
+        seconds = sum(item.get("duration_sec") or 0.0 for item in scenarios.values())
+        entry: dict[str, Any] = {
+            "warmup_sec": (report.get("profile_warmups") or {}).get(profile),
+            "generation_sec": round(seconds, 3),
+            "speedup": round(reference_seconds / seconds, 3) if seconds else None,
+            "psnr_db": {},
+            "new_warnings": {},
+        }
+        reasons = []
+        for name, scenario in scenarios.items():
+            if scenario.get("status") != "succeeded":
+                reasons.append(f"{name}: {scenario.get('status', 'not-run')}")
+                continue
+            base = reference.get(name) or {}
+            if profile != baseline and base.get("status") == "succeeded":
+                psnr = image_psnr(base["metadata"]["path"], scenario["metadata"]["path"])
+                entry["psnr_db"][name] = psnr if psnr is None or math.isfinite(psnr) else "identical"
+                if psnr is not None and psnr < PROFILE_MIN_PSNR_DB:
+                    reasons.append(f"{name}: psnr {psnr} dB < {PROFILE_MIN_PSNR_DB}")
+            base_warnings = set((base.get("quality_verdict") or {}).get("warnings") or [])
+            new_warnings = sorted(set((scenario.get("quality_verdict") or {}).get("warnings") or []) - base_warnings)
+            if new_warnings:
+                entry["new_warnings"][name] = new_warnings
+                reasons.append(f"{name}: new quality warnings {', '.join(new_warnings)}")
+        if profile == baseline:
+            entry["verdict"] = "baseline"
+        else:
+            if entry["speedup"] is not None and entry["speedup"] < PROFILE_MIN_SPEEDUP:
+                reasons.append(f"speedup {entry['speedup']} < {PROFILE_MIN_SPEEDUP}")
+            entry["verdict"] = "reject" if reasons else "accept"
+        entry["reasons"] = reasons
+        comparison["profiles"][profile] = entry
+    return comparison
+
+
 def quality_verdict(name: str, evaluation: dict[str, Any]) -> dict[str, Any]:
     warnings = []
     actual = evaluation.get("actual_image") or {}
@@ -297,11 +382,17 @@ def _main() -> int:
     parser.add_argument("--base-url", default=DEFAULT_BASE_URL)
     parser.add_argument("--run", action="store_true", help="enqueue real generation jobs")
     parser.add_argument("--concept-engines", action="store_true", help="include SD3.5 and Flux concept txt2img probes")
+    parser.add_argument(
+        "--accel-profiles",
+        default="",
+        help="comma-separated acceleration profiles to compare, first is the baseline (e.g. fp32,bf16,int8)",
+    )
     parser.add_argument("--report-json", default="")
     args = parser.parse_args()
 
     base_url = args.base_url.rstrip("/")
     run_id = dt.datetime.now(dt.UTC).strftime("%Y%m%d-%H%M%S-forge-quality")
+    profiles = [item.strip() for item in args.accel_profiles.split(",") if item.strip()]
     started = time.monotonic()
     assets = prepare_assets()
     expected = load_expected_notes()
@@ -312,19 +403,30 @@ def _main() -> int:
         "base_url": base_url,
         "run_jobs": bool(args.run),
         "concept_engines": bool(args.concept_engines),
+        "accel_profiles": profiles,
         "assets": assets,
         "expected_notes_path": str(EXPECTED_NOTES),
         "scenarios": [],
         "ok": False,
     }
     sheet_items: list[tuple[str, str]] = [("source", assets["source"])]
-    for scenario in scenario_specs(assets, include_concept_engines=args.concept_engines):
-        name = scenario["name"]
-        spec = scenario["spec"]
+    scenarios = scenario_specs(assets, include_concept_engines=args.concept_engines)
+    runs: list[tuple[str | None, dict[str, Any]]] = [
+        (profile, scenario) for profile in (profiles or [None]) for scenario in scenarios
+    ]
+    if args.run and profiles:
+        report["profile_warmups"] = {}
+    for profile, scenario in runs:
+        name = f"{scenario['name']}@{profile}" if profile else scenario["name"]
+        spec = copy.deepcopy(scenario["spec"])
+        if profile:
+            spec["accel_profile"] = profile
         entry: dict[str, Any] = {
             "name": name,
+            "base_name": scenario["name"],
+            "accel_profile": profile,
             "spec": spec,
-            "expected_notes": expected_by_name.get(name, {}),
+            "expected_notes": expected_by_name.get(scenario["name"], {}),
         }
         dry_run = requests.post(f"{base_url}/forge/jobs?dry_run=true", json=spec, timeout=60)
         entry["dry_run_status_code"] = dry_run.status_code
@@ -334,6 +436,14 @@ def _main() -> int:
             report["scenarios"].append(entry)
             continue
         entry["dry_run"] = dry_run.json()
+        if args.run and profile and profile not in report["profile_warmups"]:
+            # Pipeline load, quantization and compilation are paid once per profile;
+            # keep them out of the per-scenario timings the profiles are judged on.
+            warmup_spec = {**spec, "steps": 1, "quality_preset": "quality_bench_profile_warmup"}
+            started_warmup = time.monotonic()
+            warmup = request_json("POST", f"{base_url}/forge/jobs", json=warmup_spec)
+            wait_job(base_url, warmup["id"])
+            report["profile_warmups"][profile] = round(time.monotonic() - started_warmup, 3)
         if args.run:
             started_job = time.monotonic()
             record = request_json("POST", f"{base_url}/forge/jobs", json=spec)
@@ -350,12 +460,14 @@ def _main() -> int:
                 evaluation = request_json("GET", f"{base_url}/forge/artifacts/{artifact_id}/evaluation")
                 entry["metadata"] = metadata
                 entry["evaluation"] = evaluation
-                entry["quality_verdict"] = quality_verdict(name, evaluation)
+                entry["quality_verdict"] = quality_verdict(scenario["name"], evaluation)
                 sheet_items.append((name, metadata["path"]))
         report["scenarios"].append(entry)
         print(f"{name}: dry_run={entry['dry_run_ok']} status={entry.get('status', 'not-run')}", flush=True)
 
     REPORTS_DIR.mkdir(parents=True, exist_ok=True)
+    if args.run and profiles:
+        report["profile_comparison"] = profile_comparison(report, profiles[0])
     if args.run and len(sheet_items) > 1:
         report["contact_sheet"] = make_contact_sheet(sheet_items, REPORTS_DIR / f"{run_id}-contact-sheet.png")
     report["finished_at"] = utc_now()
@@ -2,6 +2,8 @@ from __future__ import annotations
 
 from typing import Any
 
+import time
+
 import requests
 
 
@@ -288,6 +290,25 @@ class DemonsForgeClient:
     def job(self, job_id: str) -> dict[str, Any]:
         return self._request("GET", f"/forge/jobs/{job_id}")
 
+    def wait_job(self, job_id: str, timeout: float = 1800.0, poll_timeout: float = 60.0) -> dict[str, Any]:
+        """Wait for a job via the long-poll endpoint; returns ``{"job", "finished", "artifacts", ...}``.
+
+        ``finished`` is False when ``timeout`` expires first.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = max(0.0, deadline - time.monotonic())
+            wait_seconds = min(poll_timeout, remaining)
+            response = requests.get(
+                f"{self.base_url}/forge/jobs/{job_id}/wait",
+                params={"timeout": wait_seconds},
+                timeout=self.timeout + wait_seconds,
+            )
+            response.raise_for_status()
+            result = response.json()
+            if result.get("finished") or remaining <= 0:
+                return result
+
     def job_manifest(self, job_id: str) -> dict[str, Any]:
         return self._request("GET", f"/forge/jobs/{job_id}/manifest")
 
@@ -15,6 +15,9 @@ LOGS_DIR = RUNTIME_DIR / "logs"
 PROJECTS_DIR = RUNTIME_DIR / "projects"
 ASSET_REQUESTS_DIR = ROOT / "asset_requests"
 DB_PATH = RUNTIME_DIR / "forge.sqlite3"
+COMPILE_CACHE_DIR = RUNTIME_DIR / "torch_compile_cache"
+VISION_REVIEW_CACHE_DIR = RUNTIME_DIR / "vision_reviews"
+ASSET_INDEX_PATH = RUNTIME_DIR / "asset_index.sqlite3"
 
 DEFAULT_HOST = "0.0.0.0"
 DEFAULT_PORT = 8110
@@ -22,6 +25,25 @@ CPU_THREADS = os.cpu_count() or 32
 TORCH_ACTIVE_THREADS = int(os.environ.get("FORGE_TORCH_ACTIVE_THREADS", str(CPU_THREADS)))
 TORCH_IDLE_THREADS = int(os.environ.get("FORGE_TORCH_IDLE_THREADS", "1"))
 MODEL_IDLE_SECONDS = int(os.environ.get("FORGE_MODEL_IDLE_SECONDS", "1800"))
+# Engines kept loaded side by side when RAM allows; 1 restores unload-before-every-switch.
+MAX_RESIDENT_ENGINES = max(1, int(os.environ.get("FORGE_MAX_RESIDENT_ENGINES", "2")))
+SCHEDULER_WINDOW = int(os.environ.get("FORGE_SCHEDULER_WINDOW", "8"))
+SCHEDULER_MAX_BYPASS = int(os.environ.get("FORGE_SCHEDULER_MAX_BYPASS", "3"))
+SCHEDULER_MAX_WAIT_SECONDS = float(os.environ.get("FORGE_SCHEDULER_MAX_WAIT_SECONDS", "900"))
+# CPU acceleration profile (DemonsForge/forge_service/engines/acceleration.py);
+# FORGE_ACCEL_PROFILE_<ENGINE> overrides it per engine, JobSpec.accel_profile per job.
+ACCEL_PROFILE = os.environ.get("FORGE_ACCEL_PROFILE", "fp32").strip() or "fp32"
+# Job waiters are woken in-process when a job finishes; this is only the fallback
+# re-read interval for jobs finished by another process (external worker).
+JOB_WAIT_POLL_SECONDS = float(os.environ.get("FORGE_JOB_WAIT_POLL_SECONDS", "0.25"))
+JOB_WAIT_MAX_SECONDS = float(os.environ.get("FORGE_JOB_WAIT_MAX_SECONDS", "300"))
+# Long-polls blocked at once; further waits answer with the job's current state.
+JOB_WAIT_MAX_CONCURRENT = max(1, int(os.environ.get("FORGE_JOB_WAIT_MAX_CONCURRENT", "16")))
+# How long model/LoRA/embedding listings trust the asset index before re-statting
+# its directories; downloads update the index directly.
+ASSET_INDEX_REVALIDATE_SECONDS = float(os.environ.get("FORGE_ASSET_INDEX_REVALIDATE_SECONDS", "5"))
+# Cached vision verdicts kept in VISION_REVIEW_CACHE_DIR; the least recently used go first.
+VISION_REVIEW_CACHE_MAX_ENTRIES = int(os.environ.get("FORGE_VISION_REVIEW_CACHE_MAX_ENTRIES", "5000"))
 EMBEDDED_WORKER = os.environ.get("FORGE_EMBEDDED_WORKER", "1") not in {"0", "false", "False"}
 WORKER_MAX_JOBS = int(os.environ.get("FORGE_WORKER_MAX_JOBS", "0"))
 BUILD_COMMIT = os.environ.get("FORGE_GIT_COMMIT", "").strip()
@@ -71,6 +93,12 @@ def ensure_dirs() -> None:
         path.mkdir(parents=True, exist_ok=True)
 
 
+def accel_profile_for(engine_name: str, requested: str | None = None) -> str:
+    if requested:
+        return requested
+    return os.environ.get(f"FORGE_ACCEL_PROFILE_{engine_name.upper()}", "").strip() or ACCEL_PROFILE
+
+
 def force_cpu_runtime() -> None:
     os.environ["CUDA_VISIBLE_DEVICES"] = ""
     os.environ.setdefault("OMP_NUM_THREADS", str(CPU_THREADS))
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import gc
 import hashlib
 import json
 import mimetypes
 import os
-import queue
 import random
 import sys
 import threading
@@ -48,17 +48,24 @@ from EyeOfTerror.Pictorium.Moriana.moriana_core.asset_downloader import (
     target_dir_for,
     validate_download_spec,
 )
+from EyeOfTerror.Pictorium.Moriana.moriana_core.candidate_rankers import candidate_ranker
+from EyeOfTerror.Pictorium.Moriana.moriana_core.preview_judges import preview_judge
+from DemonsForge.forge_service.engines.acceleration import ACCEL_PROFILES
+from DemonsForge.forge_service.engines.base import candidate_seeds
 from DemonsForge.forge_service.engines.diffusers_adapter import DiffusersEngine
+from DemonsForge.forge_service.engines.previews import PreviewAbort, PreviewHook, save_preview
+from .scheduler import AffinityScheduler, resident_model_label
 from .schemas import ArtifactRecord, AssetDownloadRecord, JobRecord, JobSpec, JobStatus, JobType, utc_now
-from .storage import ForgeStore
+from .storage import TERMINAL_JOB_STATUSES, ForgeStore
 
 
 class ForgeQueue:
     def __init__(self, store: ForgeStore, start_worker: bool = True):
         self.store = store
-        self._queue: queue.Queue[str] = queue.Queue()
+        self._queue = AffinityScheduler(resident=self._resident_pipelines)
         self._cancel = set[str]()
         self._engines: dict[str, DiffusersEngine] = {}
+        self._evictions = 0
         self.memory = ArchiveMemoryClient.from_config()
         self._embedded_worker = start_worker
         self._worker = None
@@ -80,7 +87,7 @@ class ForgeQueue:
         record = JobRecord(id=job_id, spec=spec, status=JobStatus.queued)
         self.store.create_job(record)
         if self._embedded_worker:
-            self._queue.put(job_id)
+            self._queue.put(job_id, spec)
         return record
 
     def validate(self, spec: JobSpec) -> dict[str, object]:
@@ -167,6 +174,16 @@ class ForgeQueue:
         for lora in spec.loras:
             if not find_lora(lora.name):
                 raise RuntimeError(f"LoRA is not available locally: {lora.name}")
+        profile_name = config.accel_profile_for(engine_name, spec.accel_profile)
+        profile = ACCEL_PROFILES.get(profile_name)
+        if profile is None:
+            raise RuntimeError(f"unknown acceleration profile: {profile_name}")
+        if spec.loras and (profile.int8_dynamic or profile.compile):
+            raise RuntimeError(f"LoRA is not supported with the {profile.name} acceleration profile")
+        if spec.preview_check is not None:
+            preview_judge(spec.preview_check.judge)
+        if spec.candidate_ranking is not None:
+            candidate_ranker(spec.candidate_ranking.ranker)
         if spec.embeddings:
             raise RuntimeError("textual inversion embeddings are not implemented for active backends yet")
         if spec.control and not meta.get("supports_control"):
@@ -182,28 +199,48 @@ class ForgeQueue:
         updated = self.store.update_job(job_id, status=JobStatus.canceled, progress=record.progress)
         if record.status == JobStatus.queued:
             self._cancel.discard(job_id)
+            self._queue.discard(job_id)
         return updated
 
+    def wait_for_job(self, job_id: str, timeout: float) -> JobRecord | None:
+        return self.store.wait_for_job(job_id, timeout)
+
+    def job_result(self, job_id: str, timeout: float = 0.0) -> dict[str, object] | None:
+        """Job record plus its artifact records, optionally after waiting up to ``timeout`` for completion."""
+        record = self.wait_for_job(job_id, timeout) if timeout > 0 else self.store.get_job(job_id)
+        if record is None:
+            return None
+        artifacts = []
+        for artifact_id in record.artifacts:
+            artifact = self.store.get_artifact(artifact_id)
+            if artifact is not None:
+                artifacts.append(artifact.model_dump(mode="json"))
+        return {
+            "job": record.model_dump(mode="json"),
+            "finished": record.status in TERMINAL_JOB_STATUSES,
+            "artifacts": artifacts,
+            "artifact_count": len(artifacts),
+            "candidates": list(record.metadata.get("candidates") or []),
+        }
+
     def _run(self) -> None:
         while True:
             job_id = self._queue.get()
-            try:
-                if job_id in self._cancel:
-                    self._cancel.discard(job_id)
-                    continue
-                while self.store.get_runtime_flag("queue_paused", default=False):
-                    time.sleep(0.5)
-                self._execute(job_id)
-            finally:
-                self._queue.task_done()
+            if job_id in self._cancel:
+                self._cancel.discard(job_id)
+                continue
+            while self.store.get_runtime_flag("queue_paused", default=False):
+                time.sleep(0.5)
+            self._execute(job_id)
 
     def run_pending_once(self) -> bool:
         if self.store.get_runtime_flag("queue_paused", default=False):
             return False
-        queued = self.store.list_jobs(status=JobStatus.queued.value, limit=1)
-        if not queued:
+        queued = self.store.list_jobs(status=JobStatus.queued.value, limit=self._queue.window, oldest_first=True)
+        selected = self._queue.select_record(queued)
+        if selected is None:
             return False
-        job_id = queued[0].id
+        job_id = selected.id
         if job_id in self._cancel:
             self._cancel.discard(job_id)
             return True
@@ -217,6 +254,28 @@ class ForgeQueue:
                 if engine.unload_if_idle(config.MODEL_IDLE_SECONDS):
                     self.store.append_log("system", f"unloaded idle engine {engine.name}")
 
+    def _resident_pipelines(self) -> set[tuple[str, str, str]]:
+        resident = set()
+        for engine in list(self._engines.values()):
+            state = engine.runtime_state()
+            if not state["loaded"] or not state["loaded_model"]:
+                continue
+            model_name = resident_model_label(Path(str(state["loaded_model"])).name, str(state["accel_profile"]))
+            for kind, loaded in dict(state["loaded_pipelines"]).items():
+                if loaded:
+                    resident.add((engine.name, model_name, kind))
+        return resident
+
+    def scheduler_state(self) -> dict[str, object]:
+        engine_states = [engine.runtime_state() for engine in list(self._engines.values())]
+        return {
+            **self._queue.stats(),
+            "max_resident_engines": config.MAX_RESIDENT_ENGINES,
+            "swap_count": sum(int(state["pipeline_loads"]) for state in engine_states),
+            "load_seconds": round(sum(float(state["load_seconds"]) for state in engine_states), 2),
+            "evictions": self._evictions,
+        }
+
     def runtime_state(self) -> dict[str, object]:
         mem = psutil.virtual_memory()
         return {
@@ -230,6 +289,7 @@ class ForgeQueue:
             "cpu_threads": config.CPU_THREADS,
             "thread_policy": config.thread_policy(),
             "model_idle_seconds": config.MODEL_IDLE_SECONDS,
+            "scheduler": self.scheduler_state(),
             "db_schema_version": self.store.schema_version(),
             "memory": self.memory.status(),
             "ram": {
@@ -268,13 +328,28 @@ class ForgeQueue:
                 unloaded.append(name)
         return {"ok": True, "engine": engine_name, "unloaded": unloaded, "runtime": self.runtime_state()}
 
-    def _unload_other_engines(self, target_engine: str) -> list[str]:
+    def _make_room(self, spec: JobSpec, target_engine: str) -> list[str]:
+        """Evict least-recently-used engines over the residency budget or while RAM is short."""
+        others = sorted(
+            (engine for name, engine in self._engines.items() if name != target_engine and engine.runtime_state()["loaded"]),
+            key=lambda engine: engine.last_used,
+        )
+        target = self._engines.get(target_engine)
+        target_state = target.runtime_state() if target is not None else None
+        target_warm = bool(target_state and target_state["loaded_pipelines"].get(spec.type.value))
+        estimate = resource_estimate(spec)
+        required_gb = float(estimate["estimated_working_ram_gb"] if target_warm else estimate["min_free_ram_gb"])
         unloaded = []
-        for name, engine in list(self._engines.items()):
-            if name == target_engine:
-                continue
+        while others:
+            over_budget = len(others) + 1 > config.MAX_RESIDENT_ENGINES
+            short_on_ram = psutil.virtual_memory().available < required_gb * 1024**3
+            if not over_budget and not short_on_ram:
+                break
+            engine = others.pop(0)
             if engine.unload():
-                unloaded.append(name)
+                unloaded.append(engine.name)
+                self._evictions += 1
+                gc.collect()
         return unloaded
 
     def _progress(self, job_id: str, value: float, message: str) -> None:
@@ -288,7 +363,7 @@ class ForgeQueue:
 
     def _resource_check(self, spec: JobSpec, engine_name: str | None = None) -> None:
         if spec.type.value in {"txt2img", "img2img", "inpaint"} and engine_name:
-            unloaded = self._unload_other_engines(engine_name)
+            unloaded = self._make_room(spec, engine_name)
             for unloaded_engine in unloaded:
                 self.store.append_log("system", f"unloaded {unloaded_engine} before {engine_name} job")
         mem = psutil.virtual_memory()
@@ -341,6 +416,8 @@ class ForgeQueue:
                 raise RuntimeError(f"job type is not supported by any registered backend yet: {spec.type.value}")
             self.store.update_job(job_id, status=JobStatus.succeeded, progress=1.0)
             self.store.append_log(job_id, "job succeeded")
+        except PreviewAbort as exc:
+            self._finish_preview_abort(job_id, record.spec, exc)
         except Exception as exc:
             status = JobStatus.canceled if str(exc) == "job canceled" else JobStatus.failed
             self.store.update_job(job_id, status=status, error=str(exc))
@@ -349,6 +426,62 @@ class ForgeQueue:
             config.cooldown_torch_threads()
             self._cancel.discard(job_id)
 
+    def _preview_hook(self, job_id: str, spec: JobSpec) -> PreviewHook | None:
+        check = spec.preview_check
+        if check is None:
+            return None
+        judge = preview_judge(check.judge)
+
+        def hook(image: object, context: dict[str, object]) -> None:
+            if job_id in self._cancel:
+                raise RuntimeError("job canceled")
+            preview_path = save_preview(image, job_id)
+            judge_started = time.monotonic()
+            decision = judge(preview_path, spec)
+            step = int(context["step"])
+            total = int(context["total_steps"])
+            report = {
+                **context,
+                "judge": check.judge,
+                "preview_path": str(preview_path),
+                "judge_seconds": round(time.monotonic() - judge_started, 3),
+                "action": str(decision.get("action") or "continue"),
+                "reason": str(decision.get("reason") or ""),
+                "decision": decision,
+            }
+            self.store.append_log(job_id, f"preview at step {step}/{total}: {report['action']} ({report['reason']})")
+            if report["action"] != "reject":
+                self.store.merge_job_metadata(job_id, preview=report)
+                return
+            # Remaining denoising steps cost about what the finished ones did; the
+            # VAE decode that an abort also skips is not counted.
+            remaining = max(0, total - step) / max(1, step)
+            report["estimated_saved_seconds"] = round(float(context["elapsed_seconds"]) * remaining, 3)
+            report["estimated_saved_cpu_seconds"] = round(float(context["cpu_seconds"]) * remaining, 3)
+            raise PreviewAbort(report)
+
+        return hook
+
+    def _finish_preview_abort(self, job_id: str, spec: JobSpec, exc: PreviewAbort) -> None:
+        report = dict(exc.report)
+        check = spec.preview_check
+        error = str(exc)
+        if check is not None and check.on_reject == "branch" and check.max_branches > 0:
+            payload = spec.model_dump(mode="json")
+            payload.update(dict(report.get("decision", {}).get("branch_overrides") or {}))
+            payload["seed"] = None
+            payload["preview_check"] = (
+                check.model_copy(update={"max_branches": check.max_branches - 1}).model_dump()
+                if check.max_branches > 1
+                else None
+            )
+            payload["safety"] = {**dict(payload.get("safety") or {}), "branched_from": job_id}
+            branched = self.submit(JobSpec(**payload))
+            report["branched_to"] = branched.id
+            error = f"{error}; branched to {branched.id}"
+        self.store.fail_job(job_id, error, preview=report)
+        self.store.append_log(job_id, f"job failed: {error}")
+
     def _resolve_input_path(self, value: str) -> Path:
         path = Path(value)
         if not path.is_absolute():
@@ -387,9 +520,9 @@ class ForgeQueue:
         images = self._engine(engine_name).generate_txt2img(
             spec,
             lambda value, message: self._progress(job_id, value, message),
+            preview=self._preview_hook(job_id, spec),
         )
-        for index, image in enumerate(images[: spec.batch_size]):
-            self._save_image_artifact(job_id, spec, image, index)
+        self._save_generated_images(job_id, spec, images)
 
     def _execute_img2img(self, job_id: str, spec: JobSpec) -> None:
         if not spec.prompt or not spec.prompt.strip():
@@ -405,9 +538,9 @@ class ForgeQueue:
             spec,
             source_image,
             lambda value, message: self._progress(job_id, value, message),
+            preview=self._preview_hook(job_id, spec),
         )
-        for index, image in enumerate(images[: spec.batch_size]):
-            self._save_image_artifact(job_id, spec, image, index)
+        self._save_generated_images(job_id, spec, images)
 
     def _execute_inpaint(self, job_id: str, spec: JobSpec) -> None:
         if not spec.prompt or not spec.prompt.strip():
@@ -425,9 +558,9 @@ class ForgeQueue:
             source_image,
             mask_image,
             lambda value, message: self._progress(job_id, value, message),
+            preview=self._preview_hook(job_id, spec),
         )
-        for index, image in enumerate(images[: spec.batch_size]):
-            self._save_image_artifact(job_id, spec, image, index)
+        self._save_generated_images(job_id, spec, images)
 
     def _execute_upscale(self, job_id: str, spec: JobSpec) -> None:
         if not spec.source_images:
@@ -649,7 +782,7 @@ class ForgeQueue:
             "quality_preset": spec.quality_preset,
             "loras": [item.model_dump() for item in spec.loras],
             "embeddings": spec.embeddings,
-            "seed": spec.seed,
+            "seed": spec.seed if index == 0 else candidate_seeds(spec)[index],
             "strength": spec.strength,
             "upscale_factor": spec.upscale_factor,
             "dimensions": {"width": spec.width, "height": spec.height},
@@ -669,7 +802,62 @@ class ForgeQueue:
             image.thumbnail((256, 256))
             image.save(thumbnail_path)
 
-    def _save_image_artifact(self, job_id: str, spec: JobSpec, image: object, index: int) -> None:
+    def _save_generated_images(self, job_id: str, spec: JobSpec, images: list[object]) -> None:
+        records = [self._save_image_artifact(job_id, spec, image, index) for index, image in enumerate(images[: spec.batch_size])]
+        if spec.candidate_ranking is not None and records:
+            self._rank_candidates(job_id, spec, records)
+
+    def _rank_candidates(self, job_id: str, spec: JobSpec, records: list[ArtifactRecord]) -> None:
+        ranking = spec.candidate_ranking
+        started = time.monotonic()
+        rank_paths = []
+        for record in records:
+            image_path = Path(record.path)
+            rank_path = image_path.with_suffix(".rank.jpg")
+            with Image.open(image_path) as image:
+                image = image.convert("RGB")
+                image.thumbnail((ranking.max_side, ranking.max_side))
+                image.save(rank_path, quality=90)
+            rank_paths.append(rank_path)
+        ranker_name = ranking.ranker
+        error = None
+        try:
+            scores = candidate_ranker(ranker_name)(rank_paths, spec)
+        except Exception as exc:
+            # The images are already paid for; an unavailable ranker must not fail the job.
+            error = str(exc)
+            self.store.append_log(job_id, f"{ranker_name} ranker failed, falling back to heuristic: {error}")
+            ranker_name = "heuristic"
+            scores = candidate_ranker(ranker_name)(rank_paths, spec)
+        scored = [
+            {
+                "artifact_id": record.id,
+                "path": record.path,
+                "rank_path": str(rank_path),
+                "artifact_index": record.metadata.get("artifact_index"),
+                "seed": record.metadata.get("seed"),
+                **score,
+            }
+            for record, rank_path, score in zip(records, rank_paths, scores)
+        ]
+        scored.sort(key=lambda item: float(item["score"]), reverse=True)
+        candidates = [{"rank": rank, **item} for rank, item in enumerate(scored, start=1)]
+        summary = {
+            "ranker": ranker_name,
+            "requested_ranker": ranking.ranker,
+            "candidate_count": len(candidates),
+            "max_side": ranking.max_side,
+            "seconds": round(time.monotonic() - started, 3),
+        }
+        if error:
+            summary["error"] = error
+        self.store.merge_job_metadata(job_id, candidates=candidates, ranking=summary)
+        self.store.append_log(
+            job_id,
+            f"ranked {len(candidates)} candidates with {ranker_name}: best seed {candidates[0]['seed']} score {candidates[0]['score']}",
+        )
+
+    def _save_image_artifact(self, job_id: str, spec: JobSpec, image: object, index: int) -> ArtifactRecord:
         artifact_id = uuid.uuid4().hex
         artifact_dir = config.ARTIFACTS_DIR / job_id
         artifact_dir.mkdir(parents=True, exist_ok=True)
@@ -685,16 +873,16 @@ class ForgeQueue:
         metadata["thumbnail_sha256"] = self._sha256_file(thumbnail_path)
         metadata["thumbnail_size_bytes"] = thumbnail_path.stat().st_size
         write_json(metadata_path, metadata)
-        self.store.add_artifact(
-            ArtifactRecord(
-                id=artifact_id,
-                job_id=job_id,
-                kind="image",
-                path=str(image_path),
-                metadata_path=str(metadata_path),
-                metadata=metadata,
-            )
+        record = ArtifactRecord(
+            id=artifact_id,
+            job_id=job_id,
+            kind="image",
+            path=str(image_path),
+            metadata_path=str(metadata_path),
+            metadata=metadata,
         )
+        self.store.add_artifact(record)
+        return record
 
 
 def resource_estimate(spec: JobSpec) -> dict[str, object]:
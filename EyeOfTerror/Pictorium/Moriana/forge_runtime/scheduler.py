@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable
+
+from . import config
+from .schemas import JobRecord, JobSpec, JobType
+from EyeOfTerror.Pictorium.Moriana.moriana_core.asset_catalog import ENGINE_MODELS
+
+DIFFUSION_JOB_TYPES = {JobType.txt2img, JobType.img2img, JobType.inpaint}
+
+AffinityKey = tuple[str, str, str, tuple[str, ...]]
+ResidentFn = Callable[[], set[tuple[str, str, str]]]
+
+
+def affinity_key(spec: JobSpec) -> AffinityKey | None:
+    """(engine, model@profile, pipeline kind, LoRA set) a diffusion job needs warm; None for model-free jobs."""
+    if spec.type not in DIFFUSION_JOB_TYPES:
+        return None
+    engine = spec.engine or "sdxl"
+    model = spec.model or str(ENGINE_MODELS.get(engine, {}).get("default_model") or "")
+    model = resident_model_label(model, config.accel_profile_for(engine, spec.accel_profile))
+    loras = tuple(sorted({lora.name for lora in spec.loras}))
+    return engine, model, spec.type.value, loras
+
+
+def resident_model_label(model: str, profile: str) -> str:
+    # The same weights under another acceleration profile are a full reload.
+    return f"{model}@{profile}"
+
+
+@dataclass
+class ScheduledJob:
+    job_id: str
+    key: AffinityKey | None
+    enqueued_at: float
+
+
+class AffinityScheduler:
+    """Work queue that groups diffusion jobs by the pipeline they need.
+
+    Jobs needing the pipeline that is already warm jump ahead of jobs that
+    would force a multi-GB reload, but only within the first ``window``
+    entries, and the oldest job runs unconditionally once it has been
+    bypassed ``max_bypass`` times or has waited ``max_wait_seconds``.
+    """
+
+    def __init__(
+        self,
+        resident: ResidentFn | None = None,
+        window: int = config.SCHEDULER_WINDOW,
+        max_bypass: int = config.SCHEDULER_MAX_BYPASS,
+        max_wait_seconds: float = config.SCHEDULER_MAX_WAIT_SECONDS,
+    ):
+        self.resident = resident or (lambda: set())
+        self.window = max(1, window)
+        self.max_bypass = max(0, max_bypass)
+        self.max_wait_seconds = max(0.0, max_wait_seconds)
+        self.warm_key: AffinityKey | None = None
+        self._cond = threading.Condition()
+        self._pending: list[ScheduledJob] = []
+        self._bypassed: dict[str, int] = {}
+        self._stats = {
+            "scheduled": 0,
+            "affinity_picks": 0,
+            "reordered": 0,
+            "forced_by_bypass": 0,
+            "forced_by_age": 0,
+        }
+
+    def put(self, job_id: str, spec: JobSpec) -> None:
+        entry = ScheduledJob(job_id, affinity_key(spec), time.monotonic())
+        with self._cond:
+            self._pending.append(entry)
+            self._cond.notify()
+
+    def get(self) -> str:
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            index = self.select(self._pending, time.monotonic())
+            entry = self._pending.pop(index)
+            return entry.job_id
+
+    def discard(self, job_id: str) -> bool:
+        with self._cond:
+            # Also reached for jobs this queue never held (external worker mode).
+            self._bypassed.pop(job_id, None)
+            for index, entry in enumerate(self._pending):
+                if entry.job_id == job_id:
+                    del self._pending[index]
+                    return True
+        return False
+
+    def qsize(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def select_record(self, records: list[JobRecord]) -> JobRecord | None:
+        """Pick the next job from queued store records ordered oldest first (external worker mode)."""
+        if not records:
+            return None
+        now = time.time()
+        entries = [
+            ScheduledJob(record.id, affinity_key(record.spec), _record_timestamp(record, now))
+            for record in records
+        ]
+        with self._cond:
+            # The store is the queue here: jobs that left it (run elsewhere,
+            # canceled, deleted) must not keep their bypass counts.
+            queued = {entry.job_id for entry in entries}
+            for job_id in [job_id for job_id in self._bypassed if job_id not in queued]:
+                del self._bypassed[job_id]
+            return records[self.select(entries, now)]
+
+    def select(self, entries: list[ScheduledJob], now: float) -> int:
+        """Return the index of the next entry; ``entries`` must be oldest first. Caller holds the lock."""
+        head = entries[0]
+        self._stats["scheduled"] += 1
+        if self._bypassed.get(head.job_id, 0) >= self.max_bypass:
+            self._stats["forced_by_bypass"] += 1
+            return self._picked(entries, 0)
+        if now - head.enqueued_at >= self.max_wait_seconds:
+            self._stats["forced_by_age"] += 1
+            return self._picked(entries, 0)
+        resident = self.resident()
+        candidates = entries[: self.window]
+        best = min(range(len(candidates)), key=lambda index: (self._cost(candidates[index].key, resident), index))
+        if best and self._cost(candidates[best].key, resident) < self._cost(head.key, resident):
+            self._stats["affinity_picks"] += 1
+        return self._picked(entries, best)
+
+    def _picked(self, entries: list[ScheduledJob], index: int) -> int:
+        if index:
+            self._stats["reordered"] += 1
+            for skipped in entries[:index]:
+                self._bypassed[skipped.job_id] = self._bypassed.get(skipped.job_id, 0) + 1
+        chosen = entries[index]
+        self._bypassed.pop(chosen.job_id, None)
+        if chosen.key is not None:
+            self.warm_key = chosen.key
+        return index
+
+    def _cost(self, key: AffinityKey | None, resident: set[tuple[str, str, str]]) -> int:
+        # 0: nothing to load; 1: pipeline warm, LoRA set differs; 2: model warm in another
+        # pipeline kind; 3: cold engine/model load.
+        if key is None:
+            return 0
+        engine, model, kind, _ = key
+        if (engine, model, kind) in resident:
+            return 0 if key == self.warm_key else 1
+        if any(item[0] == engine and item[1] == model for item in resident):
+            return 2
+        return 3
+
+    def stats(self) -> dict[str, object]:
+        with self._cond:
+            pending_groups: dict[str, int] = {}
+            for entry in self._pending:
+                label = "/".join(entry.key[:3]) if entry.key else "service"
+                pending_groups[label] = pending_groups.get(label, 0) + 1
+            return {
+                "policy": "model_affinity",
+                "window": self.window,
+                "max_bypass": self.max_bypass,
+                "max_wait_seconds": self.max_wait_seconds,
+                "warm_key": list(self.warm_key[:3]) + [list(self.warm_key[3])] if self.warm_key else None,
+                "pending_groups": pending_groups,
+                **self._stats,
+            }
+
+
+def _record_timestamp(record: JobRecord, default: float) -> float:
+    try:
+        return datetime.fromisoformat(record.created_at).timestamp()
+    except ValueError:
+        return default
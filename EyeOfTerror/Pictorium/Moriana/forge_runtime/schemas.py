@@ -57,6 +57,31 @@ class AssetDownloadSpec(BaseModel):
     approved: bool = False
 
 
+class PreviewCheck(BaseModel):
+    """Judge a cheap latent preview part-way through denoising and stop bad jobs early."""
+
+    at_fraction: float = 0.35
+    judge: str = "structure"
+    intent: str | None = None
+    on_reject: Literal["abort", "branch"] = "abort"
+    max_branches: int = 1
+
+    @field_validator("at_fraction")
+    @classmethod
+    def validate_at_fraction(cls, value: float) -> float:
+        if value <= 0.0 or value >= 1.0:
+            raise ValueError("at_fraction must be between 0.0 and 1.0 (exclusive)")
+        return value
+
+
+class CandidateRanking(BaseModel):
+    """Score every image of a batched job on a downscaled copy and rank them best first."""
+
+    ranker: str = "heuristic"
+    intent: str | None = None
+    max_side: int = Field(default=384, ge=64, le=1024)
+
+
 class JobSpec(BaseModel):
     type: JobType = JobType.txt2img
     engine: str | None = None
@@ -76,6 +101,9 @@ class JobSpec(BaseModel):
     strength: float = 0.75
     upscale_factor: int = 2
     batch_size: int = 1
+    accel_profile: str | None = None
+    preview_check: PreviewCheck | None = None
+    candidate_ranking: CandidateRanking | None = None
     loras: list[LoraRef] = Field(default_factory=list)
     embeddings: list[str] = Field(default_factory=list)
     source_images: list[str] = Field(default_factory=list)
@@ -134,6 +162,7 @@ class JobRecord(BaseModel):
     logs: list[str] = Field(default_factory=list)
     artifacts: list[str] = Field(default_factory=list)
     error: str | None = None
+    metadata: dict[str, Any] = Field(default_factory=dict)
 
 
 class JobCloneRequest(BaseModel):
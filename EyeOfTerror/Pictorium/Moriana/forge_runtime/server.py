@@ -497,6 +497,27 @@ def get_job_manifest(job_id: str) -> dict[str, object]:
     }
 
 
+_JOB_WAIT_SLOTS = asyncio.Semaphore(config.JOB_WAIT_MAX_CONCURRENT)
+
+
+@app.get("/forge/jobs/{job_id}/wait")
+async def wait_job(job_id: str, timeout: float = 60.0) -> dict[str, object]:
+    """Long-poll until the job is terminal (or ``timeout`` seconds pass); returns the job and its artifacts.
+
+    The wait runs off the event loop and outside the request thread pool, so
+    waiters do not starve other endpoints. Past JOB_WAIT_MAX_CONCURRENT waits
+    the current state comes back at once with ``finished`` false, like a timeout.
+    """
+    timeout = max(0.0, min(timeout, config.JOB_WAIT_MAX_SECONDS))
+    if _JOB_WAIT_SLOTS.locked():
+        timeout = 0.0
+    async with _JOB_WAIT_SLOTS:
+        result = await asyncio.to_thread(forge_queue.job_result, job_id, timeout)
+    if result is None:
+        raise HTTPException(status_code=404, detail="job not found")
+    return result
+
+
 @app.get("/forge/jobs/{job_id}/spec")
 def get_job_spec(job_id: str) -> dict[str, object]:
     record = store.get_job(job_id)
@@ -533,7 +554,8 @@ async def job_events(job_id: str):
             yield f"event: status\ndata: {payload}\n\n"
             if record.status.value in {"succeeded", "failed", "canceled"}:
                 break
-            await asyncio.sleep(1)
+            # Returns as soon as the job finishes; otherwise re-emits progress every second.
+            await asyncio.to_thread(store.wait_for_job, job_id, 1.0)
 
     return StreamingResponse(stream(), media_type="text/event-stream")
 
@@ -4,15 +4,23 @@ import json
 import hashlib
 import sqlite3
 import threading
+import time
 from collections import deque
 from pathlib import Path
 from typing import Any
 
-from .config import DB_PATH, LOGS_DIR, ensure_dirs
+from .config import DB_PATH, JOB_WAIT_POLL_SECONDS, LOGS_DIR, ensure_dirs
 from .schemas import ArtifactRecord, AssetDownloadRecord, JobRecord, JobStatus, utc_now
 
 
-SCHEMA_VERSION = 4
+SCHEMA_VERSION = 5
+TERMINAL_JOB_STATUSES = {JobStatus.succeeded, JobStatus.failed, JobStatus.canceled}
+# Shared by every store in the process so a waiter wakes no matter which
+# ForgeStore instance the worker used to finish the job.
+_JOB_FINISHED = threading.Condition()
+# Bumped under _JOB_FINISHED on every finish, so a waiter that read a running
+# job just before it finished does not sleep through the notification.
+_jobs_finished = 0
 
 
 class ForgeStore:
@@ -42,10 +50,14 @@ class ForgeStore:
                     progress REAL NOT NULL,
                     logs_json TEXT NOT NULL,
                     artifacts_json TEXT NOT NULL,
-                    error TEXT
+                    error TEXT,
+                    metadata_json TEXT NOT NULL DEFAULT '{}'
                 )
                 """
             )
+            job_columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)").fetchall()}
+            if "metadata_json" not in job_columns:
+                conn.execute("ALTER TABLE jobs ADD COLUMN metadata_json TEXT NOT NULL DEFAULT '{}'")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS artifacts (
@@ -147,7 +159,10 @@ class ForgeStore:
         with self._lock, self._connect() as conn:
             conn.execute(
                 """
-                INSERT INTO jobs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO jobs (
+                    id, spec_json, status, created_at, updated_at, progress, logs_json, artifacts_json, error, metadata_json
+                )
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     record.id,
@@ -159,6 +174,7 @@ class ForgeStore:
                     json.dumps(record.logs),
                     json.dumps(record.artifacts),
                     record.error,
+                    json.dumps(record.metadata),
                 ),
             )
 
@@ -167,17 +183,7 @@ class ForgeStore:
             row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
         if row is None:
             return None
-        return JobRecord(
-            id=row["id"],
-            spec=json.loads(row["spec_json"]),
-            status=row["status"],
-            created_at=row["created_at"],
-            updated_at=row["updated_at"],
-            progress=row["progress"],
-            logs=json.loads(row["logs_json"]),
-            artifacts=json.loads(row["artifacts_json"]),
-            error=row["error"],
-        )
+        return _job_from_row(row)
 
     def list_jobs(
         self,
@@ -185,30 +191,18 @@ class ForgeStore:
         limit: int = 100,
         engine: str | None = None,
         job_type: str | None = None,
+        oldest_first: bool = False,
     ) -> list[JobRecord]:
         query = "SELECT * FROM jobs"
         params: list[object] = []
         if status:
             query += " WHERE status = ?"
             params.append(status)
-        query += " ORDER BY created_at DESC LIMIT ?"
+        query += f" ORDER BY created_at {'ASC' if oldest_first else 'DESC'} LIMIT ?"
         params.append(max(limit * 5, limit) if engine or job_type else limit)
         with self._lock, self._connect() as conn:
             rows = conn.execute(query, params).fetchall()
-        records = [
-            JobRecord(
-                id=row["id"],
-                spec=json.loads(row["spec_json"]),
-                status=row["status"],
-                created_at=row["created_at"],
-                updated_at=row["updated_at"],
-                progress=row["progress"],
-                logs=json.loads(row["logs_json"]),
-                artifacts=json.loads(row["artifacts_json"]),
-                error=row["error"],
-            )
-            for row in rows
-        ]
+        records = [_job_from_row(row) for row in rows]
         if engine:
             records = [record for record in records if record.spec.engine == engine]
         if job_type:
@@ -232,7 +226,8 @@ class ForgeStore:
             conn.execute(
                 """
                 UPDATE jobs
-                SET spec_json=?, status=?, updated_at=?, progress=?, logs_json=?, artifacts_json=?, error=?
+                SET spec_json=?, status=?, updated_at=?, progress=?, logs_json=?, artifacts_json=?, error=?,
+                    metadata_json=?
                 WHERE id=?
                 """,
                 (
@@ -243,11 +238,65 @@ class ForgeStore:
                     json.dumps(updated.logs),
                     json.dumps(updated.artifacts),
                     updated.error,
+                    json.dumps(updated.metadata),
                     job_id,
                 ),
             )
+        if updated.status in TERMINAL_JOB_STATUSES and record.status not in TERMINAL_JOB_STATUSES:
+            global _jobs_finished
+            with _JOB_FINISHED:
+                _jobs_finished += 1
+                _JOB_FINISHED.notify_all()
         return updated
 
+    def merge_job_metadata(self, job_id: str, **fields: Any) -> JobRecord:
+        with self._lock:
+            record = self.get_job(job_id)
+            if record is None:
+                raise KeyError(job_id)
+            return self.update_job(job_id, metadata={**record.metadata, **fields})
+
+    def fail_job(self, job_id: str, error: str, **metadata: Any) -> JobRecord:
+        """Mark the job failed and merge ``metadata`` in the same update.
+
+        Waiters are woken by the failure, so anything they must see with it
+        has to be written before, not after, the status change.
+        """
+        with self._lock:
+            record = self.get_job(job_id)
+            if record is None:
+                raise KeyError(job_id)
+            return self.update_job(
+                job_id,
+                status=JobStatus.failed,
+                error=error,
+                metadata={**record.metadata, **metadata},
+            )
+
+    def wait_for_job(
+        self,
+        job_id: str,
+        timeout: float,
+        poll_interval: float = JOB_WAIT_POLL_SECONDS,
+    ) -> JobRecord | None:
+        """Block until the job is terminal or ``timeout`` expires; returns the latest record.
+
+        Jobs finished in this process wake the waiter immediately. The periodic
+        re-read only matters for jobs finished by an external worker process.
+        The condition is only held to sleep, never across the SQLite read.
+        """
+        deadline = time.monotonic() + max(0.0, timeout)
+        while True:
+            with _JOB_FINISHED:
+                seen = _jobs_finished
+            record = self.get_job(job_id)
+            remaining = deadline - time.monotonic()
+            if record is None or record.status in TERMINAL_JOB_STATUSES or remaining <= 0:
+                return record
+            with _JOB_FINISHED:
+                if _jobs_finished == seen:
+                    _JOB_FINISHED.wait(min(max(0.01, poll_interval), remaining))
+
     def append_log(self, job_id: str, message: str) -> None:
         record = self.get_job(job_id)
         if record is None:
@@ -555,3 +604,18 @@ class ForgeStore:
                     json.dumps(response, ensure_ascii=False),
                 ),
             )
+
+
+def _job_from_row(row: sqlite3.Row) -> JobRecord:
+    return JobRecord(
+        id=row["id"],
+        spec=json.loads(row["spec_json"]),
+        status=row["status"],
+        created_at=row["created_at"],
+        updated_at=row["updated_at"],
+        progress=row["progress"],
+        logs=json.loads(row["logs_json"]),
+        artifacts=json.loads(row["artifacts_json"]),
+        error=row["error"],
+        metadata=json.loads(row["metadata_json"] or "{}"),
+    )
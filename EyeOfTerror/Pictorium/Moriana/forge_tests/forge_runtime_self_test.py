@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+PROJECT_ROOT = Path(__file__).resolve().parents[4]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from PIL import Image
+
+from DemonsForge.forge_service.engines.previews import PreviewAbort
+from EyeOfTerror.Pictorium.Moriana.forge_runtime import config, storage
+from EyeOfTerror.Pictorium.Moriana.forge_runtime.queue import ForgeQueue
+from EyeOfTerror.Pictorium.Moriana.forge_runtime.scheduler import AffinityScheduler, affinity_key
+from EyeOfTerror.Pictorium.Moriana.forge_runtime.schemas import JobRecord, JobSpec, JobStatus, PreviewCheck
+from EyeOfTerror.Pictorium.Moriana.forge_runtime.storage import ForgeStore
+from EyeOfTerror.Pictorium.Moriana.moriana_core import image_evaluator
+
+
+def create_job(store: ForgeStore, spec: JobSpec, status: JobStatus = JobStatus.running) -> str:
+    record = JobRecord(id=f"job-{len(store.list_jobs(limit=1000))}", spec=spec, status=status)
+    store.create_job(record)
+    return record.id
+
+
+class FirstWakeCondition(threading.Condition):
+    """Records what a waiter woken by ``notify_all`` reads first."""
+
+    def __init__(self, store: ForgeStore, job_id: str):
+        super().__init__()
+        self.store = store
+        self.job_id = job_id
+        self.first_wake: JobRecord | None = None
+
+    def notify_all(self) -> None:
+        if self.first_wake is None:
+            self.first_wake = self.store.get_job(self.job_id)
+        super().notify_all()
+
+
+def branching_preview_abort_is_visible_on_first_wake(root: Path) -> None:
+    store = ForgeStore(root / "preview.sqlite3")
+    spec = JobSpec(prompt="a lighthouse at dusk", engine="sdxl", preview_check=PreviewCheck(on_reject="branch"))
+    job_id = create_job(store, spec)
+    queue = ForgeQueue(store, start_worker=False)
+    condition = FirstWakeCondition(store, job_id)
+    woken: list[JobRecord | None] = []
+    with patch.object(storage, "_JOB_FINISHED", condition), patch.object(ForgeQueue, "validate", return_value={}):
+        waiter = threading.Thread(target=lambda: woken.append(store.wait_for_job(job_id, timeout=10, poll_interval=5)))
+        waiter.start()
+        queue._finish_preview_abort(job_id, spec, PreviewAbort({"action": "reject", "reason": "melted", "decision": {}}))
+        waiter.join(10)
+    assert not waiter.is_alive(), "waiter was not woken by the preview abort"
+    for record in (condition.first_wake, woken[0]):
+        assert record is not None and record.status == JobStatus.failed, record
+        preview = dict(record.metadata.get("preview") or {})
+        assert preview.get("branched_to"), f"branched_to missing on wake-up: {record.metadata}"
+        assert str(preview["branched_to"]) in str(record.error), record.error
+    branched = store.get_job(str(preview["branched_to"]))
+    assert branched is not None and branched.spec.safety.get("branched_from") == job_id, branched
+    assert branched.spec.preview_check is None, branched.spec.preview_check
+
+
+def job_waits_return_on_finish_or_timeout(root: Path) -> None:
+    store = ForgeStore(root / "wait.sqlite3")
+    done = create_job(store, JobSpec(prompt="done"), status=JobStatus.succeeded)
+    started = time.monotonic()
+    record = store.wait_for_job(done, timeout=30)
+    assert record is not None and record.status == JobStatus.succeeded, record
+    assert time.monotonic() - started < 1.0, "a terminal job should return at once"
+    assert store.wait_for_job("missing", timeout=30) is None
+
+    running = create_job(store, JobSpec(prompt="running"))
+    started = time.monotonic()
+    record = store.wait_for_job(running, timeout=0.3, poll_interval=0.05)
+    elapsed = time.monotonic() - started
+    assert record is not None and record.status == JobStatus.running, record
+    assert 0.3 <= elapsed < 2.0, elapsed
+
+    # A poll interval far past the finish proves the waiter is woken, not polling.
+    timer = threading.Timer(0.2, lambda: store.update_job(running, status=JobStatus.succeeded))
+    started = time.monotonic()
+    timer.start()
+    record = store.wait_for_job(running, timeout=30, poll_interval=30)
+    timer.join()
+    assert record is not None and record.status == JobStatus.succeeded, record
+    assert time.monotonic() - started < 5.0, "waiter was not woken when the job finished"
+
+
+def diffusion_spec(model: str) -> JobSpec:
+    return JobSpec(prompt=f"render with {model}", engine="sdxl", model=model)
+
+
+def drain(scheduler: AffinityScheduler) -> list[str]:
+    return [scheduler.get() for _ in range(scheduler.qsize())]
+
+
+def scheduler_groups_warm_jobs_within_its_limits() -> None:
+    warm = diffusion_spec("warm-model")
+    resident = {affinity_key(warm)[:3]}
+
+    grouped = AffinityScheduler(resident=lambda: resident, window=8, max_bypass=5, max_wait_seconds=900)
+    for job_id, model in (("cold-1", "cold-model"), ("warm-1", "warm-model"), ("cold-2", "cold-model"), ("warm-2", "warm-model")):
+        grouped.put(job_id, diffusion_spec(model))
+    order = drain(grouped)
+    assert order == ["warm-1", "warm-2", "cold-1", "cold-2"], order
+    assert grouped.stats()["affinity_picks"] >= 1 and not grouped._bypassed, grouped._bypassed
+
+    guarded = AffinityScheduler(resident=lambda: resident, window=8, max_bypass=1, max_wait_seconds=900)
+    for job_id, model in (("cold-1", "cold-model"), ("warm-1", "warm-model"), ("warm-2", "warm-model")):
+        guarded.put(job_id, diffusion_spec(model))
+    order = drain(guarded)
+    assert order == ["warm-1", "cold-1", "warm-2"], order
+    assert guarded.stats()["forced_by_bypass"] == 1, guarded.stats()
+
+    windowed = AffinityScheduler(resident=lambda: resident, window=2, max_bypass=5, max_wait_seconds=900)
+    for job_id, model in (("cold-1", "cold-model"), ("cold-2", "cold-model"), ("warm-1", "warm-model")):
+        windowed.put(job_id, diffusion_spec(model))
+    assert windowed.get() == "cold-1", "a warm job outside the window must not jump the queue"
+
+    aged = AffinityScheduler(resident=lambda: resident, window=8, max_bypass=5, max_wait_seconds=0)
+    aged.put("cold-1", diffusion_spec("cold-model"))
+    aged.put("warm-1", diffusion_spec("warm-model"))
+    assert aged.get() == "cold-1" and aged.stats()["forced_by_age"] == 1
+
+
+def scheduler_forgets_bypass_counts_of_removed_jobs(root: Path) -> None:
+    warm = diffusion_spec("warm-model")
+    resident = {affinity_key(warm)[:3]}
+    scheduler = AffinityScheduler(resident=lambda: resident, window=8, max_bypass=5, max_wait_seconds=900)
+    scheduler.put("cold-1", diffusion_spec("cold-model"))
+    scheduler.put("warm-1", warm)
+    assert scheduler.get() == "warm-1" and scheduler._bypassed == {"cold-1": 1}, scheduler._bypassed
+    assert scheduler.discard("cold-1") and not scheduler._bypassed, scheduler._bypassed
+
+    # External worker mode: the queued store records are the queue.
+    store = ForgeStore(root / "scheduler.sqlite3")
+    cold = store.get_job(create_job(store, diffusion_spec("cold-model"), status=JobStatus.queued))
+    warm_record = store.get_job(create_job(store, warm, status=JobStatus.queued))
+    assert scheduler.select_record([cold, warm_record]).id == warm_record.id
+    assert scheduler._bypassed == {cold.id: 1}, scheduler._bypassed
+    scheduler.discard(cold.id)  # ForgeQueue.cancel on a job this scheduler never held
+    assert not scheduler._bypassed, scheduler._bypassed
+    assert scheduler.select_record([cold, warm_record]).id == warm_record.id
+    other = store.get_job(create_job(store, diffusion_spec("other-model"), status=JobStatus.queued))
+    assert scheduler.select_record([other]).id == other.id
+    assert not scheduler._bypassed, "a job that left the store queue kept its bypass count"
+
+
+def vision_verdicts_are_cached_per_image_and_prompt(root: Path) -> None:
+    calls: list[str] = []
+
+    def judge(_system, content, max_tokens):
+        calls.append(str(content[0]["text"]))
+        return {"accept": True, "quality": 7, "matches_intent": True, "problems": []}
+
+    image_path = root / "render.png"
+    Image.new("RGB", (64, 64), (200, 40, 40)).save(image_path)
+    with (
+        patch.object(config, "VISION_REVIEW_CACHE_DIR", root / "vision_reviews"),
+        patch.object(image_evaluator, "_vision_chat", side_effect=judge),
+        patch.object(image_evaluator, "VISION_MULTI_IMAGE", False),
+    ):
+        first = image_evaluator.vision_review(image_path, "a red square")
+        repeated = image_evaluator.vision_review(image_path, "a red square")
+        assert first["ok"] and first["cache_hit"] is False, first
+        assert repeated["cache_hit"] is True and len(calls) == 1, (repeated, calls)
+        assert {key: value for key, value in repeated.items() if key != "cache_hit"} == {
+            key: value for key, value in first.items() if key != "cache_hit"
+        }
+        other_prompt = image_evaluator.vision_review(image_path, "a blue circle")
+        assert other_prompt["cache_hit"] is False and len(calls) == 2, (other_prompt, calls)
+        Image.new("RGB", (64, 64), (40, 40, 200)).save(image_path)
+        changed_image = image_evaluator.vision_review(image_path, "a red square")
+        assert changed_image["cache_hit"] is False and len(calls) == 3, (changed_image, calls)
+
+        cached = sorted((root / "vision_reviews").glob("*/*.json"), key=lambda path: path.stat().st_mtime)
+        assert len(cached) == 3, cached
+        for age, path in zip((300, 200, 100), cached):
+            stamp = time.time() - age
+            os.utime(path, (stamp, stamp))
+        image_evaluator._cached_verdict(cached[0])  # a hit makes the oldest verdict the most recent
+        assert image_evaluator._prune_verdicts(2) == 1
+        assert [path.exists() for path in cached] == [True, False, True], cached
+
+        with patch.object(config, "VISION_REVIEW_CACHE_MAX_ENTRIES", 1), patch.object(image_evaluator, "_VERDICT_WRITES", itertools.count()):
+            image_evaluator.vision_review(image_path, "a green triangle")
+        remaining = list((root / "vision_reviews").glob("*/*.json"))
+        assert len(remaining) == 1 and len(calls) == 4, remaining
+
+
+def _main() -> int:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        branching_preview_abort_is_visible_on_first_wake(root)
+        job_waits_return_on_finish_or_timeout(root)
+        scheduler_groups_warm_jobs_within_its_limits()
+        scheduler_forgets_bypass_counts_of_removed_jobs(root)
+        vision_verdicts_are_cached_per_image_and_prompt(root)
+    print("forge runtime self-test passed")
+    return 0
+
+
+def main() -> int:
+    return _main()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -51,14 +51,18 @@ def py_compile() -> dict[str, Any]:
         "../EyeOfTerror/Pictorium/Moriana/forge_runtime/queue.py",
         "../EyeOfTerror/Pictorium/Moriana/forge_runtime/server.py",
         "../EyeOfTerror/Pictorium/Moriana/forge_runtime/client.py",
+        "../EyeOfTerror/Pictorium/Moriana/forge_runtime/scheduler.py",
         "../EyeOfTerror/Pictorium/Moriana/forge_runtime/schemas.py",
         "../EyeOfTerror/Pictorium/Moriana/forge_runtime/storage.py",
         "../EyeOfTerror/Pictorium/Moriana/forge_runtime/archive_memory.py",
         "../EyeOfTerror/Pictorium/Moriana/moriana_core/asset_catalog.py",
         "../EyeOfTerror/Pictorium/Moriana/moriana_core/asset_downloader.py",
+        "../EyeOfTerror/Pictorium/Moriana/moriana_core/asset_index.py",
+        "../EyeOfTerror/Pictorium/Moriana/moriana_core/candidate_rankers.py",
         "../EyeOfTerror/Pictorium/Moriana/moriana_core/character_profiles.py",
         "../EyeOfTerror/Pictorium/Moriana/moriana_core/forge_reports.py",
         "../EyeOfTerror/Pictorium/Moriana/moriana_core/image_evaluator.py",
+        "../EyeOfTerror/Pictorium/Moriana/moriana_core/preview_judges.py",
         "../EyeOfTerror/Pictorium/Moriana/moriana_core/project_planner.py",
         "../EyeOfTerror/Pictorium/Moriana/moriana_core/prompt_thinker.py",
         "../EyeOfTerror/Pictorium/Moriana/moriana_core/promptwright.py",
@@ -87,7 +91,12 @@ def py_compile() -> dict[str, Any]:
         "../EyeOfTerror/Pictorium/Moriana/benches/quality_bench.py",
         "../EyeOfTerror/Pictorium/Moriana/benches/project_bench.py",
         "../EyeOfTerror/Pictorium/Moriana/benches/long_forge_api.py",
+        "../EyeOfTerror/Pictorium/Moriana/benches/pipeline_memory_bench.py",
+        "forge_service/engines/acceleration.py",
+        "forge_service/engines/diffusers_adapter.py",
+        "forge_service/engines/previews.py",
         "../EyeOfTerror/Pictorium/Moriana/forge_tests/smoke_forge_api.py",
+        "../EyeOfTerror/Pictorium/Moriana/forge_tests/forge_runtime_self_test.py",
         "../EyeOfTerror/Pictorium/Moriana/forge_tests/moriana_e2e_self_test.py",
         "../EyeOfTerror/Pictorium/Moriana/forge_tests/moriana_quality_trials.py",
         "../EyeOfTerror/Pictorium/Moriana/forge_tests/moriana_live_quality_trials.py",
@@ -174,6 +183,22 @@ def moriana_quality_trials() -> dict[str, Any]:
     }
 
 
+def forge_runtime_self_test() -> dict[str, Any]:
+    completed = subprocess.run(
+        [
+            str(ROOT / "DemonsForge/bin/python"),
+            "../EyeOfTerror/Pictorium/Moriana/forge_tests/forge_runtime_self_test.py",
+        ],
+        cwd=ROOT,
+        text=True,
+        capture_output=True,
+        timeout=120,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError((completed.stderr or completed.stdout).strip())
+    return {"script": "EyeOfTerror/Pictorium/Moriana/forge_tests/forge_runtime_self_test.py", "stdout": completed.stdout.strip()}
+
+
 def moriana_e2e_self_test() -> dict[str, Any]:
     completed = subprocess.run(
         [
@@ -328,6 +353,7 @@ def _main() -> int:
     }
     report["steps"].append(run_step("py_compile", py_compile))
     report["steps"].append(run_step("smoke_test", smoke_test))
+    report["steps"].append(run_step("forge_runtime_self_test", forge_runtime_self_test))
     report["steps"].append(run_step("demonsforge_boundary_test", demonsforge_boundary_test))
     report["steps"].append(run_step("moriana_e2e_self_test", moriana_e2e_self_test))
     report["steps"].append(run_step("moriana_quality_trials", moriana_quality_trials))
@@ -3,11 +3,11 @@ from __future__ import annotations
 import json
 from pathlib import Path
 from typing import Any
-from datetime import datetime, timezone
 from functools import lru_cache
 
 from EyeOfTerror.Pictorium.Moriana.forge_runtime import __version__, config
 
+from .asset_index import asset_index
 from .character_profiles import character_profiles
 
 
@@ -84,28 +84,18 @@ def peft_available() -> bool:
     return True
 
 
-@lru_cache(maxsize=256)
 def _dir_size(path: Path) -> int:
-    if not path.exists():
-        return 0
-    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return asset_index().tree_size(path)
 
 
-@lru_cache(maxsize=512)
 def _modified_at(path: Path) -> str | None:
-    if not path.exists():
-        return None
-    if path.is_file():
-        mtime = path.stat().st_mtime
-    else:
-        mtimes = [p.stat().st_mtime for p in path.rglob("*") if p.exists()]
-        mtime = max(mtimes, default=path.stat().st_mtime)
-    return datetime.fromtimestamp(mtime, timezone.utc).isoformat()
+    return asset_index().tree_modified_at(path)
 
 
 def discover_models() -> list[dict[str, Any]]:
     models = []
     known_names = set()
+    model_indexes = {Path(item["path"]).parent.name: item for item in asset_index().files("model_index")}
     for engine, meta in ENGINE_MODELS.items():
         name = meta["default_model"]
         known_names.add(name)
@@ -115,81 +105,69 @@ def discover_models() -> list[dict[str, Any]]:
                 "name": name,
                 "engine": engine,
                 "path": str(path),
-                "available": (path / "model_index.json").exists(),
+                "available": name in model_indexes,
                 "size_bytes": _dir_size(path),
                 "modified_at": _modified_at(path),
                 "pipeline": meta["pipeline"],
             }
         )
-    if config.MODELS_DIR.exists():
-        for path in sorted(config.MODELS_DIR.iterdir()):
-            if not path.is_dir() or path.name in known_names:
-                continue
-            model_index = path / "model_index.json"
-            if not model_index.exists():
-                continue
-            try:
-                payload = json.loads(model_index.read_text(encoding="utf-8"))
-            except json.JSONDecodeError:
-                payload = {}
-            pipeline = payload.get("_class_name")
-            inferred_engine = {
-                "StableDiffusionXLPipeline": "sdxl",
-                "StableDiffusion3Pipeline": "stable_diffusion",
-                "FluxPipeline": "flux",
-            }.get(str(pipeline), "unknown")
-            models.append(
-                {
-                    "name": path.name,
-                    "engine": inferred_engine,
-                    "path": str(path),
-                    "available": True,
-                    "size_bytes": _dir_size(path),
-                    "modified_at": _modified_at(path),
-                    "pipeline": pipeline,
-                    "registered": False,
-                }
-            )
+    for name in sorted(model_indexes):
+        if name in known_names:
+            continue
+        path = config.MODELS_DIR / name
+        pipeline = model_indexes[name]["meta"].get("class_name")
+        inferred_engine = {
+            "StableDiffusionXLPipeline": "sdxl",
+            "StableDiffusion3Pipeline": "stable_diffusion",
+            "FluxPipeline": "flux",
+        }.get(str(pipeline), "unknown")
+        models.append(
+            {
+                "name": path.name,
+                "engine": inferred_engine,
+                "path": str(path),
+                "available": True,
+                "size_bytes": _dir_size(path),
+                "modified_at": _modified_at(path),
+                "pipeline": pipeline,
+                "registered": False,
+            }
+        )
     return models
 
 
+def _lora_entry(item: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "name": item["name"],
+        "path": item["path"],
+        "size_bytes": item["size_bytes"],
+        "modified_at": item["modified_at"],
+        "sha256": item["sha256"],
+        "license_note": None,
+        "status": "local",
+        "safetensors": item["meta"].get("safetensors"),
+    }
+
+
 def discover_loras() -> list[dict[str, Any]]:
-    roots = [config.LORAS_DIR, config.MODELS_DIR]
-    found = []
-    for root in roots:
-        if not root.exists():
-            continue
-        for path in root.rglob("*.safetensors"):
-            if "lora" not in path.name.lower() and "lora" not in str(path.parent).lower():
-                continue
-            found.append(
-                {
-                    "name": path.stem,
-                    "path": str(path),
-                    "size_bytes": path.stat().st_size,
-                    "modified_at": _modified_at(path),
-                    "sha256": None,
-                    "license_note": None,
-                    "status": "local",
-                }
-            )
-    return found
+    return [_lora_entry(item) for item in asset_index().files("lora")]
 
 
 def find_lora(name: str) -> dict[str, Any] | None:
-    for item in discover_loras():
-        if item["name"].lower() == name.lower():
-            return item
-    return None
+    item = asset_index().find("lora", name)
+    return _lora_entry(item) if item is not None else None
 
 
 def discover_embeddings() -> list[dict[str, Any]]:
-    if not config.EMBEDDINGS_DIR.exists():
-        return []
     return [
-        {"name": p.stem, "path": str(p), "size_bytes": p.stat().st_size, "modified_at": _modified_at(p)}
-        for p in config.EMBEDDINGS_DIR.rglob("*")
-        if p.is_file()
+        {
+            "name": item["name"],
+            "path": item["path"],
+            "size_bytes": item["size_bytes"],
+            "modified_at": item["modified_at"],
+            **({"safetensors": item["meta"]["safetensors"]} if "safetensors" in item["meta"] else {}),
+        }
+        for item in asset_index().files("embedding")
     ]
 
 
@@ -292,6 +270,7 @@ def capabilities() -> dict[str, Any]:
         "models": models,
         "loras": discover_loras(),
         "embeddings": discover_embeddings(),
+        "asset_index": asset_index().stats(),
         "asset_profiles": asset_profiles(),
         "character_profiles": character_profiles(),
         "samplers": SAMPLERS,
@@ -325,8 +304,7 @@ def capabilities() -> dict[str, Any]:
 
 
 def clear_registry_caches() -> None:
-    _dir_size.cache_clear()
-    _modified_at.cache_clear()
+    asset_index().invalidate()
     peft_available.cache_clear()
 
 
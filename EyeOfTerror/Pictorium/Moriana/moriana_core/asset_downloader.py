@@ -10,6 +10,8 @@ import requests
 from EyeOfTerror.Pictorium.Moriana.forge_runtime import config
 from EyeOfTerror.Pictorium.Moriana.forge_runtime.schemas import AssetDownloadSpec
 
+from .asset_index import asset_index
+
 
 APPROVED_HOSTS = {
     "huggingface.co",
@@ -102,6 +104,7 @@ def download_asset(spec: AssetDownloadSpec) -> dict[str, object]:
     if spec.sha256 and spec.sha256.lower() != sha256:
         target.unlink(missing_ok=True)
         raise DownloadError("downloaded file sha256 does not match expected hash")
+    asset_index().record_file(target, sha256=sha256)
 
     return {
         "path": str(target),
@@ -0,0 +1,343 @@
+"""Persistent SQLite index of the files under models/, loras/ and embeddings/.
+
+Revalidation stats directories, not files: a directory whose mtime is
+unchanged still has the entries it had when it was indexed, so only changed
+directories are listed again and only their entries are stat'ed. A file
+rewritten in place keeps its directory's mtime; downloads go through
+``record_file`` and anything else can call ``rebuild``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import struct
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from EyeOfTerror.Pictorium.Moriana.forge_runtime import config
+
+
+SCHEMA_VERSION = 1
+SAFETENSORS_MAX_HEADER_BYTES = 16 * 1024**2
+METADATA_VALUE_MAX_CHARS = 500
+
+
+def _iso(mtime_ns: int | None) -> str | None:
+    if mtime_ns is None:
+        return None
+    return datetime.fromtimestamp(mtime_ns / 1e9, timezone.utc).isoformat()
+
+
+def _under(path: str) -> tuple[str, str]:
+    # Every path strictly below ``path`` sorts in [path + "/", path + "0").
+    return f"{path}/", f"{path}0"
+
+
+def safetensors_header(path: Path) -> dict[str, Any]:
+    """Tensor count, dtypes and ``__metadata__`` from a safetensors header without reading the weights."""
+    try:
+        with path.open("rb") as handle:
+            (length,) = struct.unpack("<Q", handle.read(8))
+            if length > SAFETENSORS_MAX_HEADER_BYTES:
+                return {"error": f"header too large: {length} bytes"}
+            header = json.loads(handle.read(length))
+    except (OSError, struct.error, ValueError) as exc:
+        return {"error": str(exc)}
+    metadata = header.pop("__metadata__", None) or {}
+    dtypes = sorted({str(item.get("dtype")) for item in header.values() if isinstance(item, dict)})
+    return {
+        "tensor_count": len(header),
+        "dtypes": dtypes,
+        "metadata": {str(key): str(value)[:METADATA_VALUE_MAX_CHARS] for key, value in metadata.items()},
+    }
+
+
+class AssetIndex:
+    def __init__(self, db_path: Path | None = None):
+        self.db_path = db_path or config.ASSET_INDEX_PATH
+        self._lock = threading.RLock()
+        self._checked_at: dict[str, float] = {}
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout = 5000")
+        conn.execute("PRAGMA journal_mode = WAL")
+        return conn
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                # Everything here is derived from the filesystem; rebuild rather than migrate.
+                conn.execute("DROP TABLE IF EXISTS asset_dirs")
+                conn.execute("DROP TABLE IF EXISTS asset_files")
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS asset_dirs (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT,
+                    mtime_ns INTEGER NOT NULL
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS asset_dirs_parent ON asset_dirs(parent)")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS asset_files (
+                    path TEXT PRIMARY KEY,
+                    root TEXT NOT NULL,
+                    parent TEXT NOT NULL,
+                    stem_lower TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha256 TEXT,
+                    meta_json TEXT NOT NULL DEFAULT '{}'
+                )
+                """
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS asset_files_lookup ON asset_files(kind, stem_lower)")
+            conn.execute("CREATE INDEX IF NOT EXISTS asset_files_parent ON asset_files(parent)")
+
+    def _roots(self) -> list[Path]:
+        # Order matters: find() prefers loras/ over a same-named file under models/.
+        return [config.LORAS_DIR, config.MODELS_DIR, config.EMBEDDINGS_DIR]
+
+    def _classify(self, root: Path, path: Path) -> str:
+        if root == config.EMBEDDINGS_DIR:
+            return "embedding"
+        if path.name.endswith(".safetensors") and ("lora" in path.name.lower() or "lora" in str(path.parent).lower()):
+            return "lora"
+        if root == config.MODELS_DIR and path.name == "model_index.json" and path.parent.parent == root:
+            return "model_index"
+        return "file"
+
+    def _file_meta(self, kind: str, path: Path) -> dict[str, Any]:
+        if path.name.endswith(".safetensors") and kind in {"lora", "embedding"}:
+            return {"safetensors": safetensors_header(path)}
+        if kind == "model_index":
+            try:
+                payload = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                payload = {}
+            return {"class_name": payload.get("_class_name")}
+        return {}
+
+    def invalidate(self) -> None:
+        """Revalidate every root on the next read (still by directory mtime only)."""
+        with self._lock:
+            self._checked_at.clear()
+
+    def ensure_fresh(self, force: bool = False) -> None:
+        now = time.monotonic()
+        with self._lock:
+            stale = [
+                root
+                for root in self._roots()
+                if force or now - self._checked_at.get(str(root), float("-inf")) >= config.ASSET_INDEX_REVALIDATE_SECONDS
+            ]
+            if not stale:
+                return
+            with self._connect() as conn:
+                for root in stale:
+                    self._revalidate(conn, root)
+                    self._checked_at[str(root)] = now
+
+    def rebuild(self) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM asset_dirs")
+            conn.execute("DELETE FROM asset_files")
+        self.ensure_fresh(force=True)
+
+    def _forget_tree(self, conn: sqlite3.Connection, path: str) -> None:
+        low, high = _under(path)
+        conn.execute("DELETE FROM asset_dirs WHERE path = ? OR (path >= ? AND path < ?)", (path, low, high))
+        conn.execute("DELETE FROM asset_files WHERE path >= ? AND path < ?", (low, high))
+
+    def _revalidate(self, conn: sqlite3.Connection, root: Path) -> None:
+        stack = [root]
+        visited: set[str] = set()
+        while stack:
+            directory = stack.pop()
+            key = str(directory)
+            try:
+                stat = directory.stat()
+                real = os.path.realpath(directory)
+            except OSError:
+                self._forget_tree(conn, key)
+                continue
+            if real in visited:
+                continue
+            visited.add(real)
+            row = conn.execute("SELECT mtime_ns FROM asset_dirs WHERE path = ?", (key,)).fetchone()
+            if row is not None and row["mtime_ns"] == stat.st_mtime_ns:
+                children = conn.execute("SELECT path FROM asset_dirs WHERE parent = ?", (key,)).fetchall()
+                stack.extend(Path(child["path"]) for child in children)
+                continue
+            stack.extend(self._rescan_dir(conn, root, directory, stat.st_mtime_ns))
+
+    def _rescan_dir(self, conn: sqlite3.Connection, root: Path, directory: Path, mtime_ns: int) -> list[Path]:
+        key = str(directory)
+        known = {
+            row["path"]: row
+            for row in conn.execute("SELECT path, size_bytes, mtime_ns FROM asset_files WHERE parent = ?", (key,))
+        }
+        subdirs: list[Path] = []
+        seen_files: set[str] = set()
+        try:
+            entries = list(os.scandir(directory))
+        except OSError:
+            entries = []
+        for entry in entries:
+            try:
+                if entry.is_dir():
+                    subdirs.append(Path(entry.path))
+                    continue
+                if not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            seen_files.add(entry.path)
+            previous = known.get(entry.path)
+            if previous is not None and previous["size_bytes"] == stat.st_size and previous["mtime_ns"] == stat.st_mtime_ns:
+                continue
+            self._upsert_file(conn, root, Path(entry.path), stat.st_size, stat.st_mtime_ns, sha256=None)
+        for path in set(known) - seen_files:
+            conn.execute("DELETE FROM asset_files WHERE path = ?", (path,))
+        live_dirs = {str(path) for path in subdirs}
+        for row in conn.execute("SELECT path FROM asset_dirs WHERE parent = ?", (key,)).fetchall():
+            if row["path"] not in live_dirs:
+                self._forget_tree(conn, row["path"])
+        parent = None if directory == root else str(directory.parent)
+        conn.execute(
+            "INSERT OR REPLACE INTO asset_dirs (path, parent, mtime_ns) VALUES (?, ?, ?)",
+            (key, parent, mtime_ns),
+        )
+        return subdirs
+
+    def _upsert_file(
+        self,
+        conn: sqlite3.Connection,
+        root: Path,
+        path: Path,
+        size_bytes: int,
+        mtime_ns: int,
+        sha256: str | None,
+    ) -> None:
+        kind = self._classify(root, path)
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO asset_files (
+                path, root, parent, stem_lower, kind, size_bytes, mtime_ns, sha256, meta_json
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                str(path),
+                str(root),
+                str(path.parent),
+                path.stem.lower(),
+                kind,
+                size_bytes,
+                mtime_ns,
+                sha256,
+                json.dumps(self._file_meta(kind, path), ensure_ascii=False),
+            ),
+        )
+
+    def record_file(self, path: Path, sha256: str | None = None) -> None:
+        """Index one new or replaced file immediately, e.g. right after a download lands."""
+        path = Path(path)
+        root = next((item for item in self._roots() if item == path or item in path.parents), None)
+        if root is None:
+            return
+        stat = path.stat()
+        with self._lock, self._connect() as conn:
+            self._upsert_file(conn, root, path, stat.st_size, stat.st_mtime_ns, sha256)
+
+    def _file_dict(self, row: sqlite3.Row) -> dict[str, Any]:
+        path = Path(row["path"])
+        return {
+            "name": path.stem,
+            "path": row["path"],
+            "size_bytes": row["size_bytes"],
+            "modified_at": _iso(row["mtime_ns"]),
+            "sha256": row["sha256"],
+            "meta": json.loads(row["meta_json"]),
+        }
+
+    def files(self, kind: str) -> list[dict[str, Any]]:
+        self.ensure_fresh()
+        with self._connect() as conn:
+            rows = conn.execute("SELECT * FROM asset_files WHERE kind = ?", (kind,)).fetchall()
+        rank = {str(root): index for index, root in enumerate(self._roots())}
+        rows = sorted(rows, key=lambda row: (rank.get(row["root"], len(rank)), row["path"]))
+        return [self._file_dict(row) for row in rows]
+
+    def find(self, kind: str, name: str) -> dict[str, Any] | None:
+        self.ensure_fresh()
+        rows = self._lookup(kind, name)
+        if not rows:
+            # A miss fails job validation, so confirm it against the directories
+            # instead of trusting an index that may be a few seconds old.
+            self.ensure_fresh(force=True)
+            rows = self._lookup(kind, name)
+        if not rows:
+            return None
+        rank = {str(root): index for index, root in enumerate(self._roots())}
+        return self._file_dict(min(rows, key=lambda row: (rank.get(row["root"], len(rank)), row["path"])))
+
+    def _lookup(self, kind: str, name: str) -> list[sqlite3.Row]:
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT * FROM asset_files WHERE kind = ? AND stem_lower = ?",
+                (kind, name.lower()),
+            ).fetchall()
+
+    def tree_size(self, path: Path) -> int:
+        self.ensure_fresh()
+        key = str(path)
+        low, high = _under(key)
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COALESCE(SUM(size_bytes), 0) FROM asset_files WHERE path = ? OR (path >= ? AND path < ?)",
+                (key, low, high),
+            ).fetchone()
+        return int(row[0])
+
+    def tree_modified_at(self, path: Path) -> str | None:
+        self.ensure_fresh()
+        key = str(path)
+        low, high = _under(key)
+        with self._connect() as conn:
+            newest_file = conn.execute(
+                "SELECT MAX(mtime_ns) FROM asset_files WHERE path = ? OR (path >= ? AND path < ?)",
+                (key, low, high),
+            ).fetchone()[0]
+            newest_dir = conn.execute(
+                "SELECT MAX(mtime_ns) FROM asset_dirs WHERE path = ? OR (path >= ? AND path < ?)",
+                (key, low, high),
+            ).fetchone()[0]
+        values = [value for value in (newest_file, newest_dir) if value is not None]
+        return _iso(max(values)) if values else None
+
+    def stats(self) -> dict[str, Any]:
+        with self._connect() as conn:
+            kinds = {row["kind"]: row["count"] for row in conn.execute("SELECT kind, COUNT(*) AS count FROM asset_files GROUP BY kind")}
+            dirs = conn.execute("SELECT COUNT(*) FROM asset_dirs").fetchone()[0]
+        return {"db_path": str(self.db_path), "directories": dirs, "files_by_kind": kinds}
+
+
+@lru_cache(maxsize=1)
+def asset_index() -> AssetIndex:
+    return AssetIndex()
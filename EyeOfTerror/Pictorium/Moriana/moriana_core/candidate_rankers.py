@@ -0,0 +1,119 @@
+"""Rankers for batched candidate jobs (JobSpec.candidate_ranking).
+
+A ranker takes the downscaled copy of every candidate in batch order plus the
+job spec and returns one ``{"score": float, ...}`` dict per candidate; higher
+is better. The queue sorts by score, so rankers never reorder themselves.
+"""
+from __future__ import annotations
+
+import functools
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from EyeOfTerror.Pictorium.Moriana.forge_runtime import config
+from EyeOfTerror.Pictorium.Moriana.forge_runtime.schemas import JobSpec
+from EyeOfTerror.Pictorium.Moriana.moriana_core.image_evaluator import Image, ImageStat, vision_review_batch
+
+CandidateRanker = Callable[[list[Path], JobSpec], list[dict[str, Any]]]
+
+CLIP_RANKER_MODEL = os.environ.get("FORGE_CLIP_RANKER_MODEL", "clip-vit-base-patch32")
+
+
+def _intent(spec: JobSpec) -> str:
+    ranking = spec.candidate_ranking
+    return (ranking.intent if ranking else None) or spec.prompt or ""
+
+
+def heuristic_score(path: Path) -> dict[str, Any]:
+    """Contrast plus edge energy, penalising clipped shadows/highlights.
+
+    Blank, washed-out and mushy candidates sink; it cannot tell a good subject
+    from a wrong one, which is what the vision and clip rankers are for.
+    """
+    from PIL import ImageFilter
+
+    with Image.open(path) as image:
+        gray = image.convert("L")
+        contrast = ImageStat.Stat(gray).stddev[0]
+        edges = ImageStat.Stat(gray.filter(ImageFilter.FIND_EDGES)).mean[0]
+        histogram = gray.histogram()
+    pixels = max(1, sum(histogram))
+    clipped = (sum(histogram[:4]) + sum(histogram[-4:])) / pixels
+    score = contrast / 64.0 + edges / 16.0 - 2.0 * max(0.0, clipped - 0.05)
+    return {
+        "score": round(score, 4),
+        "contrast": round(contrast, 3),
+        "edge_energy": round(edges, 3),
+        "clipped_fraction": round(clipped, 4),
+    }
+
+
+def heuristic_ranker(paths: list[Path], spec: JobSpec) -> list[dict[str, Any]]:
+    return [heuristic_score(path) for path in paths]
+
+
+def vision_ranker(paths: list[Path], spec: JobSpec) -> list[dict[str, Any]]:
+    """Comparative vision review; accepted beats rejected, then quality, then the reviewer's pick.
+
+    Candidates the reviewer could not judge fall back to the heuristic score,
+    scaled below any reviewed quality so they never outrank a real verdict.
+    """
+    scores = []
+    for path, verdict in zip(paths, vision_review_batch(paths, _intent(spec))):
+        if not verdict.get("ok"):
+            fallback = heuristic_score(path)
+            scores.append({**fallback, "score": round(fallback["score"] / 100.0, 4), "verdict": verdict, "fallback": "heuristic"})
+            continue
+        quality = int(verdict.get("quality") or 0)
+        score = (10.0 if verdict.get("accept") else 0.0) + quality + (0.5 if verdict.get("best_in_batch") else 0.0)
+        scores.append({"score": score, "verdict": verdict})
+    return scores
+
+
+@functools.lru_cache(maxsize=1)
+def _clip_model() -> tuple[Any, Any]:
+    model_dir = config.MODELS_DIR / CLIP_RANKER_MODEL
+    if not (model_dir / "config.json").exists():
+        raise RuntimeError(f"CLIP ranker model is not available locally: {model_dir}")
+    from transformers import CLIPModel, CLIPProcessor
+
+    model = CLIPModel.from_pretrained(model_dir)
+    model.eval()
+    return model, CLIPProcessor.from_pretrained(model_dir)
+
+
+def clip_ranker(paths: list[Path], spec: JobSpec) -> list[dict[str, Any]]:
+    """Cosine similarity of each candidate to the intent, one batched forward pass."""
+    import torch
+
+    model, processor = _clip_model()
+    images = []
+    for path in paths:
+        with Image.open(path) as image:
+            images.append(image.convert("RGB"))
+    inputs = processor(text=[_intent(spec)], images=images, return_tensors="pt", padding=True, truncation=True)
+    with torch.no_grad():
+        output = model(**inputs)
+    image_embeds = output.image_embeds / output.image_embeds.norm(dim=-1, keepdim=True)
+    text_embeds = output.text_embeds / output.text_embeds.norm(dim=-1, keepdim=True)
+    similarity = (image_embeds @ text_embeds.T)[:, 0].tolist()
+    return [{"score": round(float(value), 4), "clip_similarity": round(float(value), 4)} for value in similarity]
+
+
+CANDIDATE_RANKERS: dict[str, CandidateRanker] = {
+    "heuristic": heuristic_ranker,
+    "vision": vision_ranker,
+    "clip": clip_ranker,
+}
+
+
+def register_candidate_ranker(name: str, ranker: CandidateRanker) -> None:
+    CANDIDATE_RANKERS[name] = ranker
+
+
+def candidate_ranker(name: str) -> CandidateRanker:
+    try:
+        return CANDIDATE_RANKERS[name]
+    except KeyError:
+        raise RuntimeError(f"unknown candidate ranker: {name}; expected one of {', '.join(CANDIDATE_RANKERS)}") from None
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import base64
+import hashlib
+import io
+import itertools
 import json
 import os
 import re
+import threading
+import time
 import urllib.request
+from collections import OrderedDict
 from pathlib import Path
 from typing import Any
 
@@ -18,61 +24,230 @@ if not VISION_BASE_URL.endswith("/v1"):
 VISION_MODEL = os.environ.get("EYE_MODEL_NAME", "gemma-4-12b-it-UD-Q5_K_XL.gguf")
 
 
-def vision_review(image_path: Path, intent: str) -> dict[str, Any]:
-    """Actually LOOK at the generated image with the multimodal model and judge
-    it against the intent — the eyes the pipeline needs to tell a faithful
-    render from a two-headed mess. Shared by the ImageVerifier and the studio
-    refine loop."""
+# The vision tower sees a fixed square (896px for Gemma 3); larger uploads are
+# resized server-side after paying to base64 and transfer them.
+VISION_INPUT_SIDE = int(os.environ.get("EYE_VISION_INPUT_SIDE", "896"))
+VISION_JPEG_QUALITY = int(os.environ.get("EYE_VISION_JPEG_QUALITY", "90"))
+VISION_MULTI_IMAGE = os.environ.get("EYE_VISION_MULTI_IMAGE", "1").strip().lower() not in {"0", "false", "no"}
+VISION_MAX_IMAGES_PER_CALL = max(1, int(os.environ.get("EYE_VISION_MAX_IMAGES_PER_CALL", "4")))
+_VISION_SYSTEM = (
+    "You are a strict image art critic for a generation pipeline. You are shown a generated image and the "
+    "intended subject/prompt. Judge ONLY what you actually see. Return strict JSON: "
+    '{"accept": bool, "quality": 1-10, "matches_intent": bool, '
+    '"problems": ["short concrete defects: extra or duplicate parts (e.g. two heads), wrong anatomy, missing '
+    'required features, wrong colors, blur, artifacts, off-subject"], '
+    '"refine_instructions": "one concrete paragraph telling the next pass exactly what to fix, in English, image-prompt style"}. '
+    "accept=true ONLY if the image is genuinely good AND faithfully depicts the intended subject. Be honest and harsh; "
+    "a pretty image that shows the wrong thing does NOT pass."
+)
+_VISION_BATCH_SYSTEM = (
+    "You are a strict image art critic for a generation pipeline. You are shown several numbered images generated "
+    "for the same intended subject/prompt. Judge ONLY what you actually see, each image on its own merits, then "
+    "compare them. Return strict JSON: "
+    '{"images": [{"index": 1-based image number, "accept": bool, "quality": 1-10, "matches_intent": bool, '
+    '"problems": ["short concrete defects: extra or duplicate parts (e.g. two heads), wrong anatomy, missing '
+    'required features, wrong colors, blur, artifacts, off-subject"], '
+    '"refine_instructions": "one concrete paragraph telling the next pass exactly what to fix, in English, image-prompt style"}], '
+    '"best": 1-based number of the best image}. Include every image exactly once. '
+    "accept=true ONLY if the image is genuinely good AND faithfully depicts the intended subject. Be honest and harsh; "
+    "a pretty image that shows the wrong thing does NOT pass."
+)
+_ENCODED_IMAGES: OrderedDict[str, str] = OrderedDict()
+_ENCODED_IMAGES_MAX = 32
+_ENCODED_IMAGES_LOCK = threading.Lock()
+# The verdict cache is pruned on the first write of a process and every this many writes after.
+_VERDICT_PRUNE_EVERY_WRITES = 64
+_VERDICT_WRITES = itertools.count()
+
+
+def _encode_for_vision(image_path: Path) -> tuple[str, str]:
+    """sha256 of the file and a data URI downscaled to the model's input size, encoded once per image."""
+    raw = Path(image_path).read_bytes()
+    digest = hashlib.sha256(raw).hexdigest()
+    with _ENCODED_IMAGES_LOCK:
+        if digest in _ENCODED_IMAGES:
+            _ENCODED_IMAGES.move_to_end(digest)
+            return digest, _ENCODED_IMAGES[digest]
     try:
-        data_uri = "data:image/png;base64," + base64.b64encode(Path(image_path).read_bytes()).decode("ascii")
-    except OSError as exc:
-        return {"ok": False, "error": f"cannot read artifact: {exc}"}
-    system = (
-        "You are a strict image art critic for a generation pipeline. You are shown a generated image and the "
-        "intended subject/prompt. Judge ONLY what you actually see. Return strict JSON: "
-        '{"accept": bool, "quality": 1-10, "matches_intent": bool, '
-        '"problems": ["short concrete defects: extra or duplicate parts (e.g. two heads), wrong anatomy, missing '
-        'required features, wrong colors, blur, artifacts, off-subject"], '
-        '"refine_instructions": "one concrete paragraph telling the next pass exactly what to fix, in English, image-prompt style"}. '
-        "accept=true ONLY if the image is genuinely good AND faithfully depicts the intended subject. Be honest and harsh; "
-        "a pretty image that shows the wrong thing does NOT pass."
-    )
+        with Image.open(io.BytesIO(raw)) as image:
+            rgb = image.convert("RGB")
+        rgb.thumbnail((VISION_INPUT_SIDE, VISION_INPUT_SIDE), Image.Resampling.LANCZOS)
+        buffer = io.BytesIO()
+        rgb.save(buffer, format="JPEG", quality=VISION_JPEG_QUALITY)
+        data_uri = "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+    except ModuleNotFoundError:
+        data_uri = "data:image/png;base64," + base64.b64encode(raw).decode("ascii")
+    with _ENCODED_IMAGES_LOCK:
+        _ENCODED_IMAGES[digest] = data_uri
+        while len(_ENCODED_IMAGES) > _ENCODED_IMAGES_MAX:
+            _ENCODED_IMAGES.popitem(last=False)
+    return digest, data_uri
+
+
+def _verdict_cache_path(image_sha256: str, intent: str) -> Path:
+    intent_sha256 = hashlib.sha256(intent.encode("utf-8")).hexdigest()
+    key = hashlib.sha256(f"{image_sha256}:{intent_sha256}:{VISION_MODEL}".encode("utf-8")).hexdigest()
+    return config.VISION_REVIEW_CACHE_DIR / key[:2] / f"{key}.json"
+
+
+def _cached_verdict(path: Path) -> dict[str, Any] | None:
+    try:
+        verdict = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(verdict, dict) or not verdict.get("ok"):
+        return None
+    try:
+        os.utime(path)  # eviction goes by mtime, so a hit keeps the verdict
+    except OSError:
+        pass
+    return verdict
+
+
+def _prune_verdicts(max_entries: int) -> int:
+    """Delete the least recently used verdicts beyond ``max_entries``; returns how many went."""
+    if max_entries <= 0:
+        return 0
+    verdicts: list[tuple[float, Path]] = []
+    stale_before = time.time() - 600
+    for path in config.VISION_REVIEW_CACHE_DIR.glob("*/*"):
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        if path.suffix == ".json":
+            verdicts.append((mtime, path))
+        elif path.suffix == ".tmp" and mtime < stale_before:
+            path.unlink(missing_ok=True)
+    removed = 0
+    for _mtime, path in sorted(verdicts, key=lambda item: item[0])[: max(0, len(verdicts) - max_entries)]:
+        try:
+            path.unlink()
+        except OSError:
+            continue
+        removed += 1
+    return removed
+
+
+def _store_verdict(path: Path, verdict: dict[str, Any]) -> None:
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(verdict, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+    if next(_VERDICT_WRITES) % _VERDICT_PRUNE_EVERY_WRITES == 0:
+        _prune_verdicts(config.VISION_REVIEW_CACHE_MAX_ENTRIES)
+
+
+def _vision_chat(system: str, content: list[dict[str, Any]], max_tokens: int) -> dict[str, Any]:
     payload = {
         "model": VISION_MODEL,
         "temperature": 0.2,
-        "max_tokens": 500,
-        "messages": [
-            {"role": "system", "content": system},
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": f"Intended subject / prompt:\n{intent[:1500]}\n\nJudge the image below."},
-                    {"type": "image_url", "image_url": {"url": data_uri}},
-                ],
-            },
-        ],
+        "max_tokens": max_tokens,
+        "messages": [{"role": "system", "content": system}, {"role": "user", "content": content}],
     }
+    request = urllib.request.Request(
+        f"{VISION_BASE_URL}/chat/completions",
+        data=json.dumps(payload).encode("utf-8"),
+        headers={"Content-Type": "application/json", "X-LLM-Priority": "other"},
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=180) as response:
+        reply = str(((json.loads(response.read())["choices"] or [{}])[0].get("message") or {}).get("content") or "")
+    match = re.search(r"\{.*\}", reply, re.DOTALL)
+    if not match:
+        raise ValueError(f"no JSON in vision response: {reply[:300]}")
+    return json.loads(match.group(0))
+
+
+def _review_one(data_uri: str, intent: str) -> dict[str, Any]:
     try:
-        request = urllib.request.Request(
-            f"{VISION_BASE_URL}/chat/completions",
-            data=json.dumps(payload).encode("utf-8"),
-            headers={"Content-Type": "application/json", "X-LLM-Priority": "other"},
-            method="POST",
+        verdict = _vision_chat(
+            _VISION_SYSTEM,
+            [
+                {"type": "text", "text": f"Intended subject / prompt:\n{intent}\n\nJudge the image below."},
+                {"type": "image_url", "image_url": {"url": data_uri}},
+            ],
+            max_tokens=500,
         )
-        with urllib.request.urlopen(request, timeout=180) as response:
-            content = str(((json.loads(response.read())["choices"] or [{}])[0].get("message") or {}).get("content") or "")
     except Exception as exc:  # noqa: BLE001 - a blind spot is worse than a soft failure
         return {"ok": False, "error": str(exc)}
-    match = re.search(r"\{.*\}", content, re.DOTALL)
-    if not match:
-        return {"ok": False, "error": "no JSON in vision response", "raw": content[:300]}
-    try:
-        verdict = json.loads(match.group(0))
-    except json.JSONDecodeError as exc:
-        return {"ok": False, "error": f"bad JSON: {exc}", "raw": content[:300]}
     verdict["ok"] = True
     return verdict
 
+
+def _review_together(data_uris: list[str], intent: str) -> list[dict[str, Any]] | None:
+    """One comparative call for several images; None when the reply does not cover every image."""
+    content: list[dict[str, Any]] = [
+        {"type": "text", "text": f"Intended subject / prompt:\n{intent}\n\nJudge the {len(data_uris)} images below."}
+    ]
+    for number, data_uri in enumerate(data_uris, start=1):
+        content.append({"type": "text", "text": f"Image {number}:"})
+        content.append({"type": "image_url", "image_url": {"url": data_uri}})
+    try:
+        reply = _vision_chat(_VISION_BATCH_SYSTEM, content, max_tokens=500 * len(data_uris))
+    except Exception:  # noqa: BLE001 - the caller falls back to one call per image
+        return None
+    by_index = {}
+    for item in reply.get("images") or []:
+        if isinstance(item, dict) and isinstance(item.get("index"), int):
+            by_index[item["index"]] = item
+    if sorted(by_index) != list(range(1, len(data_uris) + 1)):
+        return None
+    best = reply.get("best")
+    verdicts = []
+    for number in range(1, len(data_uris) + 1):
+        verdict = {key: value for key, value in by_index[number].items() if key != "index"}
+        verdict.update({"ok": True, "batch_size": len(data_uris), "best_in_batch": best == number})
+        verdicts.append(verdict)
+    return verdicts
+
+
+def vision_review_batch(image_paths: list[Path], intent: str, use_cache: bool = True) -> list[dict[str, Any]]:
+    """Review several images against one intent, one verdict per path in order.
+
+    Images are downscaled and JPEG-encoded once; verdicts are cached on disk by
+    (image sha256, intent, model) so a revision does not re-judge an unchanged
+    image, keeping the VISION_REVIEW_CACHE_MAX_ENTRIES most recently used; uncached images are sent together in comparative calls of up to
+    VISION_MAX_IMAGES_PER_CALL when the model takes multiple images.
+    """
+    intent = intent[:1500]
+    verdicts: list[dict[str, Any] | None] = [None] * len(image_paths)
+    pending: list[tuple[int, str, Path]] = []
+    for position, image_path in enumerate(image_paths):
+        try:
+            digest, data_uri = _encode_for_vision(image_path)
+        except OSError as exc:
+            verdicts[position] = {"ok": False, "error": f"cannot read artifact: {exc}"}
+            continue
+        cache_path = _verdict_cache_path(digest, intent)
+        cached = _cached_verdict(cache_path) if use_cache else None
+        if cached is not None:
+            verdicts[position] = {**cached, "cache_hit": True}
+            continue
+        pending.append((position, data_uri, cache_path))
+    chunk_size = VISION_MAX_IMAGES_PER_CALL if VISION_MULTI_IMAGE else 1
+    for offset in range(0, len(pending), chunk_size):
+        chunk = pending[offset : offset + chunk_size]
+        together = _review_together([data_uri for _, data_uri, _ in chunk], intent) if len(chunk) > 1 else None
+        for number, (position, data_uri, cache_path) in enumerate(chunk):
+            verdict = together[number] if together is not None else _review_one(data_uri, intent)
+            if verdict.get("ok") and use_cache:
+                # "best" only means something next to the images it was compared with.
+                _store_verdict(cache_path, {key: value for key, value in verdict.items() if key not in {"batch_size", "best_in_batch"}})
+            verdicts[position] = {**verdict, "cache_hit": False}
+    return [verdict or {"ok": False, "error": "not reviewed"} for verdict in verdicts]
+
+
+def vision_review(image_path: Path, intent: str, use_cache: bool = True) -> dict[str, Any]:
+    """Actually LOOK at the generated image with the multimodal model and judge
+    it against the intent — the eyes the pipeline needs to tell a faithful
+    render from a two-headed mess. Shared by the ImageVerifier and the studio
+    refine loop."""
+    return vision_review_batch([image_path], intent, use_cache=use_cache)[0]
+
 try:
     from PIL import Image, ImageChops, ImageStat
 except ModuleNotFoundError:  # Pillow lives in the forge venv; planners import this module without it
@@ -108,7 +283,7 @@ _STOPWORDS = {
 }
 
 
-def _image_stats(path: Path) -> dict[str, object]:
+def image_stats(path: Path) -> dict[str, object]:
     with Image.open(path) as image:
         rgb = image.convert("RGB")
         stat = ImageStat.Stat(rgb)
@@ -215,7 +390,7 @@ def evaluate_artifact(path: Path, metadata: dict[str, Any]) -> dict[str, object]
         "quality_preset": metadata.get("quality_preset") or (metadata.get("raw_spec") or {}).get("quality_preset"),
         "requested_dimensions": dimensions,
         "expected_dimensions": expected_dimensions,
-        "actual_image": _image_stats(path),
+        "actual_image": image_stats(path),
         "prompt_terms": _prompt_terms(str(prompt) if prompt else None),
         "limited_checks": [
             "No semantic vision model is used.",
@@ -0,0 +1,96 @@
+"""Judges for mid-run latent previews (JobSpec.preview_check).
+
+A judge takes the saved preview PNG and the job spec and returns
+``{"action": "continue" | "reject", "reason": str, ...}``. A rejecting judge
+may add ``branch_overrides`` (JobSpec fields) used when the check branches
+instead of aborting. Judges must fail open: an unreachable reviewer returns
+``continue`` so a blind spot never kills a healthy job.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Callable
+
+from EyeOfTerror.Pictorium.Moriana.forge_runtime.schemas import JobSpec
+from EyeOfTerror.Pictorium.Moriana.moriana_core.image_evaluator import image_stats, vision_review
+
+PreviewJudge = Callable[[Path, JobSpec], dict[str, Any]]
+
+# Defects img2img cannot fix because they are baked into the composition; the
+# studio regenerates instead of refining when the judge reports one.
+STRUCTURAL_DEFECT_TOKENS = (
+    "two head",
+    "second head",
+    "extra head",
+    "duplicate",
+    "two face",
+    "two creature",
+    "second face",
+    "extra limb",
+    "extra eye",
+)
+FLAT_PREVIEW_STDDEV = 6.0
+
+
+ANTI_DUPLICATION_SUFFIX = (
+    "ABSOLUTELY ONE single head and one face only, a single fused creature, "
+    "no second head, no duplicate head on the neck or back, one body."
+)
+
+
+def anti_duplication_prompt(prompt: str) -> str:
+    if ANTI_DUPLICATION_SUFFIX in prompt:
+        return prompt
+    return f"{prompt} {ANTI_DUPLICATION_SUFFIX}"
+
+
+def structural_problems(verdict: dict[str, Any]) -> list[str]:
+    problems = [str(item) for item in verdict.get("problems") or []]
+    return [item for item in problems if any(token in item.lower() for token in STRUCTURAL_DEFECT_TOKENS)]
+
+
+def flat_preview_judge(preview_path: Path, spec: JobSpec) -> dict[str, Any]:
+    """Reject previews that are already blank or a single flat colour."""
+    stats = image_stats(preview_path)
+    stddev = [float(value) for value in stats["stddev"]]
+    mean_stddev = sum(stddev) / len(stddev)
+    if mean_stddev < FLAT_PREVIEW_STDDEV:
+        return {"action": "reject", "reason": f"flat preview (stddev {mean_stddev:.1f})", "stats": stats}
+    return {"action": "continue", "reason": "preview has structure", "stats": stats}
+
+
+def structure_preview_judge(preview_path: Path, spec: JobSpec) -> dict[str, Any]:
+    """Ask the vision reviewer about composition defects (extra heads, duplicated parts) only."""
+    flat = flat_preview_judge(preview_path, spec)
+    if flat["action"] == "reject":
+        return flat
+    intent = (spec.preview_check.intent if spec.preview_check else None) or spec.prompt or ""
+    verdict = vision_review(preview_path, f"{intent}\n\n(This is a blurry early preview; judge composition only.)")
+    if not verdict.get("ok"):
+        return {"action": "continue", "reason": f"vision review unavailable: {verdict.get('error')}", "verdict": verdict}
+    problems = structural_problems(verdict)
+    if not problems:
+        return {"action": "continue", "reason": "no structural defects", "verdict": verdict}
+    return {
+        "action": "reject",
+        "reason": "; ".join(problems)[:300],
+        "verdict": verdict,
+        "branch_overrides": {"prompt": anti_duplication_prompt(spec.prompt or intent)},
+    }
+
+
+PREVIEW_JUDGES: dict[str, PreviewJudge] = {
+    "flat": flat_preview_judge,
+    "structure": structure_preview_judge,
+}
+
+
+def register_preview_judge(name: str, judge: PreviewJudge) -> None:
+    PREVIEW_JUDGES[name] = judge
+
+
+def preview_judge(name: str) -> PreviewJudge:
+    try:
+        return PREVIEW_JUDGES[name]
+    except KeyError:
+        raise RuntimeError(f"unknown preview judge: {name}; expected one of {', '.join(PREVIEW_JUDGES)}") from None
@@ -8,35 +8,31 @@ fragile mission machinery so it can be tested and driven directly.
 """
 from __future__ import annotations
 
-import sqlite3
-import time
 from pathlib import Path
 from typing import Any, Callable
 
 from EyeOfTerror.Pictorium.Moriana.forge_runtime.queue import ForgeQueue
-from EyeOfTerror.Pictorium.Moriana.forge_runtime.schemas import JobSpec, PlanRequest
+from EyeOfTerror.Pictorium.Moriana.forge_runtime.schemas import CandidateRanking, JobSpec, PlanRequest, PreviewCheck
 from EyeOfTerror.Pictorium.Moriana.forge_runtime.storage import ForgeStore
 from EyeOfTerror.Pictorium.Moriana.moriana_core.image_evaluator import vision_review
+from EyeOfTerror.Pictorium.Moriana.moriana_core.preview_judges import anti_duplication_prompt, structural_problems
 from EyeOfTerror.Pictorium.Moriana.moriana_core.promptwright import plan_txt2img
 
-FORGE_DB = "DemonsForge/runtime/forge.sqlite3"
 
-
-def _wait_for_image(store: ForgeStore, job_id: str, timeout_sec: int = 1500) -> str | None:
-    deadline = time.time() + timeout_sec
-    while time.time() < deadline:
-        time.sleep(5)
-        job = store.get_job(job_id)
-        status = str(getattr(job, "status", "") or "")
-        if "succeeded" in status or "completed" in status:
-            conn = sqlite3.connect(FORGE_DB)
-            conn.row_factory = sqlite3.Row
-            row = conn.execute("SELECT path FROM artifacts WHERE job_id=? AND kind='image'", (job_id,)).fetchone()
-            conn.close()
-            return row["path"] if row else None
-        if "failed" in status:
+def _wait_for_image(queue: ForgeQueue, job_id: str, timeout_sec: int = 1500) -> str | None:
+    result = queue.job_result(job_id, timeout=timeout_sec)
+    # A preview judge that rejects a draft with on_reject="branch" fails the job
+    # and submits a fresh seed; follow it instead of reporting a failure.
+    while result and result["job"]["status"] == "failed":
+        branched_to = (result["job"].get("metadata") or {}).get("preview", {}).get("branched_to")
+        if not branched_to:
             return None
-    return None
+        result = queue.job_result(branched_to, timeout=timeout_sec)
+    if not result or result["job"]["status"] != "succeeded":
+        return None
+    if result["candidates"]:
+        return result["candidates"][0]["path"]
+    return next((item["path"] for item in result["artifacts"] if item["kind"] == "image"), None)
 
 
 def produce_refined_image(
@@ -45,14 +41,20 @@ def produce_refined_image(
     loras: list[dict[str, Any]] | None = None,
     lora_style: str | None = None,
     log: Callable[[str], None] = print,
+    early_abort: bool = True,
+    draft_candidates: int = 1,
 ) -> dict[str, Any]:
     """Draft in FLUX, judge with vision, refine in SDXL img2img on the judge's
     notes, judge again, keep the best. Returns the best image path and the trail.
 
     If lora_style is given, autonomously fetch a matching SDXL LoRA and apply it
-    in the refine pass (full autonomy: HuggingFace, SDXL-only, size-capped)."""
-    store = ForgeStore()
-    queue = ForgeQueue(store, start_worker=True)
+    in the refine pass (full autonomy: HuggingFace, SDXL-only, size-capped).
+
+    With early_abort, FLUX drafts are judged on a latent preview part-way through
+    denoising and a structurally broken one is dropped for a fresh seed before
+    it finishes. draft_candidates > 1 renders that many FLUX seeds in one batched
+    job and starts from the one the vision ranker scores best."""
+    queue = ForgeQueue(ForgeStore(), start_worker=True)
 
     loras = list(loras or [])
     if lora_style:
@@ -71,9 +73,16 @@ def produce_refined_image(
     # 1. understand + art-directed draft prompt (Promptwright thinker), FLUX draft
     plan = plan_txt2img(PlanRequest(request=intent, use_thinker=True, use_memory=False))
     prompt = plan.prompt or intent
-    draft_spec = JobSpec(engine="flux", model="FLUX.1-schnell", type="txt2img", prompt=prompt, width=832, height=832, steps=4)
+    preview_check = PreviewCheck(judge="structure", intent=intent, on_reject="branch") if early_abort else None
+    draft_spec = JobSpec(
+        engine="flux", model="FLUX.1-schnell", type="txt2img", prompt=prompt,
+        width=832, height=832, steps=4, batch_size=draft_candidates,
+        # The preview only shows the first latent of a batch; ranking covers the rest.
+        preview_check=preview_check if draft_candidates == 1 else None,
+        candidate_ranking=CandidateRanking(ranker="vision", intent=intent) if draft_candidates > 1 else None,
+    )
     log(f"[studio] FLUX draft: {prompt[:120]}...")
-    draft_path = _wait_for_image(store, queue.submit(draft_spec).id)
+    draft_path = _wait_for_image(queue, queue.submit(draft_spec).id)
     if not draft_path:
         return {"ok": False, "error": "draft generation failed"}
 
@@ -93,16 +102,11 @@ def produce_refined_image(
             break  # already good, no point spending a pass
         problems_text = " ".join(str(p) for p in (verdict.get("problems") or [])).lower()
         fixes = str(verdict.get("refine_instructions") or "").strip()
-        structural = any(
-            token in problems_text
-            for token in ("two head", "second head", "extra head", "duplicate", "two face", "two creature", "second face", "extra limb", "extra eye")
-        )
-        if structural:
-            boosted = (
-                f"{prompt} ABSOLUTELY ONE single head and one face only, a single fused creature, "
-                "no second head, no duplicate head on the neck or back, one body."
+        if structural_problems(verdict):
+            spec = JobSpec(
+                engine="flux", model="FLUX.1-schnell", type="txt2img", prompt=anti_duplication_prompt(prompt),
+                width=832, height=832, steps=4, preview_check=preview_check,
             )
-            spec = JobSpec(engine="flux", model="FLUX.1-schnell", type="txt2img", prompt=boosted, width=832, height=832, steps=4)
             stage = f"flux_regen_{i + 1}"
             log(f"[studio] structural defect ({problems_text[:60]}...) -> fresh FLUX regen with anti-duplication")
         else:
@@ -113,7 +117,7 @@ def produce_refined_image(
             )
             stage = f"sdxl_refine_{i + 1}"
             log(f"[studio] SDXL refine {i + 1} on fixes: {fixes[:100]}...")
-        new_path = _wait_for_image(store, queue.submit(spec).id)
+        new_path = _wait_for_image(queue, queue.submit(spec).id)
         if not new_path:
             log("[studio] pass failed, keeping best so far")
             break
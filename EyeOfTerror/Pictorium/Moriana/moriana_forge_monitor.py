@@ -53,9 +53,14 @@ def monitor_forge_job(
         deadline = time.monotonic() + max(0.0, float(max_wait_sec))
         record = store.get_job(job_id)
         while record is not None and record.status.value not in TERMINAL_STATUSES and time.monotonic() < deadline:
-            time.sleep(max(0.05, float(poll_interval_sec)))
-            if inline_queue is not None:
-                inline_queue.run_pending_once()
+            remaining = deadline - time.monotonic()
+            if inline_queue is None:
+                # Wakes on completion; poll_interval_sec only paces re-reads of
+                # jobs finished by an external worker process.
+                record = store.wait_for_job(job_id, remaining, poll_interval=float(poll_interval_sec))
+                continue
+            if not inline_queue.run_pending_once():
+                time.sleep(min(max(0.05, float(poll_interval_sec)), max(0.0, remaining)))
             record = store.get_job(job_id)
     finally:
         if inline_queue is not None:
@@ -17,6 +17,7 @@ if str(BRIGADE_ROOT) not in sys.path:
 
 from EyeOfTerror.Services.Search.web_tools import web_fetch  # noqa: E402
 from scriptorium_model import model_unavailable_payload, request_required_scriptorium_guidance  # noqa: E402
+from workspace_artifacts import write_json_artifact  # noqa: E402
 
 CORPUS_INGESTOR_DIR = Path(__file__).resolve().parents[1] / "CorpusIngestor"
 if str(CORPUS_INGESTOR_DIR) not in sys.path:
@@ -223,9 +224,7 @@ def run(request: dict[str, Any], workspace_root: Path, fetcher: FetchFn = defaul
         return model_unavailable_payload("AuspexBrowser", request.get("task_id"), guidance)
     snapshots = collect_snapshots(source_map, fetcher=fetcher)
     snapshots["model_guidance"] = guidance
-    host_path = sandbox_path(workspace_root, output_path)
-    host_path.parent.mkdir(parents=True, exist_ok=True)
-    host_path.write_text(json.dumps(snapshots, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    write_json_artifact(sandbox_path(workspace_root, output_path), snapshots)
     failed_sources = [item for item in snapshots["snapshots"] if not item.get("ok")]
     problems = [
         f"source fetch failed: {item.get('source_title') or item.get('requested_url')} — {item.get('error') or 'no content'}"
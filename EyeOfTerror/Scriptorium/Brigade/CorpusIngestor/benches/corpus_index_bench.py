@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Corpus scan cost per research task on a synthetic local library.
+
+``legacy`` reproduces the pre-index scan: every task walks the corpus, fully
+extracts every TXT/HTML/FB2/EPUB, re-reads sidecar metadata and hashes every
+file. ``cold`` is the first indexed scan into an empty index, ``warm`` a
+repeat task against an unchanged corpus, and ``touched`` a task after a
+handful of files were edited. Every indexed result is checked against the
+legacy result for the same query.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+from typing import Any
+
+WORKER_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(WORKER_ROOT))
+
+import corpus_ingestor  # noqa: E402
+from corpus_ingestor import (  # noqa: E402
+    MAX_TEXT_CHARS,
+    SUPPORTED_EXTENSIONS,
+    contract_terms,
+    corpus_source,
+    haystack_tokens,
+    read_corpus_text,
+    read_source_metadata,
+    scan_corpus,
+)
+
+MODES = ("legacy", "cold", "warm", "touched")
+GOALS = (
+    "Максимально полно реконструируй события Скалатракса",
+    "Istvaan III betrayal chronology",
+    "Horus Heresy Prospero burning",
+)
+VOCABULARY = (
+    "legion", "primarch", "warp", "crusade", "siege", "ruin", "fleet", "astartes", "chapter", "world",
+    "battle", "heresy", "traitor", "loyalist", "daemon", "forge", "titan", "hive", "sector", "archive",
+)
+TOPICS = ("skalathrax", "istvaan", "prospero", "cadia", "armageddon", "calth", "tallarn", "signus")
+
+
+def prose(rng: random.Random, words: int, topic: str) -> str:
+    chosen = [rng.choice(VOCABULARY) for _ in range(words)]
+    chosen[rng.randrange(words)] = topic
+    return " ".join(chosen)
+
+
+def write_corpus(root: Path, files: int, text_kb: int, seed: int) -> None:
+    rng = random.Random(seed)
+    words = max(40, text_kb * 1024 // 7)
+    for index in range(files):
+        topic = TOPICS[index % len(TOPICS)]
+        folder = root / f"shelf-{index % 50:02d}"
+        folder.mkdir(parents=True, exist_ok=True)
+        body = prose(rng, words, topic)
+        kind = index % 10
+        if kind < 6:
+            path = folder / f"note-{index:05d}.txt"
+            path.write_text(f"Note {index}\n{body}\n", encoding="utf-8")
+        elif kind < 8:
+            path = folder / f"page-{index:05d}.html"
+            path.write_text(f"<html><head><style>p{{}}</style></head><body><h1>Page {index}</h1><p>{body}</p></body></html>", encoding="utf-8")
+        elif kind == 8:
+            path = folder / f"book-{index:05d}.fb2"
+            path.write_text(
+                f'<?xml version="1.0" encoding="utf-8"?><FictionBook xmlns="http://www.gribuser.ru/xml/fictionbook/2.0">'
+                f"<body><title><p>Book {index}</p></title><section><p>{body}</p></section></body></FictionBook>",
+                encoding="utf-8",
+            )
+        else:
+            path = folder / f"book-{index:05d}.epub"
+            with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+                for chapter in range(3):
+                    archive.writestr(f"chapter-{chapter}.xhtml", f"<html><body><p>{body}</p></body></html>")
+        if index % 25 == 0:
+            path.with_name(path.name + ".metadata.json").write_text(
+                json.dumps({"title": f"{topic.title()} Primary {index}", "tags": [topic], "source_class": "official_primary_narrative"}),
+                encoding="utf-8",
+            )
+
+
+def legacy_scan(contract: dict[str, Any], root: Path) -> dict[str, Any]:
+    """The scan loop as it ran before the index, trimmed to what is compared."""
+    terms = contract_terms(contract)
+    sources: list[dict[str, Any]] = []
+    skipped: list[dict[str, Any]] = []
+    non_matching_count = 0
+    for path in sorted(root.rglob("*")):
+        if not path.is_file() or path.suffix.lower() not in SUPPORTED_EXTENSIONS:
+            continue
+        try:
+            text, source_kind = read_corpus_text(path)
+        except Exception as exc:  # noqa: BLE001
+            skipped.append({"path": str(path), "reason": str(exc)})
+            continue
+        metadata, _error = read_source_metadata(path, root)
+        matched_terms = terms & haystack_tokens(path, root, metadata, text)
+        if terms and not matched_terms:
+            non_matching_count += 1
+            continue
+        if len(text.strip()) < 100:
+            skipped.append({"path": str(path), "reason": "text extraction produced too little text"})
+            continue
+        sources.append(corpus_source(path, root, text[:MAX_TEXT_CHARS], source_kind, len(matched_terms), matched_terms, metadata))
+    sources.sort(key=lambda item: (int(item.get("relevance_score") or 0), int(item.get("text_chars") or 0)), reverse=True)
+    return {"sources": sources, "skipped": skipped, "sources_non_matching": non_matching_count}
+
+
+def comparable(result: dict[str, Any]) -> dict[str, Any]:
+    summary = result.get("summary", {})
+    return {
+        "sources": result["sources"],
+        "skipped": result["skipped"],
+        "sources_non_matching": summary.get("sources_non_matching", result.get("sources_non_matching")),
+    }
+
+
+def touch_files(root: Path, count: int) -> None:
+    for path in sorted(root.rglob("note-*.txt"))[:count]:
+        path.write_text(path.read_text(encoding="utf-8") + "\nskalathrax addendum\n", encoding="utf-8")
+
+
+def timed(callable_, *args: Any, **kwargs: Any) -> tuple[Any, float]:
+    started = time.perf_counter()
+    result = callable_(*args, **kwargs)
+    return result, (time.perf_counter() - started) * 1000.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=5_000)
+    parser.add_argument("--text-kb", type=int, default=8, help="approximate extracted text per file")
+    parser.add_argument("--touched", type=int, default=20, help="files edited before the touched run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report-json", default="")
+    args = parser.parse_args()
+    results = []
+    with tempfile.TemporaryDirectory() as temp:
+        root = (Path(temp) / "Corpus").resolve()
+        index_path = Path(temp) / "corpus_index.sqlite3"
+        started = time.perf_counter()
+        write_corpus(root, args.files, args.text_kb, args.seed)
+        print(f"corpus: {args.files} files written in {time.perf_counter() - started:.1f} s", flush=True)
+        for mode in MODES:
+            if mode == "touched":
+                touch_files(root, args.touched)
+            latencies = []
+            index_stats: dict[str, Any] = {}
+            for goal in GOALS if mode != "cold" else GOALS[:1]:
+                contract = {"goal": goal}
+                if mode == "legacy":
+                    _result, elapsed = timed(legacy_scan, contract, root)
+                else:
+                    result, elapsed = timed(scan_corpus, contract, corpus_root=root, index_path=index_path)
+                    index_stats = result["summary"]["index"]
+                    if comparable(result) != comparable(legacy_scan(contract, root)):
+                        raise AssertionError(f"{mode} index scan disagrees with the legacy scan for {goal!r}")
+                latencies.append(elapsed)
+                if mode in {"cold", "touched"}:
+                    break
+            result_row = {
+                "mode": mode,
+                "files": args.files,
+                "ms_per_task": round(statistics.median(latencies), 1),
+                "index": {key: value for key, value in index_stats.items() if key != "path"},
+            }
+            results.append(result_row)
+            print(
+                f"{mode}: {result_row['ms_per_task']} ms/task"
+                + (f", extracted {index_stats['files_extracted']} rehashed {index_stats['files_rehashed']}" if index_stats else ""),
+                flush=True,
+            )
+        corpus_ingestor._INDEXES.clear()
+    if args.report_json:
+        Path(args.report_json).write_text(json.dumps({"results": results}, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,7 +5,9 @@ import html.parser
 import json
 import os
 import re
+import sqlite3
 import sys
+import threading
 import zipfile
 from pathlib import Path
 from typing import Any
@@ -16,6 +18,13 @@ SUPPORTED_EXTENSIONS = {".txt", ".md", ".html", ".htm", ".xhtml", ".fb2", ".epub
 MAX_SCAN_BYTES = 25_000_000
 MAX_TEXT_CHARS = 250_000
 METADATA_SUFFIXES = (".metadata.json", ".meta.json")
+HAYSTACK_TEXT_CHARS = 5000
+MIN_SOURCE_TEXT_CHARS = 100
+NON_MATCHING_SAMPLE_LIMIT = 30
+# Index refreshes commit after this many written files, so a cold build of a
+# large corpus does not hold the write lock (or one huge WAL) for its whole run.
+INDEX_COMMIT_EVERY_FILES = 200
+DEFAULT_INDEX_PATH = Path(__file__).resolve().parent / "runtime" / "corpus_index.sqlite3"
 
 REPO_ROOT = next(parent for parent in Path(__file__).resolve().parents if (parent / "EyeOfTerror" / "Warmaster").exists())
 DEFAULT_CORPUS_ROOT = REPO_ROOT / "Corpus"
@@ -69,6 +78,11 @@ def configured_corpus_root() -> Path:
     return Path(raw).expanduser().resolve() if raw else DEFAULT_CORPUS_ROOT.resolve()
 
 
+def configured_index_path() -> Path:
+    raw = os.environ.get("SHUSHUNYA_CORPUS_INDEX", "").strip()
+    return Path(raw).expanduser().resolve() if raw else DEFAULT_INDEX_PATH
+
+
 def clean_text(value: str) -> str:
     return re.sub(r"\n{3,}", "\n\n", "\n".join(line.strip() for line in value.splitlines())).strip()
 
@@ -246,6 +260,7 @@ def corpus_source(
     score: int,
     matched_terms: set[str],
     metadata: dict[str, Any] | None = None,
+    sha256: str = "",
 ) -> dict[str, Any]:
     metadata = metadata if isinstance(metadata, dict) else {}
     extension_type = {
@@ -263,7 +278,7 @@ def corpus_source(
         "language": str(metadata.get("language") or "unknown"),
         "local_path": str(path),
         "corpus_relative_path": str(path.relative_to(corpus_root)),
-        "sha256": file_sha256(path),
+        "sha256": sha256 or file_sha256(path),
         "text_chars": min(len(text), MAX_TEXT_CHARS),
         "relevance_score": score,
         "matched_terms": sorted(matched_terms),
@@ -281,7 +296,390 @@ def corpus_source(
     return source
 
 
-def scan_corpus(contract: dict[str, Any], corpus_root: Path | None = None) -> dict[str, Any]:
+def corpus_files(root: Path):
+    """Yield ``(relative_path, path, stat, metadata_signature)`` for supported files.
+
+    Same walk as ``root.rglob("*")`` (symlinked directories are not entered),
+    but sidecar metadata is detected from the directory listing instead of
+    probing every candidate name with its own ``stat``.
+    """
+    pending = [(str(root), "")]
+    while pending:
+        directory, prefix = pending.pop()
+        try:
+            with os.scandir(directory) as iterator:
+                entries = {entry.name: entry for entry in iterator}
+        except OSError:
+            continue
+        for name, entry in entries.items():
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append((entry.path, prefix + name + os.sep))
+                    continue
+                if os.path.splitext(name)[1].lower() not in SUPPORTED_EXTENSIONS or not entry.is_file():
+                    continue
+                stat = entry.stat()
+            except OSError:
+                continue
+            signature: list[str] = []
+            for metadata_name in [name + suffix for suffix in METADATA_SUFFIXES] + [name + ".json"]:
+                sidecar = entries.get(metadata_name)
+                if sidecar is None:
+                    continue
+                try:
+                    sidecar_stat = sidecar.stat()
+                except OSError:
+                    continue
+                signature.append(f"{metadata_name}:{sidecar_stat.st_size}:{sidecar_stat.st_mtime_ns}")
+            yield prefix + name, Path(entry.path), stat, "|".join(signature)
+
+
+def haystack_tokens(path: Path, corpus_root: Path, metadata: dict[str, Any], text: str) -> set[str]:
+    haystack = " ".join(
+        [
+            path.name,
+            str(path.relative_to(corpus_root)),
+            " ".join(sorted(metadata_terms(metadata))),
+            text[:HAYSTACK_TEXT_CHARS],
+        ]
+    ).lower()
+    return relevance_tokens(haystack)
+
+
+class CorpusIndex:
+    """Persistent extraction cache and term index for local corpus roots.
+
+    Every supported file gets one row keyed by (corpus root, relative path)
+    that remembers the size, mtime and sha256 its text was extracted from and
+    the stat signature of its metadata sidecar. ``refresh`` stats the tree and
+    only re-extracts files whose size or mtime moved and whose content hash no
+    longer matches; a changed sidecar only re-reads the metadata. Relevance
+    lookups go through an FTS5 table over the same haystack tokens the scan
+    has always matched on, or through the stored token lists when this
+    SQLite build has no FTS5.
+    """
+
+    SCHEMA_VERSION = 1
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.fts = True
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+    def _connect(self) -> sqlite3.Connection:
+        if not self._schema_ready:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=30)
+        db.execute("PRAGMA busy_timeout = 30000")
+        if not self._schema_ready:
+            db.execute("PRAGMA journal_mode = WAL")
+            if db.execute("PRAGMA user_version").fetchone()[0] != self.SCHEMA_VERSION:
+                db.execute("DROP TABLE IF EXISTS corpus_files")
+                db.execute("DROP TABLE IF EXISTS corpus_terms")
+                db.execute(f"PRAGMA user_version = {self.SCHEMA_VERSION}")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS corpus_files (
+                    id INTEGER PRIMARY KEY,
+                    corpus_root TEXT NOT NULL,
+                    relative_path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    sha256 TEXT NOT NULL,
+                    metadata_signature TEXT NOT NULL,
+                    source_kind TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    text_chars INTEGER NOT NULL,
+                    short_text INTEGER NOT NULL,
+                    metadata TEXT NOT NULL,
+                    metadata_error TEXT NOT NULL,
+                    error TEXT NOT NULL,
+                    tokens TEXT NOT NULL,
+                    UNIQUE (corpus_root, relative_path)
+                )
+                """
+            )
+            try:
+                db.execute(
+                    "CREATE VIRTUAL TABLE IF NOT EXISTS corpus_terms USING fts5(tokens, tokenize = 'unicode61 remove_diacritics 0')"
+                )
+            except sqlite3.OperationalError:
+                self.fts = False
+            db.commit()
+            self._schema_ready = True
+        return db
+
+    def _store_terms(self, db: sqlite3.Connection, row_id: int, tokens: str) -> None:
+        if self.fts:
+            db.execute("DELETE FROM corpus_terms WHERE rowid = ?", (row_id,))
+            db.execute("INSERT INTO corpus_terms (rowid, tokens) VALUES (?, ?)", (row_id, tokens))
+
+    def _extract(
+        self,
+        db: sqlite3.Connection,
+        root: Path,
+        path: Path,
+        stat: os.stat_result,
+        sha256: str,
+        signature: str,
+    ) -> None:
+        text, source_kind, error = "", "", ""
+        metadata: dict[str, Any] = {}
+        metadata_error = ""
+        try:
+            text, source_kind = read_corpus_text(path)
+        except Exception as exc:  # noqa: BLE001 - unreadable local files are corpus diagnostics.
+            error = str(exc)
+        else:
+            metadata, metadata_error = read_source_metadata(path, root)
+        text = text[:MAX_TEXT_CHARS]
+        tokens = " ".join(sorted(haystack_tokens(path, root, metadata, text))) if not error else ""
+        row_id = db.execute(
+            """
+            INSERT INTO corpus_files (
+                corpus_root, relative_path, size, mtime_ns, sha256, metadata_signature, source_kind,
+                text, text_chars, short_text, metadata, metadata_error, error, tokens
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (corpus_root, relative_path) DO UPDATE SET
+                size = excluded.size,
+                mtime_ns = excluded.mtime_ns,
+                sha256 = excluded.sha256,
+                metadata_signature = excluded.metadata_signature,
+                source_kind = excluded.source_kind,
+                text = excluded.text,
+                text_chars = excluded.text_chars,
+                short_text = excluded.short_text,
+                metadata = excluded.metadata,
+                metadata_error = excluded.metadata_error,
+                error = excluded.error,
+                tokens = excluded.tokens
+            RETURNING id
+            """,
+            (
+                str(root),
+                str(path.relative_to(root)),
+                stat.st_size,
+                stat.st_mtime_ns,
+                sha256,
+                signature,
+                source_kind,
+                text,
+                len(text),
+                int(len(text.strip()) < MIN_SOURCE_TEXT_CHARS),
+                json.dumps(metadata, ensure_ascii=False),
+                metadata_error,
+                error,
+                tokens,
+            ),
+        ).fetchone()[0]
+        self._store_terms(db, row_id, tokens)
+
+    def _reload_metadata(self, db: sqlite3.Connection, root: Path, path: Path, row_id: int, signature: str) -> None:
+        text, error = db.execute("SELECT text, error FROM corpus_files WHERE id = ?", (row_id,)).fetchone()
+        if error:
+            db.execute("UPDATE corpus_files SET metadata_signature = ? WHERE id = ?", (signature, row_id))
+            return
+        metadata, metadata_error = read_source_metadata(path, root)
+        tokens = " ".join(sorted(haystack_tokens(path, root, metadata, text)))
+        db.execute(
+            "UPDATE corpus_files SET metadata_signature = ?, metadata = ?, metadata_error = ?, tokens = ? WHERE id = ?",
+            (signature, json.dumps(metadata, ensure_ascii=False), metadata_error, tokens, row_id),
+        )
+        self._store_terms(db, row_id, tokens)
+
+    def refresh(self, root: Path) -> dict[str, int]:
+        """Bring the rows for ``root`` in line with the files on disk.
+
+        Writes are committed every ``INDEX_COMMIT_EVERY_FILES`` files; each
+        committed row is complete, so an interrupted refresh only leaves work
+        for the next one.
+        """
+        stats = {"files_indexed": 0, "files_extracted": 0, "files_rehashed": 0, "metadata_reloaded": 0, "files_removed": 0}
+        with self._lock:
+            db = self._connect()
+            try:
+                pending = 0
+                known = {
+                    row[0]: row[1:]
+                    for row in db.execute(
+                        "SELECT relative_path, id, size, mtime_ns, sha256, metadata_signature FROM corpus_files WHERE corpus_root = ?",
+                        (str(root),),
+                    )
+                }
+                seen: set[str] = set()
+                for relative, path, stat, signature in corpus_files(root):
+                    seen.add(relative)
+                    if pending >= INDEX_COMMIT_EVERY_FILES:
+                        db.commit()
+                        pending = 0
+                    row = known.get(relative)
+                    if row is not None and (row[1], row[2]) == (stat.st_size, stat.st_mtime_ns):
+                        if row[4] != signature:
+                            self._reload_metadata(db, root, path, row[0], signature)
+                            stats["metadata_reloaded"] += 1
+                            pending += 1
+                        continue
+                    pending += 1
+                    try:
+                        sha256 = file_sha256(path)
+                    except OSError:
+                        sha256 = ""
+                    if row is not None and sha256 and sha256 == row[3]:
+                        db.execute(
+                            "UPDATE corpus_files SET size = ?, mtime_ns = ? WHERE id = ?",
+                            (stat.st_size, stat.st_mtime_ns, row[0]),
+                        )
+                        stats["files_rehashed"] += 1
+                        if row[4] != signature:
+                            self._reload_metadata(db, root, path, row[0], signature)
+                            stats["metadata_reloaded"] += 1
+                        continue
+                    self._extract(db, root, path, stat, sha256, signature)
+                    stats["files_extracted"] += 1
+                for relative in set(known) - seen:
+                    row_id = known[relative][0]
+                    db.execute("DELETE FROM corpus_files WHERE id = ?", (row_id,))
+                    if self.fts:
+                        db.execute("DELETE FROM corpus_terms WHERE rowid = ?", (row_id,))
+                    stats["files_removed"] += 1
+                db.commit()
+            finally:
+                db.close()
+        stats["files_indexed"] = len(seen)
+        return stats
+
+    def forget_roots(self, keep: set[str]) -> int:
+        """Drop the rows of every corpus root not in ``keep``; returns the row count."""
+        with self._lock:
+            db = self._connect()
+            try:
+                placeholders = ", ".join("?" for _ in keep) or "NULL"
+                stale = f"SELECT id FROM corpus_files WHERE corpus_root NOT IN ({placeholders})"
+                if self.fts:
+                    db.execute(f"DELETE FROM corpus_terms WHERE rowid IN ({stale})", tuple(keep))
+                removed = db.execute(f"DELETE FROM corpus_files WHERE id IN ({stale})", tuple(keep)).rowcount
+                db.commit()
+            finally:
+                db.close()
+        return removed
+
+    def entries(self, root: Path, terms: set[str]) -> list[dict[str, Any]]:
+        """Indexed files under ``root`` in path order with their matched terms.
+
+        Text, metadata and hash are only loaded for files that share at least
+        one term with the query (or for every file when there are no terms).
+        """
+        db = self._connect()
+        try:
+            rows = db.execute(
+                """
+                SELECT id, relative_path, text_chars, short_text, error, metadata != '{}', metadata_error
+                FROM corpus_files WHERE corpus_root = ?
+                """,
+                (str(root),),
+            ).fetchall()
+            detail_query = "SELECT id, tokens, text, source_kind, sha256, metadata FROM corpus_files WHERE corpus_root = ?"
+            if not terms:
+                details = {row[0]: row[1:] for row in db.execute(detail_query, (str(root),))}
+            elif self.fts:
+                expression = " OR ".join(f'"{term}"' for term in sorted(terms))
+                details = {
+                    row[0]: row[1:]
+                    for row in db.execute(
+                        detail_query + " AND id IN (SELECT rowid FROM corpus_terms WHERE corpus_terms MATCH ?)",
+                        (str(root), expression),
+                    )
+                }
+            else:
+                matching = [
+                    row_id
+                    for row_id, tokens in db.execute("SELECT id, tokens FROM corpus_files WHERE corpus_root = ?", (str(root),))
+                    if terms.intersection(tokens.split())
+                ]
+                details = {}
+                for row_id in matching:
+                    row = db.execute(detail_query + " AND id = ?", (str(root), row_id)).fetchone()
+                    if row is not None:
+                        details[row_id] = row[1:]
+        finally:
+            db.close()
+        entries: list[dict[str, Any]] = []
+        for row_id, relative, text_chars, short_text, error, metadata_loaded, metadata_error in sorted(rows, key=lambda row: row[1].split(os.sep)):
+            entry: dict[str, Any] = {
+                "relative_path": relative,
+                "text_chars": text_chars,
+                "short_text": bool(short_text),
+                "error": error,
+                "metadata_loaded": bool(metadata_loaded),
+                "metadata_error": metadata_error,
+                "matched_terms": set(),
+            }
+            detail = details.get(row_id)
+            if detail is not None:
+                tokens, text, source_kind, sha256, metadata = detail
+                entry.update(
+                    matched_terms=terms.intersection(tokens.split()),
+                    text=text,
+                    source_kind=source_kind,
+                    sha256=sha256,
+                    metadata=json.loads(metadata),
+                )
+            entries.append(entry)
+        return entries
+
+
+_INDEXES: dict[str, CorpusIndex] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def corpus_index(path: Path | None = None) -> CorpusIndex:
+    key = str(path or configured_index_path())
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(key)
+        if index is None:
+            index = _INDEXES[key] = CorpusIndex(Path(key))
+        return index
+
+
+def uncached_entries(root: Path, terms: set[str]) -> list[dict[str, Any]]:
+    """``CorpusIndex.entries`` computed straight from the files, for when the index is unusable."""
+    entries: list[dict[str, Any]] = []
+    for relative, path, _stat, _signature in sorted(corpus_files(root), key=lambda item: item[0].split(os.sep)):
+        entry: dict[str, Any] = {
+            "relative_path": relative,
+            "text_chars": 0,
+            "short_text": True,
+            "error": "",
+            "metadata_loaded": False,
+            "metadata_error": "",
+            "matched_terms": set(),
+        }
+        try:
+            text, source_kind = read_corpus_text(path)
+        except Exception as exc:  # noqa: BLE001 - unreadable local files are corpus diagnostics.
+            entry["error"] = str(exc)
+            entries.append(entry)
+            continue
+        metadata, metadata_error = read_source_metadata(path, root)
+        text = text[:MAX_TEXT_CHARS]
+        entry.update(
+            text_chars=len(text),
+            short_text=len(text.strip()) < MIN_SOURCE_TEXT_CHARS,
+            metadata_loaded=bool(metadata),
+            metadata_error=metadata_error,
+            matched_terms=terms.intersection(haystack_tokens(path, root, metadata, text)),
+            text=text,
+            source_kind=source_kind,
+            sha256="",
+            metadata=metadata,
+        )
+        entries.append(entry)
+    return entries
+
+
+def scan_corpus(contract: dict[str, Any], corpus_root: Path | None = None, index_path: Path | None = None) -> dict[str, Any]:
     root = (corpus_root or configured_corpus_root()).resolve()
     terms = contract_terms(contract)
     sources: list[dict[str, Any]] = []
@@ -307,46 +705,54 @@ def scan_corpus(contract: dict[str, Any], corpus_root: Path | None = None) -> di
             },
             "gaps": [f"Local corpus directory does not exist: {root}"],
         }
-    for path in sorted(root.rglob("*")):
-        if not path.is_file() or path.suffix.lower() not in SUPPORTED_EXTENSIONS:
-            continue
+    index = corpus_index(index_path)
+    try:
+        index.forget_roots({str(configured_corpus_root()), str(root)})
+        refreshed = index.refresh(root)
+        entries = index.entries(root, terms)
+        index_summary: dict[str, Any] = {"path": str(index.path), "backend": "fts5" if index.fts else "tokens", **refreshed}
+    except sqlite3.OperationalError as exc:
+        # A locked, full or corrupt index must not fail the task: read the files directly.
+        entries = uncached_entries(root, terms)
+        index_summary = {"path": str(index.path), "backend": "uncached", "error": str(exc), "files_indexed": len(entries)}
+    for entry in entries:
+        path = root / entry["relative_path"]
         files_scanned += 1
-        try:
-            text, source_kind = read_corpus_text(path)
-        except Exception as exc:  # noqa: BLE001 - unreadable local files are corpus diagnostics.
-            skipped.append({"path": str(path), "reason": str(exc)})
+        if entry["error"]:
+            skipped.append({"path": str(path), "reason": entry["error"]})
             continue
-        metadata, metadata_error = read_source_metadata(path, root)
-        if metadata_error:
-            metadata_errors.append(metadata_error)
-        if metadata:
+        if entry["metadata_error"]:
+            metadata_errors.append(entry["metadata_error"])
+        if entry["metadata_loaded"]:
             metadata_count += 1
-        haystack = " ".join(
-            [
-                path.name,
-                str(path.relative_to(root)),
-                " ".join(sorted(metadata_terms(metadata))),
-                text[:5000],
-            ]
-        ).lower()
-        haystack_tokens = relevance_tokens(haystack)
-        matched_terms = terms & haystack_tokens
+        matched_terms = entry["matched_terms"]
         score = len(matched_terms)
         if terms and score == 0:
             non_matching_count += 1
-            if len(non_matching) < 30:
+            if len(non_matching) < NON_MATCHING_SAMPLE_LIMIT:
                 non_matching.append(
                     {
-                        "corpus_relative_path": str(path.relative_to(root)),
-                        "text_chars": min(len(text), MAX_TEXT_CHARS),
+                        "corpus_relative_path": entry["relative_path"],
+                        "text_chars": entry["text_chars"],
                         "reason": "no task relevance terms matched filename, path, or text sample",
                     }
                 )
             continue
-        if len(text.strip()) < 100:
+        if entry["short_text"]:
             skipped.append({"path": str(path), "reason": "text extraction produced too little text"})
             continue
-        sources.append(corpus_source(path, root, text, source_kind, score, matched_terms, metadata))
+        sources.append(
+            corpus_source(
+                path,
+                root,
+                entry["text"],
+                entry["source_kind"],
+                score,
+                matched_terms,
+                entry["metadata"],
+                sha256=entry["sha256"],
+            )
+        )
     sources.sort(key=lambda item: (int(item.get("relevance_score") or 0), int(item.get("text_chars") or 0)), reverse=True)
     gaps: list[str] = []
     if not sources:
@@ -366,6 +772,7 @@ def scan_corpus(contract: dict[str, Any], corpus_root: Path | None = None) -> di
             "metadata_files_loaded": metadata_count,
             "metadata_error_count": len(metadata_errors),
             "supported_extensions": sorted(SUPPORTED_EXTENSIONS),
+            "index": index_summary,
         },
         "metadata_errors": metadata_errors,
         "gaps": gaps,
@@ -3,9 +3,11 @@ from __future__ import annotations
 
 import json
 import os
+import sqlite3
 import tempfile
 import zipfile
 from pathlib import Path
+from unittest.mock import patch
 
 import corpus_ingestor
 from corpus_ingestor import run as run_without_model, scan_corpus
@@ -66,6 +68,7 @@ def main() -> int:
             )
         old_root = corpus_ingestor.DEFAULT_CORPUS_ROOT
         corpus_ingestor.DEFAULT_CORPUS_ROOT = corpus_root
+        os.environ["SHUSHUNYA_CORPUS_INDEX"] = str(root / "corpus_index.sqlite3")
         try:
             index = scan_corpus({"goal": "Максимально полно реконструируй события Скалатракса"})
             if index.get("summary", {}).get("sources_matched") != 3:
@@ -95,6 +98,30 @@ def main() -> int:
                 or not metadata_source.get("metadata_available")
             ):
                 raise AssertionError(f"sidecar corpus metadata was not applied: {metadata_source}")
+            if index["summary"].get("index", {}).get("files_extracted") != 39:
+                raise AssertionError(f"cold corpus scan should extract every supported file once: {index['summary']}")
+            warm = scan_corpus({"goal": "Максимально полно реконструируй события Скалатракса"})
+            warm_index = warm["summary"].get("index", {})
+            if warm_index.get("files_extracted") or warm_index.get("files_indexed") != 39:
+                raise AssertionError(f"unchanged corpus should be answered from the index: {warm['summary']}")
+            if [item["sha256"] for item in warm["sources"]] != [item["sha256"] for item in index["sources"]]:
+                raise AssertionError("indexed sources should keep their content hashes")
+            (corpus_root / "irrelevant-00.txt").write_text("Skalathrax after the ice. " * 8, encoding="utf-8")
+            (corpus_root / "irrelevant-01.txt").unlink()
+            metadata_path = corpus_root / "chapter-one.txt.metadata.json"
+            metadata_path.write_text(json.dumps({"title": "Chapter One", "tags": ["Istvaan"]}) + "\n", encoding="utf-8")
+            changed = scan_corpus({"goal": "Максимально полно реконструируй события Скалатракса"})
+            changed_index = changed["summary"].get("index", {})
+            if (changed_index.get("files_extracted"), changed_index.get("files_removed"), changed_index.get("metadata_reloaded")) != (1, 1, 1):
+                raise AssertionError(f"only changed corpus files should be re-read: {changed_index}")
+            changed_paths = {item["corpus_relative_path"] for item in changed["sources"]}
+            if changed_paths != {"skalathrax-notes.txt", "kharn-eater-of-worlds.epub", "irrelevant-00.txt"}:
+                raise AssertionError(f"index lookup should follow edited text and metadata: {changed_paths}")
+            metadata_path.write_text(
+                json.dumps({"title": "Skalathrax Primary Appendix", "source_class": "official_primary_narrative", "type": "short_story", "language": "en", "tags": ["Skalathrax", "Kharn"]})
+                + "\n",
+                encoding="utf-8",
+            )
             request = {
                 "task_id": "test:corpus_ingestion",
                 "contract": {"goal": "Скалатракс"},
@@ -108,11 +135,33 @@ def main() -> int:
             if not output.exists():
                 raise AssertionError("corpus index was not written")
             written = json.loads(output.read_text(encoding="utf-8"))
-            if written.get("summary", {}).get("sources_matched") != 3:
+            if written.get("summary", {}).get("sources_matched") != 4:
                 raise AssertionError(f"written corpus index is wrong: {written}")
+            other_root = root / "OtherCorpus"
+            other_root.mkdir()
+            for index in range(5):
+                (other_root / f"skalathrax-{index}.txt").write_text("Skalathrax in another corpus. " * 8, encoding="utf-8")
+            with patch.object(corpus_ingestor, "INDEX_COMMIT_EVERY_FILES", 2):
+                other = scan_corpus({"goal": "Скалатракс"}, corpus_root=other_root)
+            if other["summary"].get("sources_matched") != 5 or other["summary"]["index"].get("files_extracted") != 5:
+                raise AssertionError(f"batched refresh should index every file: {other['summary']}")
+            configured = scan_corpus({"goal": "Скалатракс"})
+            with sqlite3.connect(root / "corpus_index.sqlite3") as db:
+                roots = {row[0] for row in db.execute("SELECT DISTINCT corpus_root FROM corpus_files")}
+            if roots != {str(corpus_root.resolve())}:
+                raise AssertionError(f"rows of corpus roots that are no longer configured should be dropped: {roots}")
+            with patch.object(corpus_ingestor.CorpusIndex, "refresh", side_effect=sqlite3.OperationalError("database is locked")):
+                fallback = scan_corpus({"goal": "Скалатракс"})
+            if fallback["summary"]["index"].get("backend") != "uncached":
+                raise AssertionError(f"an unusable index should fall back to the uncached scan: {fallback['summary']}")
+            if [item["corpus_relative_path"] for item in fallback["sources"]] != [item["corpus_relative_path"] for item in configured["sources"]]:
+                raise AssertionError("uncached fallback should find the same sources as the index")
+            if fallback["summary"]["sources_non_matching"] != configured["summary"]["sources_non_matching"]:
+                raise AssertionError(f"uncached fallback should count the same non-matching files: {fallback['summary']}")
         finally:
             corpus_ingestor.DEFAULT_CORPUS_ROOT = old_root
             os.environ.pop("SHUSHUNYA_CORPUS_DIR", None)
+            os.environ.pop("SHUSHUNYA_CORPUS_INDEX", None)
     print("[ok] CorpusIngestor local corpus scan")
     return 0
 
@@ -10,6 +10,7 @@ if str(BRIGADE_ROOT) not in sys.path:
     sys.path.insert(0, str(BRIGADE_ROOT))
 
 from scriptorium_model import model_unavailable_payload, request_required_scriptorium_guidance  # noqa: E402
+from workspace_artifacts import load_json_artifact  # noqa: E402
 
 
 PACKAGE_FILES = [
@@ -95,7 +96,7 @@ def package_file_kind(filename: str) -> str:
 
 
 def load_json(path: Path) -> dict[str, Any]:
-    payload = json.loads(path.read_text(encoding="utf-8"))
+    payload = load_json_artifact(path)
     if not isinstance(payload, dict):
         raise ValueError(f"artifact must be an object: {path}")
     return payload
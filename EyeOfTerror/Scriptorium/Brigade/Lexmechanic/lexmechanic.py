@@ -18,6 +18,7 @@ if str(BRIGADE_ROOT) not in sys.path:
     sys.path.insert(0, str(BRIGADE_ROOT))
 
 from EyeOfTerror.Services.Search.web_tools import web_search  # noqa: E402
+from playbook_matcher import MarkerMatcher, term_matcher  # noqa: E402
 from scriptorium_model import model_unavailable_payload, request_required_scriptorium_guidance  # noqa: E402
 
 
@@ -79,8 +80,7 @@ def matching_playbooks(goal: str) -> list[dict[str, Any]]:
     lowered = goal.lower()
     matches = []
     for playbook in SOURCE_PLAYBOOKS:
-        terms = [str(term).lower() for term in playbook.get("match_terms", [])]
-        if any(term in lowered for term in terms):
+        if term_matcher(tuple(str(term) for term in playbook.get("match_terms", []))).any(lowered):
             matches.append(playbook)
     return matches
 
@@ -701,7 +701,29 @@ def term_matches_haystack(term: str, haystack: str, haystack_tokens: set[str]) -
     return len(tokens & haystack_tokens) >= required
 
 
-def relevant_live_result(result: dict[str, Any], relevance_terms: list[str] | None) -> bool:
+class RelevanceTerms:
+    """``relevance_terms`` prepared once for every discovered result.
+
+    Same decision as ``term_matches_haystack`` over each term: one combined
+    scan for the whitespace-normalized phrases, then the token-overlap check
+    with the terms' tokens computed up front.
+    """
+
+    def __init__(self, terms: list[str]) -> None:
+        terms = [term for term in terms if term]
+        self.phrases = MarkerMatcher(phrase for phrase in (" ".join(term.lower().split()) for term in terms) if phrase)
+        self.token_sets = [(tokens, min(len(tokens), 2)) for tokens in (relevance_tokens(term) for term in terms) if tokens]
+
+    def matches(self, haystack: str) -> bool:
+        if self.phrases.any(haystack):
+            return True
+        if not self.token_sets:
+            return False
+        haystack_tokens = relevance_tokens(haystack)
+        return any(len(tokens & haystack_tokens) >= required for tokens, required in self.token_sets)
+
+
+def relevant_live_result(result: dict[str, Any], relevance_terms: list[str] | RelevanceTerms | None) -> bool:
     if not relevance_terms:
         return True
     haystack = " ".join(
@@ -711,17 +733,18 @@ def relevant_live_result(result: dict[str, Any], relevance_terms: list[str] | No
             str(result.get("snippet") or ""),
         ]
     ).lower()
-    haystack_tokens = relevance_tokens(haystack)
-    return any(term_matches_haystack(term, haystack, haystack_tokens) for term in relevance_terms if term)
+    compiled = relevance_terms if isinstance(relevance_terms, RelevanceTerms) else RelevanceTerms(relevance_terms)
+    return compiled.matches(haystack)
 
 
 def classified_live_sources(discovery_results: list[dict[str, Any]], relevance_terms: list[str] | None = None) -> list[dict[str, Any]]:
     candidates: list[dict[str, Any]] = []
+    compiled = RelevanceTerms(relevance_terms) if relevance_terms else None
     for discovery in discovery_results:
         for result in discovery.get("results", []):
             if not isinstance(result, dict):
                 continue
-            if not relevant_live_result(result, relevance_terms):
+            if not relevant_live_result(result, compiled):
                 continue
             candidate = classify_discovered_result(result)
             if candidate:
@@ -13,6 +13,8 @@ if str(BRIGADE_ROOT) not in sys.path:
     sys.path.insert(0, str(BRIGADE_ROOT))
 
 from scriptorium_model import model_unavailable_payload, parsed_model_content, request_required_scriptorium_guidance  # noqa: E402
+from playbook_matcher import MarkerMatcher, term_matcher  # noqa: E402
+from workspace_artifacts import load_json_artifact  # noqa: E402
 
 
 def load_playbook(path: Path) -> dict[str, Any]:
@@ -77,13 +79,14 @@ EVENT_EVIDENCE_MARKERS = {
     for event in playbook.get("events", [])
     if isinstance(event, dict) and event.get("event_id")
 }
+EVIDENCE_MATCHER = MarkerMatcher(marker for markers in EVENT_EVIDENCE_MARKERS.values() for marker in markers)
 
 
 def load_optional_snapshots(workspace_root: Path, output_path: str) -> dict[str, Any]:
     snapshots_path = sandbox_path(workspace_root, source_snapshots_path_for_output(output_path))
     if not snapshots_path.exists():
         return {}
-    payload = json.loads(snapshots_path.read_text(encoding="utf-8"))
+    payload = load_json_artifact(snapshots_path, lazy_text=True)
     return payload if isinstance(payload, dict) else {}
 
 
@@ -91,7 +94,7 @@ def load_optional_rendered_snapshots(workspace_root: Path, output_path: str) ->
     rendered_path = sandbox_path(workspace_root, rendered_snapshots_path_for_output(output_path))
     if not rendered_path.exists():
         return {}
-    payload = json.loads(rendered_path.read_text(encoding="utf-8"))
+    payload = load_json_artifact(rendered_path, lazy_text=True)
     return payload if isinstance(payload, dict) else {}
 
 
@@ -130,6 +133,10 @@ def evidence_excerpt(text: str, matched: list[str], max_chars: int = 520) -> str
     lowered = compact.lower()
     positions = [lowered.find(marker.lower()) for marker in matched if marker and marker.lower() in lowered]
     pivot = min([position for position in positions if position >= 0], default=0)
+    return compact_excerpt(compact, pivot, max_chars)
+
+
+def compact_excerpt(compact: str, pivot: int, max_chars: int = 520) -> str:
     start = max(0, pivot - max_chars // 3)
     end = min(len(compact), start + max_chars)
     if end - start < max_chars and start > 0:
@@ -173,18 +180,47 @@ def snapshot_search_text(snapshot: dict[str, Any]) -> str:
     return str(snapshot.get("text_excerpt") or "")
 
 
-def snapshot_evidence(event_id: str, snapshots: dict[str, Any]) -> list[dict[str, Any]]:
+class SnapshotMarkerHits:
+    """Playbook evidence markers found in each fetched snapshot, scanned once.
+
+    Every snapshot text is read, lowered and scanned by ``EVIDENCE_MATCHER``
+    a single time; each event then only looks its markers up in the hits.
+    Excerpt pivots come from one scan of the whitespace-compacted text, the
+    same text ``evidence_excerpt`` searches.
+    """
+
+    def __init__(self, snapshots: dict[str, Any]) -> None:
+        self.items: list[tuple[dict[str, Any], set[str], str, dict[str, int] | None]] = []
+        for snapshot in snapshots.get("snapshots", []):
+            if not isinstance(snapshot, dict) or not snapshot.get("ok"):
+                continue
+            text = snapshot_search_text(snapshot)
+            found = EVIDENCE_MATCHER.found(text.lower())
+            self.items.append((snapshot, found, text, None))
+
+    def evidence(self, markers: list[str]) -> list[dict[str, Any]]:
+        evidence: list[dict[str, Any]] = []
+        for index, (snapshot, found, text, pivots) in enumerate(self.items):
+            matched = [marker for marker in markers if marker.lower() in found]
+            if not matched:
+                continue
+            compact = " ".join(text.split())
+            if not compact:
+                evidence.append(evidence_item(snapshot, ", ".join(matched), ""))
+                continue
+            if pivots is None:
+                pivots = EVIDENCE_MATCHER.first_positions(compact.lower())
+                self.items[index] = (snapshot, found, text, pivots)
+            pivot = min((pivots[marker.lower()] for marker in matched if marker and marker.lower() in pivots), default=0)
+            evidence.append(evidence_item(snapshot, ", ".join(matched), compact_excerpt(compact, pivot)))
+        return evidence
+
+
+def snapshot_evidence(event_id: str, snapshots: dict[str, Any], hits: SnapshotMarkerHits | None = None) -> list[dict[str, Any]]:
     markers = EVENT_EVIDENCE_MARKERS.get(event_id, [])
-    evidence: list[dict[str, str]] = []
-    for snapshot in snapshots.get("snapshots", []):
-        if not isinstance(snapshot, dict) or not snapshot.get("ok"):
-            continue
-        text = snapshot_search_text(snapshot)
-        lowered = text.lower()
-        matched = [marker for marker in markers if marker.lower() in lowered]
-        if matched:
-            evidence.append(evidence_item(snapshot, ", ".join(matched), evidence_excerpt(text, matched)))
-    return evidence
+    if not markers:
+        return []
+    return (hits or SnapshotMarkerHits(snapshots)).evidence(markers)
 
 
 def snapshot_gaps(snapshots: dict[str, Any]) -> list[str]:
@@ -209,7 +245,7 @@ def snapshot_gaps(snapshots: dict[str, Any]) -> list[str]:
 
 def playbook_matches(playbook: dict[str, Any], topic: str, source_titles: set[str]) -> bool:
     haystack = " ".join([topic.lower(), *(title.lower() for title in source_titles)])
-    return any(str(term).lower() in haystack for term in playbook.get("match_terms", []))
+    return term_matcher(tuple(str(term) for term in playbook.get("match_terms", []))).any(haystack)
 
 
 def events_from_playbook(playbook: dict[str, Any], source_titles: set[str]) -> list[dict[str, Any]]:
@@ -332,10 +368,14 @@ def extract_events(source_map: dict[str, Any], source_snapshots: dict[str, Any]
     }
     primary_leads = primary_evidence_leads(source_snapshots, existing_source_refs)
     events.extend(primary_leads)
+    hits: SnapshotMarkerHits | None = None
     for event in events:
         if isinstance(event, dict):
             if "evidence_snapshots" not in event:
-                event["evidence_snapshots"] = snapshot_evidence(str(event.get("event_id") or ""), source_snapshots)
+                event_id = str(event.get("event_id") or "")
+                if hits is None and EVENT_EVIDENCE_MARKERS.get(event_id):
+                    hits = SnapshotMarkerHits(source_snapshots)
+                event["evidence_snapshots"] = snapshot_evidence(event_id, source_snapshots, hits)
             primary_evidence = [
                 item
                 for item in event.get("evidence_snapshots", [])
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""Render throughput and memory of OcularisRenderium against a local static site.
+
+The fixture is a threaded HTTP server on 127.0.0.1 serving generated pages
+that look like the scripted sources AuspexBrowser flags as render_required:
+a thin HTML shell whose text is inserted by a script after a short delay,
+plus images, a web font and a video that are served slowly. ``legacy``
+reproduces the pre-pool renderer (a fresh Chromium per URL, serial,
+``networkidle``); ``pool`` is ``BrowserPool`` at the given concurrency. The
+bench reports pages per minute and peak RSS of this process plus every
+browser process it spawned, and checks that both modes extracted the
+scripted text. Requires Playwright with Chromium installed.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable
+
+WORKER_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(WORKER_ROOT))
+
+from ocularis_renderium import BrowserPool  # noqa: E402
+
+MODES = ("legacy", "pool")
+PAGE_TEMPLATE = """<!doctype html>
+<html><head><title>Fixture page {index}</title>
+<link rel="preload" href="/assets/font-{index}.woff2" as="font" crossorigin>
+<style>@font-face {{ font-family: f; src: url(/assets/font-{index}.woff2); }} body {{ font-family: f; }}</style>
+</head><body>
+<div id="app">Loading...</div>
+{images}
+<video src="/assets/clip-{index}.mp4" autoplay muted></video>
+<script>
+setTimeout(() => {{
+  document.getElementById("app").innerHTML = {paragraphs};
+}}, {script_delay_ms});
+</script>
+</body></html>
+"""
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    asset_delay_ms = 0
+
+    def do_GET(self) -> None:  # noqa: N802 - http.server API
+        if self.path.startswith("/assets/"):
+            time.sleep(self.asset_delay_ms / 1000)
+            body = b"\0" * 4096
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+        super().do_GET()
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        return
+
+
+def write_site(root: Path, pages: int, script_delay_ms: int) -> None:
+    for index in range(pages):
+        paragraphs = "".join(f"<p>Marker-{index} paragraph {item} of the rendered chronicle.</p>" for item in range(40))
+        images = "\n".join(f'<img src="/assets/plate-{index}-{item}.png">' for item in range(6))
+        (root / f"page-{index}.html").write_text(
+            PAGE_TEMPLATE.format(index=index, images=images, paragraphs=json.dumps(paragraphs), script_delay_ms=script_delay_ms),
+            encoding="utf-8",
+        )
+
+
+def legacy_render(url: str, timeout_ms: int) -> dict[str, Any]:
+    """``playwright_render`` as it was before the pool."""
+    from playwright.sync_api import sync_playwright  # type: ignore
+
+    with sync_playwright() as playwright:
+        browser = playwright.chromium.launch(headless=True)
+        try:
+            page = browser.new_page(viewport={"width": 1365, "height": 768})
+            page.goto(url, wait_until="networkidle", timeout=timeout_ms)
+            text = page.locator("body").inner_text(timeout=timeout_ms)
+            return {"ok": True, "title": page.title(), "text": text}
+        finally:
+            browser.close()
+
+
+def tree_rss_bytes(root_pid: int) -> int:
+    children: dict[int, list[int]] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            stat = Path(f"/proc/{entry}/stat").read_text()
+        except OSError:
+            continue
+        parent = int(stat.rsplit(")", 1)[1].split()[1])
+        children.setdefault(parent, []).append(int(entry))
+    total = 0
+    pending = [root_pid]
+    while pending:
+        pid = pending.pop()
+        pending.extend(children.get(pid, []))
+        try:
+            for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+                if line.startswith("VmRSS:"):
+                    total += int(line.split()[1]) * 1024
+                    break
+        except OSError:
+            continue
+    return total
+
+
+class RssSampler(threading.Thread):
+    def __init__(self, interval: float = 0.05) -> None:
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.peak = 0
+        self._done = threading.Event()
+
+    def run(self) -> None:
+        while not self._done.is_set():
+            self.peak = max(self.peak, tree_rss_bytes(os.getpid()))
+            self._done.wait(self.interval)
+
+    def stop(self) -> int:
+        self._done.set()
+        self.join()
+        return self.peak
+
+
+def measure(mode: str, urls: list[str], render: Callable[[str, int], dict[str, Any]], concurrency: int, timeout_ms: int) -> dict[str, Any]:
+    sampler = RssSampler()
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda url: render(url, timeout_ms), urls))
+    elapsed = time.perf_counter() - started
+    peak = sampler.stop()
+    missing = [url for url, result in zip(urls, results) if f"Marker-{url.rsplit('-', 1)[1].split('.')[0]}" not in str(result.get("text") or "")]
+    if missing:
+        raise AssertionError(f"{mode}: scripted text missing for {len(missing)} pages, e.g. {missing[0]}: {results[urls.index(missing[0])]}")
+    return {
+        "mode": mode,
+        "pages": len(urls),
+        "concurrency": concurrency,
+        "pages_per_min": round(len(urls) / elapsed * 60, 1),
+        "seconds": round(elapsed, 2),
+        "peak_rss_mb": round(peak / 1024 / 1024, 1),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--asset-delay-ms", type=int, default=800, help="latency of every image/font/media response")
+    parser.add_argument("--script-delay-ms", type=int, default=150, help="delay before the page script inserts its text")
+    parser.add_argument("--timeout-ms", type=int, default=30_000)
+    parser.add_argument("--mode", choices=[*MODES, "all"], default="all")
+    parser.add_argument("--report-json", default="")
+    args = parser.parse_args()
+    try:
+        import playwright  # type: ignore  # noqa: F401
+    except ImportError:
+        print("playwright is not installed; pip install playwright && playwright install chromium", file=sys.stderr)
+        return 2
+    modes = MODES if args.mode == "all" else (args.mode,)
+    results = []
+    with tempfile.TemporaryDirectory() as temp:
+        write_site(Path(temp), args.pages, args.script_delay_ms)
+        FixtureHandler.asset_delay_ms = args.asset_delay_ms
+        server = ThreadingHTTPServer(("127.0.0.1", 0), partial(FixtureHandler, directory=temp))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        urls = [f"http://127.0.0.1:{server.server_port}/page-{index}.html" for index in range(args.pages)]
+        try:
+            for mode in modes:
+                if mode == "legacy":
+                    result = measure(mode, urls, legacy_render, 1, args.timeout_ms)
+                else:
+                    pool = BrowserPool(max_pages=args.concurrency)
+                    try:
+                        result = measure(mode, urls, pool.render, args.concurrency, args.timeout_ms)
+                        result["browser_pool"] = pool.stats_snapshot()
+                    finally:
+                        pool.close()
+                results.append(result)
+                print(
+                    f"{mode}: {result['pages_per_min']} pages/min ({result['pages']} pages in {result['seconds']} s, "
+                    f"concurrency {result['concurrency']}), peak RSS {result['peak_rss_mb']} MB",
+                    flush=True,
+                )
+        finally:
+            server.shutdown()
+    if args.report_json:
+        Path(args.report_json).write_text(json.dumps({"results": results}, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,10 +1,14 @@
 from __future__ import annotations
 
+import asyncio
+import atexit
 import ipaddress
 import json
 import os
 import socket
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Callable
 from urllib.parse import urlparse
@@ -14,10 +18,37 @@ if str(BRIGADE_ROOT) not in sys.path:
     sys.path.insert(0, str(BRIGADE_ROOT))
 
 from scriptorium_model import model_unavailable_payload, request_required_scriptorium_guidance  # noqa: E402
+from workspace_artifacts import load_json_artifact, write_json_artifact  # noqa: E402
 
 
 RenderFn = Callable[[str, int], dict[str, Any]]
 
+RENDER_CONCURRENCY = max(1, int(os.environ.get("OCULARIS_RENDER_CONCURRENCY", "4")))
+DOM_QUIET_MS = max(50, int(os.environ.get("OCULARIS_DOM_QUIET_MS", "500")))
+DOM_SETTLE_MAX_MS = max(DOM_QUIET_MS, int(os.environ.get("OCULARIS_DOM_SETTLE_MAX_MS", "5000")))
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+BROWSER_LAUNCH_ARGS = ("--disable-dev-shm-usage", "--disable-gpu", "--mute-audio", "--no-first-run")
+VIEWPORT = {"width": 1365, "height": 768}
+# Resolves once the DOM has gone ``quiet`` ms without a mutation, or after ``max`` ms.
+DOM_SETTLE_SCRIPT = """
+([quiet, max]) => new Promise((resolve) => {
+  const started = performance.now();
+  let timer = null;
+  const finish = () => { observer.disconnect(); resolve(Math.round(performance.now() - started)); };
+  const observer = new MutationObserver(() => { clearTimeout(timer); timer = setTimeout(finish, quiet); });
+  observer.observe(document, { subtree: true, childList: true, characterData: true });
+  timer = setTimeout(finish, quiet);
+  setTimeout(finish, max);
+})
+"""
+# A client-side redirect or meta refresh during the settle wait tears down the
+# page's execution context; Playwright reports it with one of these messages.
+NAVIGATION_INTERRUPTED_MARKERS = ("Execution context was destroyed", "because of a navigation", "Cannot find context with specified id")
+
+
+def navigation_interrupted(exc: BaseException) -> bool:
+    return any(marker in str(exc) for marker in NAVIGATION_INTERRUPTED_MARKERS)
+
 
 def sandbox_path(workspace_root: Path, path: str) -> Path:
     if not path.startswith("/work/"):
@@ -62,33 +93,181 @@ def validate_public_url(url: str) -> str:
     return url
 
 
-def playwright_render(url: str, timeout_ms: int) -> dict[str, Any]:
-    if os.environ.get("OCULARIS_ENABLE_PLAYWRIGHT", "").strip().lower() not in {"1", "true", "yes", "on"}:
-        return {"ok": False, "render_available": False, "error": "Playwright rendering disabled; set OCULARIS_ENABLE_PLAYWRIGHT=1"}
-    try:
-        from playwright.sync_api import sync_playwright  # type: ignore
-    except Exception as exc:  # pragma: no cover - depends on optional local browser tooling.
-        return {"ok": False, "render_available": False, "error": f"Playwright unavailable: {exc}"}
-    try:
-        with sync_playwright() as playwright:
-            browser = playwright.chromium.launch(headless=True)
+def playwright_enabled() -> bool:
+    return os.environ.get("OCULARIS_ENABLE_PLAYWRIGHT", "").strip().lower() in {"1", "true", "yes", "on"}
+
+
+class BrowserPool:
+    """One long-lived headless Chromium shared by every render in the process.
+
+    Playwright's async API runs on a private event-loop thread; callers on any
+    thread submit renders with ``render``. Each render gets its own browser
+    context (no cookies, storage or cache shared between sources), at most
+    ``max_pages`` contexts are open at once, image/font/media requests are
+    aborted, and text is read once the DOM stops mutating rather than after
+    network idle. A crashed browser is relaunched on the next render.
+    """
+
+    def __init__(self, max_pages: int = RENDER_CONCURRENCY, quiet_ms: int = DOM_QUIET_MS, settle_max_ms: int = DOM_SETTLE_MAX_MS):
+        self.max_pages = max(1, int(max_pages))
+        self.quiet_ms = quiet_ms
+        self.settle_max_ms = settle_max_ms
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._playwright: Any = None
+        self._browser: Any = None
+        self._launch_lock: asyncio.Lock | None = None
+        self._pages: asyncio.Semaphore | None = None
+        # Renders finish on the pool's loop thread, errors are counted on caller threads.
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "browser_launches": 0,
+            "pages_rendered": 0,
+            "render_errors": 0,
+            "requests_blocked": 0,
+            "settle_retries": 0,
+            "peak_open_pages": 0,
+        }
+        self._open_pages = 0
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="ocularis-browser-pool", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+                self._launch_lock = asyncio.Lock()
+                self._pages = asyncio.Semaphore(self.max_pages)
+            return self._loop
+
+    async def _browser_handle(self) -> Any:
+        assert self._launch_lock is not None
+        async with self._launch_lock:
+            if self._browser is None or not self._browser.is_connected():
+                if self._playwright is None:
+                    from playwright.async_api import async_playwright  # type: ignore
+
+                    self._playwright = await async_playwright().start()
+                self._browser = await self._playwright.chromium.launch(headless=True, args=list(BROWSER_LAUNCH_ARGS))
+                self._count("browser_launches")
+            return self._browser
+
+    async def _route(self, route: Any) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            self._count("requests_blocked")
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def _render(self, url: str, timeout_ms: int) -> dict[str, Any]:
+        assert self._pages is not None
+        async with self._pages:
+            browser = await self._browser_handle()
+            context = await browser.new_context(viewport=VIEWPORT, service_workers="block")
+            with self._stats_lock:
+                self._open_pages += 1
+                self.stats["peak_open_pages"] = max(self.stats["peak_open_pages"], self._open_pages)
             try:
-                page = browser.new_page(viewport={"width": 1365, "height": 768})
-                page.goto(url, wait_until="networkidle", timeout=timeout_ms)
-                title = page.title()
-                text = page.locator("body").inner_text(timeout=timeout_ms)
-                return {
-                    "ok": True,
-                    "render_available": True,
-                    "title": title,
-                    "text": text,
-                    "text_chars": len(text),
-                    "screenshot": "",
-                }
+                await context.route("**/*", self._route)
+                page = await context.new_page()
+                page.set_default_timeout(timeout_ms)
+                await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
+                settle_ms = await self._settle(page, timeout_ms)
+                title = await page.title()
+                text = await page.locator("body").inner_text(timeout=timeout_ms)
             finally:
-                browser.close()
-    except Exception as exc:  # noqa: BLE001 - render failures are worker diagnostics.
-        return {"ok": False, "render_available": True, "error": str(exc)}
+                with self._stats_lock:
+                    self._open_pages -= 1
+                await context.close()
+        self._count("pages_rendered")
+        return {
+            "ok": True,
+            "render_available": True,
+            "title": title,
+            "text": text,
+            "text_chars": len(text),
+            "screenshot": "",
+            "dom_settle_ms": settle_ms,
+        }
+
+    async def _settle(self, page: Any, timeout_ms: int) -> int:
+        """Wait for a quiet DOM; after a navigation mid-wait, settle the new document once more."""
+        bounds = [self.quiet_ms, min(self.settle_max_ms, timeout_ms)]
+        try:
+            return await page.evaluate(DOM_SETTLE_SCRIPT, bounds)
+        except Exception as exc:  # noqa: BLE001 - Playwright raises its own Error type.
+            if not navigation_interrupted(exc):
+                raise
+        self._count("settle_retries")
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout_ms)
+        return await page.evaluate(DOM_SETTLE_SCRIPT, bounds)
+
+    def render(self, url: str, timeout_ms: int) -> dict[str, Any]:
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(self._render(url, timeout_ms), loop)
+        try:
+            # Queueing behind other pages is part of the wait, so allow for a full turn of the pool.
+            return future.result(timeout=(timeout_ms + self.settle_max_ms) / 1000 * 2 + 30)
+        except ImportError as exc:
+            future.cancel()
+            return {"ok": False, "render_available": False, "error": f"Playwright unavailable: {exc}"}
+        except Exception as exc:  # noqa: BLE001 - render failures are worker diagnostics.
+            future.cancel()
+            self._count("render_errors")
+            return {"ok": False, "render_available": True, "error": str(exc) or type(exc).__name__}
+
+    async def _shutdown(self) -> None:
+        if self._browser is not None:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def close(self) -> None:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=30)
+        except Exception:  # noqa: BLE001 - best effort on shutdown.
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+
+    def stats_snapshot(self) -> dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return {"max_pages": self.max_pages, "browser_running": self._browser is not None, **stats}
+
+
+_POOL: BrowserPool | None = None
+_POOL_LOCK = threading.Lock()
+
+
+def shared_browser_pool() -> BrowserPool:
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = BrowserPool()
+            atexit.register(_POOL.close)
+        return _POOL
+
+
+def playwright_render(url: str, timeout_ms: int) -> dict[str, Any]:
+    if not playwright_enabled():
+        return {"ok": False, "render_available": False, "error": "Playwright rendering disabled; set OCULARIS_ENABLE_PLAYWRIGHT=1"}
+    return shared_browser_pool().render(url, timeout_ms)
 
 
 def render_source(snapshot: dict[str, Any], renderer: RenderFn = playwright_render, timeout_ms: int = 30000) -> dict[str, Any]:
@@ -116,8 +295,13 @@ def render_source(snapshot: dict[str, Any], renderer: RenderFn = playwright_rend
     }
 
 
-def render_snapshots(source_snapshots: dict[str, Any], renderer: RenderFn = playwright_render, timeout_ms: int = 30000) -> dict[str, Any]:
-    rendered: list[dict[str, Any]] = []
+def render_snapshots(
+    source_snapshots: dict[str, Any],
+    renderer: RenderFn = playwright_render,
+    timeout_ms: int = 30000,
+    concurrency: int = RENDER_CONCURRENCY,
+) -> dict[str, Any]:
+    required: list[dict[str, Any]] = []
     skipped: list[dict[str, Any]] = []
     for snapshot in source_snapshots.get("snapshots", []):
         if not isinstance(snapshot, dict):
@@ -125,7 +309,10 @@ def render_snapshots(source_snapshots: dict[str, Any], renderer: RenderFn = play
         if not snapshot.get("render_required"):
             skipped.append({"source_title": snapshot.get("source_title", ""), "reason": "render_not_required"})
             continue
-        rendered.append(render_source(snapshot, renderer=renderer, timeout_ms=timeout_ms))
+        required.append(snapshot)
+    workers = max(1, min(int(concurrency), len(required)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ocularis-render") as executor:
+        rendered = list(executor.map(lambda snapshot: render_source(snapshot, renderer=renderer, timeout_ms=timeout_ms), required))
     return {
         "topic": source_snapshots.get("topic", ""),
         "rendered_snapshots": rendered,
@@ -152,7 +339,8 @@ def run(request: dict[str, Any], workspace_root: Path) -> dict[str, Any]:
     source_host_path = sandbox_path(workspace_root, source_path)
     if not source_host_path.exists():
         return {"ok": False, "worker": "OcularisRenderium", "error": "source_snapshots is missing", "missing": source_path}
-    source_snapshots = json.loads(source_host_path.read_text(encoding="utf-8"))
+    # Rendering reads URLs and flags only; fetched texts stay in the sidecar.
+    source_snapshots = load_json_artifact(source_host_path, lazy_text=True)
     guidance = request_required_scriptorium_guidance(
         "OcularisRenderium",
         request,
@@ -164,9 +352,9 @@ def run(request: dict[str, Any], workspace_root: Path) -> dict[str, Any]:
     timeout_ms = max(1000, min(int(request.get("render_timeout_ms") or 30000), 120000))
     rendered = render_snapshots(source_snapshots, timeout_ms=timeout_ms)
     rendered["model_guidance"] = guidance
-    host_path = sandbox_path(workspace_root, output_path)
-    host_path.parent.mkdir(parents=True, exist_ok=True)
-    host_path.write_text(json.dumps(rendered, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    if playwright_enabled():
+        rendered["browser_pool"] = shared_browser_pool().stats_snapshot()
+    write_json_artifact(sandbox_path(workspace_root, output_path), rendered)
     summary = rendered["summary"]
     return {
         "ok": True,
@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import asyncio
 import json
 import tempfile
+import threading
+import time
 from pathlib import Path
 
-from ocularis_renderium import render_snapshots, run as run_without_model, validate_public_url
+from ocularis_renderium import BrowserPool, render_snapshots, run as run_without_model, validate_public_url
 
 
 MODEL_BRAIN = {"ok": True, "status": "answered", "content": "{\"status\":\"ok\"}"}
@@ -60,6 +63,30 @@ def main() -> int:
         raise AssertionError(f"bad render summary: {rendered}")
     if rendered["rendered_snapshots"][0]["text_excerpt"] != "Rendered DOM text with application content":
         raise AssertionError(f"rendered text missing: {rendered}")
+    in_flight = {"now": 0, "peak": 0}
+    in_flight_lock = threading.Lock()
+
+    def slow_renderer(url: str, timeout_ms: int) -> dict:
+        with in_flight_lock:
+            in_flight["now"] += 1
+            in_flight["peak"] = max(in_flight["peak"], in_flight["now"])
+        time.sleep(0.05)
+        with in_flight_lock:
+            in_flight["now"] -= 1
+        return {"ok": True, "render_available": True, "title": url, "text": f"text of {url}"}
+
+    many = {
+        "topic": "render pool",
+        "snapshots": [
+            {"source_title": f"Page {index}", "final_url": f"https://example.com/page-{index}", "render_required": True}
+            for index in range(9)
+        ],
+    }
+    pooled = render_snapshots(many, renderer=slow_renderer, concurrency=3)
+    if [item["source_title"] for item in pooled["rendered_snapshots"]] != [f"Page {index}" for index in range(9)]:
+        raise AssertionError(f"concurrent renders must keep snapshot order: {pooled}")
+    if in_flight["peak"] != 3 or pooled["summary"]["render_ok"] != 9:
+        raise AssertionError(f"render concurrency should be bounded, not serial: {in_flight}, {pooled['summary']}")
     try:
         validate_public_url("http://127.0.0.1/private")
     except ValueError as exc:
@@ -68,6 +95,38 @@ def main() -> int:
     else:
         raise AssertionError("loopback render URL should be rejected")
 
+    class RedirectingPage:
+        """Page whose first settle wait is cut short by a client-side redirect."""
+
+        def __init__(self, failure: str) -> None:
+            self.failure = failure
+            self.calls: list[str] = []
+
+        async def evaluate(self, script: str, bounds: list[int]) -> int:
+            self.calls.append("evaluate")
+            if self.calls.count("evaluate") == 1:
+                raise RuntimeError(self.failure)
+            return 120
+
+        async def wait_for_load_state(self, state: str, timeout: int) -> None:
+            self.calls.append(state)
+
+    pool = BrowserPool(max_pages=1)
+    redirected = RedirectingPage("Page.evaluate: Execution context was destroyed, most likely because of a navigation")
+    if asyncio.run(pool._settle(redirected, 30000)) != 120 or redirected.calls != ["evaluate", "domcontentloaded", "evaluate"]:
+        raise AssertionError(f"settle should retry once on the redirected document: {redirected.calls}")
+    if pool.stats_snapshot()["settle_retries"] != 1:
+        raise AssertionError(f"settle retry should be counted: {pool.stats_snapshot()}")
+    broken = RedirectingPage("Page.evaluate: ReferenceError: document is not defined")
+    try:
+        asyncio.run(pool._settle(broken, 30000))
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("non-navigation settle errors must still fail the render")
+    if broken.calls != ["evaluate"]:
+        raise AssertionError(f"non-navigation settle errors must not be retried: {broken.calls}")
+
     request = {
         "task_id": "test:render",
         "step": {"expected_artifacts": ["/work/test/rendered_snapshots.json"]},
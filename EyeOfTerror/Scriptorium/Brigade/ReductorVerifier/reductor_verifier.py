@@ -18,6 +18,8 @@ from scriptorium_model import (
     request_scriptorium_model_guidance,
     research_intent_from_worker_request,
 )  # noqa: E402
+from playbook_matcher import MarkerMatcher, term_matcher  # noqa: E402
+from workspace_artifacts import load_json_artifact  # noqa: E402
 
 GuidanceFn = Callable[[str, dict[str, Any], str], dict[str, Any]]
 
@@ -213,8 +215,7 @@ def playbook_matches(playbook: dict[str, Any], source_map: dict[str, Any], notes
             *timeline_ids,
         ]
     ).lower()
-    terms = [str(term).lower() for term in playbook.get("match_terms", []) if term]
-    return any(term in haystack for term in terms)
+    return term_matcher(tuple(str(term) for term in playbook.get("match_terms", []) if term)).any(haystack)
 
 
 def required_review_events(source_map: dict[str, Any], notes: dict[str, Any], timeline: dict[str, Any]) -> list[dict[str, Any]]:
@@ -258,8 +259,8 @@ def sibling_artifact(output_path: str, filename: str) -> str:
     return f"{parent}/{filename}"
 
 
-def load_json(workspace_root: Path, path: str) -> dict[str, Any]:
-    payload = json.loads(sandbox_path(workspace_root, path).read_text(encoding="utf-8"))
+def load_json(workspace_root: Path, path: str, lazy_text: bool = False) -> dict[str, Any]:
+    payload = load_json_artifact(sandbox_path(workspace_root, path), lazy_text=lazy_text)
     if not isinstance(payload, dict):
         raise ValueError(f"artifact must be an object: {path}")
     return payload
@@ -389,14 +390,20 @@ def evidence_support_chars(note: dict[str, Any]) -> int:
     return total
 
 
-def marker_context_chars(text: str, markers: list[str], radius: int = 120) -> int:
+def draft_marker_positions(text: str, required_events: list[dict[str, Any]]) -> dict[str, int]:
+    """First position of every required-event marker in the draft, from one scan."""
+    matcher = MarkerMatcher(marker for event in required_events for marker in required_event_markers(event))
+    return matcher.first_positions(text.lower())
+
+
+def marker_context_chars(text: str, markers: list[str], radius: int = 120, positions: dict[str, int] | None = None) -> int:
     if not markers:
         return 0
-    lowered = text.lower()
+    if positions is None:
+        positions = MarkerMatcher(markers).first_positions(text.lower())
     intervals: list[tuple[int, int]] = []
     for marker in markers:
-        needle = marker.lower()
-        position = lowered.find(needle)
+        position = positions.get(marker.lower(), -1)
         if position < 0:
             continue
         intervals.append((max(0, position - radius), min(len(text), position + len(marker) + radius)))
@@ -437,12 +444,13 @@ def comprehensive_required_event_metrics(
     evidence_supported = 0
     under_detailed: list[str] = []
     weak_evidence: list[str] = []
+    positions = draft_marker_positions(reconstruction, required_events)
     for event in required_events:
         event_id = str(event.get("event_id") or "")
         label = required_event_label(event)
         markers = required_event_markers(event)
-        detail_chars = marker_context_chars(reconstruction, markers)
-        if markers and text_contains_markers(reconstruction, markers):
+        detail_chars = marker_context_chars(reconstruction, markers, positions=positions)
+        if markers and text_contains_markers(reconstruction, markers, positions):
             draft_covered += 1
         if detail_chars < min_detail_chars:
             under_detailed.append(label)
@@ -763,9 +771,11 @@ def book_artifact_findings(workspace_root: Path, critic_path: str, required_arti
     return findings, metrics
 
 
-def text_contains_markers(text: str, markers: list[str]) -> bool:
-    lowered = text.lower()
-    return all(marker.lower() in lowered for marker in markers)
+def text_contains_markers(text: str, markers: list[str], positions: dict[str, int] | None = None) -> bool:
+    if positions is None:
+        lowered = text.lower()
+        return all(marker.lower() in lowered for marker in markers)
+    return all(marker.lower() in positions for marker in markers)
 
 
 def extract_section_bullets(text: str, headings: set[str]) -> list[str]:
@@ -989,7 +999,7 @@ def load_optional_json(workspace_root: Path, path: str) -> dict[str, Any]:
     host_path = sandbox_path(workspace_root, path)
     if not host_path.exists():
         return {}
-    payload = json.loads(host_path.read_text(encoding="utf-8"))
+    payload = load_json_artifact(host_path)
     return payload if isinstance(payload, dict) else {}
 
 
@@ -1188,8 +1198,9 @@ def review_artifacts(
         }
 
     source_map = load_json(workspace_root, source_path)
-    source_snapshots = load_json(workspace_root, source_snapshots_path)
-    rendered_snapshots = load_json(workspace_root, rendered_snapshots_path)
+    # Snapshots are only counted here; their texts stay in the sidecar.
+    source_snapshots = load_json(workspace_root, source_snapshots_path, lazy_text=True)
+    rendered_snapshots = load_json(workspace_root, rendered_snapshots_path, lazy_text=True)
     notes = load_json(workspace_root, notes_path)
     timeline = load_optional_json(workspace_root, timeline_path)
     structure_map = load_optional_json(workspace_root, structure_path)
@@ -1223,6 +1234,7 @@ def review_artifacts(
     # Events whose literal markers didn't match are judged by the model critic
     # (the draft may phrase or translate them differently), not blocked here.
     coverage_events_for_model: list[dict[str, Any]] = []
+    draft_positions = draft_marker_positions(reconstruction, required_events)
     for event in required_events:
         event_id = str(event.get("event_id") or "")
         label = required_event_label(event)
@@ -1232,7 +1244,7 @@ def review_artifacts(
                 findings.append({"severity": "blocker", "message": f"Missing required direct event in timeline: {label}"})
             elif not note_by_event_id.get(event_id, {}).get("evidence_snapshots"):
                 findings.append({"severity": "blocker", "message": f"Required event lacks fetched source evidence: {label}"})
-            elif markers and not text_contains_markers(reconstruction, markers):
+            elif markers and not text_contains_markers(reconstruction, markers, draft_positions):
                 coverage_events_for_model.append(
                     {
                         "event_id": event_id,
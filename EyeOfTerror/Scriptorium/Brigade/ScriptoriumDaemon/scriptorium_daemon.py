@@ -32,6 +32,7 @@ from scriptorium_model import (
     request_scriptorium_model_guidance,
     research_intent_from_worker_request,
 )  # noqa: E402
+from workspace_artifacts import load_json_artifact as load_workspace_json  # noqa: E402
 
 GuidanceFn = Callable[[str, dict[str, Any], str], dict[str, Any]]
 
@@ -79,11 +80,11 @@ def sibling_artifact(output_path: str, filename: str) -> str:
     return f"{parent}/{filename}"
 
 
-def load_json_artifact(workspace_root: Path, path: str) -> dict[str, Any]:
+def load_json_artifact(workspace_root: Path, path: str, lazy_text: bool = False) -> dict[str, Any]:
     host_path = sandbox_path(workspace_root, path)
     if not host_path.exists():
         raise FileNotFoundError(path)
-    payload = json.loads(host_path.read_text(encoding="utf-8"))
+    payload = load_workspace_json(host_path, lazy_text=lazy_text)
     if not isinstance(payload, dict):
         raise ValueError(f"artifact must be an object: {path}")
     return payload
@@ -93,7 +94,7 @@ def load_optional_json_artifact(workspace_root: Path, path: str) -> dict[str, An
     host_path = sandbox_path(workspace_root, path)
     if not host_path.exists():
         return {}
-    payload = json.loads(host_path.read_text(encoding="utf-8"))
+    payload = load_workspace_json(host_path)
     return payload if isinstance(payload, dict) else {}
 
 
@@ -940,7 +941,8 @@ def run(
     synthesis_plan_path = sibling_artifact(reconstruction_path, "synthesis_plan.json")
     try:
         source_map = load_json_artifact(workspace_root, source_path)
-        source_snapshots = load_json_artifact(workspace_root, source_snapshots_path)
+        # Only titles, status and counts are read here; snapshot texts stay in the sidecar.
+        source_snapshots = load_json_artifact(workspace_root, source_snapshots_path, lazy_text=True)
         notes = load_json_artifact(workspace_root, notes_path)
         timeline = load_optional_json_artifact(workspace_root, timeline_path)
         research_corpus = load_optional_json_artifact(workspace_root, research_corpus_path)
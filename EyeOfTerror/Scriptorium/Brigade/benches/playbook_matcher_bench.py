@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Evidence marker matching cost of NoosphericExtractor on large snapshot sets.
+
+Synthetic events carry playbook-style evidence markers (multi-word English
+and Russian phrases, some of them prefixes of others); synthetic snapshots are
+fetched pages with excerpts of the AuspexBrowser size, a share of which mention
+a few markers. ``legacy`` is the per-event loop that lowers every snapshot
+text and checks every marker with ``in``; ``matcher`` is ``extract_events``'
+path, one ``MarkerMatcher`` scan per snapshot. Both must return identical
+evidence for every event.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+BRIGADE_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BRIGADE_ROOT))
+sys.path.insert(0, str(BRIGADE_ROOT / "NoosphericExtractor"))
+
+import noospheric_extractor  # noqa: E402
+from noospheric_extractor import SnapshotMarkerHits, evidence_excerpt, evidence_item, snapshot_search_text  # noqa: E402
+from playbook_matcher import MarkerMatcher  # noqa: E402
+
+MODES = ("legacy", "matcher")
+WORDS = (
+    "legion", "warp", "fleet", "siege", "traitor", "primarch", "world", "daemon", "archive", "chapter",
+    "легион", "флот", "осада", "предатель", "примарх", "мир", "архив", "варп", "битва", "капитул",
+)
+
+
+def synthetic_markers(rng: random.Random, events: int, per_event: int) -> dict[str, list[str]]:
+    markers: dict[str, list[str]] = {}
+    for index in range(events):
+        base = " ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 3)))
+        markers[f"event_{index}"] = [f"{base} {index}", f"{base.title()} {index} aftermath"][:per_event] + [
+            f"Marker {index}-{item}" for item in range(max(0, per_event - 2))
+        ]
+    return markers
+
+
+def synthetic_snapshots(rng: random.Random, count: int, text_chars: int, markers: dict[str, list[str]]) -> dict[str, Any]:
+    flat = [marker for values in markers.values() for marker in values]
+    snapshots = []
+    for index in range(count):
+        words: list[str] = []
+        while sum(len(word) + 1 for word in words) < text_chars:
+            words.append(rng.choice(WORDS))
+        if index % 3 == 0:
+            for _ in range(3):
+                words.insert(rng.randrange(len(words)), rng.choice(flat))
+        snapshots.append({"source_title": f"Source {index}", "ok": index % 11 != 0, "text_excerpt": " ".join(words)})
+    return {"snapshots": snapshots}
+
+
+def legacy_evidence(markers: list[str], snapshots: dict[str, Any]) -> list[dict[str, Any]]:
+    """``snapshot_evidence`` as it ran before the shared matcher."""
+    evidence: list[dict[str, Any]] = []
+    for snapshot in snapshots.get("snapshots", []):
+        if not isinstance(snapshot, dict) or not snapshot.get("ok"):
+            continue
+        text = snapshot_search_text(snapshot)
+        lowered = text.lower()
+        matched = [marker for marker in markers if marker.lower() in lowered]
+        if matched:
+            evidence.append(evidence_item(snapshot, ", ".join(matched), evidence_excerpt(text, matched)))
+    return evidence
+
+
+def run_mode(mode: str, markers: dict[str, list[str]], snapshots: dict[str, Any]) -> dict[str, list[dict[str, Any]]]:
+    if mode == "legacy":
+        return {event_id: legacy_evidence(values, snapshots) for event_id, values in markers.items()}
+    hits = SnapshotMarkerHits(snapshots)
+    return {event_id: hits.evidence(values) for event_id, values in markers.items()}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--snapshots", type=int, default=400)
+    parser.add_argument("--text-chars", type=int, default=12_000, help="excerpt size per snapshot (AuspexBrowser keeps 12000)")
+    parser.add_argument("--events", type=int, default=120)
+    parser.add_argument("--markers-per-event", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report-json", default="")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    markers = synthetic_markers(rng, args.events, args.markers_per_event)
+    snapshots = synthetic_snapshots(rng, args.snapshots, args.text_chars, markers)
+    noospheric_extractor.EVENT_EVIDENCE_MARKERS = markers
+    noospheric_extractor.EVIDENCE_MATCHER = MarkerMatcher(marker for values in markers.values() for marker in values)
+    results = []
+    outputs: dict[str, Any] = {}
+    for mode in MODES:
+        latencies = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            outputs[mode] = run_mode(mode, markers, snapshots)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+        matched = sum(1 for evidence in outputs[mode].values() if evidence)
+        result = {
+            "mode": mode,
+            "snapshots": args.snapshots,
+            "events": args.events,
+            "markers": sum(len(values) for values in markers.values()),
+            "ms": round(statistics.median(latencies), 1),
+            "events_with_evidence": matched,
+        }
+        results.append(result)
+        print(f"{mode}: {result['ms']} ms for {result['events']} events x {result['snapshots']} snapshots, {matched} events with evidence", flush=True)
+    if outputs["legacy"] != outputs["matcher"]:
+        raise AssertionError("matcher evidence differs from the legacy per-event loop")
+    if args.report_json:
+        Path(args.report_json).write_text(json.dumps({"results": results}, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
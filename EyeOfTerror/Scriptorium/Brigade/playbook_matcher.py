@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Iterable
+
+
+def _trie_pattern(keys: list[str]) -> str:
+    """Regex for ``keys`` shaped as a character trie, longest match first.
+
+    A flat ``a|b|c`` alternation makes ``re`` try every marker at every
+    position; the trie form branches on one character per step, so the cost
+    per position is bounded by the trie depth actually matched, like an
+    Aho–Corasick walk but inside the C regex engine.
+    """
+    trie: dict[str, dict] = {}
+    for key in keys:
+        node = trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: dict[str, dict]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Greedy optional: the longer continuation is tried before ending here.
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class MarkerMatcher:
+    """Case-insensitive matcher for a fixed set of playbook markers.
+
+    All markers compile into one trie-shaped regex, so a single pass over the
+    text reports the longest marker starting at every position; markers
+    that are prefixes of it are reported at the same position. The result
+    is every occurrence of every marker, with the same ``str.lower``
+    semantics as the ``marker.lower() in text.lower()`` checks it replaces.
+    Keys of the results are lowered markers.
+    """
+
+    def __init__(self, markers: Iterable[str]) -> None:
+        self.originals: dict[str, list[str]] = {}
+        for marker in markers:
+            key = str(marker).lower()
+            self.originals.setdefault(key, [])
+            if str(marker) not in self.originals[key]:
+                self.originals[key].append(str(marker))
+        # "" is a substring of everything, exactly as in the plain ``in`` checks.
+        self.always = "" in self.originals
+        keys = sorted((key for key in self.originals if key), key=lambda key: (-len(key), key))
+        self._prefixes = {key: [other for other in keys if key.startswith(other)] for key in keys}
+        self._pattern = re.compile(_trie_pattern(keys)) if keys else None
+
+    def positions(self, lowered: str) -> dict[str, list[int]]:
+        """Every start position of every marker in an already lowered text."""
+        found: dict[str, list[int]] = {"": [0]} if self.always else {}
+        if self._pattern is None:
+            return found
+        # search() rather than finditer(): restarting one character after each
+        # hit keeps overlapping occurrences, and a pattern that starts with a
+        # plain character branch lets re skip non-candidate positions in C.
+        search = self._pattern.search
+        match = search(lowered)
+        while match is not None:
+            start = match.start()
+            for key in self._prefixes[match.group()]:
+                found.setdefault(key, []).append(start)
+            match = search(lowered, start + 1)
+        return found
+
+    def first_positions(self, lowered: str) -> dict[str, int]:
+        return {key: spots[0] for key, spots in self.positions(lowered).items()}
+
+    def found(self, lowered: str) -> set[str]:
+        return set(self.positions(lowered))
+
+    def any(self, lowered: str) -> bool:
+        return self.always or bool(self._pattern is not None and self._pattern.search(lowered))
+
+
+@lru_cache(maxsize=256)
+def term_matcher(terms: tuple[str, ...]) -> MarkerMatcher:
+    """Shared compiled matcher for one playbook's ``match_terms``."""
+    return MarkerMatcher(terms)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+BRIGADE_ROOT = Path(__file__).resolve().parent
+if str(BRIGADE_ROOT) not in sys.path:
+    sys.path.insert(0, str(BRIGADE_ROOT))
+
+from playbook_matcher import MarkerMatcher, term_matcher  # noqa: E402
+
+
+def naive_positions(lowered: str, markers: list[str]) -> dict[str, list[int]]:
+    found: dict[str, list[int]] = {}
+    for key in {marker.lower() for marker in markers}:
+        start = lowered.find(key)
+        while start >= 0:
+            found.setdefault(key, []).append(start)
+            start = lowered.find(key, start + 1) if key else -1
+    return {key: sorted(value) for key, value in found.items()}
+
+
+def main() -> int:
+    matcher = MarkerMatcher(["Skalathrax", "skalathrax massacre", "Kharn", "Khârn", "арх", "Скалатракс", "a.b", "aa"])
+    text = "The Skalathrax massacre: Kharn and Khârn. Скалатракс, архив, a.b axb aaa".lower()
+    positions = matcher.positions(text)
+    if positions != naive_positions(text, ["Skalathrax", "skalathrax massacre", "Kharn", "Khârn", "арх", "Скалатракс", "a.b", "aa"]):
+        raise AssertionError(f"matcher missed prefix, overlapping or escaped markers: {positions}")
+    if matcher.originals["skalathrax"] != ["Skalathrax"] or "a.b" in matcher.found("axb"):
+        raise AssertionError("matcher keys or regex escaping are wrong")
+    if not MarkerMatcher(["", "absent"]).any("text") or MarkerMatcher([]).any("text") or MarkerMatcher(["absent"]).found("text"):
+        raise AssertionError("empty-marker semantics differ from substring checks")
+    if term_matcher(("Istvaan",)) is not term_matcher(("Istvaan",)) or not term_matcher(("Istvaan",)).any("istvaan iii"):
+        raise AssertionError("playbook term matchers are not shared")
+
+    rng = random.Random(7)
+    alphabet = "abcа б"
+    for _round in range(200):
+        markers = ["".join(rng.choice(alphabet) for _ in range(rng.randint(1, 4))) for _ in range(rng.randint(1, 8))]
+        haystack = "".join(rng.choice(alphabet + "ABC") for _ in range(rng.randint(0, 60))).lower()
+        if MarkerMatcher(markers).positions(haystack) != naive_positions(haystack, markers):
+            raise AssertionError(f"matcher disagrees with substring search: {markers!r} in {haystack!r}")
+    print("[ok] Scriptorium playbook matcher")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
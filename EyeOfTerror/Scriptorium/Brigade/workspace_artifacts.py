@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+# JSON artifacts at least this large get a binary sidecar next to them:
+# ``.<name>.sidecar`` = magic, skeleton length, the artifact as compact JSON
+# with every long string replaced by a reference, then those strings back to
+# back as UTF-8. Readers parse the small skeleton and slice texts out of a
+# memory map instead of re-parsing tens of MB of JSON per worker.
+SIDECAR_MIN_BYTES = int(os.environ.get("SCRIPTORIUM_ARTIFACT_SIDECAR_MIN_BYTES", str(256 * 1024)))
+COLUMN_TEXT_MIN_CHARS = 1024
+SIDECAR_MAGIC = b"SCRIPTORIUM-ARTIFACT\x01\n"
+SIDECAR_VERSION = 1
+TEXT_REF_KEY = "$artifact_text"
+
+
+class ArtifactText:
+    """A long artifact string that is decoded from the sidecar only when used.
+
+    ``str()`` gives the text; truthiness, ``len``, comparison, slicing,
+    ``in`` and the usual ``str`` methods behave like the decoded string.
+    """
+
+    __slots__ = ("_buffer", "_offset", "_size", "_chars", "_text")
+
+    def __init__(self, buffer: mmap.mmap, offset: int, size: int, chars: int) -> None:
+        self._buffer = buffer
+        self._offset = offset
+        self._size = size
+        self._chars = chars
+        self._text: str | None = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = self._buffer[self._offset : self._offset + self._size].decode("utf-8")
+        return self._text
+
+    def __repr__(self) -> str:
+        return f"ArtifactText({self._chars} chars)"
+
+    def __len__(self) -> int:
+        return self._chars
+
+    def __bool__(self) -> bool:
+        return self._chars > 0
+
+    def __eq__(self, other: object) -> bool:
+        return str(self) == (str(other) if isinstance(other, ArtifactText) else other)
+
+    def __hash__(self) -> int:
+        return hash(str(self))
+
+    def __getitem__(self, index: Any) -> str:
+        return str(self)[index]
+
+    def __contains__(self, item: str) -> bool:
+        return item in str(self)
+
+    def __add__(self, other: str) -> str:
+        return str(self) + other
+
+    def __radd__(self, other: str) -> str:
+        return other + str(self)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(str(self), name)
+
+
+def sidecar_path(host_path: Path) -> Path:
+    return host_path.with_name(f".{host_path.name}.sidecar")
+
+
+def _split_texts(value: Any, texts: list[bytes], offset: list[int]) -> Any:
+    if isinstance(value, dict):
+        return {key: _split_texts(item, texts, offset) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_split_texts(item, texts, offset) for item in value]
+    if isinstance(value, str) and len(value) >= COLUMN_TEXT_MIN_CHARS:
+        encoded = value.encode("utf-8")
+        ref = {TEXT_REF_KEY: [offset[0], len(encoded), len(value)]}
+        texts.append(encoded)
+        offset[0] += len(encoded)
+        return ref
+    return value
+
+
+def _join_texts(value: Any, buffer: mmap.mmap, base: int, lazy_text: bool) -> Any:
+    if isinstance(value, dict):
+        ref = value.get(TEXT_REF_KEY) if len(value) == 1 else None
+        if isinstance(ref, list) and len(ref) == 3:
+            offset, size, chars = (int(item) for item in ref)
+            if lazy_text:
+                return ArtifactText(buffer, base + offset, size, chars)
+            return buffer[base + offset : base + offset + size].decode("utf-8")
+        return {key: _join_texts(item, buffer, base, lazy_text) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_join_texts(item, buffer, base, lazy_text) for item in value]
+    return value
+
+
+def write_sidecar(host_path: Path, payload: Any) -> Path:
+    """Write the sidecar for ``payload``, the current content of ``host_path``."""
+    stat = host_path.stat()
+    texts: list[bytes] = []
+    skeleton = {
+        "version": SIDECAR_VERSION,
+        "source": {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns},
+        "payload": _split_texts(payload, texts, [0]),
+    }
+    encoded = json.dumps(skeleton, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    target = sidecar_path(host_path)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{host_path.name}-", suffix=".tmp", dir=host_path.parent)
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(SIDECAR_MAGIC)
+            handle.write(struct.pack(">Q", len(encoded)))
+            handle.write(encoded)
+            for item in texts:
+                handle.write(item)
+        os.replace(temp_name, target)
+    except BaseException:
+        Path(temp_name).unlink(missing_ok=True)
+        raise
+    return target
+
+
+def _read_sidecar(host_path: Path, lazy_text: bool) -> Any:
+    """Payload from a sidecar that still matches ``host_path``, else None."""
+    target = sidecar_path(host_path)
+    try:
+        stat = host_path.stat()
+        with target.open("rb") as handle:
+            if os.fstat(handle.fileno()).st_size <= len(SIDECAR_MAGIC) + 8:
+                return None
+            buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    header = len(SIDECAR_MAGIC)
+    if buffer[:header] != SIDECAR_MAGIC:
+        buffer.close()
+        return None
+    (length,) = struct.unpack(">Q", buffer[header : header + 8])
+    try:
+        skeleton = json.loads(buffer[header + 8 : header + 8 + length].decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):
+        buffer.close()
+        return None
+    source = skeleton.get("source") if isinstance(skeleton, dict) else None
+    if skeleton.get("version") != SIDECAR_VERSION or source != {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}:
+        buffer.close()
+        return None
+    payload = _join_texts(skeleton.get("payload"), buffer, header + 8 + length, lazy_text)
+    if not lazy_text:
+        buffer.close()
+    return payload
+
+
+def load_json_artifact(host_path: Path, *, lazy_text: bool = False) -> Any:
+    """Parse a workspace JSON artifact, through its sidecar when it is large.
+
+    With ``lazy_text`` long strings come back as ``ArtifactText`` handles and
+    are only decoded when a caller reads them; leave it off for payloads that
+    are re-serialized with ``json.dumps``. A missing or stale sidecar is
+    rebuilt from the JSON, so artifacts written by any producer work.
+    """
+    payload = _read_sidecar(host_path, lazy_text)
+    if payload is not None:
+        return payload
+    text = host_path.read_text(encoding="utf-8")
+    payload = json.loads(text)
+    if len(text) >= SIDECAR_MIN_BYTES:
+        try:
+            write_sidecar(host_path, payload)
+        except OSError:
+            pass
+    return payload
+
+
+def write_json_artifact(host_path: Path, payload: Any) -> None:
+    """Write a JSON artifact in the workspace layout, plus its sidecar when large."""
+    host_path.parent.mkdir(parents=True, exist_ok=True)
+    text = json.dumps(payload, ensure_ascii=False, indent=2) + "\n"
+    host_path.write_text(text, encoding="utf-8")
+    if len(text) >= SIDECAR_MIN_BYTES:
+        write_sidecar(host_path, payload)
+    else:
+        sidecar_path(host_path).unlink(missing_ok=True)
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+BRIGADE_ROOT = Path(__file__).resolve().parent
+if str(BRIGADE_ROOT) not in sys.path:
+    sys.path.insert(0, str(BRIGADE_ROOT))
+
+from workspace_artifacts import ArtifactText, load_json_artifact, sidecar_path, write_json_artifact  # noqa: E402
+
+
+def snapshots_payload(count: int) -> dict:
+    return {
+        "topic": "Скалатракс",
+        "snapshots": [
+            {
+                "source_title": f"Source {index}",
+                "ok": index % 5 != 0,
+                "text_excerpt": f"Глава {index}. " + "Легион сжёг мир Скалатракс. " * 400,
+                "note": "short",
+            }
+            for index in range(count)
+        ],
+    }
+
+
+def main() -> int:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        payload = snapshots_payload(40)
+        host_path = root / "skalathrax" / "source_snapshots.json"
+        write_json_artifact(host_path, payload)
+        if json.loads(host_path.read_text(encoding="utf-8")) != payload or not sidecar_path(host_path).exists():
+            raise AssertionError("large artifact was not written as JSON plus sidecar")
+        if load_json_artifact(host_path) != payload:
+            raise AssertionError("sidecar load does not reproduce the JSON artifact")
+        lazy = load_json_artifact(host_path, lazy_text=True)
+        text = lazy["snapshots"][3]["text_excerpt"]
+        expected = payload["snapshots"][3]["text_excerpt"]
+        if not isinstance(text, ArtifactText) or len(text) != len(expected) or text._text is not None:
+            raise AssertionError(f"lazy load decoded snapshot text eagerly: {text!r}")
+        if str(text) != expected or text != expected or "Скалатракс" not in text or text.lower() != expected.lower() or text[:6] != expected[:6]:
+            raise AssertionError("lazy snapshot text does not behave like the stored string")
+        if lazy["snapshots"][3]["note"] != "short" or json.loads(json.dumps(lazy, ensure_ascii=False, default=str)) != payload:
+            raise AssertionError("lazy artifact does not serialize back to the stored payload")
+
+        payload["snapshots"][0]["text_excerpt"] = "rewritten by a producer that knows nothing about sidecars " * 30
+        host_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+        os.utime(host_path, ns=(1, 1))
+        if load_json_artifact(host_path, lazy_text=True)["snapshots"][0]["text_excerpt"] != payload["snapshots"][0]["text_excerpt"]:
+            raise AssertionError("stale sidecar was used after the JSON artifact changed")
+        if str(load_json_artifact(host_path, lazy_text=True)["snapshots"][0]["text_excerpt"]) != payload["snapshots"][0]["text_excerpt"]:
+            raise AssertionError("sidecar was not rebuilt from the changed JSON artifact")
+
+        small_path = root / "skalathrax" / "timeline.json"
+        write_json_artifact(small_path, {"timeline": [{"event_id": "fall"}]})
+        if sidecar_path(small_path).exists() or load_json_artifact(small_path) != {"timeline": [{"event_id": "fall"}]}:
+            raise AssertionError("small artifact should be plain JSON without a sidecar")
+    print("[ok] Scriptorium workspace artifacts")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
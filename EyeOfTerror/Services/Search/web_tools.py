@@ -1,15 +1,23 @@
 from __future__ import annotations
 
+import codecs
+import hashlib
 import html
 import io
 import ipaddress
 import json
 import os
+import re
 import socket
+import threading
+import time
+import uuid
 import zipfile
 from html.parser import HTMLParser
-from typing import Any, Callable, Protocol
-from urllib.parse import parse_qs, quote, urlencode, urlparse
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Protocol
+from urllib.error import HTTPError
+from urllib.parse import parse_qs, parse_qsl, quote, urlencode, urlparse, urlunparse
 from urllib.request import HTTPRedirectHandler, Request, build_opener
 
 class WebConfig(Protocol):
@@ -25,6 +33,19 @@ WEB_USER_AGENT = os.environ.get(
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124.0 Safari/537.36",
 )
 WEB_ACCEPT_LANGUAGE = os.environ.get("SHUSHUNYA_SEARCH_WEB_ACCEPT_LANGUAGE", "ru,en;q=0.9")
+WEB_CACHE_DIR = os.environ.get(
+    "SHUSHUNYA_SEARCH_WEB_CACHE_DIR",
+    str(Path.home() / ".cache" / "shushunya" / "web_fetch"),
+).strip()
+WEB_CACHE_FRESH_SECONDS = float(os.environ.get("SHUSHUNYA_SEARCH_WEB_CACHE_FRESH_SECONDS", "300"))
+WEB_CACHE_MAX_AGE_SECONDS = float(os.environ.get("SHUSHUNYA_SEARCH_WEB_CACHE_MAX_AGE_SECONDS", str(7 * 24 * 3600)))
+# Total size of cached bodies and metadata; least recently used entries go first. 0 = unbounded.
+WEB_CACHE_MAX_BYTES = int(os.environ.get("SHUSHUNYA_SEARCH_WEB_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+# Files this recent are never pruned: a concurrent fetch may be streaming into or reading them.
+WEB_CACHE_PRUNE_GRACE_SECONDS = 120
+WEB_READ_CHUNK_BYTES = 65536
+WEB_SNIFF_BYTES = 4096
+RENDER_HINT_CHARS = 100000
 
 
 def truncate(value: str, max_chars: int) -> str:
@@ -193,15 +214,29 @@ class SearxngRedirectHandler(HTTPRedirectHandler):
         return super().redirect_request(req, fp, code, msg, headers, newurl)
 
 
+# Openers hold no per-request state, so one instance is shared by every call.
+WEB_OPENER = build_opener(SafeRedirectHandler)
+SEARXNG_OPENER = build_opener(SearxngRedirectHandler)
+
+
 class WebTextExtractor(HTMLParser):
+    """HTML-to-text extractor that may be fed the document in arbitrary chunks.
+
+    ``HTMLParser`` can split one text node across several ``handle_data``
+    calls when input arrives incrementally, so data is coalesced until the
+    next markup event and the result matches a single full-document feed.
+    """
+
     def __init__(self) -> None:
         super().__init__()
         self.skip_depth = 0
         self.title_depth = 0
         self.title_parts: list[str] = []
         self.text_parts: list[str] = []
+        self._pending_data: list[str] = []
 
     def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._flush_data()
         tag = tag.lower()
         if tag in {"script", "style", "noscript", "svg"}:
             self.skip_depth += 1
@@ -211,6 +246,7 @@ class WebTextExtractor(HTMLParser):
             self.text_parts.append("\n")
 
     def handle_endtag(self, tag: str) -> None:
+        self._flush_data()
         tag = tag.lower()
         if tag in {"script", "style", "noscript", "svg"} and self.skip_depth > 0:
             self.skip_depth -= 1
@@ -218,6 +254,25 @@ class WebTextExtractor(HTMLParser):
             self.title_depth -= 1
 
     def handle_data(self, data: str) -> None:
+        self._pending_data.append(data)
+
+    def handle_comment(self, data: str) -> None:
+        self._flush_data()
+
+    def handle_decl(self, decl: str) -> None:
+        self._flush_data()
+
+    def handle_pi(self, data: str) -> None:
+        self._flush_data()
+
+    def unknown_decl(self, data: str) -> None:
+        self._flush_data()
+
+    def _flush_data(self) -> None:
+        if not self._pending_data:
+            return
+        data = "".join(self._pending_data)
+        self._pending_data = []
         if self.skip_depth:
             return
         text = html.unescape(data).strip()
@@ -228,13 +283,14 @@ class WebTextExtractor(HTMLParser):
         self.text_parts.append(text)
 
     def result(self) -> tuple[str, str]:
+        self._flush_data()
         title = " ".join(" ".join(self.title_parts).split())
         text = "\n".join(line for line in (" ".join(self.text_parts).split("\n")) if line.strip())
         return title, " ".join(text.split())
 
 
 def html_render_hint(raw_html: str, extracted_text: str) -> str:
-    sample = raw_html[:100000].lower()
+    sample = raw_html[:RENDER_HINT_CHARS].lower()
     text_len = len(" ".join(extracted_text.split()))
     script_count = sample.count("<script")
     spa_markers = (
@@ -379,7 +435,7 @@ def web_search_brave(query: str, limit: int) -> dict[str, Any]:
             "X-Subscription-Token": BRAVE_SEARCH_API_KEY,
         },
     )
-    with build_opener(SafeRedirectHandler).open(request, timeout=20) as response:
+    with WEB_OPENER.open(request, timeout=20) as response:
         data, truncated = read_limited_response(response, 500000)
         payload = json.loads(data.decode("utf-8", errors="replace"))
     raw_results = payload.get("web", {}).get("results", [])
@@ -397,7 +453,7 @@ def web_search_searxng(query: str, limit: int) -> dict[str, Any]:
     url = SEARXNG_URL + "/search?" + urlencode({"q": query, "format": "json", "language": "auto"})
     validate_configured_searxng_url(url)
     request = Request(url, headers={"User-Agent": WEB_USER_AGENT, "Accept": "application/json", "X-Real-IP": "127.0.0.1"})
-    with build_opener(SearxngRedirectHandler).open(request, timeout=25) as response:
+    with SEARXNG_OPENER.open(request, timeout=25) as response:
         validate_configured_searxng_url(response.geturl())
         data, truncated = read_limited_response(response, 600000)
         payload = json.loads(data.decode("utf-8", errors="replace"))
@@ -413,7 +469,7 @@ def web_search_marginalia(query: str, limit: int) -> dict[str, Any]:
     url = "https://api.marginalia.nu/public/search/" + quote(query, safe="")
     validate_public_url(url)
     request = Request(url, headers={"User-Agent": WEB_USER_AGENT, "Accept": "application/json"})
-    with build_opener(SafeRedirectHandler).open(request, timeout=25) as response:
+    with WEB_OPENER.open(request, timeout=25) as response:
         data, truncated = read_limited_response(response, 600000)
         payload = json.loads(data.decode("utf-8", errors="replace"))
     results = []
@@ -435,7 +491,7 @@ def web_search_duckduckgo(query: str, limit: int) -> dict[str, Any]:
             "Accept-Language": WEB_ACCEPT_LANGUAGE,
         },
     )
-    with build_opener(SafeRedirectHandler).open(request, timeout=25) as response:
+    with WEB_OPENER.open(request, timeout=25) as response:
         final_url = response.geturl()
         validate_public_url(final_url)
         data, truncated = read_limited_response(response, 600000)
@@ -457,7 +513,7 @@ def web_search_wikipedia(query: str, limit: int) -> dict[str, Any]:
     )
     validate_public_url(wiki_url)
     request = Request(wiki_url, headers={"User-Agent": WEB_USER_AGENT, "Accept": "application/json"})
-    with build_opener(SafeRedirectHandler).open(request, timeout=20) as response:
+    with WEB_OPENER.open(request, timeout=20) as response:
         data, truncated = read_limited_response(response, 200000)
         payload = json.loads(data.decode("utf-8", errors="replace"))
     titles = payload[1] if len(payload) > 1 and isinstance(payload[1], list) else []
@@ -473,75 +529,410 @@ def web_search_wikipedia(query: str, limit: int) -> dict[str, Any]:
     return {"ok": True, "provider": "wikipedia_opensearch", "results": dedupe_results(results, limit), "truncated": truncated}
 
 
-def web_fetch(config: WebConfig, url: str, max_bytes: int | None = None) -> dict[str, Any]:
-    max_bytes = max(1024, min(int(max_bytes or MAX_WEB_BYTES), 1000000))
-    validate_public_url(url)
-    opener = build_opener(SafeRedirectHandler)
-    request = Request(
-        url,
-        headers={
-            "User-Agent": WEB_USER_AGENT,
-            "Accept": "text/html,text/plain,application/json;q=0.8,*/*;q=0.2",
-            "Accept-Language": WEB_ACCEPT_LANGUAGE,
-        },
-    )
-    with opener.open(request, timeout=30) as response:
-        final_url = response.geturl()
-        validate_public_url(final_url)
-        data, truncated = read_limited_response(response, max_bytes)
-        content_type = response.headers.get("Content-Type", "")
-        final_url_lower = final_url.lower()
-        if "epub" in content_type.lower() or final_url_lower.endswith(".epub"):
+def normalize_cache_url(raw_url: str) -> str:
+    parsed = urlparse(str(raw_url).strip())
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if ":" in host:
+        host = f"[{host}]"
+    port = parsed.port
+    netloc = host if port in {None, 443 if scheme == "https" else 80} else f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, netloc, parsed.path or "/", "", query, ""))
+
+
+def web_cache_meta_path(url: str) -> Path | None:
+    if not WEB_CACHE_DIR:
+        return None
+    key = hashlib.sha256(normalize_cache_url(url).encode("utf-8")).hexdigest()
+    return Path(WEB_CACHE_DIR).expanduser() / key[:2] / f"{key}.json"
+
+
+def load_web_cache_entry(meta_path: Path, max_bytes: int) -> dict[str, Any] | None:
+    """Return a cache entry whose stored body can answer a ``max_bytes`` fetch."""
+    try:
+        entry = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("version") != 1:
+        return None
+    if time.time() - float(entry.get("stored_at") or 0) > WEB_CACHE_MAX_AGE_SECONDS:
+        return None
+    if entry.get("truncated") and int(entry.get("bytes_read") or 0) < max_bytes:
+        return None
+    return entry
+
+
+def open_web_cache_body(meta_path: Path, entry: dict[str, Any]) -> BinaryIO | None:
+    # The handle stays valid even if a concurrent writer replaces the entry.
+    try:
+        return (meta_path.parent / str(entry.get("body_file") or "")).open("rb")
+    except OSError:
+        return None
+
+
+def web_cache_entry_fresh(entry: dict[str, Any]) -> bool:
+    cache_control = str(entry.get("cache_control") or "").lower()
+    if "no-cache" in cache_control:
+        return False
+    window = WEB_CACHE_FRESH_SECONDS
+    max_age = re.search(r"max-age=(\d+)", cache_control)
+    if max_age:
+        window = min(window, float(max_age.group(1)))
+    age = time.time() - float(entry.get("stored_at") or 0)
+    return 0 <= age < window
+
+
+def write_web_cache_meta(meta_path: Path, entry: dict[str, Any]) -> None:
+    temp_path = meta_path.with_name(f"{meta_path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        temp_path.write_text(json.dumps(entry, ensure_ascii=False), encoding="utf-8")
+        os.replace(temp_path, meta_path)
+    except OSError:
+        temp_path.unlink(missing_ok=True)
+
+
+def refresh_web_cache_entry(meta_path: Path, entry: dict[str, Any], headers: Any) -> None:
+    refreshed = dict(entry)
+    refreshed["stored_at"] = time.time()
+    for field, header in (("etag", "ETag"), ("last_modified", "Last-Modified"), ("cache_control", "Cache-Control")):
+        value = headers.get(header) if headers is not None else None
+        if value:
+            refreshed[field] = value
+    write_web_cache_meta(meta_path, refreshed)
+
+
+def touch_web_cache_entry(meta_path: Path) -> None:
+    """Mark an entry as recently used; eviction goes by metadata mtime."""
+    try:
+        os.utime(meta_path)
+    except OSError:
+        pass
+
+
+def _remove_web_cache_files(paths: list[Path]) -> int:
+    freed = 0
+    for path in paths:
+        try:
+            size = path.stat().st_size
+            path.unlink()
+        except OSError:
+            continue
+        freed += size
+    return freed
+
+
+def prune_web_cache(cache_dir: str | Path | None = None) -> int:
+    """Drop expired entries, orphaned bodies and, over ``WEB_CACHE_MAX_BYTES``,
+    the least recently used entries; returns the bytes freed."""
+    root = Path(cache_dir or WEB_CACHE_DIR).expanduser()
+    now = time.time()
+    cutoff = now - WEB_CACHE_PRUNE_GRACE_SECONDS
+    live: list[tuple[float, int, list[Path]]] = []
+    referenced: set[Path] = set()
+    total = 0
+    freed = 0
+    for meta_path in root.glob("*/*.json"):
+        try:
+            stat = meta_path.stat()
+            entry = json.loads(meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        paths = [meta_path]
+        size = stat.st_size
+        if isinstance(entry, dict) and entry.get("body_file"):
+            body_path = meta_path.parent / str(entry["body_file"])
+            referenced.add(body_path)
             try:
-                title, epub_text = extract_epub_text(data)
-            except (zipfile.BadZipFile, OSError, RuntimeError) as exc:
-                return {
-                    "ok": False,
-                    "url": final_url,
-                    "status": getattr(response, "status", 200),
-                    "content_type": content_type,
-                    "truncated": truncated,
-                    "bytes_read": len(data),
-                    "error": f"EPUB extraction failed: {exc}",
-                }
-            return {
-                "ok": True,
-                "url": final_url,
-                "status": getattr(response, "status", 200),
-                "content_type": content_type,
-                "encoding": "epub",
-                "title": title,
-                "truncated": truncated,
-                "bytes_read": len(data),
-                "is_binary": False,
-                "text": truncate(epub_text.strip(), config.max_tool_output_chars),
-                "text_note": "EPUB container extracted into text from HTML/XHTML members",
+                size += body_path.stat().st_size
+                paths.append(body_path)
+            except OSError:
+                pass
+        if not isinstance(entry, dict) or now - float(entry.get("stored_at") or 0) > WEB_CACHE_MAX_AGE_SECONDS:
+            freed += _remove_web_cache_files(paths)
+            continue
+        live.append((stat.st_mtime, size, paths))
+        total += size
+    # Bodies and temp files no entry points at are left by superseded or interrupted writers.
+    for pattern in ("*/*.body", "*/*.tmp"):
+        for path in root.glob(pattern):
+            try:
+                stale = path not in referenced and path.stat().st_mtime < cutoff
+            except OSError:
+                continue
+            if stale:
+                freed += _remove_web_cache_files([path])
+    if WEB_CACHE_MAX_BYTES <= 0 or total <= WEB_CACHE_MAX_BYTES:
+        return freed
+    # Stop below the budget so the next few writes do not prune again.
+    target = int(WEB_CACHE_MAX_BYTES * 0.9)
+    for mtime, size, paths in sorted(live, key=lambda item: item[0]):
+        if total <= target or mtime > cutoff:
+            break
+        freed += _remove_web_cache_files(paths)
+        total -= size
+    return freed
+
+
+class WebCacheBudget:
+    """Prunes the fetch cache once a tenth of its budget has been written.
+
+    The first write of a process always prunes, so a cache left over budget
+    (or full of expired entries) is trimmed without walking it at import time.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._written: int | None = None
+
+    def note_write(self, size: int) -> None:
+        step = max(1, WEB_CACHE_MAX_BYTES // 10) if WEB_CACHE_MAX_BYTES > 0 else 64 * 1024 * 1024
+        with self._lock:
+            self._written = step if self._written is None else self._written + size
+            due = self._written >= step
+            if due:
+                self._written = 0
+        if due:
+            prune_web_cache()
+
+
+WEB_CACHE_BUDGET = WebCacheBudget()
+
+
+class WebCacheWriter:
+    """Tees a response body into a uniquely named cache file and publishes it atomically."""
+
+    def __init__(self, meta_path: Path, entry: dict[str, Any]) -> None:
+        self.meta_path = meta_path
+        self.entry = entry
+        self.body_path = meta_path.with_name(f"{meta_path.stem}.{uuid.uuid4().hex}.body")
+        self.handle: BinaryIO | None = None
+        self.committed = False
+        try:
+            meta_path.parent.mkdir(parents=True, exist_ok=True)
+            self.handle = self.body_path.open("wb")
+        except OSError:
+            self.handle = None
+
+    def write(self, chunk: bytes) -> None:
+        if self.handle is None:
+            return
+        try:
+            self.handle.write(chunk)
+        except OSError:
+            self.discard()
+
+    def commit(self, body: "LimitedBodyReader") -> None:
+        if self.handle is None or not body.eof:
+            return
+        try:
+            self.handle.close()
+        except OSError:
+            self.discard()
+            return
+        self.handle = None
+        try:
+            previous = json.loads(self.meta_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            previous = {}
+        entry = dict(self.entry)
+        entry.update(
+            {
+                "body_file": self.body_path.name,
+                "bytes_read": body.bytes_read,
+                "truncated": body.truncated,
+                "stored_at": time.time(),
             }
-        if not is_textual_content(content_type, data):
+        )
+        write_web_cache_meta(self.meta_path, entry)
+        self.committed = True
+        previous_body = previous.get("body_file") if isinstance(previous, dict) else None
+        if previous_body and previous_body != self.body_path.name:
+            (self.meta_path.parent / str(previous_body)).unlink(missing_ok=True)
+        WEB_CACHE_BUDGET.note_write(body.bytes_read)
+
+    def discard(self) -> None:
+        if self.committed:
+            return
+        if self.handle is not None:
+            try:
+                self.handle.close()
+            except OSError:
+                pass
+            self.handle = None
+        self.body_path.unlink(missing_ok=True)
+
+
+def open_web_cache_writer(meta_path: Path | None, url: str, final_url: str, response: Any) -> WebCacheWriter | None:
+    if meta_path is None or getattr(response, "status", 200) != 200:
+        return None
+    cache_control = response.headers.get("Cache-Control", "") or ""
+    if "no-store" in cache_control.lower():
+        return None
+    entry = {
+        "version": 1,
+        "url": normalize_cache_url(url),
+        "final_url": final_url,
+        "status": getattr(response, "status", 200),
+        "content_type": response.headers.get("Content-Type", ""),
+        "charset": response.headers.get_content_charset(),
+        "etag": response.headers.get("ETag", ""),
+        "last_modified": response.headers.get("Last-Modified", ""),
+        "cache_control": cache_control,
+    }
+    writer = WebCacheWriter(meta_path, entry)
+    return writer if writer.handle is not None else None
+
+
+class LimitedBodyReader:
+    """Chunked body reader with the same limit semantics as ``read_limited_response``."""
+
+    def __init__(
+        self,
+        read: Callable[[int], bytes],
+        max_bytes: int,
+        source_truncated: bool = False,
+        sink: WebCacheWriter | None = None,
+    ) -> None:
+        self._read = read
+        self.max_bytes = max_bytes
+        self.source_truncated = source_truncated
+        self.sink = sink
+        self.bytes_read = 0
+        self.truncated = False
+        self.eof = False
+
+    def read_chunk(self) -> bytes:
+        if self.eof:
+            return b""
+        remaining = self.max_bytes - self.bytes_read
+        if remaining <= 0:
+            self.truncated = bool(self._read(1)) or self.source_truncated
+            self.eof = True
+            return b""
+        chunk = self._read(min(WEB_READ_CHUNK_BYTES, remaining))
+        if not chunk:
+            self.truncated = self.source_truncated
+            self.eof = True
+            return b""
+        self.bytes_read += len(chunk)
+        if self.sink is not None:
+            self.sink.write(chunk)
+        return chunk
+
+    def __iter__(self) -> Any:
+        while True:
+            chunk = self.read_chunk()
+            if not chunk:
+                return
+            yield chunk
+
+    def read_head(self, size: int) -> bytes:
+        parts: list[bytes] = []
+        total = 0
+        while total < size:
+            chunk = self.read_chunk()
+            if not chunk:
+                break
+            parts.append(chunk)
+            total += len(chunk)
+        return b"".join(parts)
+
+    def read_rest(self) -> bytes:
+        return b"".join(self)
+
+    def drain(self) -> None:
+        for _ in self:
+            pass
+
+
+def web_text_decoder(charset: str | None) -> tuple[Any, str]:
+    encoding = charset or "utf-8"
+    try:
+        return codecs.getincrementaldecoder(encoding)(errors="replace"), encoding
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace"), "utf-8"
+
+
+def web_fetch_payload(
+    config: WebConfig,
+    body: LimitedBodyReader,
+    final_url: str,
+    status: int,
+    content_type: str,
+    charset: str | None,
+) -> dict[str, Any]:
+    """Build the web_fetch payload while consuming ``body`` chunk by chunk.
+
+    HTML is streamed through ``WebTextExtractor`` as it arrives; only JSON,
+    EPUB and plain-text bodies are materialized in full.
+    """
+    head = body.read_head(WEB_SNIFF_BYTES)
+    base = {"ok": True, "url": final_url, "status": status, "content_type": content_type}
+    if "epub" in content_type.lower() or final_url.lower().endswith(".epub"):
+        data = head + body.read_rest()
+        try:
+            title, epub_text = extract_epub_text(data)
+        except (zipfile.BadZipFile, OSError, RuntimeError) as exc:
             return {
-                "ok": True,
-                "url": final_url,
-                "status": getattr(response, "status", 200),
-                "content_type": content_type,
-                "truncated": truncated,
-                "bytes_read": len(data),
-                "is_binary": True,
-                "text": "",
-                "note": "binary response was not decoded into model context",
+                **base,
+                "ok": False,
+                "truncated": body.truncated,
+                "bytes_read": body.bytes_read,
+                "error": f"EPUB extraction failed: {exc}",
             }
-        text, charset = decode_web_text(data, response.headers.get_content_charset())
-        title = ""
+        return {
+            **base,
+            "encoding": "epub",
+            "title": title,
+            "truncated": body.truncated,
+            "bytes_read": body.bytes_read,
+            "is_binary": False,
+            "text": truncate(epub_text.strip(), config.max_tool_output_chars),
+            "text_note": "EPUB container extracted into text from HTML/XHTML members",
+        }
+    if not is_textual_content(content_type, head):
+        body.drain()
+        return {
+            **base,
+            "truncated": body.truncated,
+            "bytes_read": body.bytes_read,
+            "is_binary": True,
+            "text": "",
+            "note": "binary response was not decoded into model context",
+        }
+    decoder, charset = web_text_decoder(charset)
+    text = decoder.decode(head)
+    title = ""
+    stream_html = (
+        "json" not in content_type.lower()
+        and text.strip() != ""
+        and not text.lstrip().startswith(("{", "["))
+        and (body.eof or len(text) >= 500)
+        and ("html" in content_type.lower() or "<html" in text[:500].lower())
+    )
+    if stream_html:
+        raw_html = text[:RENDER_HINT_CHARS]
+        parser = WebTextExtractor()
+        parser.feed(text)
+        for chunk in body:
+            piece = decoder.decode(chunk)
+            if len(raw_html) < RENDER_HINT_CHARS:
+                raw_html += piece[: RENDER_HINT_CHARS - len(raw_html)]
+            parser.feed(piece)
+        parser.feed(decoder.decode(b"", final=True))
+        title, text = parser.result()
+        render_reason = html_render_hint(raw_html, text)
+    else:
+        text += "".join(decoder.decode(chunk) for chunk in body) + decoder.decode(b"", final=True)
         if "json" in content_type.lower() or text.lstrip().startswith(("{", "[")):
             try:
                 return {
-                    "ok": True,
-                    "url": final_url,
-                    "status": getattr(response, "status", 200),
-                    "content_type": content_type,
+                    **base,
                     "encoding": charset,
                     "title": title,
-                    "truncated": truncated,
-                    "bytes_read": len(data),
+                    "truncated": body.truncated,
+                    "bytes_read": body.bytes_read,
                     "is_binary": False,
                     "json_summary": summarize_json_for_model(json.loads(text)),
                     "text_note": "JSON response compacted for model context; use a targeted API/file action if exact raw JSON is needed",
@@ -556,22 +947,106 @@ def web_fetch(config: WebConfig, url: str, max_bytes: int | None = None) -> dict
             render_reason = html_render_hint(raw_html, text)
         else:
             render_reason = ""
-        payload = {
-            "ok": True,
-            "url": final_url,
-            "status": getattr(response, "status", 200),
-            "content_type": content_type,
-            "encoding": charset,
-            "title": title,
-            "truncated": truncated,
-            "bytes_read": len(data),
-            "is_binary": False,
-            "text": truncate(text.strip(), config.max_tool_output_chars),
+    payload = {
+        **base,
+        "encoding": charset,
+        "title": title,
+        "truncated": body.truncated,
+        "bytes_read": body.bytes_read,
+        "is_binary": False,
+        "text": truncate(text.strip(), config.max_tool_output_chars),
+    }
+    if render_reason:
+        payload["render_required"] = True
+        payload["render_reason"] = render_reason
+    return payload
+
+
+def cached_web_fetch_payload(
+    config: WebConfig,
+    entry: dict[str, Any],
+    handle: BinaryIO,
+    max_bytes: int,
+    cache_state: str,
+) -> dict[str, Any]:
+    body = LimitedBodyReader(handle.read, max_bytes, source_truncated=bool(entry.get("truncated")))
+    payload = web_fetch_payload(
+        config,
+        body,
+        str(entry.get("final_url") or entry.get("url") or ""),
+        int(entry.get("status") or 200),
+        str(entry.get("content_type") or ""),
+        entry.get("charset"),
+    )
+    payload["cache"] = cache_state
+    return payload
+
+
+def web_fetch(config: WebConfig, url: str, max_bytes: int | None = None) -> dict[str, Any]:
+    """Fetch a public URL into model-ready text.
+
+    Responses are kept in a shared on-disk cache keyed by normalized URL.
+    Entries younger than ``WEB_CACHE_FRESH_SECONDS`` are served directly;
+    older ones are revalidated with ``If-None-Match``/``If-Modified-Since``
+    so an unchanged document costs a 304 instead of a full download. Entries
+    older than ``WEB_CACHE_MAX_AGE_SECONDS`` are deleted and the cache is kept
+    under ``WEB_CACHE_MAX_BYTES`` by ``prune_web_cache``.
+    """
+    max_bytes = max(1024, min(int(max_bytes or MAX_WEB_BYTES), 1000000))
+    validate_public_url(url)
+    meta_path = web_cache_meta_path(url)
+    entry = load_web_cache_entry(meta_path, max_bytes) if meta_path is not None else None
+    cached_body = open_web_cache_body(meta_path, entry) if meta_path is not None and entry is not None else None
+    if cached_body is None:
+        entry = None
+    try:
+        if entry is not None and cached_body is not None and web_cache_entry_fresh(entry):
+            touch_web_cache_entry(meta_path)
+            return cached_web_fetch_payload(config, entry, cached_body, max_bytes, "fresh")
+        headers = {
+            "User-Agent": WEB_USER_AGENT,
+            "Accept": "text/html,text/plain,application/json;q=0.8,*/*;q=0.2",
+            "Accept-Language": WEB_ACCEPT_LANGUAGE,
         }
-        if render_reason:
-            payload["render_required"] = True
-            payload["render_reason"] = render_reason
-        return payload
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = str(entry["etag"])
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = str(entry["last_modified"])
+        try:
+            response = WEB_OPENER.open(Request(url, headers=headers), timeout=30)
+        except HTTPError as exc:
+            if exc.code != 304 or entry is None or cached_body is None or meta_path is None:
+                raise
+            try:
+                validate_public_url(exc.geturl())
+                refresh_web_cache_entry(meta_path, entry, exc.headers)
+            finally:
+                exc.close()
+            return cached_web_fetch_payload(config, entry, cached_body, max_bytes, "revalidated")
+        with response:
+            final_url = response.geturl()
+            validate_public_url(final_url)
+            sink = open_web_cache_writer(meta_path, url, final_url, response)
+            body = LimitedBodyReader(response.read, max_bytes, sink=sink)
+            try:
+                payload = web_fetch_payload(
+                    config,
+                    body,
+                    final_url,
+                    getattr(response, "status", 200),
+                    response.headers.get("Content-Type", ""),
+                    response.headers.get_content_charset(),
+                )
+                if sink is not None:
+                    sink.commit(body)
+            finally:
+                if sink is not None:
+                    sink.discard()
+            return payload
+    finally:
+        if cached_body is not None:
+            cached_body.close()
 
 
 def web_search(config: WebConfig, query: str, limit: int | None = None) -> dict[str, Any]:
@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import io
+import os
+import sys
+import tempfile
+import time
+import unittest
+from email.message import Message
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+from urllib.error import HTTPError
+from urllib.response import addinfourl
+
+ROOT = Path(__file__).resolve().parents[3]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from EyeOfTerror.Services.Search import web_tools
+
+CONFIG = SimpleNamespace(max_tool_output_chars=10000)
+
+
+def headers(**fields: str) -> Message:
+    message = Message()
+    for name, value in fields.items():
+        message[name.replace("_", "-")] = value
+    return message
+
+
+class FakeOpener:
+    """Answers every request with the next queued response or HTTP error."""
+
+    def __init__(self) -> None:
+        self.responses: list[object] = []
+        self.requests: list[dict[str, str]] = []
+
+    def open(self, request, timeout=None):
+        self.requests.append(dict(request.header_items()))
+        response = self.responses.pop(0)
+        if isinstance(response, HTTPError):
+            raise response
+        return response
+
+
+def page(url: str, text: str, **fields: str) -> addinfourl:
+    body = text.encode("utf-8")
+    return addinfourl(io.BytesIO(body), headers(Content_Type="text/plain; charset=utf-8", **fields), url, code=200)
+
+
+def not_modified(url: str, **fields: str) -> HTTPError:
+    return HTTPError(url, 304, "Not Modified", headers(**fields), io.BytesIO(b""))
+
+
+def aged(path: Path, seconds: float) -> None:
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+class WebFetchCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp.cleanup)
+        self.cache_dir = Path(self.temp.name)
+        self.opener = FakeOpener()
+        for patcher in (
+            patch.object(web_tools, "WEB_CACHE_DIR", str(self.cache_dir)),
+            patch.object(web_tools, "WEB_OPENER", self.opener),
+            patch.object(web_tools, "validate_public_url", side_effect=lambda url: url),
+            patch.object(web_tools, "WEB_CACHE_BUDGET", web_tools.WebCacheBudget()),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def fetch(self, url: str) -> dict:
+        return web_tools.web_fetch(CONFIG, url)
+
+    def test_fresh_entry_is_served_without_a_request(self) -> None:
+        url = "https://example.org/a"
+        self.opener.responses.append(page(url, "first body"))
+        first = self.fetch(url)
+        second = self.fetch(url)
+        self.assertNotIn("cache", first)
+        self.assertEqual(second["cache"], "fresh")
+        self.assertEqual(second["text"], first["text"])
+        self.assertEqual(len(self.opener.requests), 1)
+
+    def test_stale_entry_is_revalidated_and_refreshed(self) -> None:
+        url = "https://example.org/b"
+        self.opener.responses.append(page(url, "stable body", ETag='"v1"'))
+        self.fetch(url)
+        meta_path = web_tools.web_cache_meta_path(url)
+        with patch.object(web_tools, "WEB_CACHE_FRESH_SECONDS", 0):
+            self.opener.responses.append(not_modified(url, ETag='"v2"'))
+            revalidated = self.fetch(url)
+        self.assertEqual(revalidated["cache"], "revalidated")
+        self.assertIn("stable body", revalidated["text"])
+        self.assertEqual(self.opener.requests[-1].get("If-none-match"), '"v1"')
+        entry = web_tools.load_web_cache_entry(meta_path, web_tools.MAX_WEB_BYTES)
+        self.assertEqual(entry["etag"], '"v2"')
+        self.assertTrue(web_tools.web_cache_entry_fresh(entry))
+        self.assertEqual(self.fetch(url)["cache"], "fresh")
+
+    def test_expired_entry_is_refetched_and_pruned(self) -> None:
+        url = "https://example.org/c"
+        self.opener.responses.append(page(url, "old body"))
+        self.fetch(url)
+        meta_path = web_tools.web_cache_meta_path(url)
+        entry = web_tools.load_web_cache_entry(meta_path, web_tools.MAX_WEB_BYTES)
+        body_path = meta_path.parent / entry["body_file"]
+        web_tools.write_web_cache_meta(meta_path, {**entry, "stored_at": time.time() - web_tools.WEB_CACHE_MAX_AGE_SECONDS - 1})
+        self.assertIsNone(web_tools.load_web_cache_entry(meta_path, web_tools.MAX_WEB_BYTES))
+        self.assertGreater(web_tools.prune_web_cache(), 0)
+        self.assertFalse(meta_path.exists() or body_path.exists())
+        self.opener.responses.append(page(url, "new body"))
+        refetched = self.fetch(url)
+        self.assertNotIn("cache", refetched)
+        self.assertIn("new body", refetched["text"])
+
+    def test_least_recently_used_entries_are_evicted_over_budget(self) -> None:
+        urls = [f"https://example.org/page-{index}" for index in range(4)]
+        for url in urls:
+            self.opener.responses.append(page(url, "x" * 1000))
+            self.fetch(url)
+        meta_paths = [web_tools.web_cache_meta_path(url) for url in urls]
+        for age, meta_path in zip((4000, 3000, 2000, 1000), meta_paths):
+            for path in meta_path.parent.glob(f"{meta_path.stem}*"):
+                aged(path, age)
+        web_tools.touch_web_cache_entry(meta_paths[0])
+        orphan = meta_paths[0].with_name("orphan.0.body")
+        orphan.write_bytes(b"y" * 100)
+        aged(orphan, 4000)
+        entry_bytes = max(sum(path.stat().st_size for path in meta_path.parent.glob(f"{meta_path.stem}*")) for meta_path in meta_paths)
+        # Room for two entries once pruning stops at 90% of the budget.
+        with patch.object(web_tools, "WEB_CACHE_MAX_BYTES", int(entry_bytes * 2.5 / 0.9)):
+            self.assertGreater(web_tools.prune_web_cache(), 0)
+        self.assertEqual([path.exists() for path in meta_paths], [True, False, False, True])
+        self.assertFalse(orphan.exists())
+        self.assertEqual(self.fetch(urls[0])["cache"], "fresh")
+
+    def test_recent_files_survive_pruning(self) -> None:
+        url = "https://example.org/d"
+        self.opener.responses.append(page(url, "x" * 1000))
+        self.fetch(url)
+        with patch.object(web_tools, "WEB_CACHE_MAX_BYTES", 10):
+            web_tools.prune_web_cache()
+        self.assertTrue(web_tools.web_cache_meta_path(url).exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
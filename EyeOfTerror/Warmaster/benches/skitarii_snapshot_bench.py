@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Skitarii workspace snapshot and baseline cost, legacy versus object store.
+
+A synthetic Git repository gets a few files edited before every round, the
+way a live repository changes between missions. ``legacy`` captures with the
+workspace object store disabled, so every file is read and hashed again and
+``git add`` compresses every object of the verification baseline. ``objects``
+captures through the stat index and object store (only edited files are read)
+and hardlinks the baseline's files and loose objects from the store. Both
+modes must produce the same snapshot fingerprint and baseline tree.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+WARMASTER_ROOT = Path(__file__).resolve().parents[1]
+REPO_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(WARMASTER_ROOT))
+sys.path.insert(0, str(REPO_ROOT))
+
+from eye_of_terror import skitarii_bridge as bridge  # noqa: E402
+from eye_of_terror import workspace_objects  # noqa: E402
+
+MODES = ("legacy", "objects")
+
+
+def build_repository(root: Path, files: int, file_bytes: int, rng: random.Random) -> list[Path]:
+    paths = []
+    for index in range(files):
+        path = root / f"pkg{index % 40}" / f"module_{index}.py"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        words = [rng.choice(("def", "return", "value", "self", "items", "yield")) for _ in range(file_bytes // 6)]
+        path.write_text(" ".join(words) + "\n", encoding="utf-8")
+        paths.append(path)
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "-A"], cwd=root, check=True)
+    subprocess.run(
+        ["git", "-c", "user.name=Bench", "-c", "user.email=bench@invalid", "commit", "-qm", "base"],
+        cwd=root, check=True,
+    )
+    return paths
+
+
+def tree_id(root: Path) -> str:
+    return subprocess.run(
+        ["git", "rev-parse", "HEAD^{tree}"], cwd=root, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+def run_round(mode: str, scratch: Path) -> dict[str, Any]:
+    os.environ["WARMASTER_WORKSPACE_OBJECTS"] = "1" if mode == "objects" else "0"
+    started = time.perf_counter()
+    snapshot = bridge._full_repo_snapshot()
+    captured = time.perf_counter()
+    destination = Path(tempfile.mkdtemp(dir=bridge._verification_scratch_dir() or scratch))
+    try:
+        bridge._materialize_snapshot(snapshot, destination)
+        finished = time.perf_counter()
+        tree = tree_id(destination)
+    finally:
+        shutil.rmtree(destination, ignore_errors=True)
+    return {
+        "capture_ms": (captured - started) * 1000.0,
+        "materialize_ms": (finished - captured) * 1000.0,
+        "fingerprint": snapshot.fingerprint,
+        "tree": tree,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--file-bytes", type=int, default=20_000)
+    parser.add_argument("--edits", type=int, default=5, help="files edited before every round")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--report-json", default="")
+    args = parser.parse_args()
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir) / "repo"
+        root.mkdir()
+        paths = build_repository(root, args.files, args.file_bytes, rng)
+        os.environ["WARMASTER_WORKSPACE_OBJECTS_ROOT"] = str(Path(temp_dir) / "objects")
+        bridge.REPO_ROOT = root
+        # The racy window only delays caching of files written in the last two
+        # seconds; the bench edits files immediately before each round.
+        workspace_objects.RACY_WINDOW_NS = 0
+        run_round("objects", Path(temp_dir))
+        samples: dict[str, list[dict[str, Any]]] = {mode: [] for mode in MODES}
+        for round_index in range(args.rounds):
+            for path in rng.sample(paths, args.edits):
+                path.write_text(path.read_text(encoding="utf-8") + f"# round {round_index}\n", encoding="utf-8")
+            outcomes = {mode: run_round(mode, Path(temp_dir)) for mode in MODES}
+            if len({(item["fingerprint"], item["tree"]) for item in outcomes.values()}) != 1:
+                raise AssertionError("object store snapshot differs from the legacy capture")
+            for mode, outcome in outcomes.items():
+                samples[mode].append(outcome)
+    results = []
+    for mode in MODES:
+        result = {
+            "mode": mode,
+            "files": args.files,
+            "edits": args.edits,
+            "capture_ms": round(statistics.median(item["capture_ms"] for item in samples[mode]), 1),
+            "materialize_ms": round(statistics.median(item["materialize_ms"] for item in samples[mode]), 1),
+        }
+        results.append(result)
+        print(
+            f"{mode}: capture {result['capture_ms']} ms, baseline {result['materialize_ms']} ms "
+            f"for {args.files} files with {args.edits} edited",
+            flush=True,
+        )
+    if args.report_json:
+        Path(args.report_json).write_text(json.dumps({"results": results}, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
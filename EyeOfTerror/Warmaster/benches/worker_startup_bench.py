@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Per-step startup overhead of local Brigade workers, cold versus warm host.
+
+``cold`` is how ``local_executor`` launched every step before the warm host:
+a fresh interpreter per step, paying Python startup, the worker's imports and
+its module-level playbook loads. ``warm`` forks the step from
+``eye_of_terror.worker_host``, which imported every worker once. Both modes
+run each worker's CLI with ``--help`` so the measured wall time is startup
+plus argument parsing and nothing else; ``warm`` also reports the host's own
+fork-to-main time.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+WARMASTER_ROOT = Path(__file__).resolve().parents[1]
+REPO_ROOT = Path(__file__).resolve().parents[3]
+sys.path.insert(0, str(WARMASTER_ROOT))
+sys.path.insert(0, str(REPO_ROOT))
+
+from eye_of_terror.local_executor import WORKER_COMMANDS  # noqa: E402
+from eye_of_terror.worker_host import WarmWorkerHost  # noqa: E402
+
+MODES = ("cold", "warm")
+
+
+def cold_step(worker: str) -> dict[str, Any]:
+    pythonpath, script = WORKER_COMMANDS[worker]
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT / pythonpath)}
+    started = time.perf_counter()
+    completed = subprocess.run([sys.executable, str(REPO_ROOT / script), "--help"], cwd=REPO_ROOT, env=env, capture_output=True, check=False)
+    return {"wall_ms": (time.perf_counter() - started) * 1000.0, "returncode": completed.returncode}
+
+
+def warm_step(host: WarmWorkerHost, worker: str) -> dict[str, Any]:
+    pythonpath, script = WORKER_COMMANDS[worker]
+    env = {**os.environ, "PYTHONPATH": str(REPO_ROOT / pythonpath)}
+    started = time.perf_counter()
+    outcome = host.run(pythonpath, script, ["--help"], env, 60)
+    return {"wall_ms": (time.perf_counter() - started) * 1000.0, "returncode": outcome["returncode"], "startup_ms": outcome.get("startup_ms")}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--worker", action="append", default=[], help="limit to one or more workers")
+    parser.add_argument("--report-json", default="")
+    args = parser.parse_args()
+    workers = args.worker or sorted(WORKER_COMMANDS)
+    host = WarmWorkerHost(REPO_ROOT, WORKER_COMMANDS)
+    started = time.perf_counter()
+    host.start()
+    host.run(*WORKER_COMMANDS[workers[0]], ["--help"], dict(os.environ), 60)
+    host_ready_ms = round((time.perf_counter() - started) * 1000.0, 1)
+    print(f"warm host ready in {host_ready_ms} ms (preload {host.ready_info.get('preload_ms')} ms)", flush=True)
+    results = []
+    try:
+        for worker in workers:
+            row: dict[str, Any] = {"worker": worker}
+            for mode in MODES:
+                samples = [cold_step(worker) if mode == "cold" else warm_step(host, worker) for _ in range(args.repeats)]
+                if any(sample["returncode"] != 0 for sample in samples):
+                    raise AssertionError(f"{worker} --help failed in {mode} mode: {samples}")
+                row[f"{mode}_ms_p50"] = round(statistics.median(sample["wall_ms"] for sample in samples), 1)
+                if mode == "warm":
+                    row["warm_fork_to_main_ms_p50"] = round(statistics.median(float(sample["startup_ms"] or 0.0) for sample in samples), 2)
+            results.append(row)
+            print(
+                f"{worker}: cold {row['cold_ms_p50']} ms, warm {row['warm_ms_p50']} ms "
+                f"(fork to main {row['warm_fork_to_main_ms_p50']} ms)",
+                flush=True,
+            )
+    finally:
+        host.close()
+    cold_total = sum(row["cold_ms_p50"] for row in results)
+    warm_total = sum(row["warm_ms_p50"] for row in results)
+    print(f"total per pipeline pass: cold {round(cold_total, 1)} ms, warm {round(warm_total, 1)} ms", flush=True)
+    if args.report_json:
+        Path(args.report_json).write_text(
+            json.dumps({"host_ready_ms": host_ready_ms, "results": results}, ensure_ascii=False, indent=2) + "\n",
+            encoding="utf-8",
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
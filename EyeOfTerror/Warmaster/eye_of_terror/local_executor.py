@@ -2,10 +2,13 @@ from __future__ import annotations
 
 import json
 import os
+import posixpath
 import subprocess
 import sys
 import tempfile
-from dataclasses import dataclass
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -14,12 +17,14 @@ if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 from EyeOfTerror.common_protocol import validate_protocol_payload
-from EyeOfTerror.model_brain import attach_model_brain, request_model_decision
+from EyeOfTerror.model_brain import attach_model_brain, model_settings, request_model_decision
 
 from .ledger import TaskLedger
 from .mission_control import record_worker_execution_started, record_worker_protocol_report, worker_report_from_payload
 from .native_runs import native_adapter_for_run
 from .pipeline import dispatch_packet_with_worker_order, require_dispatch_worker_order, write_json_atomic
+from .step_memo import UNMEMOIZED_WORKERS, StepMemo, artifact_digest, shared_step_memo, sibling_inputs, step_memo_enabled
+from .worker_host import WorkerHostUnavailable, shared_worker_host, warm_host_supported
 
 
 WORKER_COMMANDS = {
@@ -35,6 +40,13 @@ WORKER_COMMANDS = {
     "FabricatorFinalis": ("EyeOfTerror/Scriptorium/Brigade/FabricatorFinalis", "EyeOfTerror/Scriptorium/Brigade/FabricatorFinalis/fabricator_finalis.py"),
 }
 
+# Ready steps run side by side up to PARALLEL_STEPS, and at most WORKER_LANES
+# of them on the same worker (one lane per concurrent dispatch a worker takes).
+# Off by default: workers also read undeclared sibling files, and only steps
+# in different /work/ directories are known not to touch each other's.
+PARALLEL_STEPS = max(1, int(os.environ.get("WARMASTER_LOCAL_PARALLEL_STEPS", "1")))
+WORKER_LANES = max(1, int(os.environ.get("WARMASTER_LOCAL_WORKER_LANES", "2")))
+
 
 @dataclass
 class StepResult:
@@ -45,9 +57,10 @@ class StepResult:
     payload: dict[str, Any]
     stdout: str
     stderr: str
+    launch: dict[str, Any] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, Any]:
-        return {
+        payload = {
             "step_id": self.step_id,
             "worker": self.worker,
             "returncode": self.returncode,
@@ -56,6 +69,9 @@ class StepResult:
             "stdout": self.stdout,
             "stderr": self.stderr,
         }
+        if self.launch:
+            payload["launch"] = self.launch
+        return payload
 
 
 def load_json(path: Path) -> dict[str, Any]:
@@ -196,6 +212,66 @@ def write_execution_dispatch(dispatch_path: Path, packet: dict[str, Any]) -> Pat
     return Path(handle.name)
 
 
+def launch_worker(
+    repo_root: Path,
+    pythonpath: str,
+    script: str,
+    args: list[str],
+    env: dict[str, str],
+    timeout: float,
+) -> tuple[subprocess.CompletedProcess[str], dict[str, Any]]:
+    """Run one worker attempt, forked from the warm host when possible.
+
+    Raises ``subprocess.TimeoutExpired`` on timeout either way, so callers keep
+    one retry path. A host that cannot take the job degrades to a cold
+    interpreter for this attempt.
+    """
+    command = [sys.executable, str(repo_root / script), *args]
+    fallback = ""
+    if warm_host_supported():
+        try:
+            outcome = shared_worker_host(repo_root, WORKER_COMMANDS).run(pythonpath, script, args, env, timeout)
+        except WorkerHostUnavailable as exc:
+            fallback = str(exc)
+        else:
+            launch = {"mode": "warm_host", "startup_ms": outcome.get("startup_ms"), "wall_ms": outcome.get("wall_ms")}
+            if outcome.get("timed_out"):
+                expired = subprocess.TimeoutExpired(command, timeout, output=outcome.get("stdout", ""), stderr=outcome.get("stderr", ""))
+                expired.launch = launch  # type: ignore[attr-defined]
+                raise expired
+            return subprocess.CompletedProcess(command, int(outcome["returncode"]), outcome.get("stdout", ""), outcome.get("stderr", "")), launch
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=repo_root, env=env, text=True, capture_output=True, timeout=timeout, check=False)
+    launch = {"mode": "subprocess", "wall_ms": round((time.perf_counter() - started) * 1000, 1)}
+    if fallback:
+        launch["warm_host_error"] = fallback
+    return completed, launch
+
+
+def step_memo_key(memo: StepMemo, repo_root: Path, worker: str, request: dict[str, Any], workspace_root: Path) -> str:
+    pythonpath, script = WORKER_COMMANDS[worker]
+    input_hashes = {
+        str(artifact): artifact_digest(artifact_host_path(workspace_root, str(artifact)))
+        for artifact in request.get("input_artifacts", []) if isinstance(request.get("input_artifacts"), list)
+    }
+    for artifact in sibling_inputs(worker, request):
+        host_path = artifact_host_path(workspace_root, artifact)
+        input_hashes.setdefault(artifact, artifact_digest(host_path) if host_path.exists() else "missing")
+    settings = model_settings()
+    route = {"base_url": settings["base_url"], "model": settings["model"]}
+    return memo.key(memo.worker_code_hash(repo_root, pythonpath, script), request, input_hashes, route)
+
+
+def memo_outputs(payload: dict[str, Any], workspace_root: Path) -> dict[str, Path] | None:
+    artifacts = payload.get("artifacts", [])
+    if not isinstance(artifacts, list) or not all(isinstance(item, str) and item.startswith("/work/") for item in artifacts):
+        return None
+    try:
+        return {item: artifact_host_path(workspace_root, item) for item in artifacts}
+    except ValueError:
+        return None
+
+
 def run_step(
     repo_root: Path,
     dispatch_path: Path,
@@ -204,6 +280,8 @@ def run_step(
     revision_context: dict[str, Any] | None = None,
     timeout_retries: int = 1,
     retry_timeout_multiplier: int = 2,
+    memo: StepMemo | None = None,
+    reuse_memo: bool = False,
 ) -> StepResult:
     try:
         packet = load_json(dispatch_path)
@@ -236,6 +314,16 @@ def run_step(
         payload = {"ok": False, "error": f"no local command registered for worker: {worker}"}
         return StepResult(step_id, worker, 127, False, payload, "", payload["error"])
     pythonpath, script = WORKER_COMMANDS[worker]
+    memo_key = ""
+    if memo is not None and worker not in UNMEMOIZED_WORKERS:
+        try:
+            memo_key = step_memo_key(memo, repo_root, worker, request, workspace_root)
+        except (OSError, ValueError):
+            memo_key = ""
+        entry = memo.restore(memo_key, lambda artifact: artifact_host_path(workspace_root, artifact)) if memo_key and reuse_memo else None
+        if entry is not None:
+            launch = {"mode": "memo", "memo_key": memo_key, "memo_step_id": entry.get("step_id", ""), "artifacts_restored": entry["artifacts_restored"]}
+            return StepResult(step_id, worker, 0, True, entry["payload"], str(entry.get("stdout") or ""), "", launch)
     env = os.environ.copy()
     env["PYTHONPATH"] = str(repo_root / pythonpath)
     execution_dispatch_path = dispatch_path
@@ -278,25 +366,26 @@ def run_step(
     execution_dispatch_path = temp_dispatch_path
     timed_out: subprocess.TimeoutExpired | None = None
     completed: subprocess.CompletedProcess[str] | None = None
+    launch: dict[str, Any] = {}
     attempts = 0
     max_attempts = 1 + max(0, timeout_retries if timeout_sec > 0 else 0)
     while attempts < max_attempts:
         attempts += 1
         attempt_timeout = timeout_sec * (retry_timeout_multiplier ** (attempts - 1))
         try:
-            completed = subprocess.run(
-                [sys.executable, str(repo_root / script), str(execution_dispatch_path), "--workspace-root", str(workspace_root)],
-                cwd=repo_root,
-                env=env,
-                text=True,
-                capture_output=True,
-                timeout=attempt_timeout,
-                check=False,
+            completed, launch = launch_worker(
+                repo_root,
+                pythonpath,
+                script,
+                [str(execution_dispatch_path), "--workspace-root", str(workspace_root)],
+                env,
+                attempt_timeout,
             )
             timed_out = None
             break
         except subprocess.TimeoutExpired as exc:
             timed_out = exc
+            launch = getattr(exc, "launch", {"mode": "subprocess"})
             if attempts >= max_attempts:
                 break
     if temp_dispatch_path is not None:
@@ -327,14 +416,20 @@ def run_step(
                 ],
             },
         }
-        return StepResult(step_id, worker, 124, False, attach_model_brain(payload, model_decision), stdout[-4000:], stderr[-4000:])
+        return StepResult(step_id, worker, 124, False, attach_model_brain(payload, model_decision), stdout[-4000:], stderr[-4000:], launch)
     if completed is None:
         payload = {"ok": False, "worker": worker, "task_id": str(request.get("task_id") or ""), "status": "failed", "error": "worker process did not start"}
         return StepResult(step_id, worker, 2, False, attach_model_brain(payload, model_decision), "", payload["error"])
     payload = parse_worker_stdout(completed.stdout)
     payload = attach_model_brain(payload, model_decision)
     ok = completed.returncode == 0 and bool(payload.get("ok"))
-    return StepResult(step_id, worker, completed.returncode, ok, payload, completed.stdout, completed.stderr)
+    outputs = memo_outputs(payload, workspace_root) if memo is not None and memo_key and ok else None
+    if outputs is not None:
+        try:
+            launch["memo_stored"] = memo.store(memo_key, worker, step_id, payload, completed.stdout, outputs)
+        except OSError:
+            launch["memo_stored"] = False
+    return StepResult(step_id, worker, completed.returncode, ok, payload, completed.stdout, completed.stderr, launch)
 
 
 def ordered_dispatch_paths(run_dir: Path, step_ids: list[str] | None = None) -> list[Path]:
@@ -394,6 +489,121 @@ def _reject_native_warband_run(run_dir: Path) -> None:
     raise RuntimeError(adapter.raw_executor_error)
 
 
+def _packet_artifacts(packet: dict[str, Any], field_name: str) -> set[str]:
+    request = packet.get("request") if isinstance(packet.get("request"), dict) else {}
+    step = request.get("step") if isinstance(request.get("step"), dict) else {}
+    values = packet.get(field_name)
+    if not isinstance(values, list):
+        values = request.get(field_name) if field_name == "input_artifacts" else step.get(field_name)
+    return {str(item) for item in values or [] if isinstance(item, str) and item}
+
+
+def step_dependency_graph(dispatch_paths: list[Path]) -> dict[str, set[str]]:
+    """Map each selected step to the earlier selected steps it must wait for.
+
+    A step waits for an earlier one it names in ``depends_on``, whose declared
+    output it reads, whose declared input it would overwrite, or whose output
+    it also writes. Workers also read and write undeclared siblings of their
+    artifacts (``source_snapshots.json`` next to the notes, the critic report
+    next to the draft), so steps whose artifacts share a directory keep their
+    declared order too. A packet that cannot be read waits for everything
+    before it; it fails preflight as soon as it runs anyway.
+    """
+    graph: dict[str, set[str]] = {}
+    declared: list[tuple[str, set[str], set[str], set[str]]] = []
+    for dispatch_path in dispatch_paths:
+        step_id = dispatch_path.stem
+        try:
+            packet = load_json(dispatch_path)
+        except Exception:  # noqa: BLE001 - malformed dispatch is reported by run_step.
+            graph[step_id] = {earlier for earlier, *_artifacts in declared}
+            declared.append((step_id, set(), set(), set()))
+            continue
+        inputs = _packet_artifacts(packet, "input_artifacts")
+        outputs = _packet_artifacts(packet, "expected_artifacts")
+        directories = {posixpath.dirname(artifact) for artifact in inputs | outputs}
+        named = {str(item) for item in packet.get("depends_on", []) if isinstance(item, str)} if isinstance(packet.get("depends_on"), list) else set()
+        graph[step_id] = {
+            earlier
+            for earlier, earlier_inputs, earlier_outputs, earlier_directories in declared
+            if earlier in named
+            or inputs & earlier_outputs
+            or outputs & earlier_inputs
+            or outputs & earlier_outputs
+            or directories & earlier_directories
+        }
+        declared.append((step_id, inputs, outputs, directories))
+    return graph
+
+
+def critical_path(graph: dict[str, set[str]], durations: dict[str, float]) -> tuple[float, list[str]]:
+    """Longest chain of dependent steps that actually ran, by wall time."""
+    finish: dict[str, float] = {}
+    previous: dict[str, str] = {}
+    for step_id in graph:
+        if step_id not in durations:
+            continue
+        ran = [dependency for dependency in graph[step_id] if dependency in finish]
+        before = max(ran, key=lambda dependency: finish[dependency], default="")
+        finish[step_id] = durations[step_id] + (finish[before] if before else 0.0)
+        if before:
+            previous[step_id] = before
+    if not finish:
+        return 0.0, []
+    tail = max(finish, key=lambda step_id: finish[step_id])
+    path = [tail]
+    while path[-1] in previous:
+        path.append(previous[path[-1]])
+    return finish[tail], list(reversed(path))
+
+
+def _record_step_result(ledger_path: Path, run_dir: Path, contract: dict[str, Any], dispatch_path: Path, result: StepResult) -> None:
+    ledger = TaskLedger.load(ledger_path)
+    if result.launch.get("mode") == "memo":
+        ledger.record_event(
+            "step_memo_hit",
+            {
+                "step_id": result.step_id,
+                "worker": result.worker,
+                "memo_key": result.launch.get("memo_key", ""),
+                "artifacts_restored": result.launch.get("artifacts_restored", 0),
+            },
+        )
+    step_details: dict[str, Any] = {}
+    try:
+        packet = load_json(dispatch_path)
+        order = packet.get("worker_order") if isinstance(packet.get("worker_order"), dict) else {}
+        raw_report = result.payload.get("worker_report") if isinstance(result.payload.get("worker_report"), dict) else {}
+        report = {}
+        if raw_report:
+            try:
+                validate_protocol_payload(raw_report, expected_type="worker_report")
+                report = raw_report
+            except Exception as exc:  # noqa: BLE001 - fall back so malformed workers still leave a protocol trace.
+                step_details["worker_report_validation_error"] = str(exc)
+        if not report:
+            report = worker_report_from_payload(str(order.get("mission_id") or f"mission-{contract.get('task_id') or run_dir.name}"), result.step_id, result.worker, result.payload, result.ok)
+        record_worker_protocol_report(run_dir, report)
+        step_details["worker_report"] = report
+    except Exception as exc:  # noqa: BLE001 - protocol reporting must not hide the worker result.
+        step_details["worker_report_error"] = str(exc)
+    ledger.record_step(
+        result.step_id,
+        result.worker,
+        str(result.payload.get("status") or ("completed" if result.ok else "failed")),
+        [str(item) for item in result.payload.get("artifacts", [])] if isinstance(result.payload.get("artifacts"), list) else [],
+        str(result.payload.get("summary") or result.payload.get("error") or ""),
+        step_details,
+    )
+
+
+def _packet_worker(dispatch_path: Path) -> str:
+    try:
+        return str(load_json(dispatch_path).get("worker") or "")
+    except Exception:  # noqa: BLE001 - malformed dispatch is reported by run_step.
+        return ""
+
+
 def execute_run(
     repo_root: Path,
     run_dir: Path,
@@ -402,6 +612,8 @@ def execute_run(
     step_ids: list[str] | None = None,
     execution_mode: str = "full",
     timeout_retries: int = 1,
+    parallel_steps: int | None = None,
+    worker_lanes: int | None = None,
 ) -> dict[str, Any]:
     _reject_native_warband_run(run_dir)
     contract = load_json(run_dir / "contract.json") if (run_dir / "contract.json").exists() else {}
@@ -424,46 +636,88 @@ def execute_run(
     all_dispatch_paths = ordered_dispatch_paths(run_dir)
     selected_dispatch_paths = ordered_dispatch_paths(run_dir, step_ids=step_ids)
     partial_execution = bool(step_ids) and [path.stem for path in selected_dispatch_paths] != [path.stem for path in all_dispatch_paths]
-    results: list[StepResult] = []
-    for dispatch_path in selected_dispatch_paths:
-        ledger = TaskLedger.load(ledger_path)
-        if ledger.cancel_requested():
-            break
-        try:
-            record_worker_execution_started(run_dir, load_json(dispatch_path))
-        except Exception:  # noqa: BLE001 - progress reporting must not hide the worker result.
-            pass
-        result = run_step(repo_root, dispatch_path, workspace_root, timeout_sec, revision_context=revision_contexts.get(dispatch_path.stem), timeout_retries=timeout_retries)
-        results.append(result)
-        step_details: dict[str, Any] = {}
-        try:
-            packet = load_json(dispatch_path)
-            order = packet.get("worker_order") if isinstance(packet.get("worker_order"), dict) else {}
-            raw_report = result.payload.get("worker_report") if isinstance(result.payload.get("worker_report"), dict) else {}
-            report = {}
-            if raw_report:
-                try:
-                    validate_protocol_payload(raw_report, expected_type="worker_report")
-                    report = raw_report
-                except Exception as exc:  # noqa: BLE001 - fall back so malformed workers still leave a protocol trace.
-                    step_details["worker_report_validation_error"] = str(exc)
-            if not report:
-                report = worker_report_from_payload(str(order.get("mission_id") or f"mission-{contract.get('task_id') or run_dir.name}"), result.step_id, result.worker, result.payload, result.ok)
-            record_worker_protocol_report(run_dir, report)
-            step_details["worker_report"] = report
-        except Exception as exc:  # noqa: BLE001 - protocol reporting must not hide the worker result.
-            step_details["worker_report_error"] = str(exc)
-        ledger.record_step(
-            result.step_id,
-            result.worker,
-            str(result.payload.get("status") or ("completed" if result.ok else "failed")),
-            [str(item) for item in result.payload.get("artifacts", [])] if isinstance(result.payload.get("artifacts"), list) else [],
-            str(result.payload.get("summary") or result.payload.get("error") or ""),
-            step_details,
-        )
-        if not result.ok:
-            break
-    cancelled = TaskLedger.load(ledger_path).cancel_requested()
+    # Steps start in declared order as soon as their dependencies succeeded;
+    # the ledger and mission-control files are only written from this thread,
+    # and step records are committed in declared order.
+    parallel_limit = max(1, int(parallel_steps or PARALLEL_STEPS))
+    lane_limit = max(1, int(worker_lanes or WORKER_LANES))
+    graph = step_dependency_graph(selected_dispatch_paths)
+    # Every successful step is memoized; revision and resume runs reuse the
+    # entries of steps whose code, request, inputs and model route are unchanged.
+    memo = shared_step_memo() if step_memo_enabled() else None
+    reuse_memo = execution_mode in {"revision", "resume"}
+    paths_by_step = {path.stem: path for path in selected_dispatch_paths}
+    declared_order = list(paths_by_step)
+    workers = {step_id: _packet_worker(path) for step_id, path in paths_by_step.items()}
+    pending = list(declared_order)
+    running: dict[Future, str] = {}
+    finished: dict[str, StepResult] = {}
+    started_at: dict[str, float] = {}
+    durations: dict[str, float] = {}
+    recorded: set[str] = set()
+    failure_seen = False
+    peak_parallel = 0
+    run_started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=parallel_limit, thread_name_prefix="local-step") as executor:
+        while True:
+            if not failure_seen and pending and TaskLedger.load(ledger_path).cancel_requested():
+                pending.clear()
+            if not failure_seen:
+                for step_id in list(pending):
+                    if len(running) >= parallel_limit:
+                        break
+                    if any(dependency not in finished for dependency in graph[step_id]):
+                        continue
+                    if sum(1 for other in running.values() if workers[other] == workers[step_id]) >= lane_limit:
+                        continue
+                    pending.remove(step_id)
+                    dispatch_path = paths_by_step[step_id]
+                    try:
+                        record_worker_execution_started(run_dir, load_json(dispatch_path))
+                    except Exception:  # noqa: BLE001 - progress reporting must not hide the worker result.
+                        pass
+                    started_at[step_id] = time.perf_counter()
+                    future = executor.submit(
+                        run_step,
+                        repo_root,
+                        dispatch_path,
+                        workspace_root,
+                        timeout_sec,
+                        revision_context=revision_contexts.get(step_id),
+                        timeout_retries=timeout_retries,
+                        memo=memo,
+                        reuse_memo=reuse_memo,
+                    )
+                    running[future] = step_id
+                peak_parallel = max(peak_parallel, len(running))
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                step_id = running.pop(future)
+                durations[step_id] = time.perf_counter() - started_at[step_id]
+                result = future.result()
+                finished[step_id] = result
+                if not result.ok:
+                    failure_seen = True
+            for step_id in declared_order:
+                if step_id in recorded:
+                    continue
+                if step_id not in finished:
+                    break
+                _record_step_result(ledger_path, run_dir, contract, paths_by_step[step_id], finished[step_id])
+                recorded.add(step_id)
+    ordered_results = [finished[step_id] for step_id in declared_order if step_id in finished]
+    first_failure = next((index for index, item in enumerate(ordered_results) if not item.ok), None)
+    results = ordered_results if first_failure is None else ordered_results[: first_failure + 1]
+    overlapped = [] if first_failure is None else ordered_results[first_failure + 1 :]
+    for item in ordered_results:
+        if item.step_id not in recorded:
+            _record_step_result(ledger_path, run_dir, contract, paths_by_step[item.step_id], item)
+            recorded.add(item.step_id)
+    ledger = TaskLedger.load(ledger_path)
+    critical_sec, critical_steps = critical_path(graph, durations)
+    cancelled = ledger.cancel_requested()
     final_payload = results[-1].payload if results else {}
     terminal_ok = terminal_payload_allows_completion(final_payload) if isinstance(final_payload, dict) else False
     summary = {
@@ -472,7 +726,24 @@ def execute_run(
         "workspace_root": str(workspace_root),
         "steps": [item.to_dict() for item in results],
         "cancelled": cancelled,
+        "schedule": {
+            "parallel_steps": parallel_limit,
+            "worker_lanes": lane_limit,
+            "peak_parallel_steps": peak_parallel,
+            "wall_time_sec": round(time.perf_counter() - run_started, 3),
+            "serial_step_time_sec": round(sum(durations.values()), 3),
+            "critical_path_sec": round(critical_sec, 3),
+            "critical_path": critical_steps,
+            "step_time_sec": {step_id: round(durations[step_id], 3) for step_id in declared_order if step_id in durations},
+            "depends_on": {step_id: sorted(graph[step_id], key=declared_order.index) for step_id in declared_order},
+        },
     }
+    memo_hits = [item.step_id for item in ordered_results if item.launch.get("mode") == "memo"]
+    if memo_hits:
+        summary["step_memo_hits"] = memo_hits
+    if overlapped:
+        # Independent steps that were already running when an earlier step failed.
+        summary["steps_after_failure"] = [item.to_dict() for item in overlapped]
     if step_ids:
         summary["step_ids"] = step_ids
         summary["execution_mode"] = execution_mode
@@ -510,9 +781,10 @@ def main() -> int:
     parser.add_argument("--repo-root", default=".")
     parser.add_argument("--timeout-sec", type=int, default=1800)
     parser.add_argument("--timeout-retries", type=int, default=1)
+    parser.add_argument("--parallel-steps", type=int, default=0, help="Concurrent independent steps (default WARMASTER_LOCAL_PARALLEL_STEPS)")
     parser.add_argument("--step-id", action="append", default=[], help="Restrict execution to one or more dispatch step ids")
     args = parser.parse_args()
-    summary = execute_run(Path(args.repo_root).resolve(), Path(args.run_dir), Path(args.workspace_root), args.timeout_sec, step_ids=args.step_id or None, execution_mode="restricted" if args.step_id else "full", timeout_retries=args.timeout_retries)
+    summary = execute_run(Path(args.repo_root).resolve(), Path(args.run_dir), Path(args.workspace_root), args.timeout_sec, step_ids=args.step_id or None, execution_mode="restricted" if args.step_id else "full", timeout_retries=args.timeout_retries, parallel_steps=args.parallel_steps or None)
     print(json.dumps(summary, ensure_ascii=False, indent=2))
     return 0 if summary.get("ok") else 1
 
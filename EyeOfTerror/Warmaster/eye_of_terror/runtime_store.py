@@ -0,0 +1,146 @@
+"""Plumbing shared by the content-addressed stores under ``Warmaster/runtime``.
+
+The step memo, the workspace object store and the verification memo are each
+switched by a ``WARMASTER_<NAME>`` flag, located by ``WARMASTER_<NAME>_ROOT``,
+shared per resolved root inside one process and bounded in size by
+``WARMASTER_<NAME>_MAX_BYTES``. A store over its budget deletes its least
+recently used files; readers treat a missing file as a miss and rebuild it.
+"""
+from __future__ import annotations
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Generic, Iterable, Iterator, TypeVar
+
+RUNTIME_ROOT = Path(__file__).resolve().parents[1] / "runtime"
+# Pruning stops at this share of the budget so the next writes do not prune again.
+PRUNE_TARGET_RATIO = 0.9
+# Files touched this recently are never pruned: a concurrent run may be about
+# to link or read them.
+PRUNE_GRACE_SEC = 600
+
+StoreT = TypeVar("StoreT")
+
+
+def runtime_flag(name: str) -> bool:
+    return os.environ.get(name, "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def runtime_root(env_name: str, default: Path) -> Path:
+    return Path(os.environ.get(env_name) or default)
+
+
+def runtime_budget(env_name: str, default: int) -> int:
+    """Byte budget from ``env_name``; 0 or a negative value means unbounded."""
+    try:
+        return int(os.environ.get(env_name) or default)
+    except ValueError:
+        return default
+
+
+@contextmanager
+def atomic_replace(target: Path) -> Iterator[Path]:
+    """Yield a temporary sibling of ``target`` that replaces it on success."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_name = tempfile.mkstemp(prefix=f".{target.name}-", suffix=".tmp", dir=target.parent)
+    os.close(fd)
+    temp = Path(temp_name)
+    try:
+        yield temp
+        os.replace(temp, target)
+    except BaseException:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def touch(path: Path) -> None:
+    """Mark a store file as recently used."""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+class StoreBudget:
+    """Size bound for one store, enforced by evicting the oldest files.
+
+    Age is the file's mtime: writes set it and stores ``touch`` what they
+    reuse. Writers report their bytes through ``note_write``; once a tenth of
+    the budget has been written since the last pass, the store is pruned. The
+    first write of a process always prunes, so a store that was left over
+    budget is trimmed without walking it at import time.
+    """
+
+    def __init__(self, root: Path, directories: Iterable[str], max_bytes: int) -> None:
+        self.root = root
+        self.directories = tuple(directories)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._written = max(1, max_bytes // 10)
+
+    def note_write(self, size: int) -> None:
+        if self.max_bytes <= 0:
+            return
+        with self._lock:
+            self._written += size
+            due = self._written >= max(1, self.max_bytes // 10)
+            if due:
+                self._written = 0
+        if due:
+            self.prune()
+
+    def prune(self) -> int:
+        """Delete the oldest files until the store fits; returns the bytes freed."""
+        if self.max_bytes <= 0:
+            return 0
+        files: list[tuple[float, int, Path]] = []
+        total = 0
+        for directory in self.directories:
+            for dirpath, _dirnames, filenames in os.walk(self.root / directory):
+                for name in filenames:
+                    path = Path(dirpath) / name
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    files.append((stat.st_mtime, stat.st_size, path))
+                    total += stat.st_size
+        if total <= self.max_bytes:
+            return 0
+        target = int(self.max_bytes * PRUNE_TARGET_RATIO)
+        cutoff = time.time() - PRUNE_GRACE_SEC
+        freed = 0
+        for mtime, size, path in sorted(files, key=lambda item: item[0]):
+            if total - freed <= target or mtime > cutoff:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            freed += size
+        return freed
+
+
+class SharedStores(Generic[StoreT]):
+    """One store per resolved root, shared by every caller in the process."""
+
+    def __init__(self, factory: Callable[[Path], StoreT]) -> None:
+        self._factory = factory
+        self._stores: dict[str, StoreT] = {}
+        self._lock = threading.Lock()
+
+    def get(self, root: Path) -> StoreT:
+        resolved = root.resolve()
+        with self._lock:
+            store = self._stores.get(str(resolved))
+            if store is None:
+                store = self._stores[str(resolved)] = self._factory(resolved)
+            return store
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stores.clear()
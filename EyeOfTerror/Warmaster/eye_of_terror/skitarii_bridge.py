@@ -16,6 +16,7 @@ import posixpath
 import re
 import secrets
 import selectors
+import shlex
 import signal
 import stat
 import shutil
@@ -27,8 +28,9 @@ import tomllib
 import urllib.error
 import urllib.request
 import uuid
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path, PurePosixPath
 from typing import Any, Iterable
 
@@ -44,6 +46,9 @@ from EyeOfTerror.common_protocol.validation import (
     validate_review_findings,
 )
 
+from .verification_memo import shared_verification_memo, verification_memo_enabled
+from .workspace_objects import StatIndex, git_blob_id, shared_workspace_objects, workspace_objects_enabled
+
 SKITARII_URL = os.environ.get(
     "SKITARII_URL", os.environ.get("SKITARII_WARBAND_URL", "http://127.0.0.1:7200"),
 )
@@ -56,6 +61,13 @@ MAX_VERIFY_CHECKS = 10
 MAX_VERIFY_COMMAND_BYTES = 4096
 MAX_VERIFY_OUTPUT_BYTES = 131_072
 MAX_VERIFY_TOTAL_SECONDS = 600
+# Per-check sandbox limits; concurrent checks are sized to fit them on the host.
+VERIFY_SANDBOX_MEMORY_BYTES = 2 * 1024 ** 3
+VERIFY_SANDBOX_CPUS = 2
+VERIFY_SANDBOX_PROFILE = (
+    f"bwrap-systemd-v1:memory={VERIFY_SANDBOX_MEMORY_BYTES}:cpus={VERIFY_SANDBOX_CPUS}"
+    f":output={MAX_VERIFY_OUTPUT_BYTES}"
+)
 MAX_PATCH_INPUT_BYTES = 20_000_000
 MAX_PATCH_FILES = 1_000
 MAX_PATCH_FILE_BYTES = 20_000_000
@@ -95,9 +107,10 @@ _MODIFY_MARKERS = ("исправ", "почин", "fix ", "измен", "рефа
                    "поправ", "доработай", "bug", "рефактори", "оптимизир")
 
 
-def _safe_repo_file(rel: str) -> Path | None:
+def _safe_repo_file(rel: str, root: Path | None = None) -> Path | None:
     """Resolve rel under REPO_ROOT, refusing anything that escapes the repo (../,
-    symlinks, absolute paths). Returns the real path or None."""
+    symlinks, absolute paths). Returns the real path or None. ``root`` is an
+    already resolved REPO_ROOT for callers that check many paths."""
     raw = str(rel).replace("\\", "/")
     pure = PurePosixPath(raw)
     if (
@@ -109,7 +122,7 @@ def _safe_repo_file(rel: str) -> Path | None:
     ):
         return None
     try:
-        root = REPO_ROOT.resolve()
+        root = root or REPO_ROOT.resolve()
         current = root
         for part in pure.parts:
             current = current / part
@@ -176,11 +189,35 @@ class WorkspaceSnapshot(dict):
         self.external_assets = external_assets or {}
         self.fingerprint = fingerprint
         self.metadata_fingerprint = metadata_fingerprint
+        # path -> (captured value, sha256, Git blob id) recorded while capturing;
+        # an entry only counts while the path still holds that very value.
+        self.object_ids: dict[str, tuple[str, str, str]] = {}
 
     @property
     def inventory(self) -> list[str]:
         return sorted(set(self) | set(self.blobs) | set(self.symlinks) | set(self.external_assets))
 
+    def _recorded_object(self, path: str) -> tuple[str, str] | None:
+        recorded = self.object_ids.get(path)
+        if recorded is None:
+            return None
+        value = self[path] if path in self else self.blobs.get(path)
+        return (recorded[1], recorded[2]) if value is recorded[0] else None
+
+    def content_bytes(self, path: str) -> bytes:
+        if path in self:
+            return str(self[path]).encode("utf-8")
+        return base64.b64decode(str(self.blobs[path]), validate=True)
+
+    def content_sha256(self, path: str) -> str:
+        """sha256 of a text or binary entry, recorded at capture or computed."""
+        recorded = self._recorded_object(path)
+        return recorded[0] if recorded else hashlib.sha256(self.content_bytes(path)).hexdigest()
+
+    def git_blob_id(self, path: str, data: bytes) -> str:
+        recorded = self._recorded_object(path)
+        return recorded[1] if recorded and recorded[1] else git_blob_id(data)
+
 
 def _workspace_fingerprint(
     snapshot: WorkspaceSnapshot,
@@ -207,12 +244,10 @@ def _workspace_fingerprint(
         mode = str(snapshot.modes.get(path) or "").encode("ascii", errors="strict")
         if path in snapshot:
             kind = b"text"
-            content_hash = hashlib.sha256(str(snapshot[path]).encode("utf-8")).digest()
+            content_hash = bytes.fromhex(snapshot.content_sha256(path))
         elif path in snapshot.blobs:
             kind = b"blob"
-            content_hash = hashlib.sha256(
-                base64.b64decode(str(snapshot.blobs[path]), validate=True),
-            ).digest()
+            content_hash = bytes.fromhex(snapshot.content_sha256(path))
         elif path in snapshot.symlinks:
             kind = b"link"
             content_hash = hashlib.sha256(str(snapshot.symlinks[path]).encode("utf-8")).digest()
@@ -248,14 +283,9 @@ def _snapshot_content_fingerprint(
         if path in snapshot.symlinks:
             kind = "link"
             content_sha = hashlib.sha256(str(snapshot.symlinks[path]).encode("utf-8")).hexdigest()
-        elif path in snapshot:
-            kind = "file"
-            content_sha = hashlib.sha256(str(snapshot[path]).encode("utf-8")).hexdigest()
-        elif path in snapshot.blobs:
+        elif path in snapshot or path in snapshot.blobs:
             kind = "file"
-            content_sha = hashlib.sha256(
-                base64.b64decode(str(snapshot.blobs[path]), validate=True),
-            ).hexdigest()
+            content_sha = snapshot.content_sha256(path)
         elif path in snapshot.external_assets:
             kind = "file"
             content_sha = str(snapshot.external_assets[path].get("sha256") or "")
@@ -757,6 +787,26 @@ def _resolved_git_path(root: Path, name: str) -> Path:
     return path if path.is_absolute() else root / path
 
 
+def _resolved_git_paths(root: Path, names: Iterable[str]) -> dict[str, Path]:
+    """Resolve several ``--git-path`` names with one ``git rev-parse`` call."""
+    names = list(names)
+    args = ["git", "rev-parse"]
+    for name in names:
+        args += ["--git-path", name]
+    lines = _bounded_command_stdout(
+        args, root, timeout=30, max_bytes=4096 * max(1, len(names)),
+    ).decode("utf-8", errors="strict").split("\n")
+    if lines and not lines[-1]:
+        lines.pop()
+    if len(lines) != len(names):
+        return {name: _resolved_git_path(root, name) for name in names}
+    resolved: dict[str, Path] = {}
+    for name, line in zip(names, lines):
+        path = Path(line.strip())
+        resolved[name] = path if path.is_absolute() else root / path
+    return resolved
+
+
 def _git_mutation_lock_paths(root: Path) -> tuple[Path, ...]:
     names = [
         "index.lock", "HEAD.lock", "packed-refs.lock",
@@ -813,7 +863,7 @@ def _git_mutation_lock_paths(root: Path) -> tuple[Path, ...]:
     elif symbolic.returncode != 1:
         raise SnapshotError("git could not resolve symbolic HEAD for mutation guard")
     unique = {
-        *(_resolved_git_path(root, name).absolute() for name in names),
+        *(path.absolute() for path in _resolved_git_paths(root, names).values()),
         *(path.absolute() for path in explicit_paths),
     }
     return tuple(sorted(unique, key=lambda value: str(value)))
@@ -843,18 +893,17 @@ def _assert_git_mutation_guard(root: Path) -> None:
 
 
 def _git_operation_state_active(root: Path) -> str:
-    for name in (
+    for name, path in _resolved_git_paths(root, (
         "MERGE_HEAD", "CHERRY_PICK_HEAD", "REVERT_HEAD", "REBASE_HEAD",
         "AUTO_MERGE", "BISECT_START", "rebase-apply", "rebase-merge", "sequencer",
-    ):
-        path = _resolved_git_path(root, name)
+    )).items():
         if os.path.lexists(path):
             return name
     return ""
 
 
-def _git_pseudoref(root: Path, name: str) -> bytes:
-    path = _resolved_git_path(root, name)
+def _git_pseudoref(root: Path, name: str, path: Path | None = None) -> bytes:
+    path = path or _resolved_git_path(root, name)
     if not os.path.lexists(path):
         return b"ABSENT"
     raw = _stable_small_regular_file_bytes(path, 4096, f"git operation state {name}")
@@ -923,7 +972,10 @@ def _git_metadata_fingerprint(root: Path) -> str:
         ["git", "ls-files", "--resolve-undo", "-z"], root,
         timeout=30, max_bytes=20_000_000,
     )
-    lock_path = _resolved_git_path(root, "index.lock").absolute()
+    git_paths = _resolved_git_paths(root, (
+        "index.lock", "MERGE_HEAD", "CHERRY_PICK_HEAD", "REVERT_HEAD", "REBASE_HEAD", "AUTO_MERGE",
+    ))
+    lock_path = git_paths["index.lock"].absolute()
     if os.path.lexists(lock_path):
         owned = _OWNED_GIT_LOCKS.get(str(lock_path))
         current = lock_path.lstat()
@@ -940,11 +992,11 @@ def _git_metadata_fingerprint(root: Path) -> str:
         (b"head", head), (b"symbolic", symbolic_head),
         (b"index", index), (b"index_flags", index_flags),
         (b"unmerged", unmerged), (b"resolve_undo", resolve_undo),
-        (b"merge_head", _git_pseudoref(root, "MERGE_HEAD")),
-        (b"cherry_pick_head", _git_pseudoref(root, "CHERRY_PICK_HEAD")),
-        (b"revert_head", _git_pseudoref(root, "REVERT_HEAD")),
-        (b"rebase_head", _git_pseudoref(root, "REBASE_HEAD")),
-        (b"auto_merge", _git_pseudoref(root, "AUTO_MERGE")),
+        (b"merge_head", _git_pseudoref(root, "MERGE_HEAD", git_paths["MERGE_HEAD"])),
+        (b"cherry_pick_head", _git_pseudoref(root, "CHERRY_PICK_HEAD", git_paths["CHERRY_PICK_HEAD"])),
+        (b"revert_head", _git_pseudoref(root, "REVERT_HEAD", git_paths["REVERT_HEAD"])),
+        (b"rebase_head", _git_pseudoref(root, "REBASE_HEAD", git_paths["REBASE_HEAD"])),
+        (b"auto_merge", _git_pseudoref(root, "AUTO_MERGE", git_paths["AUTO_MERGE"])),
     ):
         digest.update(label + b"\0" + value + b"\0")
     return digest.hexdigest()
@@ -1242,6 +1294,59 @@ def _bounded_command_stdout(
     return bytes(stdout)
 
 
+def _snapshot_object_index(root: Path) -> StatIndex | None:
+    return shared_workspace_objects().stat_index(root) if workspace_objects_enabled() else None
+
+
+def _inline_snapshot_value(data: bytes) -> tuple[str, str]:
+    """Classify captured bytes as inline UTF-8 text or a base64 blob."""
+    try:
+        decoded = data.decode("utf-8")
+    except UnicodeDecodeError:
+        decoded = ""
+    if decoded and "\x00" not in decoded:
+        return "text", decoded
+    if not data:
+        return "text", ""
+    return "blob", base64.b64encode(data).decode("ascii")
+
+
+def _capture_inline_file(
+    path: Path, rel: str, metadata: os.stat_result, index: StatIndex | None,
+) -> tuple[str, str, int, str, str]:
+    """Return ``(kind, value, size, sha256, git blob id)`` for one inline file.
+
+    A file whose stat signature matches the object index is taken from the
+    previous capture (or the object store) without reading it again; anything
+    else is read, hashed and recorded.  Without an index nothing is cached
+    and the Git blob id is left empty.
+    """
+    signature = _stable_stat_signature(metadata)
+    recorded = index.lookup(rel, signature) if index is not None else None
+    if index is not None and recorded is not None:
+        sha256, blob_id = recorded
+        cached = index.content(sha256)
+        if cached is None:
+            data = index.store.read(blob_id, metadata.st_size)
+            if data is not None:
+                cached = _inline_snapshot_value(data)
+                index.remember(sha256, cached)
+        if cached is not None:
+            return cached[0], cached[1], metadata.st_size, sha256, blob_id
+    data = path.read_bytes()
+    kind, value = _inline_snapshot_value(data)
+    if index is None:
+        return kind, value, len(data), hashlib.sha256(data).hexdigest(), ""
+    try:
+        sha256, blob_id = index.store.put(data)
+    except OSError:
+        return kind, value, len(data), hashlib.sha256(data).hexdigest(), git_blob_id(data)
+    index.remember(sha256, (kind, value))
+    if len(data) == metadata.st_size and _stable_stat_signature(path.lstat()) == signature:
+        index.record(rel, signature, sha256, blob_id)
+    return kind, value, len(data), sha256, blob_id
+
+
 def _full_repo_snapshot(
     max_files: int = 5000,
     max_total_bytes: int = 50_000_000,
@@ -1258,6 +1363,10 @@ def _full_repo_snapshot(
     by an immutable hash/size manifest entry. This preserves an exact, conflict-checked
     baseline without letting an unrelated large dirty or untracked image stop the whole
     warband. Submodules still block because their contents are a separate repository.
+
+    Captures are incremental: the workspace object index remembers every file by
+    its stat signature, so only files changed since the previous snapshot are
+    read and hashed again, and large assets are not re-hashed at all.
     """
     root = REPO_ROOT.resolve()
     inventory_output_limit = max(1_000_000, max_files * 4096)
@@ -1276,21 +1385,19 @@ def _full_repo_snapshot(
             ["git", "ls-files", "-s", "-z"], cwd=root,
             timeout=60, max_bytes=inventory_output_limit,
         )
-        unmerged = _bounded_command_stdout(
-            ["git", "ls-files", "-u", "-z"], cwd=root,
-            timeout=30, max_bytes=inventory_output_limit,
-        )
     except (OSError, subprocess.SubprocessError, SnapshotError) as exc:
         raise SnapshotError(f"git could not enumerate the repository: {exc}") from exc
-    if unmerged:
-        raise SnapshotError("repository has unresolved index conflicts")
     git_modes: dict[str, str] = {}
     for entry in staged.split(b"\0"):
         if not entry or b"\t" not in entry:
             continue
         metadata, raw_path = entry.split(b"\t", 1)
         fields = metadata.split()
-        if len(fields) >= 3 and fields[2] == b"0":
+        # ``ls-files -s`` lists unmerged entries with their non-zero stage, which
+        # is exactly what ``ls-files -u`` would report.
+        if len(fields) >= 3 and fields[2] != b"0":
+            raise SnapshotError("repository has unresolved index conflicts")
+        if len(fields) >= 3:
             path = raw_path.decode("utf-8", errors="surrogateescape").replace("\\", "/")
             git_modes[path] = fields[0].decode("ascii", errors="strict")
     files: dict[str, str] = {}
@@ -1311,6 +1418,8 @@ def _full_repo_snapshot(
         raise SnapshotError(f"repository inventory exceeds {max_total_bytes} path bytes")
     total = inventory_path_bytes
     external_total = 0
+    index = _snapshot_object_index(root)
+    object_ids: dict[str, tuple[str, str, str]] = {}
     for rel in inventory_paths:
         indexed_mode = git_modes.get(rel, "")
         if indexed_mode == "160000":
@@ -1332,7 +1441,7 @@ def _full_repo_snapshot(
             modes[rel] = "120000"
             total += len(encoded_target)
             continue
-        p = _safe_repo_file(rel)
+        p = _safe_repo_file(rel, root)
         if p is None:
             if os.path.lexists(raw_path):
                 raise SnapshotError(
@@ -1343,14 +1452,24 @@ def _full_repo_snapshot(
             # Deleted tracked files are represented separately below.
             continue
         try:
-            size = p.stat().st_size
+            current = p.lstat()
+            size = current.st_size
             if size > max_file_bytes:
                 if len(external_assets) >= max_external_assets:
                     raise SnapshotError(f"repository exceeds {max_external_assets} external assets")
-                stable, content_sha = _stable_regular_file_digest(
-                    p,
-                    max_external_file_bytes,
+                recorded = (
+                    index.lookup(rel, _stable_stat_signature(current))
+                    if index is not None and size <= max_external_file_bytes else None
                 )
+                if recorded is not None:
+                    stable, content_sha = current, recorded[0]
+                else:
+                    stable, content_sha = _stable_regular_file_digest(
+                        p,
+                        max_external_file_bytes,
+                    )
+                    if index is not None:
+                        index.record(rel, _stable_stat_signature(stable), content_sha)
                 size = stable.st_size
                 if external_total + size > max_external_total_bytes:
                     raise SnapshotError(
@@ -1378,25 +1497,20 @@ def _full_repo_snapshot(
                 }
                 external_total += size
                 continue
-            data = p.read_bytes()
+            kind, value, size, content_sha, blob_id = _capture_inline_file(p, rel, current, index)
         except OSError as exc:
             raise SnapshotError(f"repository file could not be read: {rel}") from exc
         if len(files) + len(blobs) + len(symlinks) + len(external_assets) >= max_files:
             raise SnapshotError(f"repository snapshot exceeds {max_files} files")
-        if total + len(data) > max_total_bytes:
+        if total + size > max_total_bytes:
             raise SnapshotError(f"repository snapshot exceeds {max_total_bytes} bytes")
-        try:
-            decoded = data.decode("utf-8")
-        except UnicodeDecodeError:
-            decoded = ""
-        if decoded and "\x00" not in decoded:
-            files[rel] = decoded
-        elif not data:
-            files[rel] = ""
+        if kind == "text":
+            files[rel] = value
         else:
-            blobs[rel] = base64.b64encode(data).decode("ascii")
-        modes[rel] = "100755" if p.stat().st_mode & stat.S_IXUSR else "100644"
-        total += len(data)
+            blobs[rel] = value
+        object_ids[rel] = (value, content_sha, blob_id)
+        modes[rel] = "100755" if current.st_mode & stat.S_IXUSR else "100644"
+        total += size
     for link_path, target in symlinks.items():
         normalized_target = _safe_relative_path(
             posixpath.normpath(posixpath.join(posixpath.dirname(link_path), target)),
@@ -1425,6 +1539,15 @@ def _full_repo_snapshot(
         files, deleted_paths=deleted, modes=modes, symlinks=symlinks, blobs=blobs,
         external_assets=external_assets,
     )
+    snapshot.object_ids = object_ids
+    if index is not None:
+        try:
+            index.save(
+                [*object_ids, *external_assets],
+                (content_sha for _value, content_sha, _blob_id in object_ids.values()),
+            )
+        except OSError:
+            pass
     snapshot.fingerprint = _workspace_fingerprint(snapshot, root, head=head, index=staged)
     snapshot.metadata_fingerprint = _git_metadata_fingerprint(root)
     return snapshot
@@ -1655,10 +1778,27 @@ def _normalize_goal_repo_scope(goal: str) -> str:
     return normalized
 
 
-def _run_sandboxed_check(command: str, worktree: Path, timeout: int = 180) -> SandboxResult:
-    """Run one check in a fresh, resource-bounded cgroup and bubblewrap workspace."""
+def _baseline_copy_command(source: str, target: str) -> str:
+    """Shell command copying a materialized baseline into a writable tree.
+
+    Files with identical content are hardlinks to one store object in the
+    baseline; ``--no-preserve=links`` gives every copied path its own inode so
+    a check writing one file cannot change another.
+    """
+    return f"cp -a --no-preserve=links {shlex.quote(source)}/. {shlex.quote(target)}/"
+
+
+def _run_sandboxed_check(
+    command: str, worktree: Path, timeout: int = 180, *, cancel: threading.Event | None = None,
+) -> SandboxResult:
+    """Run one check in a fresh, resource-bounded cgroup and bubblewrap workspace.
+
+    Setting ``cancel`` stops the check like a timeout and reports it as cancelled.
+    """
     if len(command.encode("utf-8")) > MAX_VERIFY_COMMAND_BYTES:
         return SandboxResult(125, "", "verification command exceeds the size limit", limit_reason="command_size")
+    if cancel is not None and cancel.is_set():
+        return SandboxResult(130, "", "verification check was cancelled", limit_reason="cancelled")
     bwrap = shutil.which("bwrap")
     systemd_run = shutil.which("systemd-run")
     systemctl = shutil.which("systemctl")
@@ -1681,14 +1821,14 @@ def _run_sandboxed_check(command: str, worktree: Path, timeout: int = 180) -> Sa
         "--setenv", "PYTHONNOUSERSITE", "1",
         "--setenv", "PYTHONDONTWRITEBYTECODE", "1",
         "--chdir", "/work", "--", "/bin/bash", "-c",
-        "cp -a /baseline/. /work/ && cd /work && " + command,
+        _baseline_copy_command("/baseline", "/work") + " && cd /work && " + command,
     ]
     unit = f"skitarii-check-{uuid.uuid4().hex}.service"
     args = [
         systemd_run, "--user", "--quiet", "--wait", "--collect", "--pipe",
         "--service-type=exec", f"--unit={unit}",
-        "-p", "MemoryMax=2G", "-p", "MemorySwapMax=0", "-p", "TasksMax=128",
-        "-p", "CPUQuota=200%", "-p", f"LimitCPU={max(1, timeout)}",
+        "-p", f"MemoryMax={VERIFY_SANDBOX_MEMORY_BYTES}", "-p", "MemorySwapMax=0", "-p", "TasksMax=128",
+        "-p", f"CPUQuota={VERIFY_SANDBOX_CPUS * 100}%", "-p", f"LimitCPU={max(1, timeout)}",
         "-p", "LimitFSIZE=67108864", "-p", "LimitNOFILE=256", "-p", "LimitCORE=0",
         "-p", f"RuntimeMaxSec={max(1, timeout + 5)}s", "-p", "KillMode=control-group",
         "-p", "TimeoutStopSec=3s", "--", *sandbox,
@@ -1710,6 +1850,7 @@ def _run_sandboxed_check(command: str, worktree: Path, timeout: int = 180) -> Sa
     deadline = time.monotonic() + timeout
     timed_out = False
     output_limit = False
+    cancelled = False
     terminated = False
     terminated_at = 0.0
 
@@ -1733,6 +1874,9 @@ def _run_sandboxed_check(command: str, worktree: Path, timeout: int = 180) -> Sa
             if time.monotonic() >= deadline:
                 timed_out = True
                 terminate()
+            elif cancel is not None and cancel.is_set() and not terminated:
+                cancelled = True
+                terminate()
             for key, _ in selector.select(timeout=0.2):
                 chunk = os.read(key.fileobj.fileno(), 65_536)
                 if not chunk:
@@ -1766,13 +1910,17 @@ def _run_sandboxed_check(command: str, worktree: Path, timeout: int = 180) -> Sa
         returncode = 124
     elif output_limit:
         returncode = 125
+    elif cancelled:
+        returncode = 130
     return SandboxResult(
         returncode,
         buffers["stdout"].decode("utf-8", errors="replace"),
         buffers["stderr"].decode("utf-8", errors="replace"),
         timed_out=timed_out,
         output_limit=output_limit,
-        limit_reason="timeout" if timed_out else ("output" if output_limit else ""),
+        limit_reason=(
+            "timeout" if timed_out else "output" if output_limit else "cancelled" if cancelled else ""
+        ),
     )
 
 
@@ -2998,21 +3146,41 @@ def _changed_paths_against_head(root: Path) -> list[str]:
 
 
 def _materialize_snapshot(snapshot: WorkspaceSnapshot, destination: Path) -> None:
-    """Create a self-contained Git baseline from the captured repository bytes."""
+    """Create a self-contained Git baseline from the captured repository bytes.
+
+    With the workspace object store, files are hardlinked from the store and the
+    baseline's loose objects are hardlinked in before ``git add`` runs, so Git
+    only hashes each file, finds its object present and skips compressing and
+    writing it again.  Content the store has never seen is stored once.
+    """
     destination.mkdir(parents=True, exist_ok=True)
-    for rel, content in snapshot.items():
-        path = _materialize_path(destination, rel)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(str(content), encoding="utf-8")
-    for rel, encoded in snapshot.blobs.items():
+    store = shared_workspace_objects() if workspace_objects_enabled() else None
+    made_dirs: set[Path] = {destination}
+    objects: list[tuple[str, bytes]] = []
+
+    def parent_dir(path: Path) -> None:
+        if path.parent not in made_dirs:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            made_dirs.add(path.parent)
+
+    for rel in [*snapshot, *snapshot.blobs]:
         path = _materialize_path(destination, rel)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_bytes(base64.b64decode(str(encoded), validate=True))
+        parent_dir(path)
+        data = snapshot.content_bytes(rel)
+        if store is None:
+            path.write_bytes(data)
+        else:
+            executable = str(snapshot.modes.get(rel) or "") == "100755"
+            store.link_file(snapshot.content_sha256(rel), data, path, executable)
+            objects.append((snapshot.git_blob_id(rel, data), data))
     for rel, target in snapshot.symlinks.items():
         safe_rel = _safe_relative_path(rel)
         path = _materialize_path(destination, safe_rel)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.symlink_to(_safe_symlink_target(safe_rel, target))
+        parent_dir(path)
+        safe_target = _safe_symlink_target(safe_rel, target)
+        path.symlink_to(safe_target)
+        encoded_target = safe_target.encode("utf-8", errors="surrogateescape")
+        objects.append((git_blob_id(encoded_target), encoded_target))
     # Clean oversized tracked assets are immutable manifest entries. They are omitted
     # from disposable worktrees so verification never duplicates multi-GB blobs; the
     # content fingerprint below projects their recorded hashes back into the tree.
@@ -3025,8 +3193,17 @@ def _materialize_snapshot(snapshot: WorkspaceSnapshot, destination: Path) -> Non
         if path.is_symlink() or not path.exists():
             raise SnapshotError(f"baseline mode target is missing: {rel}")
         current = path.stat().st_mode
-        path.chmod((current | 0o111) if str(mode) == "100755" else (current & ~0o111))
+        wanted = (current | 0o111) if str(mode) == "100755" else (current & ~0o111)
+        if wanted != current:
+            path.chmod(wanted)
     subprocess.run(["git", "init", "-q"], cwd=destination, check=True, timeout=60)
+    if store is not None:
+        try:
+            for blob_id, data in objects:
+                store.link_git_object(blob_id, data, destination / ".git")
+        except OSError:
+            # Seeding is an optimisation; ``git add`` below writes anything missing.
+            pass
     subprocess.run(["git", "add", "-f", "-A", "--", "."], cwd=destination, check=True, timeout=120)
     subprocess.run(
         ["git", "-c", "user.email=skitarii@invalid", "-c", "user.name=Skitarii",
@@ -3035,53 +3212,169 @@ def _materialize_snapshot(snapshot: WorkspaceSnapshot, destination: Path) -> Non
     )
 
 
-def _run_check_set(checks: list[dict[str, Any]], baseline: Path) -> tuple[bool, list[dict], str]:
+def _verification_scratch_dir() -> str | None:
+    """Parent for disposable baselines: next to the object store so links stay local."""
+    if not workspace_objects_enabled():
+        return None
+    try:
+        return str(shared_workspace_objects().scratch_dir())
+    except OSError:
+        return None
+
+
+def _available_memory_bytes() -> int:
+    try:
+        with open("/proc/meminfo", encoding="ascii") as handle:
+            for line in handle:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (AttributeError, OSError, ValueError):
+        return 0
+
+
+def _verification_parallelism() -> int:
+    """How many check sandboxes fit the host's CPUs and available memory at once."""
+    configured = os.environ.get("SKITARII_VERIFY_PARALLEL", "").strip()
+    if configured:
+        try:
+            return max(1, int(configured))
+        except ValueError:
+            pass
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cpus = os.cpu_count() or 1
+    limit = max(1, cpus // VERIFY_SANDBOX_CPUS)
+    available = _available_memory_bytes()
+    if available > 0:
+        limit = min(limit, max(1, available // VERIFY_SANDBOX_MEMORY_BYTES))
+    return limit
+
+
+def _sandbox_result_ok(result: SandboxResult) -> bool:
+    return result.returncode == 0 and not result.timed_out and not result.output_limit
+
+
+def _run_check_set(
+    checks: list[dict[str, Any]],
+    baseline: Path,
+    memo_scope: tuple[str, str] | None = None,
+) -> tuple[bool, list[dict], str]:
+    """Run checks and their oracles side by side, each in its own sandbox copy.
+
+    Every command copies the read-only baseline into a private tmpfs, so they
+    can run concurrently up to ``_verification_parallelism()``. Results are
+    judged in declared order with the sequential semantics: the first failing
+    check ends the set, and checks after a known failure are cancelled.
+    ``memo_scope`` is ``(baseline fingerprint, patch sha256)``; with it, every
+    finished command is memoized and an unchanged check on the same tree
+    returns its recorded result without a sandbox.
+    """
     if not checks:
         return False, [], "accepted patch has no executable checks to rerun"
     if len(checks) > MAX_VERIFY_CHECKS:
         return False, [], f"verification check count exceeds {MAX_VERIFY_CHECKS}"
     deadline = time.monotonic() + MAX_VERIFY_TOTAL_SECONDS
-    results: list[dict] = []
+    commands: list[tuple[str, str]] = []
     for check in checks:
         command = str(check.get("cmd") or "")
         if not command or len(command.encode("utf-8")) > MAX_VERIFY_COMMAND_BYTES:
-            return False, results, "verification command is empty or oversized"
+            break
+        commands.append((command, str(check.get("oracle") or "").strip()))
+    memo = shared_verification_memo() if memo_scope and verification_memo_enabled() else None
+    cancels = [threading.Event() for _ in commands]
+
+    def cancel_after(index: int) -> None:
+        for event in cancels[index + 1:]:
+            event.set()
+
+    def run(index: int, command: str) -> tuple[SandboxResult | None, bool]:
+        key = ""
+        if memo is not None and memo_scope is not None:
+            key = memo.key(memo_scope[0], memo_scope[1], command, VERIFY_SANDBOX_PROFILE)
+            cached = memo.load(key)
+            if cached is not None:
+                return SandboxResult(**cached), True
         remaining = int(deadline - time.monotonic())
         if remaining <= 0:
-            return False, results, "verification set exceeded its cumulative deadline"
-        result = _run_sandboxed_check(command, baseline, min(180, remaining))
-        ok = result.returncode == 0 and not result.timed_out and not result.output_limit
-        stdout = (result.stdout or "").strip()
-        if "expect_stdout" in check:
-            ok = ok and stdout == str(check["expect_stdout"]).strip()
-        oracle_result = None
-        oracle_command = str(check.get("oracle") or "").strip()
-        if oracle_command:
-            remaining = int(deadline - time.monotonic())
-            if remaining <= 0:
-                return False, results, "verification set exceeded its cumulative deadline"
-            oracle_result = _run_sandboxed_check(oracle_command, baseline, min(180, remaining))
-            ok = (
-                ok and oracle_result.returncode == 0
-                and not oracle_result.timed_out and not oracle_result.output_limit
-                and stdout == (oracle_result.stdout or "").strip()
-            )
-        record = {
-            "command": command,
-            "returncode": result.returncode,
-            "ok": ok,
-            "stdout": result.stdout[-400:],
-            "stderr": result.stderr[-400:],
-            "timed_out": result.timed_out,
-            "output_limit": result.output_limit,
-            "limit_reason": result.limit_reason,
-        }
-        if oracle_result is not None:
-            record["oracle_returncode"] = oracle_result.returncode
-            record["oracle_output_limit"] = oracle_result.output_limit
-        results.append(record)
-        if not ok:
-            return False, results, "a bounded isolated verification check failed"
+            return None, False
+        result = _run_sandboxed_check(command, baseline, min(180, remaining), cancel=cancels[index])
+        if memo is not None:
+            try:
+                memo.store(key, asdict(result))
+            except OSError:
+                pass
+        return result, False
+
+    def submit(executor: ThreadPoolExecutor, index: int, command: str) -> Future:
+        future = executor.submit(run, index, command)
+
+        def settle(done: Future) -> None:
+            if done.cancelled() or done.exception() is not None:
+                cancel_after(index)
+                return
+            result = done.result()[0]
+            if result is None or not _sandbox_result_ok(result):
+                cancel_after(index)
+
+        future.add_done_callback(settle)
+        return future
+
+    results: list[dict] = []
+    if commands:
+        workers = min(_verification_parallelism(), sum(2 if oracle else 1 for _, oracle in commands))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="skitarii-verify")
+        try:
+            futures = [
+                (submit(executor, index, command), submit(executor, index, oracle) if oracle else None)
+                for index, (command, oracle) in enumerate(commands)
+            ]
+            for check, (command, _), (check_future, oracle_future) in zip(checks, commands, futures):
+                result, memoized = check_future.result()
+                if result is None:
+                    return False, results, "verification set exceeded its cumulative deadline"
+                ok = _sandbox_result_ok(result)
+                stdout = (result.stdout or "").strip()
+                if "expect_stdout" in check:
+                    ok = ok and stdout == str(check["expect_stdout"]).strip()
+                oracle_result = None
+                if oracle_future is not None:
+                    oracle_result, oracle_memoized = oracle_future.result()
+                    if oracle_result is None:
+                        return False, results, "verification set exceeded its cumulative deadline"
+                    memoized = memoized and oracle_memoized
+                    ok = (
+                        ok and _sandbox_result_ok(oracle_result)
+                        and stdout == (oracle_result.stdout or "").strip()
+                    )
+                record = {
+                    "command": command,
+                    "returncode": result.returncode,
+                    "ok": ok,
+                    "stdout": result.stdout[-400:],
+                    "stderr": result.stderr[-400:],
+                    "timed_out": result.timed_out,
+                    "output_limit": result.output_limit,
+                    "limit_reason": result.limit_reason,
+                }
+                if oracle_result is not None:
+                    record["oracle_returncode"] = oracle_result.returncode
+                    record["oracle_output_limit"] = oracle_result.output_limit
+                if memoized:
+                    record["memoized"] = True
+                results.append(record)
+                if not ok:
+                    return False, results, "a bounded isolated verification check failed"
+        finally:
+            for event in cancels:
+                event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+    if len(commands) < len(checks):
+        return False, results, "verification command is empty or oversized"
     return True, results, ""
 
 
@@ -3249,7 +3542,7 @@ def _verify_and_stage_patch(
             if persist_artifacts else hashlib.sha256(checks_bytes).hexdigest()
         )
 
-        verify_dir = Path(tempfile.mkdtemp(prefix="skitarii-verify-"))
+        verify_dir = Path(tempfile.mkdtemp(prefix="skitarii-verify-", dir=_verification_scratch_dir()))
         try:
             _materialize_snapshot(snapshot, verify_dir)
             applied = run_git(
@@ -3341,7 +3634,9 @@ def _verify_and_stage_patch(
                     out["reason"] = "scoped conflict proof changed before live apply"
                     ledger.record_event("skitarii_patch_stage", out)
                     return out
-                passed, results, reason = _run_check_set(checks, verify_dir)
+                passed, results, reason = _run_check_set(
+                    checks, verify_dir, (expected_fingerprint, out["patch_sha256"]),
+                )
                 out["tests_pass_in_worktree"] = passed
                 out["verification_results"] = results
                 if reason:
@@ -3583,10 +3878,14 @@ def _verify_and_stage_patch(
                     out["post_apply_tests_passed"] = False
                     out["reason"] = "live patch targets or Git metadata diverged from verification"
                 else:
-                    post_dir = Path(tempfile.mkdtemp(prefix="skitarii-post-apply-"))
+                    post_dir = Path(tempfile.mkdtemp(
+                        prefix="skitarii-post-apply-", dir=_verification_scratch_dir(),
+                    ))
                     try:
                         _materialize_snapshot(post_snapshot, post_dir)
-                        post_passed, post_results, post_reason = _run_check_set(checks, post_dir)
+                        post_passed, post_results, post_reason = _run_check_set(
+                            checks, post_dir, (post_fingerprint, ""),
+                        )
                         out["post_apply_tests_passed"] = post_passed
                         out["post_apply_verification_results"] = post_results
                         if post_reason:
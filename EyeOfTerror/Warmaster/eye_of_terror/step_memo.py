@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import shutil
+import threading
+from pathlib import Path
+from typing import Any
+
+from .pipeline import write_json_atomic
+from .runtime_store import RUNTIME_ROOT, SharedStores, StoreBudget, atomic_replace, runtime_budget, runtime_flag, runtime_root, touch
+
+DEFAULT_MEMO_ROOT = RUNTIME_ROOT / "step_memo"
+DEFAULT_MEMO_MAX_BYTES = 2 * 1024 ** 3
+MEMO_KEY_VERSION = 1
+# Workers whose result depends on something other than their declared input
+# artifacts and known siblings are never reused: CorpusIngestor reads the local
+# library directly, ReductorVerifier and FabricatorFinalis read whatever
+# siblings the manifest and the critic report name.
+UNMEMOIZED_WORKERS = {"CorpusIngestor", "ReductorVerifier", "FabricatorFinalis"}
+# Files a worker reads next to its first expected artifact without declaring
+# them (``sibling_artifact``, ``load_optional_snapshots``); their bytes are part
+# of the key like declared inputs.
+SIBLING_INPUTS = {
+    "AuspexBrowser": ("source_map.json",),
+    "OcularisRenderium": ("source_snapshots.json",),
+    "NoosphericExtractor": ("source_map.json", "source_snapshots.json", "rendered_snapshots.json"),
+    "Chronologis": ("direct_event_notes.json", "research_corpus.json"),
+    "ScriptoriumArchitect": ("research_corpus.json", "structure_map.json"),
+    "ScriptoriumDaemon": (
+        "chapter_plan.json",
+        "source_map.json",
+        "source_snapshots.json",
+        "direct_event_notes.json",
+        "timeline.json",
+        "research_corpus.json",
+        "structure_map.json",
+        "synthesis_plan.json",
+    ),
+}
+# Request fields that change between attempts without changing the work.
+VOLATILE_REQUEST_FIELDS = {"model_brain", "max_runtime_sec"}
+SKIPPED_WORKER_DIRS = {"runtime", "__pycache__", "benches", ".pytest_cache"}
+
+
+def step_memo_enabled() -> bool:
+    return runtime_flag("WARMASTER_STEP_MEMO")
+
+
+def configured_memo_root() -> Path:
+    return runtime_root("WARMASTER_STEP_MEMO_ROOT", DEFAULT_MEMO_ROOT)
+
+
+def sibling_inputs(worker: str, request: dict[str, Any]) -> list[str]:
+    """``/work/`` paths of the undeclared files ``worker`` reads for ``request``."""
+    step = request.get("step") if isinstance(request.get("step"), dict) else {}
+    expected = step.get("expected_artifacts")
+    if not isinstance(expected, list) or not expected or not isinstance(expected[0], str):
+        return []
+    parent = expected[0].rsplit("/", 1)[0]
+    return [f"{parent}/{filename}" for filename in SIBLING_INPUTS.get(worker, ())]
+
+
+def _sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def artifact_digest(path: Path) -> str:
+    """Hash of a file, or of every file under a directory artifact."""
+    if path.is_file():
+        return _sha256_file(path)
+    digest = hashlib.sha256()
+    for child in sorted(item for item in path.rglob("*") if item.is_file()):
+        digest.update(child.relative_to(path).as_posix().encode("utf-8") + b"\0" + _sha256_file(child).encode("ascii"))
+    return digest.hexdigest()
+
+
+def _module_files(path: Path, search_roots: list[Path], repo_root: Path) -> list[Path]:
+    try:
+        tree = ast.parse(path.read_text(encoding="utf-8"))
+    except (OSError, SyntaxError, UnicodeDecodeError):
+        return []
+    names: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.add(node.module)
+            names.update(f"{node.module}.{alias.name}" for alias in node.names)
+    found: list[Path] = []
+    for name in sorted(names):
+        parts = name.split(".")
+        for root in search_roots:
+            for candidate in (root.joinpath(*parts).with_suffix(".py"), root.joinpath(*parts, "__init__.py")):
+                if candidate.is_file() and candidate.resolve().is_relative_to(repo_root):
+                    found.append(candidate.resolve())
+                    break
+            else:
+                continue
+            break
+    return found
+
+
+class StepMemo:
+    """Content-addressed cache of successful worker steps.
+
+    ``entries/<key>.json`` holds the result payload and the output artifacts of
+    a step as ``/work/`` path -> blob hash; ``blobs/<aa>/<sha256>`` holds the
+    artifact bytes, shared by every entry that produced the same file. The key
+    covers the worker code (script, the repo modules it imports and its
+    playbooks), the request without volatile fields, the bytes of every input
+    artifact and of the siblings in ``SIBLING_INPUTS``, and the model route, so
+    any of those changing re-runs the step. Entries and blobs past
+    ``WARMASTER_STEP_MEMO_MAX_BYTES`` are evicted least recently used first;
+    an entry whose blob is gone is a miss.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.budget = StoreBudget(root, ("entries", "blobs"), runtime_budget("WARMASTER_STEP_MEMO_MAX_BYTES", DEFAULT_MEMO_MAX_BYTES))
+        self._lock = threading.Lock()
+        self._code_hashes: dict[tuple[str, ...], tuple[tuple[tuple[str, int, int], ...], str]] = {}
+        self._imports: dict[Path, tuple[tuple[int, int], list[Path]]] = {}
+
+    def _imported_files(self, path: Path, search_roots: list[Path], repo_root: Path) -> list[Path]:
+        stat = path.stat()
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._imports.get(path)
+        if cached and cached[0] == signature:
+            return cached[1]
+        found = _module_files(path, search_roots, repo_root)
+        with self._lock:
+            self._imports[path] = (signature, found)
+        return found
+
+    def worker_code_hash(self, repo_root: Path, pythonpath: str, script: str) -> str:
+        repo_root = repo_root.resolve()
+        script_path = (repo_root / script).resolve()
+        worker_dir = (repo_root / pythonpath).resolve()
+        search_roots = [script_path.parent, worker_dir, script_path.parent.parent, repo_root]
+        files = {script_path}
+        pending = [script_path]
+        while pending:
+            for module in self._imported_files(pending.pop(), search_roots, repo_root):
+                if module not in files:
+                    files.add(module)
+                    pending.append(module)
+        if worker_dir.is_dir() and worker_dir != repo_root:
+            for path in worker_dir.rglob("*"):
+                relative = path.relative_to(worker_dir).parts
+                if path.is_file() and not SKIPPED_WORKER_DIRS & set(relative[:-1]) and "self_test" not in path.name and not path.name.endswith(".pyc"):
+                    files.add(path.resolve())
+        signature = tuple(sorted((str(path), path.stat().st_mtime_ns, path.stat().st_size) for path in files if path.is_file()))
+        cache_key = (str(repo_root), pythonpath, script)
+        with self._lock:
+            cached = self._code_hashes.get(cache_key)
+        if cached and cached[0] == signature:
+            return cached[1]
+        digest = hashlib.sha256()
+        for path, _mtime, _size in signature:
+            digest.update(Path(path).relative_to(repo_root).as_posix().encode("utf-8") + b"\0")
+            digest.update(_sha256_file(Path(path)).encode("ascii"))
+        with self._lock:
+            self._code_hashes[cache_key] = (signature, digest.hexdigest())
+        return digest.hexdigest()
+
+    def key(self, code_hash: str, request: dict[str, Any], input_hashes: dict[str, str], model_route: dict[str, Any]) -> str:
+        normalized = {key: value for key, value in request.items() if key not in VOLATILE_REQUEST_FIELDS}
+        material = {
+            "version": MEMO_KEY_VERSION,
+            "worker_code": code_hash,
+            "request": normalized,
+            "inputs": input_hashes,
+            "model_route": model_route,
+        }
+        return hashlib.sha256(json.dumps(material, ensure_ascii=False, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / "entries" / f"{key}.json"
+
+    def _blob_path(self, sha: str) -> Path:
+        return self.root / "blobs" / sha[:2] / sha
+
+    def _put_blob(self, path: Path) -> str:
+        sha = _sha256_file(path)
+        blob = self._blob_path(sha)
+        if blob.exists():
+            touch(blob)
+        else:
+            with atomic_replace(blob) as temp:
+                shutil.copyfile(path, temp)
+            self.budget.note_write(blob.stat().st_size)
+        return sha
+
+    def store(self, key: str, worker: str, step_id: str, payload: dict[str, Any], stdout: str, outputs: dict[str, Path]) -> bool:
+        """Record a finished step; ``outputs`` maps ``/work/`` paths to files on disk."""
+        files: dict[str, str] = {}
+        for artifact, path in outputs.items():
+            if path.is_file():
+                files[artifact] = self._put_blob(path)
+            elif path.is_dir():
+                for child in sorted(item for item in path.rglob("*") if item.is_file()):
+                    files[f"{artifact.rstrip('/')}/{child.relative_to(path).as_posix()}"] = self._put_blob(child)
+            else:
+                return False
+        entry = {"key": key, "worker": worker, "step_id": step_id, "payload": payload, "stdout": stdout, "artifacts": files}
+        entry_path = self._entry_path(key)
+        write_json_atomic(entry_path, entry, indent=None)
+        self.budget.note_write(entry_path.stat().st_size)
+        return True
+
+    def restore(self, key: str, host_path: Any) -> dict[str, Any] | None:
+        """Write a cached step's artifacts back through ``host_path`` and return its entry.
+
+        Returns None when there is no entry or one of its blobs is gone.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        artifacts = entry.get("artifacts") if isinstance(entry.get("artifacts"), dict) else {}
+        if any(not self._blob_path(str(sha)).is_file() for sha in artifacts.values()):
+            return None
+        touch(entry_path)
+        restored = 0
+        for artifact, sha in artifacts.items():
+            blob = self._blob_path(str(sha))
+            touch(blob)
+            target = host_path(artifact)
+            if target.is_file() and _sha256_file(target) == sha:
+                continue
+            try:
+                with atomic_replace(target) as temp:
+                    shutil.copyfile(blob, temp)
+            except FileNotFoundError:
+                return None  # pruned by another process since the check above; run the step
+            restored += 1
+        entry["artifacts_restored"] = restored
+        return entry
+
+
+_MEMOS: SharedStores[StepMemo] = SharedStores(StepMemo)
+
+
+def shared_step_memo(root: Path | None = None) -> StepMemo:
+    return _MEMOS.get(root or configured_memo_root())
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Any
+
+from .pipeline import write_json_atomic
+from .runtime_store import RUNTIME_ROOT, SharedStores, StoreBudget, runtime_budget, runtime_flag, runtime_root, touch
+
+DEFAULT_VERIFICATION_MEMO_ROOT = RUNTIME_ROOT / "verification_memo"
+DEFAULT_VERIFICATION_MEMO_MAX_BYTES = 256 * 1024 ** 2
+MEMO_KEY_VERSION = 1
+RESULT_FIELDS = ("returncode", "stdout", "stderr", "timed_out", "output_limit", "limit_reason")
+# Exit statuses from 128 up are signals: the cgroup's OOM killer, LimitCPU or
+# RuntimeMaxSec, which depend on host load rather than on the tree.
+SIGNAL_EXIT_MIN = 128
+
+
+def verification_memo_enabled() -> bool:
+    return runtime_flag("WARMASTER_VERIFICATION_MEMO")
+
+
+def configured_verification_memo_root() -> Path:
+    return runtime_root("WARMASTER_VERIFICATION_MEMO_ROOT", DEFAULT_VERIFICATION_MEMO_ROOT)
+
+
+def reusable_result(result: dict[str, Any]) -> bool:
+    """Whether a finished command would end the same way on the same tree.
+
+    Passes and ordinary failing exit codes are; timeouts, output and other
+    sandbox limits, cancellations and signal exits are not.
+    """
+    if set(result) != set(RESULT_FIELDS) or result.get("timed_out") or result.get("output_limit") or result.get("limit_reason"):
+        return False
+    returncode = result.get("returncode")
+    return isinstance(returncode, int) and 0 <= returncode < SIGNAL_EXIT_MIN
+
+
+class VerificationMemo:
+    """Results of sandboxed verification commands keyed by what they ran against.
+
+    ``entries/<key>.json`` holds the exit status and bounded output of one
+    command. The key covers the baseline fingerprint, the hash of the patch
+    applied on top of it, the command text and the sandbox profile, so the
+    same check on the same tree is answered without starting a sandbox.
+    Only ``reusable_result`` outcomes are recorded: timeouts and limit kills
+    depend on host load, not on the tree. Entries past
+    ``WARMASTER_VERIFICATION_MEMO_MAX_BYTES`` are evicted least recently used
+    first.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] = {}
+        self.budget = StoreBudget(
+            root, ("entries",), runtime_budget("WARMASTER_VERIFICATION_MEMO_MAX_BYTES", DEFAULT_VERIFICATION_MEMO_MAX_BYTES),
+        )
+
+    def key(self, baseline_fingerprint: str, patch_sha256: str, command: str, sandbox_profile: str) -> str:
+        material = {
+            "version": MEMO_KEY_VERSION,
+            "baseline": baseline_fingerprint,
+            "patch": patch_sha256,
+            "command": command,
+            "sandbox": sandbox_profile,
+        }
+        return hashlib.sha256(json.dumps(material, ensure_ascii=False, sort_keys=True).encode("utf-8")).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / "entries" / f"{key}.json"
+
+    def load(self, key: str) -> dict[str, Any] | None:
+        with self._lock:
+            cached = self._entries.get(key)
+        if cached is not None:
+            return dict(cached)
+        entry_path = self._entry_path(key)
+        try:
+            entry = json.loads(entry_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("key") != key:
+            return None
+        result = entry.get("result")
+        if not isinstance(result, dict) or not reusable_result(result):
+            return None
+        touch(entry_path)
+        with self._lock:
+            self._entries[key] = result
+        return dict(result)
+
+    def store(self, key: str, result: dict[str, Any]) -> bool:
+        """Record one finished command; returns False for results that are not reusable."""
+        if not reusable_result(result):
+            return False
+        entry_path = self._entry_path(key)
+        write_json_atomic(entry_path, {"key": key, "result": result}, indent=None)
+        with self._lock:
+            self._entries[key] = dict(result)
+        self.budget.note_write(entry_path.stat().st_size)
+        return True
+
+
+_MEMOS: SharedStores[VerificationMemo] = SharedStores(VerificationMemo)
+
+
+def shared_verification_memo(root: Path | None = None) -> VerificationMemo:
+    return _MEMOS.get(root or configured_verification_memo_root())
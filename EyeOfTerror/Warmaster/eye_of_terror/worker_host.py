@@ -0,0 +1,423 @@
+"""Pre-forked warm host for local Brigade worker steps.
+
+Every local step used to start a fresh interpreter: Python startup, the
+worker module and its imports, and the module-level playbook loads
+(``load_source_playbooks``, ``load_event_playbooks``) were paid again for
+each dispatch packet. The host is one long-lived interpreter that imports
+every registered worker module once and then runs each step in a freshly
+forked child, so a step starts from a pristine, already-warm copy of that
+state. Children get their own process group, cwd, environment, argv and
+stdout/stderr files; the host kills a child's group when its timeout expires,
+which keeps the isolation and timeout semantics of ``subprocess.run``.
+
+Worker modules read settings such as ``OCULARIS_RENDER_CONCURRENCY`` at import
+time, so a preloaded module only matches a cold start under the environment
+the host was started with. A job whose environment differs in anything but
+``PYTHONPATH`` is refused with ``WorkerHostUnavailable`` and runs cold.
+
+This module is stdlib-only. ``WarmWorkerHost`` is the executor-side client;
+running the file as a script starts the host itself, speaking JSON lines over
+two inherited pipe descriptors (stdout stays free for noisy worker imports).
+"""
+from __future__ import annotations
+
+import atexit
+import importlib
+import itertools
+import json
+import os
+import select
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any
+
+HOST_READY_TIMEOUT_SEC = 120
+HOST_RESULT_GRACE_SEC = 30
+HOST_POLL_SEC = 0.005
+# The host puts each worker's directory on sys.path itself.
+HOST_ENV_IGNORED = frozenset({"PYTHONPATH"})
+
+
+class WorkerHostUnavailable(RuntimeError):
+    """The warm host could not take the job; callers fall back to a cold subprocess."""
+
+
+def warm_host_supported() -> bool:
+    return hasattr(os, "fork") and os.environ.get("WARMASTER_WORKER_HOST", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+def environment_drift(host_env: dict[str, str], job_env: dict[str, str]) -> list[str]:
+    """Variables a job sets differently from the host, ignoring ``HOST_ENV_IGNORED``."""
+    names = (set(host_env) | set(job_env)) - HOST_ENV_IGNORED
+    return sorted(name for name in names if host_env.get(name) != job_env.get(name))
+
+
+# -- host side ---------------------------------------------------------------
+
+
+def preload_workers(repo_root: Path, commands: dict[str, list[str]]) -> tuple[dict[str, Any], dict[str, dict[str, Any]]]:
+    """Import every worker module; returns modules keyed by resolved script path."""
+    modules: dict[str, Any] = {}
+    report: dict[str, dict[str, Any]] = {}
+    for worker, (pythonpath, script) in sorted(commands.items()):
+        script_path = (repo_root / script).resolve()
+        if not script_path.exists():
+            report[worker] = {"ok": False, "error": "worker script does not exist"}
+            continue
+        directory = str(repo_root / pythonpath)
+        if directory not in sys.path:
+            sys.path.insert(0, directory)
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(script_path.stem)
+        except BaseException as exc:  # noqa: BLE001 - a broken worker still runs cold in its child.
+            report[worker] = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+            continue
+        if Path(getattr(module, "__file__", "") or "").resolve() != script_path or not callable(getattr(module, "main", None)):
+            report[worker] = {"ok": False, "error": "module name is shadowed or has no main()"}
+            continue
+        modules[str(script_path)] = module
+        report[worker] = {"ok": True, "import_ms": round((time.perf_counter() - started) * 1000, 1)}
+    return modules, report
+
+
+def _run_child(job: dict[str, Any], paths: dict[str, str], modules: dict[str, Any], protocol_fds: tuple[int, ...]) -> None:
+    code: Any = 70
+    try:
+        for fd in protocol_fds:
+            os.close(fd)
+        os.setpgid(0, 0)
+        null = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(null, 0)
+        os.dup2(os.open(paths["stdout"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 1)
+        os.dup2(os.open(paths["stderr"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 2)
+        os.chdir(job["cwd"])
+        os.environ.clear()
+        os.environ.update(job["env"])
+        sys.path.insert(0, job["pythonpath"])
+        script = str(Path(job["script"]).resolve())
+        sys.argv = [script, *job["args"]]
+        Path(paths["ready"]).write_text(repr(time.monotonic()), encoding="utf-8")
+        try:
+            module = modules.get(script)
+            if module is not None:
+                code = module.main()
+            else:
+                import runpy
+
+                runpy.run_path(script, run_name="__main__")
+                code = 0
+        except SystemExit as exc:
+            code = exc.code
+        except BaseException:  # noqa: BLE001 - mirror an uncaught exception in a cold interpreter.
+            traceback.print_exc()
+            code = 1
+        if code is None:
+            code = 0
+        elif not isinstance(code, int):
+            print(code, file=sys.stderr)
+            code = 1
+    finally:
+        try:
+            # A cold interpreter runs atexit handlers before exiting; os._exit skips them.
+            atexit._run_exitfuncs()
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code if isinstance(code, int) else 70)
+
+
+def serve(repo_root: Path, commands: dict[str, list[str]], requests_fd: int, responses_fd: int) -> int:
+    started = time.perf_counter()
+    modules, preload_report = preload_workers(repo_root, commands)
+    scratch = tempfile.mkdtemp(prefix="warm-worker-host.")
+
+    def send(message: dict[str, Any]) -> None:
+        data = (json.dumps(message, ensure_ascii=False) + "\n").encode("utf-8")
+        while data:
+            data = data[os.write(responses_fd, data):]
+
+    send({"type": "ready", "pid": os.getpid(), "preload_ms": round((time.perf_counter() - started) * 1000, 1), "preload": preload_report})
+    children: dict[int, dict[str, Any]] = {}
+    buffer = b""
+    accepting = True
+    try:
+        while accepting or children:
+            readable, _, _ = select.select([requests_fd] if accepting else [], [], [], HOST_POLL_SEC if children else None)
+            if readable:
+                chunk = os.read(requests_fd, 65536)
+                if not chunk:
+                    accepting = False
+                    for child in children.values():
+                        _kill_group(child["pid"])
+                buffer += chunk
+                while b"\n" in buffer:
+                    line, buffer = buffer.split(b"\n", 1)
+                    if not line.strip():
+                        continue
+                    job = json.loads(line)
+                    paths = {name: os.path.join(scratch, f"{job['id']}.{name}") for name in ("stdout", "stderr", "ready")}
+                    received = time.monotonic()
+                    sys.stdout.flush()
+                    sys.stderr.flush()
+                    pid = os.fork()
+                    if pid == 0:
+                        _run_child(job, paths, modules, (requests_fd, responses_fd))
+                    try:
+                        os.setpgid(pid, pid)
+                    except OSError:
+                        pass
+                    timeout = job.get("timeout")
+                    children[pid] = {
+                        "pid": pid,
+                        "job": job,
+                        "paths": paths,
+                        "received": received,
+                        "deadline": received + float(timeout) if timeout is not None else None,
+                        "timed_out": False,
+                    }
+            now = time.monotonic()
+            for child in children.values():
+                if child["deadline"] is not None and not child["timed_out"] and now >= child["deadline"]:
+                    child["timed_out"] = True
+                    _kill_group(child["pid"])
+            while children:
+                try:
+                    pid, status = os.waitpid(-1, os.WNOHANG)
+                except ChildProcessError:
+                    break
+                if pid == 0:
+                    break
+                child = children.pop(pid, None)
+                if child is not None:
+                    send(_child_outcome(child, status))
+    finally:
+        for child in children.values():
+            _kill_group(child["pid"])
+        shutil.rmtree(scratch, ignore_errors=True)
+    return 0
+
+
+def _kill_group(pid: int) -> None:
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except OSError:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            pass
+
+
+def _child_outcome(child: dict[str, Any], status: int) -> dict[str, Any]:
+    outputs: dict[str, str] = {}
+    for name in ("stdout", "stderr"):
+        path = Path(child["paths"][name])
+        try:
+            outputs[name] = path.read_bytes().decode("utf-8", errors="replace")
+        except OSError:
+            outputs[name] = ""
+        path.unlink(missing_ok=True)
+    ready = Path(child["paths"]["ready"])
+    startup_ms = None
+    try:
+        startup_ms = round((float(ready.read_text(encoding="utf-8")) - child["received"]) * 1000, 2)
+    except (OSError, ValueError):
+        pass
+    ready.unlink(missing_ok=True)
+    return {
+        "type": "result",
+        "id": child["job"]["id"],
+        "returncode": os.waitstatus_to_exitcode(status),
+        "timed_out": child["timed_out"],
+        "stdout": outputs["stdout"],
+        "stderr": outputs["stderr"],
+        "startup_ms": startup_ms,
+        "wall_ms": round((time.monotonic() - child["received"]) * 1000, 1),
+    }
+
+
+# -- executor side -----------------------------------------------------------
+
+
+class WarmWorkerHost:
+    """Client for one host process bound to a repository root.
+
+    ``run`` may be called from several threads at once; the host forks one
+    child per job and answers in completion order.
+    """
+
+    def __init__(self, repo_root: Path, commands: dict[str, tuple[str, str]]):
+        self.repo_root = Path(repo_root).resolve()
+        self.commands = {worker: [pythonpath, script] for worker, (pythonpath, script) in commands.items()}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._pending: dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._process: subprocess.Popen | None = None
+        self._requests: int | None = None
+        self._dead = False
+        self.environment: dict[str, str] = {}
+        self.ready_info: dict[str, Any] = {}
+        self.stats = {"jobs": 0, "timeouts": 0, "startup_ms_total": 0.0}
+
+    def start(self) -> None:
+        with self._lock:
+            if self._process is not None:
+                return
+            self.environment = dict(os.environ)
+            requests_read, requests_write = os.pipe()
+            responses_read, responses_write = os.pipe()
+            self._process = subprocess.Popen(
+                [
+                    sys.executable,
+                    str(Path(__file__).resolve()),
+                    "--repo-root",
+                    str(self.repo_root),
+                    "--commands",
+                    json.dumps(self.commands),
+                    "--requests-fd",
+                    str(requests_read),
+                    "--responses-fd",
+                    str(responses_write),
+                ],
+                cwd=self.repo_root,
+                env=self.environment,
+                pass_fds=(requests_read, responses_write),
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+            os.close(requests_read)
+            os.close(responses_write)
+            self._requests = requests_write
+            threading.Thread(target=self._read_responses, args=(responses_read,), name="warm-worker-host", daemon=True).start()
+
+    @property
+    def alive(self) -> bool:
+        return not self._dead and (self._process is None or self._process.poll() is None)
+
+    def _read_responses(self, fd: int) -> None:
+        with os.fdopen(fd, "rb") as stream:
+            for line in stream:
+                try:
+                    message = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if message.get("type") == "ready":
+                    self.ready_info = message
+                    self._ready.set()
+                    continue
+                future = self._pending.pop(int(message.get("id") or 0), None)
+                if future is not None:
+                    future.set_result(message)
+        self._dead = True
+        self._ready.set()
+        for job_id in list(self._pending):
+            future = self._pending.pop(job_id, None)
+            if future is not None:
+                future.set_exception(WorkerHostUnavailable("warm worker host exited"))
+
+    def run(self, pythonpath: str, script: str, args: list[str], env: dict[str, str], timeout: float | None) -> dict[str, Any]:
+        self.start()
+        if not self._ready.wait(HOST_READY_TIMEOUT_SEC) or self._dead:
+            raise WorkerHostUnavailable("warm worker host is not ready")
+        drift = environment_drift(self.environment, env)
+        if drift:
+            raise WorkerHostUnavailable(f"job environment differs from the warm host's: {', '.join(drift[:5])}")
+        job_id = next(self._ids)
+        future: Future = Future()
+        self._pending[job_id] = future
+        job = {
+            "id": job_id,
+            "pythonpath": str(self.repo_root / pythonpath),
+            "script": str(self.repo_root / script),
+            "args": [str(item) for item in args],
+            "cwd": str(self.repo_root),
+            "env": dict(env),
+            "timeout": timeout,
+        }
+        data = (json.dumps(job, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            with self._write_lock:
+                while data:
+                    data = data[os.write(self._requests, data):]  # type: ignore[arg-type]
+        except OSError as exc:
+            self._pending.pop(job_id, None)
+            self._dead = True
+            raise WorkerHostUnavailable(f"warm worker host is gone: {exc}") from exc
+        try:
+            outcome = future.result(timeout=None if timeout is None else float(timeout) + HOST_RESULT_GRACE_SEC)
+        except TimeoutError as exc:
+            self._pending.pop(job_id, None)
+            raise WorkerHostUnavailable("warm worker host did not answer") from exc
+        with self._lock:
+            self.stats["jobs"] += 1
+            self.stats["timeouts"] += int(bool(outcome.get("timed_out")))
+            self.stats["startup_ms_total"] += float(outcome.get("startup_ms") or 0.0)
+        return outcome
+
+    def close(self) -> None:
+        with self._lock:
+            process, requests = self._process, self._requests
+            self._process = self._requests = None
+            self._dead = True
+        if requests is not None:
+            os.close(requests)
+        if process is not None:
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+_HOSTS: dict[str, WarmWorkerHost] = {}
+_HOSTS_LOCK = threading.Lock()
+
+
+def shared_worker_host(repo_root: Path, commands: dict[str, tuple[str, str]]) -> WarmWorkerHost:
+    key = str(Path(repo_root).resolve())
+    with _HOSTS_LOCK:
+        host = _HOSTS.get(key)
+        if host is None or not host.alive:
+            if host is not None:
+                host.close()
+            host = _HOSTS[key] = WarmWorkerHost(Path(key), commands)
+        return host
+
+
+@atexit.register
+def close_worker_hosts() -> None:
+    with _HOSTS_LOCK:
+        hosts = list(_HOSTS.values())
+        _HOSTS.clear()
+    for host in hosts:
+        host.close()
+
+
+def main() -> int:
+    import argparse
+
+    if sys.path and Path(sys.path[0]).resolve() == Path(__file__).resolve().parent:
+        sys.path.pop(0)  # keep eye_of_terror's modules from shadowing worker imports
+    parser = argparse.ArgumentParser(description="Warm pre-forking host for local Brigade worker steps.")
+    parser.add_argument("--repo-root", required=True)
+    parser.add_argument("--commands", required=True)
+    parser.add_argument("--requests-fd", type=int, required=True)
+    parser.add_argument("--responses-fd", type=int, required=True)
+    args = parser.parse_args()
+    return serve(Path(args.repo_root), json.loads(args.commands), args.requests_fd, args.responses_fd)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import stat
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Iterable
+
+from .pipeline import write_json_atomic
+from .runtime_store import RUNTIME_ROOT, SharedStores, StoreBudget, atomic_replace, runtime_budget, runtime_flag, runtime_root
+
+DEFAULT_OBJECTS_ROOT = RUNTIME_ROOT / "workspace_objects"
+DEFAULT_OBJECTS_MAX_BYTES = 4 * 1024 ** 3
+STAT_INDEX_VERSION = 1
+# A file written within this window of being hashed can change again without
+# moving its stat signature on coarse filesystem clocks.  Such entries are
+# hashed again on the next capture, like Git's racily clean index entries.
+RACY_WINDOW_NS = 2_000_000_000
+# Git writes loose objects with Z_BEST_SPEED unless core.loosecompression says otherwise.
+LOOSE_OBJECT_COMPRESSION = 1
+
+
+def workspace_objects_enabled() -> bool:
+    return runtime_flag("WARMASTER_WORKSPACE_OBJECTS")
+
+
+def configured_objects_root() -> Path:
+    return runtime_root("WARMASTER_WORKSPACE_OBJECTS_ROOT", DEFAULT_OBJECTS_ROOT)
+
+
+def git_blob_id(data: bytes) -> str:
+    """SHA-1 object id Git assigns to ``data`` as a blob."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def _write_atomic(target: Path, data: bytes, mode: int) -> os.stat_result:
+    with atomic_replace(target) as temp:
+        temp.write_bytes(data)
+        os.chmod(temp, mode)
+    return target.lstat()
+
+
+def _link_or_copy(source: Path, target: Path) -> bool:
+    """Hardlink ``source`` to ``target``; False when the filesystem refuses."""
+    try:
+        os.link(source, target)
+    except OSError as exc:
+        if exc.errno not in {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}:
+            raise
+        return False
+    return True
+
+
+class StatIndex:
+    """Persistent ``repository path -> (stat signature, content hashes)`` map.
+
+    A path whose ``(dev, ino, mode, size, mtime_ns, ctime_ns)`` signature is
+    unchanged since it was hashed reuses the recorded sha256 and Git blob id;
+    only new or touched files are read again.  The bytes themselves live in
+    the owning ``WorkspaceObjectStore``; contents of the last capture stay in
+    memory so an unchanged file is not even read back from there.
+    """
+
+    def __init__(self, store: "WorkspaceObjectStore", repo_root: Path) -> None:
+        self.store = store
+        self.repo_root = str(repo_root)
+        self.path = store.root / "stat" / f"{hashlib.sha256(self.repo_root.encode('utf-8')).hexdigest()[:24]}.json"
+        self._lock = threading.Lock()
+        self._entries: dict[str, list[Any]] = {}
+        self._contents: dict[str, Any] = {}
+        self._dirty = False
+        try:
+            payload = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            payload = {}
+        if isinstance(payload, dict) and payload.get("version") == STAT_INDEX_VERSION and payload.get("root") == self.repo_root:
+            entries = payload.get("entries")
+            if isinstance(entries, dict):
+                self._entries = {str(key): value for key, value in entries.items() if isinstance(value, list) and len(value) == 9}
+
+    def lookup(self, rel: str, signature: tuple[int, ...]) -> tuple[str, str] | None:
+        """``(sha256, git blob id)`` recorded for ``rel`` at exactly this signature."""
+        with self._lock:
+            entry = self._entries.get(rel)
+        if entry is None or tuple(entry[:6]) != tuple(signature):
+            return None
+        if int(entry[8]) - int(signature[5]) < RACY_WINDOW_NS:
+            return None
+        return str(entry[6]), str(entry[7])
+
+    def record(self, rel: str, signature: tuple[int, ...], sha256: str, blob_id: str = "") -> None:
+        with self._lock:
+            self._entries[rel] = [*signature, sha256, blob_id, time.time_ns()]
+            self._dirty = True
+
+    def content(self, sha256: str) -> Any:
+        with self._lock:
+            return self._contents.get(sha256)
+
+    def remember(self, sha256: str, value: Any) -> None:
+        with self._lock:
+            self._contents[sha256] = value
+
+    def save(self, keep: Iterable[str], contents: Iterable[str]) -> None:
+        """Persist entries for the paths of the latest capture and forget the rest."""
+        keep_set = set(keep)
+        content_set = set(contents)
+        with self._lock:
+            stale = set(self._entries) - keep_set
+            for rel in stale:
+                del self._entries[rel]
+            self._contents = {sha: value for sha, value in self._contents.items() if sha in content_set}
+            if not (self._dirty or stale):
+                return
+            payload = {"version": STAT_INDEX_VERSION, "root": self.repo_root, "entries": dict(self._entries)}
+            self._dirty = False
+        write_json_atomic(self.path, payload, indent=None)
+
+
+class WorkspaceObjectStore:
+    """Content-addressed store shared by Skitarii workspace snapshots.
+
+    ``git/<aa>/<rest>`` holds every captured file as a Git loose object and
+    ``files/<aa>/<sha256>`` (``.x`` for executables) as a plain file to hardlink
+    into disposable baselines; ``stat/<repo>.json`` is the per-repository
+    ``StatIndex``.  Baselines are assembled under ``scratch/`` so the links
+    stay on one filesystem.  Loose objects are immutable; a plain file that was
+    written through a link no longer matches what this process verified and
+    is replaced before it is linked again.  Past
+    ``WARMASTER_WORKSPACE_OBJECTS_MAX_BYTES`` the oldest objects and files are
+    evicted; every caller holds the bytes and writes an evicted one again.
+    """
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.budget = StoreBudget(root, ("git", "files"), runtime_budget("WARMASTER_WORKSPACE_OBJECTS_MAX_BYTES", DEFAULT_OBJECTS_MAX_BYTES))
+        self._lock = threading.Lock()
+        self._indexes: dict[str, StatIndex] = {}
+        self._verified_files: dict[Path, tuple[int, int, int, int]] = {}
+
+    def git_object_path(self, blob_id: str) -> Path:
+        return self.root / "git" / blob_id[:2] / blob_id[2:]
+
+    def file_path(self, sha256: str, executable: bool = False) -> Path:
+        return self.root / "files" / sha256[:2] / (f"{sha256}.x" if executable else sha256)
+
+    def stat_index(self, repo_root: Path) -> StatIndex:
+        key = str(repo_root)
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is None:
+                index = StatIndex(self, repo_root)
+                self._indexes[key] = index
+            return index
+
+    def put(self, data: bytes) -> tuple[str, str]:
+        """Store ``data`` and return its ``(sha256, git blob id)``."""
+        blob_id = git_blob_id(data)
+        self.put_git_object(blob_id, data)
+        return hashlib.sha256(data).hexdigest(), blob_id
+
+    def put_git_object(self, blob_id: str, data: bytes) -> Path:
+        target = self.git_object_path(blob_id)
+        if not target.exists():
+            self.budget.note_write(_write_atomic(target, zlib.compress(b"blob %d\0" % len(data) + data, LOOSE_OBJECT_COMPRESSION), 0o444).st_size)
+        return target
+
+    def read(self, blob_id: str, size: int) -> bytes | None:
+        """Stored bytes of a blob when present, intact and of the expected size."""
+        try:
+            raw = zlib.decompress(self.git_object_path(blob_id).read_bytes())
+        except (OSError, zlib.error):
+            return None
+        header, _, data = raw.partition(b"\0")
+        if header != b"blob %d" % size or len(data) != size or git_blob_id(data) != blob_id:
+            return None
+        return data
+
+    def _verified_file(self, sha256: str, data: bytes, executable: bool) -> Path:
+        path = self.file_path(sha256, executable)
+        try:
+            current = path.lstat()
+        except FileNotFoundError:
+            current = None
+        mode = 0o755 if executable else 0o644
+        signature = (current.st_ino, current.st_size, current.st_mtime_ns, current.st_mode) if current else None
+        with self._lock:
+            known = self._verified_files.get(path)
+        if signature is None or signature != known:
+            if (
+                current is None or current.st_size != len(data)
+                or stat.S_IMODE(current.st_mode) != mode or path.read_bytes() != data
+            ):
+                current = _write_atomic(path, data, mode)
+                self.budget.note_write(current.st_size)
+            with self._lock:
+                self._verified_files[path] = (current.st_ino, current.st_size, current.st_mtime_ns, current.st_mode)
+        return path
+
+    def link_file(self, sha256: str, data: bytes, target: Path, executable: bool = False) -> None:
+        """Hardlink stored bytes to ``target``, writing them when links are refused."""
+        source = self._verified_file(sha256, data, executable)
+        try:
+            linked = _link_or_copy(source, target)
+        except FileExistsError:
+            target.unlink()
+            linked = _link_or_copy(source, target)
+        except FileNotFoundError:
+            linked = False  # evicted by the size bound since it was verified
+        if not linked:
+            target.write_bytes(data)
+
+    def link_git_object(self, blob_id: str, data: bytes, git_dir: Path) -> None:
+        """Place the loose object for ``data`` in ``git_dir``, hardlinked when possible."""
+        source = self.put_git_object(blob_id, data)
+        target = git_dir / "objects" / blob_id[:2] / blob_id[2:]
+        if target.exists():
+            return
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            linked = _link_or_copy(source, target)
+        except FileNotFoundError:
+            source = self.put_git_object(blob_id, data)
+            linked = _link_or_copy(source, target)
+        if not linked:
+            shutil.copyfile(source, target)
+            os.chmod(target, 0o444)
+
+    def scratch_dir(self) -> Path:
+        path = self.root / "scratch"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+
+_STORES: SharedStores[WorkspaceObjectStore] = SharedStores(WorkspaceObjectStore)
+
+
+def shared_workspace_objects(root: Path | None = None) -> WorkspaceObjectStore:
+    return _STORES.get(root or configured_objects_root())
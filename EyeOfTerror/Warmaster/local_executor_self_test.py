@@ -2,16 +2,18 @@
 from __future__ import annotations
 
 import json
+import os
 import sys
 import tempfile
 from pathlib import Path
+from unittest.mock import patch
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
 from EyeOfTerror.common_protocol import worker_order
-from eye_of_terror import local_executor
+from eye_of_terror import local_executor, step_memo
 from eye_of_terror.local_executor import execute_run, revision_contexts_from_result, terminal_payload_allows_completion
 
 
@@ -81,7 +83,7 @@ def main() -> int:
     if revision_contexts.get("draft_reconstruction", {}).get("source_steps") != ["critic_finding", "revision_dependency"]:
         raise AssertionError(f"bad revision source mapping: {revision_contexts}")
     repo_root = Path(__file__).resolve().parents[2]
-    with tempfile.TemporaryDirectory() as temp_dir:
+    with tempfile.TemporaryDirectory() as temp_dir, patch.dict(os.environ, {"WARMASTER_STEP_MEMO_ROOT": str(Path(temp_dir) / "step_memo")}):
         root = Path(temp_dir)
         legacy_run = root / "legacy-dispatch-run"
         legacy_dispatch = legacy_run / "dispatch"
@@ -335,6 +337,108 @@ print(json.dumps({"ok": True, "status": "completed", "summary": "flaky worker re
                 local_executor.WORKER_COMMANDS.pop("FlakyWorker", None)
             else:
                 local_executor.WORKER_COMMANDS["FlakyWorker"] = old_command
+        (flaky_worker_dir / "sleepy_worker.py").write_text(
+            """#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from pathlib import Path
+
+parser = argparse.ArgumentParser()
+parser.add_argument("dispatch")
+parser.add_argument("--workspace-root", required=True)
+args = parser.parse_args()
+packet = json.loads(Path(args.dispatch).read_text(encoding="utf-8"))
+time.sleep(float(packet["request"]["sleep_sec"]))
+Path(args.workspace_root).mkdir(parents=True, exist_ok=True)
+for artifact in packet["expected_artifacts"]:
+    target = Path(args.workspace_root) / artifact.removeprefix("/work/")
+    target.parent.mkdir(parents=True, exist_ok=True)
+    target.write_text(packet["step_id"], encoding="utf-8")
+print(json.dumps({"ok": True, "status": "completed", "summary": packet["step_id"], "artifacts": packet["expected_artifacts"]}))
+""",
+            encoding="utf-8",
+        )
+        old_command = local_executor.WORKER_COMMANDS.get("SleepyWorker")
+        local_executor.WORKER_COMMANDS["SleepyWorker"] = (".", "workers/sleepy_worker.py")
+        try:
+            parallel_run = root / "parallel-run"
+            parallel_dispatch = parallel_run / "dispatch"
+            write_json(
+                parallel_run / "contract.json",
+                {"task_id": "parallel-local", "goal": "test dependency-aware scheduling", "assigned_governor": "IskandarKhayon"},
+            )
+            plan = [
+                ("draft_a", 1.0, [], ["/work/a/draft.md"]),
+                ("draft_b", 1.0, [], ["/work/b/draft.md"]),
+                ("merge_a", 0.5, ["/work/a/draft.md"], ["/work/merged/merged.md"]),
+            ]
+            write_json(
+                parallel_run / "status.json",
+                {
+                    "task_id": "parallel-local",
+                    "governor": "IskandarKhayon",
+                    "steps": [{"step_id": step_id, "worker": "SleepyWorker"} for step_id, *_rest in plan],
+                    "dispatch_dir": str(parallel_dispatch),
+                },
+            )
+            for step_id, sleep_sec, inputs, outputs in plan:
+                packet = dispatch_packet(step_id, "SleepyWorker", {"task_id": f"parallel-local:{step_id}", "input_artifacts": inputs, "sleep_sec": sleep_sec})
+                packet.update({"input_artifacts": inputs, "expected_artifacts": outputs})
+                packet["request"]["step"] = {"expected_artifacts": outputs}
+                write_json(parallel_dispatch / f"{step_id}.json", packet)
+            parallel_summary = execute_run(flaky_repo, parallel_run, root / "parallel-work", timeout_sec=30, parallel_steps=4)
+            schedule = parallel_summary.get("schedule", {})
+            if not parallel_summary.get("ok") or [item.get("step_id") for item in parallel_summary.get("steps", [])] != ["draft_a", "draft_b", "merge_a"]:
+                raise AssertionError(f"parallel local execution failed or reordered steps: {parallel_summary}")
+            if schedule.get("depends_on") != {"draft_a": [], "draft_b": [], "merge_a": ["draft_a"]} or schedule.get("critical_path") != ["draft_a", "merge_a"]:
+                raise AssertionError(f"parallel local execution derived the wrong dependency graph: {schedule}")
+            if schedule.get("peak_parallel_steps", 0) < 2 or not schedule["wall_time_sec"] < schedule["serial_step_time_sec"]:
+                raise AssertionError(f"independent steps did not overlap: {schedule}")
+            report = json.loads((parallel_run / "execution_report.json").read_text(encoding="utf-8"))
+            parallel_ledger = json.loads((parallel_run / "task_ledger.json").read_text(encoding="utf-8"))
+            if report.get("schedule", {}).get("critical_path_sec", 0) < 1.4 or [item.get("step_id") for item in parallel_ledger.get("steps", [])] != ["draft_a", "draft_b", "merge_a"]:
+                raise AssertionError(f"critical path or ledger order was not recorded: {report} {parallel_ledger.get('steps')}")
+            shared_dispatch = root / "shared-directory-dispatch"
+            for step_id, outputs in (("notes", ["/work/shared/notes.json"]), ("draft", ["/work/shared/draft.md"]), ("other", ["/work/other/draft.md"])):
+                write_json(shared_dispatch / f"{step_id}.json", {"step_id": step_id, "input_artifacts": [], "expected_artifacts": outputs})
+            shared_graph = local_executor.step_dependency_graph([shared_dispatch / f"{step_id}.json" for step_id in ("notes", "draft", "other")])
+            if shared_graph != {"notes": set(), "draft": {"notes"}, "other": set()}:
+                raise AssertionError(f"steps sharing a /work/ directory must keep their declared order: {shared_graph}")
+            serial_summary = execute_run(flaky_repo, parallel_run, root / "serial-work", timeout_sec=30, parallel_steps=1)
+            if not serial_summary.get("ok") or serial_summary["schedule"]["peak_parallel_steps"] != 1:
+                raise AssertionError(f"parallel_steps=1 must run the plan serially: {serial_summary}")
+            step_ids = [step_id for step_id, *_rest in plan]
+            resume_summary = execute_run(flaky_repo, parallel_run, root / "parallel-work", timeout_sec=30, step_ids=step_ids, execution_mode="resume")
+            resume_ledger = json.loads((parallel_run / "task_ledger.json").read_text(encoding="utf-8"))
+            hit_events = [event["payload"]["step_id"] for event in resume_ledger.get("events", []) if event.get("type") == "step_memo_hit"]
+            if not resume_summary.get("ok") or resume_summary.get("step_memo_hits") != step_ids or hit_events != step_ids or resume_summary["schedule"]["wall_time_sec"] > 1.0:
+                raise AssertionError(f"resume did not reuse memoized steps: {resume_summary} {hit_events}")
+            (root / "parallel-work" / "b" / "draft.md").unlink()
+            restored_summary = execute_run(flaky_repo, parallel_run, root / "parallel-work", timeout_sec=30, step_ids=["draft_b"], execution_mode="resume")
+            if restored_summary["steps"][0].get("launch", {}).get("artifacts_restored") != 1 or (root / "parallel-work" / "b" / "draft.md").read_text(encoding="utf-8") != "draft_b":
+                raise AssertionError(f"memo hit did not restore the output artifact: {restored_summary}")
+            sleepy_script = flaky_worker_dir / "sleepy_worker.py"
+            sleepy_script.write_text(sleepy_script.read_text(encoding="utf-8") + "# changed\n", encoding="utf-8")
+            changed_summary = execute_run(flaky_repo, parallel_run, root / "parallel-work", timeout_sec=30, step_ids=["draft_b"], execution_mode="resume")
+            if not changed_summary.get("ok") or changed_summary.get("step_memo_hits") or changed_summary["steps"][0].get("launch", {}).get("mode") == "memo":
+                raise AssertionError(f"changed worker code must not reuse the memo: {changed_summary}")
+            with patch.dict(step_memo.SIBLING_INPUTS, {"SleepyWorker": ("sibling_notes.json",)}):
+                sibling = root / "parallel-work" / "b" / "sibling_notes.json"
+                sibling.write_text("first", encoding="utf-8")
+                execute_run(flaky_repo, parallel_run, root / "parallel-work", timeout_sec=30, step_ids=["draft_b"], execution_mode="resume")
+                sibling_hit = execute_run(flaky_repo, parallel_run, root / "parallel-work", timeout_sec=30, step_ids=["draft_b"], execution_mode="resume")
+                sibling.write_text("second", encoding="utf-8")
+                sibling_miss = execute_run(flaky_repo, parallel_run, root / "parallel-work", timeout_sec=30, step_ids=["draft_b"], execution_mode="resume")
+            if sibling_hit.get("step_memo_hits") != ["draft_b"] or sibling_miss.get("step_memo_hits") or sibling_miss["steps"][0].get("launch", {}).get("mode") == "memo":
+                raise AssertionError(f"a changed undeclared sibling must re-run the step: {sibling_hit} {sibling_miss}")
+        finally:
+            if old_command is None:
+                local_executor.WORKER_COMMANDS.pop("SleepyWorker", None)
+            else:
+                local_executor.WORKER_COMMANDS["SleepyWorker"] = old_command
     print("[ok] local executor")
     return 0
 
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[2]
+WARM_ROOT = ROOT / "EyeOfTerror" / "Warmaster"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+if str(WARM_ROOT) not in sys.path:
+    sys.path.insert(0, str(WARM_ROOT))
+
+from eye_of_terror import runtime_store
+from eye_of_terror.step_memo import StepMemo
+from eye_of_terror.verification_memo import VerificationMemo
+
+
+def aged(path: Path, seconds: float) -> None:
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def result(stdout: str) -> dict:
+    return {"returncode": 0, "stdout": stdout, "stderr": "", "timed_out": False, "output_limit": False, "limit_reason": ""}
+
+
+class StoreBudgetTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp.cleanup)
+        self.root = Path(self.temp.name)
+
+    def write(self, name: str, size: int, age: float) -> Path:
+        path = self.root / "entries" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"x" * size)
+        aged(path, age)
+        return path
+
+    def test_oldest_files_go_first_and_recent_ones_stay(self) -> None:
+        touched = self.write("touched", 400, 5_000)
+        oldest = self.write("oldest", 400, 4_000)
+        older = self.write("older", 400, 3_000)
+        recent = self.write("recent", 400, 2_000)
+        runtime_store.touch(touched)
+        budget = runtime_store.StoreBudget(self.root, ("entries",), 1_000)
+        self.assertEqual(budget.prune(), 800)
+        self.assertEqual([path.exists() for path in (touched, oldest, older, recent)], [True, False, False, True])
+        self.assertEqual(budget.prune(), 0)
+
+    def test_grace_period_keeps_files_a_concurrent_run_may_use(self) -> None:
+        paths = [self.write(f"entry-{index}", 400, 10) for index in range(4)]
+        self.assertEqual(runtime_store.StoreBudget(self.root, ("entries",), 500).prune(), 0)
+        self.assertTrue(all(path.exists() for path in paths))
+
+    def test_zero_budget_is_unbounded(self) -> None:
+        path = self.write("entry", 4_000, 4_000)
+        budget = runtime_store.StoreBudget(self.root, ("entries",), 0)
+        budget.note_write(4_000)
+        self.assertEqual(budget.prune(), 0)
+        self.assertTrue(path.exists())
+
+    def test_verification_memo_stays_within_its_budget(self) -> None:
+        with (
+            patch.dict(os.environ, {"WARMASTER_VERIFICATION_MEMO_MAX_BYTES": "2000"}),
+            patch.object(runtime_store, "PRUNE_GRACE_SEC", 0),
+        ):
+            memo = VerificationMemo(self.root / "memo")
+            keys = [memo.key("baseline", "patch", f"check {index}", "profile") for index in range(12)]
+            for age, key in zip(range(len(keys), 0, -1), keys):
+                self.assertTrue(memo.store(key, result("y" * 200)))
+                aged(memo._entry_path(key), age)
+        kept = [key for key in keys if memo._entry_path(key).exists()]
+        self.assertLess(len(kept), len(keys))
+        self.assertEqual(kept, keys[-len(kept):])
+        self.assertLessEqual(sum(memo._entry_path(key).stat().st_size for key in kept), 2000)
+
+    def test_step_memo_misses_when_a_blob_was_evicted(self) -> None:
+        memo = StepMemo(self.root / "memo")
+        output = self.root / "work" / "notes.json"
+        output.parent.mkdir(parents=True)
+        output.write_text("{}", encoding="utf-8")
+        self.assertTrue(memo.store("key", "Worker", "step", {"ok": True}, "", {"/work/notes.json": output}))
+        restored = self.root / "restored"
+        self.assertIsNotNone(memo.restore("key", lambda artifact: restored / artifact.removeprefix("/work/")))
+        for blob in (memo.root / "blobs").rglob("*"):
+            if blob.is_file():
+                blob.unlink()
+        self.assertIsNone(memo.restore("key", lambda artifact: restored / artifact.removeprefix("/work/")))
+
+    def test_shared_stores_are_one_per_resolved_root(self) -> None:
+        stores = runtime_store.SharedStores(VerificationMemo)
+        first = stores.get(self.root / "memo")
+        self.assertIs(stores.get(self.root / "memo" / ".." / "memo"), first)
+        stores.clear()
+        self.assertIsNot(stores.get(self.root / "memo"), first)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 import subprocess
 import sys
 import tempfile
@@ -15,6 +16,7 @@ if str(WARM_ROOT) not in sys.path:
     sys.path.insert(0, str(WARM_ROOT))
 
 from eye_of_terror import skitarii_bridge as bridge
+from eye_of_terror import workspace_objects
 
 
 def git(root: Path, *args: str) -> None:
@@ -72,5 +74,118 @@ class FullRepositorySnapshotTest(unittest.TestCase):
             self.assertEqual(len(snapshot.fingerprint), 64)
 
 
+def commit_all(root: Path) -> None:
+    git(root, "add", "-A")
+    git(
+        root,
+        "-c",
+        "user.name=Snapshot Test",
+        "-c",
+        "user.email=snapshot@example.invalid",
+        "commit",
+        "-qm",
+        "baseline",
+    )
+
+
+def tree_id(root: Path) -> str:
+    return subprocess.run(
+        ["git", "rev-parse", "HEAD^{tree}"], cwd=root, check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+class IncrementalSnapshotTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp.name) / "repo"
+        self.root.mkdir()
+        git(self.root, "init", "-q")
+        (self.root / "code.py").write_text("print('ok')\n", encoding="utf-8")
+        (self.root / "data.bin").write_bytes(b"\x00\x01binary\xff")
+        (self.root / "run.sh").write_text("#!/bin/sh\necho run\n", encoding="utf-8")
+        (self.root / "run.sh").chmod(0o755)
+        (self.root / "link.py").symlink_to("code.py")
+        commit_all(self.root)
+        patches = [
+            patch.object(bridge, "REPO_ROOT", self.root),
+            patch.object(workspace_objects, "RACY_WINDOW_NS", 0),
+            patch.dict(os.environ, {"WARMASTER_WORKSPACE_OBJECTS_ROOT": str(Path(self.temp.name) / "objects")}),
+        ]
+        for item in patches:
+            item.start()
+            self.addCleanup(item.stop)
+        self.addCleanup(self.temp.cleanup)
+
+    def legacy_snapshot(self) -> bridge.WorkspaceSnapshot:
+        with patch.dict(os.environ, {"WARMASTER_WORKSPACE_OBJECTS": "0"}):
+            return bridge._full_repo_snapshot()
+
+    def test_unchanged_files_are_not_read_again(self) -> None:
+        first = bridge._full_repo_snapshot()
+        (self.root / "code.py").write_text("print('changed')\n", encoding="utf-8")
+        reads: list[str] = []
+        real_read = Path.read_bytes
+
+        def counting_read(path: Path) -> bytes:
+            reads.append(path.name)
+            return real_read(path)
+
+        with patch.object(Path, "read_bytes", counting_read):
+            second = bridge._full_repo_snapshot()
+        self.assertEqual(reads, ["code.py"])
+        self.assertEqual(second["code.py"], "print('changed')\n")
+        self.assertNotEqual(first.fingerprint, second.fingerprint)
+        legacy = self.legacy_snapshot()
+        self.assertEqual(second.fingerprint, legacy.fingerprint)
+        self.assertEqual(
+            bridge._snapshot_content_fingerprint(second), bridge._snapshot_content_fingerprint(legacy),
+        )
+
+        # A new process starts from the persisted stat index and the object store.
+        workspace_objects._STORES.clear()
+        with patch.object(Path, "read_bytes", counting_read):
+            reads.clear()
+            third = bridge._full_repo_snapshot()
+        self.assertNotIn("code.py", reads)
+        self.assertEqual(dict(third), dict(legacy))
+        self.assertEqual(third.blobs, legacy.blobs)
+        self.assertEqual(third.fingerprint, legacy.fingerprint)
+
+    def test_materialized_baseline_links_store_objects(self) -> None:
+        snapshot = bridge._full_repo_snapshot()
+        legacy_dir = Path(self.temp.name) / "legacy"
+        with patch.dict(os.environ, {"WARMASTER_WORKSPACE_OBJECTS": "0"}):
+            bridge._materialize_snapshot(self.legacy_snapshot(), legacy_dir)
+        first = Path(tempfile.mkdtemp(dir=bridge._verification_scratch_dir()))
+        bridge._materialize_snapshot(snapshot, first)
+        self.assertEqual(tree_id(first), tree_id(legacy_dir))
+        self.assertGreater((first / "code.py").stat().st_nlink, 1)
+        self.assertTrue((first / "run.sh").stat().st_mode & 0o111)
+        self.assertFalse((first / "code.py").stat().st_mode & 0o111)
+        self.assertTrue((first / "link.py").is_symlink())
+
+        # Writing through a link must not leak into the next baseline.
+        with (first / "code.py").open("w", encoding="utf-8") as handle:
+            handle.write("tampered\n")
+        second = Path(tempfile.mkdtemp(dir=bridge._verification_scratch_dir()))
+        bridge._materialize_snapshot(snapshot, second)
+        self.assertEqual((second / "code.py").read_text(encoding="utf-8"), "print('ok')\n")
+        self.assertEqual(tree_id(second), tree_id(legacy_dir))
+
+    def test_sandbox_copy_does_not_alias_identical_files(self) -> None:
+        (self.root / "copy.py").write_text("print('ok')\n", encoding="utf-8")
+        commit_all(self.root)
+        baseline = Path(tempfile.mkdtemp(dir=bridge._verification_scratch_dir()))
+        bridge._materialize_snapshot(bridge._full_repo_snapshot(), baseline)
+        self.assertTrue((baseline / "code.py").samefile(baseline / "copy.py"))
+        work = Path(self.temp.name) / "work"
+        work.mkdir()
+        subprocess.run(["/bin/bash", "-c", bridge._baseline_copy_command(str(baseline), str(work))], check=True)
+        self.assertFalse((work / "code.py").samefile(work / "copy.py"))
+        (work / "code.py").write_text("changed\n", encoding="utf-8")
+        self.assertEqual((work / "copy.py").read_text(encoding="utf-8"), "print('ok')\n")
+        self.assertTrue((work / "link.py").is_symlink())
+
+
 if __name__ == "__main__":
     unittest.main()
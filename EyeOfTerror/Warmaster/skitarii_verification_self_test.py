@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import os
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+ROOT = Path(__file__).resolve().parents[2]
+WARM_ROOT = ROOT / "EyeOfTerror" / "Warmaster"
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+if str(WARM_ROOT) not in sys.path:
+    sys.path.insert(0, str(WARM_ROOT))
+
+from eye_of_terror import skitarii_bridge as bridge
+from eye_of_terror import verification_memo
+
+
+class FakeSandbox:
+    """Stands in for bubblewrap: ``sleep:<s>:<rc>:<stdout>`` or ``hang`` until cancelled."""
+
+    def __init__(self) -> None:
+        self.calls: list[str] = []
+        self.cancelled: list[str] = []
+        self.running = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def __call__(self, command: str, worktree: Path, timeout: int = 180, *, cancel=None) -> bridge.SandboxResult:
+        with self.lock:
+            self.calls.append(command)
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        try:
+            if command == "hang":
+                if cancel is not None and cancel.wait(10):
+                    self.cancelled.append(command)
+                    return bridge.SandboxResult(130, "", "", limit_reason="cancelled")
+                return bridge.SandboxResult(0, "", "")
+            if command == "timeout":
+                return bridge.SandboxResult(124, "", "", timed_out=True, limit_reason="timeout")
+            _, seconds, returncode, stdout = command.split(":", 3)
+            time.sleep(float(seconds))
+            return bridge.SandboxResult(int(returncode), stdout + "\n", "")
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+class ParallelCheckSetTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.temp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp.cleanup)
+        self.sandbox = FakeSandbox()
+        for patcher in (
+            patch.object(bridge, "_run_sandboxed_check", self.sandbox),
+            patch.dict(os.environ, {
+                "SKITARII_VERIFY_PARALLEL": "8",
+                "WARMASTER_VERIFICATION_MEMO_ROOT": str(Path(self.temp.name) / "memo"),
+            }),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        verification_memo._MEMOS.clear()
+        self.addCleanup(verification_memo._MEMOS.clear)
+
+    def test_checks_and_oracles_run_side_by_side(self) -> None:
+        checks = [
+            {"cmd": f"sleep:0.3:0:value{index}", "oracle": f"sleep:0.3:0:value{index}"}
+            for index in range(4)
+        ]
+        started = time.monotonic()
+        passed, results, reason = bridge._run_check_set(checks, Path(self.temp.name))
+        elapsed = time.monotonic() - started
+        self.assertTrue(passed, reason)
+        self.assertEqual([record["command"] for record in results], [check["cmd"] for check in checks])
+        self.assertTrue(all(record["oracle_returncode"] == 0 for record in results))
+        self.assertEqual(self.sandbox.peak, 8)
+        self.assertLess(elapsed, 1.2)
+
+    def test_first_failure_in_declared_order_cancels_later_checks(self) -> None:
+        checks = [
+            {"cmd": "sleep:0.2:0:ok"},
+            {"cmd": "sleep:0.1:1:broken"},
+            {"cmd": "hang"},
+        ]
+        passed, results, reason = bridge._run_check_set(checks, Path(self.temp.name))
+        self.assertFalse(passed)
+        self.assertEqual(reason, "a bounded isolated verification check failed")
+        self.assertEqual([record["ok"] for record in results], [True, False])
+        self.assertEqual(self.sandbox.cancelled, ["hang"])
+
+    def test_invalid_command_is_reported_after_the_checks_before_it(self) -> None:
+        checks = [{"cmd": "sleep:0:0:ok"}, {"cmd": ""}, {"cmd": "hang"}]
+        passed, results, reason = bridge._run_check_set(checks, Path(self.temp.name))
+        self.assertFalse(passed)
+        self.assertEqual(reason, "verification command is empty or oversized")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(self.sandbox.calls, ["sleep:0:0:ok"])
+
+    def test_unchanged_checks_on_the_same_tree_are_memoized(self) -> None:
+        checks = [
+            {"cmd": "sleep:0:0:same", "oracle": "sleep:0.0:0:same"},
+            {"cmd": "sleep:0:1:failing"},
+        ]
+        scope = ("baseline-fingerprint", "patch-sha")
+        first = bridge._run_check_set(checks, Path(self.temp.name), scope)
+        self.assertEqual(len(self.sandbox.calls), 3)
+        verification_memo._MEMOS.clear()
+        second = bridge._run_check_set(checks, Path(self.temp.name), scope)
+        self.assertEqual(len(self.sandbox.calls), 3)
+        self.assertEqual(first[:1] + first[2:], second[:1] + second[2:])
+        self.assertTrue(all(record["memoized"] for record in second[1]))
+        self.assertEqual(
+            [{key: value for key, value in record.items() if key != "memoized"} for record in second[1]],
+            first[1],
+        )
+        bridge._run_check_set(checks, Path(self.temp.name), ("baseline-fingerprint", "revised-patch"))
+        self.assertEqual(len(self.sandbox.calls), 6)
+        bridge._run_check_set(checks, Path(self.temp.name))
+        self.assertEqual(len(self.sandbox.calls), 9)
+
+    def test_timed_out_and_killed_checks_are_not_memoized(self) -> None:
+        scope = ("baseline-fingerprint", "patch-sha")
+        for command in ("timeout", "sleep:0:137:oom-killed", "sleep:0:152:cpu-limit"):
+            for _ in range(2):
+                passed, results, _ = bridge._run_check_set([{"cmd": command}], Path(self.temp.name), scope)
+                self.assertFalse(passed)
+                self.assertNotIn("memoized", results[0])
+            self.assertEqual(self.sandbox.calls[-2:], [command, command])
+        self.assertEqual(len(self.sandbox.calls), 6)
+        self.assertFalse(verification_memo.reusable_result(
+            {"returncode": 1, "stdout": "", "stderr": "", "timed_out": False, "output_limit": True, "limit_reason": "output"},
+        ))
+
+
+class VerificationParallelismTest(unittest.TestCase):
+    def test_parallelism_fits_cpus_and_memory(self) -> None:
+        with (
+            patch.dict(os.environ, {"SKITARII_VERIFY_PARALLEL": ""}),
+            patch.object(bridge.os, "sched_getaffinity", return_value=set(range(16))),
+            patch.object(bridge, "_available_memory_bytes", return_value=5 * 1024 ** 3),
+        ):
+            self.assertEqual(bridge._verification_parallelism(), 2)
+        with (
+            patch.dict(os.environ, {"SKITARII_VERIFY_PARALLEL": ""}),
+            patch.object(bridge.os, "sched_getaffinity", return_value={0}),
+            patch.object(bridge, "_available_memory_bytes", return_value=0),
+        ):
+            self.assertEqual(bridge._verification_parallelism(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
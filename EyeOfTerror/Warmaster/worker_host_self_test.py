@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+WARM_ROOT = REPO_ROOT / "EyeOfTerror" / "Warmaster"
+if str(WARM_ROOT) not in sys.path:
+    sys.path.insert(0, str(WARM_ROOT))
+
+from eye_of_terror import local_executor
+from eye_of_terror.worker_host import WarmWorkerHost, WorkerHostUnavailable, warm_host_supported
+
+WORKER_SOURCE = '''
+import atexit
+import os
+import sys
+
+# Read once at import time, like OCULARIS_RENDER_CONCURRENCY.
+LIMIT = os.environ.get("WORKER_HOST_TEST_LIMIT", "unset")
+
+
+def main():
+    atexit.register(lambda: print("atexit ran", flush=True))
+    print(f"limit={LIMIT} args={sys.argv[1:]} cwd={os.path.basename(os.getcwd())}")
+    print("to stderr", file=sys.stderr)
+    mode = sys.argv[1]
+    if mode == "raise":
+        raise RuntimeError("worker crashed")
+    if mode == "exit":
+        sys.exit(3)
+    if mode == "message":
+        sys.exit("fatal message")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
+'''
+
+MODES = ("ok", "exit", "raise", "message")
+
+
+def write_worker(root: Path) -> dict[str, tuple[str, str]]:
+    (root / "workers").mkdir(parents=True)
+    (root / "workers" / "host_probe_worker.py").write_text(WORKER_SOURCE, encoding="utf-8")
+    return {"HostProbe": ("workers", "workers/host_probe_worker.py")}
+
+
+def cold(root: Path, script: str, args: list[str], env: dict[str, str]) -> tuple[int, str, str]:
+    completed = subprocess.run([sys.executable, str(root / script), *args], cwd=root, env=env, text=True, capture_output=True, timeout=60, check=False)
+    return completed.returncode, completed.stdout, completed.stderr
+
+
+def normalized_stderr(stderr: str) -> str:
+    # Tracebacks differ only in the frames above the worker's own code.
+    lines = stderr.splitlines()
+    return "\n".join(lines[:1] + lines[-1:]) if "Traceback" in stderr else stderr
+
+
+def main() -> int:
+    if not warm_host_supported():
+        print("worker host self-test skipped: no fork() or WARMASTER_WORKER_HOST is off")
+        return 0
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = Path(temp_dir)
+        commands = write_worker(root)
+        pythonpath, script = commands["HostProbe"]
+        with patch.dict(os.environ, {"WORKER_HOST_TEST_LIMIT": "host"}):
+            host = WarmWorkerHost(root, commands)
+            try:
+                host.start()
+                env = dict(os.environ, PYTHONPATH=str(root / pythonpath))
+                for mode in MODES:
+                    outcome = host.run(pythonpath, script, [mode], env, 60)
+                    warm = (int(outcome["returncode"]), outcome["stdout"], normalized_stderr(outcome["stderr"]))
+                    returncode, stdout, stderr = cold(root, script, [mode], env)
+                    if warm != (returncode, stdout, normalized_stderr(stderr)):
+                        raise AssertionError(f"warm and cold runs differ for {mode}: {warm} != {(returncode, stdout, stderr)}")
+                if host.ready_info.get("preload", {}).get("HostProbe", {}).get("ok") is not True:
+                    raise AssertionError(f"probe worker was not preloaded: {host.ready_info}")
+                drifted = dict(env, WORKER_HOST_TEST_LIMIT="job")
+                try:
+                    host.run(pythonpath, script, ["ok"], drifted, 60)
+                except WorkerHostUnavailable as exc:
+                    if "WORKER_HOST_TEST_LIMIT" not in str(exc):
+                        raise AssertionError(f"drift error does not name the variable: {exc}")
+                else:
+                    raise AssertionError("warm host ran a job whose environment differs from its own")
+                if host.run(pythonpath, script, ["ok"], dict(env, PYTHONPATH="elsewhere"), 60)["returncode"] != 0:
+                    raise AssertionError("a different PYTHONPATH alone should still run warm")
+            finally:
+                host.close()
+
+            with patch.object(local_executor, "WORKER_COMMANDS", commands):
+                completed, launch = local_executor.launch_worker(root, pythonpath, script, ["ok"], env, 60)
+                if launch.get("mode") != "warm_host" or "limit=host" not in completed.stdout:
+                    raise AssertionError(f"matching environment should run warm: {launch} {completed.stdout!r}")
+                completed, launch = local_executor.launch_worker(root, pythonpath, script, ["ok"], drifted, 60)
+                if launch.get("mode") != "subprocess" or "WORKER_HOST_TEST_LIMIT" not in launch.get("warm_host_error", ""):
+                    raise AssertionError(f"drifted environment should fall back to a cold start: {launch}")
+                if "limit=job" not in completed.stdout or "atexit ran" not in completed.stdout:
+                    raise AssertionError(f"cold fallback did not see the job environment: {completed.stdout!r}")
+    print("worker host self-test passed")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""Turn latency and event-loop stalls of the Core ledger under concurrent load.
+
+``legacy`` reproduces the pre-writer ledger: a fresh connection and an fsynced
+transaction per write, called directly on the event loop. ``writer`` is the
+current ledger: one writer thread, group commit, and ``offload`` from async
+code. Each mode runs N concurrent turns (accept + resolution with a
+commitment and an outbox effect) while a steward loop claims and finishes the
+effects, and a heartbeat coroutine measures how long the loop was blocked.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ShushunyaCore.ledger import Ledger
+
+MODES = ("legacy", "writer")
+
+
+class LegacyLedger(Ledger):
+    @contextmanager
+    def write(self) -> Iterator[Any]:
+        with self._lock, self.connect() as db:
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except Exception:
+                db.rollback()
+                raise
+            else:
+                db.commit()
+
+    async def offload(self, method, /, *args, **kwargs) -> Any:
+        return method(*args, **kwargs)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def run_turn(ledger: Ledger, worker: int, index: int) -> float:
+    key = f"bench-{worker}-{index}"
+    started = time.perf_counter()
+    turn_id, _cached = await ledger.offload(ledger.accept_turn, key, {"source": "bench", "text": key})
+    await asyncio.sleep(0)  # the model call would happen here
+    commitment_id = f"commitment-{key}"
+    await ledger.offload(
+        ledger.save_turn_resolution,
+        idempotency_key=key,
+        turn_id=turn_id,
+        resolution={"ok": True, "turn_id": turn_id},
+        commitment={
+            "id": commitment_id,
+            "kind": "archive_delivery",
+            "goal": key,
+            "spec": {"goal": key},
+            "state": "queued",
+            "delegate_kind": "archive_adapter",
+        },
+        effect={
+            "id": f"effect-{key}",
+            "commitment_id": commitment_id,
+            "kind": "deliver",
+            "destination": "archive_adapter",
+            "payload": {"text": key},
+        },
+    )
+    return (time.perf_counter() - started) * 1000.0
+
+
+async def steward(ledger: Ledger, done: asyncio.Event, counters: dict[str, int]) -> None:
+    while not done.is_set() or counters["pending"]:
+        claim = await ledger.offload(ledger.claim_outbox, "bench-steward", 60)
+        if not claim:
+            counters["pending"] = 0
+            await asyncio.sleep(0.005)
+            continue
+        counters["pending"] = 1
+        await ledger.offload(
+            ledger.finish_effect,
+            effect_id=str(claim["message_id"]),
+            lease_token=str(claim["lease_token"]),
+            ok=True,
+            result={"explanation": "bench delivery"},
+        )
+        counters["delivered"] += 1
+
+
+async def heartbeat(done: asyncio.Event, lags: list[float]) -> None:
+    while not done.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        lags.append(max(0.0, (time.perf_counter() - started) * 1000.0 - 1.0))
+
+
+async def measure(mode: str, concurrency: int, turns: int) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as temp:
+        ledger = (LegacyLedger if mode == "legacy" else Ledger)(Path(temp) / "core.sqlite3")
+        ledger.initialize()
+        done = asyncio.Event()
+        lags: list[float] = []
+        counters = {"delivered": 0, "pending": 0}
+        monitor = asyncio.create_task(heartbeat(done, lags))
+        custodian = asyncio.create_task(steward(ledger, done, counters))
+
+        async def worker(worker_id: int) -> list[float]:
+            return [await run_turn(ledger, worker_id, index) for index in range(turns)]
+
+        started = time.perf_counter()
+        latencies = [value for batch in await asyncio.gather(*(worker(i) for i in range(concurrency))) for value in batch]
+        elapsed = time.perf_counter() - started
+        done.set()
+        await custodian
+        await monitor
+        status = ledger.status()
+        ledger.close()
+    return {
+        "mode": mode,
+        "turns": len(latencies),
+        "turns_per_sec": round(len(latencies) / elapsed, 1),
+        "turn_ms_p50": round(statistics.median(latencies), 2),
+        "turn_ms_p99": round(percentile(latencies, 0.99), 2),
+        "loop_lag_ms_p99": round(percentile(lags, 0.99), 2),
+        "loop_lag_ms_max": round(max(lags or [0.0]), 2),
+        "effects_delivered": counters["delivered"],
+        "writer": status.get("writer") if mode == "writer" else None,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--turns", type=int, default=40, help="turns per concurrent worker")
+    parser.add_argument("--mode", choices=[*MODES, "all"], default="all")
+    parser.add_argument("--report-json", default="")
+    args = parser.parse_args()
+    modes = MODES if args.mode == "all" else (args.mode,)
+    results = []
+    for mode in modes:
+        result = asyncio.run(measure(mode, args.concurrency, args.turns))
+        results.append(result)
+        print(
+            f"{mode}: {result['turns_per_sec']} turns/s, turn p50 {result['turn_ms_p50']} ms "
+            f"p99 {result['turn_ms_p99']} ms, loop lag p99 {result['loop_lag_ms_p99']} ms "
+            f"max {result['loop_lag_ms_max']} ms",
+            flush=True,
+        )
+    if args.report_json:
+        Path(args.report_json).write_text(json.dumps({"results": results}, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
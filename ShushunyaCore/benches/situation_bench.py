@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""Situation assembly cost on oversized turn envelopes.
+
+Each scenario inflates a different part of the envelope (capability manifest,
+recalled memory, history, everything) past the context budget, so assembly
+has to fall through to a compacted tier. The bench reports per-turn latency,
+the tier that was produced and how many JSON serializations one turn cost.
+Run it before and after a change to ``situation.py`` to compare.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from ShushunyaCore import situation as situation_module
+from ShushunyaCore.identity import Identity
+from ShushunyaCore.ledger import Ledger
+from ShushunyaCore.organs import Organs
+from ShushunyaCore.preferences import Preferences
+from ShushunyaCore.relationship import Relationship
+from ShushunyaCore.schema import TurnEnvelope
+from ShushunyaCore.situation import SituationAssembler
+
+SCENARIOS = ("manifest", "recall", "history", "everything")
+
+
+class CountingJson:
+    """Stand-in for the ``json`` module inside situation.py."""
+
+    def __init__(self) -> None:
+        self.dumps_calls = 0
+        self.dumps_chars = 0
+
+    def dumps(self, *args: Any, **kwargs: Any) -> str:
+        encoded = json.dumps(*args, **kwargs)
+        self.dumps_calls += 1
+        self.dumps_chars += len(encoded)
+        return encoded
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(json, name)
+
+
+def prose(words: int, seed: str) -> str:
+    vocabulary = ("сборка", "галага", "кнопка", "память", "условие", "apk", "android", "задача", seed)
+    return " ".join(vocabulary[index % len(vocabulary)] for index in range(words)) + "."
+
+
+def manifest(scale: int) -> dict[str, Any]:
+    capabilities = []
+    for index in range(12):
+        capabilities.append(
+            {
+                "action": f"action_{index}",
+                "available": True,
+                "description": prose(40 * scale, f"cap{index}"),
+                "limits": [prose(20 * scale, f"limit{index}")],
+                "required_fields": ["goal", "task_id"],
+            }
+        )
+    capabilities.append(
+        {
+            "action": "deliver_artifact",
+            "available": True,
+            "artifacts": [
+                {"artifact_id": f"art_{index:032x}", "filename": f"build-{index}.apk", "size_bytes": 1_000 + index}
+                for index in range(10 * scale)
+            ],
+        }
+    )
+    return {"principle": prose(30, "principle"), "capabilities": capabilities}
+
+
+def envelope(scenario: str, index: int) -> TurnEnvelope:
+    big = {"manifest": scenario in {"manifest", "everything"}, "recall": scenario in {"recall", "everything"}}
+    history_items = 40 if scenario in {"history", "everything"} else 4
+    return TurnEnvelope.model_validate(
+        {
+            "idempotency_key": f"bench-{scenario}-{index}",
+            "source": "app",
+            "text": "А помнишь задачу про галагу и условие с кнопкой? " + prose(60, f"turn{index}"),
+            "recent_history": [
+                {"role": "user" if item % 2 else "assistant", "content": prose(200, f"history{item}")}
+                for item in range(history_items)
+            ],
+            "capability_manifest": manifest(40 if big["manifest"] else 1),
+            "context": {
+                "persona": prose(400, "persona"),
+                "recalled_memory": prose(6_000 if big["recall"] else 200, f"recall{index}"),
+                "task_page_context": prose(1_500, "taskpage"),
+                "live_roster": "\n".join(f"- core-task-{item} — running" for item in range(60)),
+                "pending_reports": {"reports": [prose(60, f"report{item}") for item in range(10)]},
+            },
+        }
+    )
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def tier(situation: dict[str, Any]) -> str:
+    if not situation.get("context_compacted"):
+        return "full"
+    if "pending_reports" in situation:
+        return "compact"
+    if "rules" not in situation:
+        return "emergency"
+    return "last_resort" if any("question" in item for item in situation.get("pending_decisions", [])) else "minimal"
+
+
+def measure(assembler: SituationAssembler, scenario: str, turns: int) -> dict[str, Any]:
+    envelopes = [envelope(scenario, index) for index in range(turns)]
+    counter = CountingJson()
+    original = situation_module.json
+    situation_module.json = counter
+    latencies: list[float] = []
+    tiers: dict[str, int] = {}
+    try:
+        for item in envelopes:
+            started = time.perf_counter()
+            situation = assembler.assemble(item)
+            latencies.append((time.perf_counter() - started) * 1000.0)
+            tiers[tier(situation)] = tiers.get(tier(situation), 0) + 1
+    finally:
+        situation_module.json = original
+    return {
+        "scenario": scenario,
+        "envelope_chars": len(envelopes[0].model_dump_json()),
+        "turns": turns,
+        "ms_p50": round(statistics.median(latencies), 3),
+        "ms_p99": round(percentile(latencies, 0.99), 3),
+        "json_dumps_per_turn": round(counter.dumps_calls / turns, 1),
+        "json_chars_per_turn": round(counter.dumps_chars / turns),
+        "tiers": tiers,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--budget", type=int, default=2_800)
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+    parser.add_argument("--report-json", default="")
+    args = parser.parse_args()
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    results = []
+    with tempfile.TemporaryDirectory() as temp:
+        ledger = Ledger(Path(temp) / "core.sqlite3")
+        ledger.initialize()
+        identity = Identity(ledger)
+        relationship = Relationship(ledger)
+        identity.seed()
+        relationship.seed()
+        assembler = SituationAssembler(
+            SimpleNamespace(context_char_budget=args.budget),
+            ledger,
+            identity,
+            relationship,
+            Preferences(ledger),
+            Organs(SimpleNamespace()),
+        )
+        for scenario in scenarios:
+            result = measure(assembler, scenario, args.turns)
+            results.append(result)
+            print(
+                f"{scenario}: {result['envelope_chars']} envelope chars, p50 {result['ms_p50']} ms "
+                f"p99 {result['ms_p99']} ms, {result['json_dumps_per_turn']} dumps "
+                f"({result['json_chars_per_turn']} chars)/turn, tiers {result['tiers']}",
+                flush=True,
+            )
+        ledger.close()
+    if args.report_json:
+        Path(args.report_json).write_text(json.dumps({"results": results}, ensure_ascii=False, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
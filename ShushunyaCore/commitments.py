@@ -792,7 +792,8 @@ class Commitments:
                     "required_action": question,
                     "resume_condition": "Ответ будет передан в связанную recovery-миссию.",
                 }
-                return self.transition(
+                return await self.ledger.offload(
+                    self.transition,
                     item["id"],
                     "waiting_user",
                     honest_status=question,
@@ -835,7 +836,8 @@ class Commitments:
                     ),
                     "requires_user": True,
                 }
-                return self.transition(
+                return await self.ledger.offload(
+                    self.transition,
                     item["id"],
                     "waiting_user",
                     honest_status=lineage_repair["explanation"],
@@ -847,7 +849,8 @@ class Commitments:
                 )
             external = self._external_diagnostic(exc.evidence)
             if external:
-                return self.transition(
+                return await self.ledger.offload(
+                    self.transition,
                     item["id"],
                     "waiting_external",
                     honest_status=external["explanation"],
@@ -886,7 +889,8 @@ class Commitments:
                         ),
                     }
                 )
-                return self._bounded_retry(
+                return await self.ledger.offload(
+                    self._bounded_retry,
                     item,
                     diagnostic=recovery_error,
                     result={
@@ -896,7 +900,8 @@ class Commitments:
                     },
                     seconds=30,
                 )
-            return self._bounded_retry(
+            return await self.ledger.offload(
+                self._bounded_retry,
                 item,
                 diagnostic=recovery_error,
                 result={
@@ -913,7 +918,8 @@ class Commitments:
             or dispatched.get("task_id")
             or recovery_payload["task_id"]
         ).strip()
-        return self.transition(
+        return await self.ledger.offload(
+            self.transition,
             item["id"],
             "working",
             honest_status=(
@@ -984,14 +990,16 @@ class Commitments:
                 "required_action": "Исправить опубликованную continuation-команду или повторить её после восстановления органа.",
                 "resume_condition": "Абаддон опубликует и примет однозначный POST action.",
             }
-            return self._bounded_retry(
+            return await self.ledger.offload(
+                self._bounded_retry,
                 item,
                 diagnostic=diagnostic,
                 result=_snapshot_record(snapshot),
             )
         new_ref = str(dispatched.get("task_id") or item["delegate_ref"])
         revision = "revision" in joined or "reprepare" in joined or self._nested_state(snapshot) in REVISION_STATES
-        return self.transition(
+        return await self.ledger.offload(
+            self.transition,
             item["id"],
             "revising" if revision else "working",
             honest_status=(
@@ -1062,7 +1070,7 @@ class Commitments:
                 "required_action": "Повторить сверку, не объявляя работу завершённой.",
                 "resume_condition": "Абаддон снова отвечает на orchestration snapshot.",
             }
-            return self._bounded_retry(item, diagnostic=diagnostic, seconds=30)
+            return await self.ledger.offload(self._bounded_retry, item, diagnostic=diagnostic, seconds=30)
 
         status = str(snapshot.get("status") or "unknown").lower()
         phase = str(snapshot.get("phase") or "").lower()
@@ -1091,14 +1099,16 @@ class Commitments:
             and not revision_required
             and not failure_status
         ):
-            return self.transition(
+            return await self.ledger.offload(
+                self.transition,
                 item["id"],
                 "succeeded",
                 honest_status="Абаддон подтвердил терминальное завершение; итог сохранён как факт.",
                 result=_snapshot_record(snapshot),
             )
         if status == "cancelled" or phase == "cancelled":
-            return self.transition(
+            return await self.ledger.offload(
+                self.transition,
                 item["id"],
                 "cancelled",
                 honest_status="Миссия отменена.",
@@ -1106,7 +1116,8 @@ class Commitments:
             )
 
         if needs_user:
-            return self.transition(
+            return await self.ledger.offload(
+                self.transition,
                 item["id"],
                 "waiting_user",
                 honest_status=needs_user["explanation"],
@@ -1114,7 +1125,8 @@ class Commitments:
                 result=_snapshot_record(snapshot),
             )
         if external:
-            return self.transition(
+            return await self.ledger.offload(
+                self.transition,
                 item["id"],
                 "waiting_external",
                 honest_status=external["explanation"],
@@ -1126,7 +1138,8 @@ class Commitments:
         # is ongoing; never resend apply merely because its idempotent action is
         # still visible in the snapshot.
         if status in {"apply_intent", "applied_unverified", "publishing", "push_pending", "protocol_finalize_pending", "cancelling"}:
-            return self.transition(
+            return await self.ledger.offload(
+                self.transition,
                 item["id"],
                 "working",
                 honest_status=f"Абаддон подтверждает фазу {status}; терминальный результат ещё не доказан.",
@@ -1160,7 +1173,8 @@ class Commitments:
             return continuation
 
         if revision_required:
-            return self.transition(
+            return await self.ledger.offload(
+                self.transition,
                 item["id"],
                 "revising",
                 honest_status=f"Абаддон подтверждает внутреннюю ревизию ({nested or phase or status}); завершение ещё не доказано.",
@@ -1192,7 +1206,8 @@ class Commitments:
                 "required_action": "Исправить orchestration snapshot или вернуть документированное состояние.",
                 "resume_condition": "Абаддон вернёт однозначный status и фактические доказательства прогресса.",
             }
-            return self._bounded_retry(
+            return await self.ledger.offload(
+                self._bounded_retry,
                 item,
                 diagnostic=diagnostic,
                 result=_snapshot_record(snapshot),
@@ -1207,7 +1222,8 @@ class Commitments:
             if latest_step
             else f"Абаддон сообщает состояние {phase or status}; завершение ещё не подтверждено."
         )
-        return self.transition(
+        return await self.ledger.offload(
+            self.transition,
             item["id"],
             "working",
             honest_status=honest,
@@ -1215,7 +1231,7 @@ class Commitments:
         )
 
     async def reconcile_all(self) -> dict[str, int]:
-        items = self.ledger.list_commitments(include_terminal=False, limit=100)
+        items = await self.ledger.offload(self.ledger.list_commitments, include_terminal=False, limit=100)
         checked = 0
         changed = 0
         now = utc_now()
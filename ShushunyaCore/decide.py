@@ -4,8 +4,6 @@ import json
 import re
 from typing import Any
 
-import httpx
-
 from .attention import decide_attention
 from .authority import (
     ALLOWED_ACTIONS,
@@ -1245,12 +1243,14 @@ class DecisionEngine:
             "response_format": {"type": "json_object"},
             "chat_template_kwargs": {"enable_thinking": False},
         }
-        async with httpx.AsyncClient(timeout=self.settings.llm_timeout_sec) as client:
-            response = await client.post(
-                f"{self.settings.llm_base_url}/chat/completions",
-                json=request,
-                headers={"X-LLM-Route": "gemma", "X-LLM-Priority": "chat"},
-            )
+        response = await self.situation.organs.request(
+            "llm_dispatcher",
+            "POST",
+            f"{self.settings.llm_base_url}/chat/completions",
+            json=request,
+            headers={"X-LLM-Route": "gemma", "X-LLM-Priority": "chat"},
+            timeout=self.settings.llm_timeout_sec,
+        )
         response.raise_for_status()
         body = response.json()
         content = str((((body.get("choices") or [{}])[0].get("message") or {}).get("content")) or "")
@@ -1318,7 +1318,7 @@ class DecisionEngine:
             "forced_action": envelope.forced_action,
             "correlation_id": envelope.correlation_id,
         }
-        turn_id, cached = self.ledger.accept_turn(envelope.idempotency_key, request_payload)
+        turn_id, cached = await self.ledger.offload(self.ledger.accept_turn, envelope.idempotency_key, request_payload)
         if cached:
             return cached
         continuation_veto = (
@@ -1744,7 +1744,8 @@ class DecisionEngine:
             # reasoning; Gemma is instructed to return only a rationale summary.
             "protocol": model_trace,
         }
-        return self.ledger.save_turn_resolution(
+        return await self.ledger.offload(
+            self.ledger.save_turn_resolution,
             idempotency_key=envelope.idempotency_key,
             turn_id=turn_id,
             resolution=resolution,
@@ -98,6 +98,9 @@ class Identity:
         )
 
     def snapshot(self) -> dict[str, Any]:
+        return dict(self.ledger.cached_projection(("identity", "snapshot"), ("identity",), self._load_snapshot))
+
+    def _load_snapshot(self) -> dict[str, Any]:
         result: dict[str, Any] = {}
         for key in IDENTITY_DEFAULTS:
             item = self.ledger.projection_get("identity", key)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import json
 import os
 import sqlite3
 import threading
+import time
 import uuid
+from collections import deque
+from concurrent.futures import Future
 from contextlib import contextmanager
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
@@ -29,6 +33,19 @@ COMMITMENT_STATES = {
     "cancelled",
 }
 MAX_PERSISTED_EVIDENCE_BYTES = 24 * 1024
+# Writes queued while one transaction is being fsynced share the next commit.
+WRITER_MAX_BATCH = 64
+WRITER_IDLE_SEC = 30.0
+PROJECTION_CACHE_ENTRIES = 64
+# Tables behind the cached read projections and the topic each row change
+# bumps. ``state_projection`` rows bump their own namespace (identity,
+# relationship, ...).
+PROJECTION_TOPICS = {
+    "commitments": "'commitment'",
+    "state_projection": "{row}.namespace",
+    "preference_candidates": "'preferences'",
+    "preference_rules": "'preferences'",
+}
 MAX_PERSISTED_STATUS_CHARS = 2_000
 _PERSISTED_FACT_FIELDS = (
     "task_id",
@@ -343,10 +360,252 @@ class _ClosingConnection(sqlite3.Connection):
             self.close()
 
 
+class _ProjectionCache:
+    """Decoded read projections tagged with the versions of their topics.
+
+    A topic version is bumped only after the commit that changed one of its
+    rows, so a value loaded while a write is in flight is at worst tagged with
+    the older version and reloaded on the next read. Callers get the cached
+    object itself and must treat it as read-only.
+    """
+
+    def __init__(self, max_entries: int = PROJECTION_CACHE_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self.enabled = True
+        self._lock = threading.Lock()
+        self._versions: dict[str, int] = {}
+        self._entries: dict[Any, tuple[tuple[int, ...], Any]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def bump(self, topic: str) -> None:
+        with self._lock:
+            self._versions[topic] = self._versions.get(topic, 0) + 1
+
+    def get(self, key: Any, topics: tuple[str, ...], load) -> Any:
+        with self._lock:
+            versions = tuple(self._versions.get(topic, 0) for topic in topics)
+            entry = self._entries.get(key)
+            if self.enabled and entry is not None and entry[0] == versions:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        value = load()
+        with self._lock:
+            if self.enabled and versions == tuple(self._versions.get(topic, 0) for topic in topics):
+                if key not in self._entries and len(self._entries) >= self.max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                self._entries[key] = (versions, value)
+        return value
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "versions": dict(self._versions),
+            }
+
+
+class _Handoff:
+    """Lend the writer connection to a ``with ledger.write()`` body.
+
+    The writer thread opens the caller's savepoint, then blocks until the body
+    in the caller's thread finishes; an exception re-raised here rolls back
+    only that caller's savepoint.
+    """
+
+    def __init__(self) -> None:
+        self.db: sqlite3.Connection | None = None
+        self.error: BaseException | None = None
+        self.acquired = threading.Event()
+        self.released = threading.Event()
+
+    def __call__(self, db: sqlite3.Connection) -> None:
+        self.db = db
+        self.acquired.set()
+        self.released.wait()
+        if self.error is not None:
+            raise self.error
+
+    def release(self, error: BaseException | None = None) -> None:
+        self.error = error
+        self.released.set()
+
+
+class _LedgerWriter:
+    """Single writer thread with a persistent connection and group commit.
+
+    Every queued job runs inside its own savepoint of one shared transaction;
+    a failing job rolls back only its savepoint. Futures resolve only after
+    the COMMIT that made them durable, so callers never observe a result that
+    a crash could still lose.
+    """
+
+    def __init__(self, ledger: "Ledger") -> None:
+        self.ledger = ledger
+        self._cond = threading.Condition()
+        self._queue: deque[tuple[Any, Future]] = deque()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self.stats = {"transactions": 0, "jobs": 0, "max_batch": 0, "commit_seconds": 0.0}
+
+    def submit(self, fn) -> Future:
+        future: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise LedgerError("ledger writer is closed")
+            self._queue.append((fn, future))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="shushunya-ledger-writer", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return future
+
+    def is_writer_thread(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def close(self, timeout: float = 5.0) -> None:
+        with self._cond:
+            self._closed = True
+            thread = self._thread
+            self._cond.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def _run(self) -> None:
+        db: sqlite3.Connection | None = None
+        try:
+            while True:
+                with self._cond:
+                    if not self._queue and not self._closed:
+                        self._cond.wait(WRITER_IDLE_SEC)
+                    if not self._queue:
+                        # Idle or closed: release the connection; the next
+                        # submit starts a fresh writer.
+                        self._thread = None
+                        return
+                    batch = [self._queue.popleft() for _ in range(min(len(self._queue), WRITER_MAX_BATCH))]
+                try:
+                    if db is None:
+                        db = self.ledger._writer_connection()
+                    reusable = self._commit_batch(db, batch)
+                except BaseException as exc:  # noqa: BLE001 - fail the batch, keep the writer alive
+                    _fail_futures(batch, exc)
+                    reusable = False
+                if not reusable and db is not None:
+                    # Unknown transaction state: the next batch gets a fresh connection.
+                    _close_quietly(db)
+                    db = None
+        finally:
+            if db is not None:
+                _close_quietly(db)
+            with self._cond:
+                if self._thread is threading.current_thread():
+                    # Exited without clearing _thread: let submit (or the
+                    # restart below) start a new writer instead of queueing
+                    # behind a dead one.
+                    self._thread = None
+                    if self._queue:
+                        self._thread = threading.Thread(target=self._run, name="shushunya-ledger-writer", daemon=True)
+                        self._thread.start()
+
+    def _commit_batch(self, db: sqlite3.Connection, batch: list[tuple[Any, Future]]) -> bool:
+        """Run and commit one batch; False when ``db`` must not be reused."""
+        batch = [(fn, future) for fn, future in batch if future.set_running_or_notify_cancel()]
+        if not batch:
+            return True
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        local = self.ledger._local
+        started = time.perf_counter()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+        except Exception as exc:
+            _fail_futures(batch, exc)
+            # A busy database leaves the connection usable; a transaction
+            # left open by an earlier failure does not.
+            return not db.in_transaction
+        aborted: BaseException | None = None
+        local.db = db
+        local.notices = notices = []
+        try:
+            for fn, future in batch:
+                db.execute("SAVEPOINT ledger_job")
+                mark = len(notices)
+                try:
+                    value = fn(db)
+                except BaseException as exc:  # noqa: BLE001 - delivered to the caller's future
+                    del notices[mark:]
+                    try:
+                        db.execute("ROLLBACK TO ledger_job")
+                        db.execute("RELEASE ledger_job")
+                    except sqlite3.Error as rollback_error:
+                        # SQLite already abandoned the whole transaction;
+                        # nothing in this batch can be committed.
+                        aborted = rollback_error
+                        outcomes.append((future, None, exc))
+                        break
+                    outcomes.append((future, None, exc))
+                else:
+                    db.execute("RELEASE ledger_job")
+                    outcomes.append((future, value, None))
+            if aborted is None:
+                db.execute("COMMIT")
+        except BaseException as exc:  # noqa: BLE001 - fail the batch, keep the writer alive
+            aborted = exc
+        finally:
+            local.db = None
+            local.notices = None
+        if aborted is not None:
+            reusable = True
+            if db.in_transaction:
+                try:
+                    db.execute("ROLLBACK")
+                except sqlite3.Error:
+                    reusable = False
+            failed = {id(future) for future, _value, _error in outcomes}
+            for future, _value, error in outcomes:
+                future.set_exception(error or aborted)
+            _fail_futures([(fn, future) for fn, future in batch if id(future) not in failed], aborted)
+            return reusable
+        self.stats["transactions"] += 1
+        self.stats["jobs"] += len(batch)
+        self.stats["max_batch"] = max(self.stats["max_batch"], len(batch))
+        self.stats["commit_seconds"] += time.perf_counter() - started
+        self.ledger._publish(notices)
+        for future, value, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(value)
+        return True
+
+
+def _fail_futures(batch: list[tuple[Any, Future]], error: BaseException) -> None:
+    for _fn, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+
+def _close_quietly(db: sqlite3.Connection) -> None:
+    try:
+        db.close()
+    except sqlite3.Error:
+        pass
+
+
 class Ledger:
     def __init__(self, db_path: Path):
         self.db_path = Path(db_path)
         self._lock = threading.RLock()
+        self._local = threading.local()
+        self._writer = _LedgerWriter(self)
+        self._listeners: list[Any] = []
+        self._projections = _ProjectionCache()
         self.ready = False
         self.integrity_error = ""
 
@@ -362,17 +621,143 @@ class Ledger:
         db.execute("PRAGMA synchronous = FULL")
         return db
 
+    def _writer_connection(self) -> sqlite3.Connection:
+        # Autocommit mode: the writer issues BEGIN/SAVEPOINT/COMMIT itself.
+        # One long-lived connection keeps its prepared-statement cache warm.
+        db = sqlite3.connect(
+            self.db_path,
+            timeout=5.0,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA foreign_keys = ON")
+        db.execute("PRAGMA busy_timeout = 5000")
+        db.execute("PRAGMA synchronous = FULL")
+        self._watch_projection_tables(db)
+        return db
+
+    def _watch_projection_tables(self, db: sqlite3.Connection) -> None:
+        """Report every row change behind a cached projection, whichever code
+        path issued the SQL. TEMP triggers live only on this connection, so
+        other connections to the file are unaffected."""
+        db.create_function("ledger_projection_changed", 1, self.projection_changed)
+        try:
+            for table, topic in PROJECTION_TOPICS.items():
+                for operation, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                    db.execute(
+                        f"CREATE TEMP TRIGGER IF NOT EXISTS watch_{table}_{operation.lower()} "
+                        f"AFTER {operation} ON main.{table} "
+                        f"BEGIN SELECT ledger_projection_changed({topic.format(row=row)}); END"
+                    )
+        except sqlite3.OperationalError:
+            # Written before initialize(): changes cannot be observed, so stop
+            # serving cached projections rather than risk stale ones.
+            self._projections.enabled = False
+
+    def projection_changed(self, topic: str) -> None:
+        """Invalidate cached projections of ``topic`` once the write commits."""
+        self._notice("projection.changed", str(topic))
+
+    def cached_projection(self, key: Any, topics: tuple[str, ...], load) -> Any:
+        """Return ``load()``, reusing the last result while none of ``topics``
+        has changed. The result is shared between callers: read-only."""
+        return self._projections.get(key, topics, load)
+
+    def submit(self, fn) -> Future:
+        """Queue ``fn(db)`` for the writer thread; the future resolves after commit."""
+        return self._writer.submit(fn)
+
+    async def offload(self, method, /, *args, **kwargs) -> Any:
+        """Run a blocking ledger call without stalling the event loop."""
+        return await asyncio.to_thread(method, *args, **kwargs)
+
+    def close(self) -> None:
+        self._writer.close()
+
+    def subscribe(self, listener) -> None:
+        """``listener(kind, effect_id)`` runs after the commit that made the
+        change durable: ``effect.enqueued`` or ``effect.finished``. It may be
+        called from any thread and must not block."""
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def unsubscribe(self, listener) -> None:
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _notice(self, kind: str, effect_id: str) -> None:
+        pending = getattr(self._local, "notices", None)
+        if pending is None:
+            self._publish([(kind, effect_id)])
+        else:
+            pending.append((kind, effect_id))
+
+    def _publish(self, notices: list[tuple[str, str]]) -> None:
+        for kind, effect_id in notices:
+            if kind == "projection.changed":
+                self._projections.bump(effect_id)
+                continue
+            for listener in list(self._listeners):
+                try:
+                    listener(kind, effect_id)
+                except Exception:  # noqa: BLE001 - a listener never fails a committed write
+                    pass
+
+    @contextmanager
+    def _savepoint(self, db: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+        notices = getattr(self._local, "notices", None)
+        mark = len(notices) if notices is not None else 0
+        db.execute("SAVEPOINT ledger_nested")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK TO ledger_nested")
+            db.execute("RELEASE ledger_nested")
+            if notices is not None:
+                del notices[mark:]
+            raise
+        else:
+            db.execute("RELEASE ledger_nested")
+
     @contextmanager
     def write(self) -> Iterator[sqlite3.Connection]:
-        with self._lock, self.connect() as db:
-            db.execute("BEGIN IMMEDIATE")
-            try:
+        """Run the body in its own savepoint of the writer's next group commit.
+
+        Nested writes on the same thread (or inside a submitted job) become
+        nested savepoints of the enclosing write.
+        """
+        current = getattr(self._local, "db", None)
+        if current is not None:
+            with self._savepoint(current) as db:
                 yield db
-            except Exception:
-                db.rollback()
-                raise
-            else:
-                db.commit()
+            return
+        handoff = _Handoff()
+        future = self.submit(handoff)
+        while not handoff.acquired.wait(0.05):
+            if future.done():
+                future.result()  # BEGIN failed: surface it to the caller
+                raise LedgerError("ledger writer finished without running the write")
+        self._local.db = handoff.db
+        self._local.notices = notices = []
+        try:
+            yield handoff.db
+        except BaseException as exc:
+            self._local.db = None
+            self._local.notices = None
+            handoff.release(exc)
+            try:
+                future.result()
+            except BaseException:  # noqa: BLE001 - the body's own exception wins
+                pass
+            raise
+        else:
+            self._local.db = None
+            self._local.notices = None
+            handoff.release()
+            future.result()
+            self._publish(notices)
 
     def initialize(self) -> None:
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -565,6 +950,7 @@ class Ledger:
                 now,
             ),
         )
+        self._notice("effect.enqueued", effect_id)
         return effect_id
 
     def accept_turn(self, idempotency_key: str, request: dict[str, Any]) -> tuple[str, dict[str, Any] | None]:
@@ -736,6 +1122,7 @@ class Ledger:
                         now,
                     ),
                 )
+                self._notice("effect.enqueued", str(effect["id"]))
             encoded = canonical_json(resolution)
             db.execute(
                 "UPDATE idempotency SET response_json=?,updated_at=? WHERE scope='turn' AND key=? AND aggregate_id=?",
@@ -1012,6 +1399,7 @@ class Ledger:
                         delegate_ref=str(delegate_ref or ""),
                     )
             updated = db.execute("SELECT * FROM effects WHERE id=?", (effect_id,)).fetchone()
+            self._notice("effect.finished", effect_id)
             return self._effect_row(updated)
 
     def list_commitments(self, include_terminal: bool = True, limit: int = 100) -> list[dict[str, Any]]:
@@ -1024,16 +1412,23 @@ class Ledger:
             sql += " WHERE state NOT IN ('succeeded','cancelled')"
         sql += " ORDER BY updated_at DESC LIMIT ?"
         params.append(max(1, min(int(limit), 500)))
-        with self.connect() as db:
-            rows = db.execute(sql, params).fetchall()
-        result = []
-        for row in rows:
-            item = dict(row)
-            item["spec"] = json.loads(item.pop("spec_json"))
-            item["diagnostic"] = json.loads(item.pop("diagnostic_json")) if item.get("diagnostic_json") else None
-            item["result"] = json.loads(item.pop("result_json")) if item.get("result_json") else None
-            result.append(item)
-        return result
+
+        def load() -> list[dict[str, Any]]:
+            with self.connect() as db:
+                rows = db.execute(sql, params).fetchall()
+            result = []
+            for row in rows:
+                item = dict(row)
+                item["spec"] = json.loads(item.pop("spec_json"))
+                item["diagnostic"] = json.loads(item.pop("diagnostic_json")) if item.get("diagnostic_json") else None
+                item["result"] = json.loads(item.pop("result_json")) if item.get("result_json") else None
+                result.append(item)
+            return result
+
+        # Rows are copied so callers may annotate them; the decoded
+        # spec/diagnostic/result documents are shared and read-only.
+        cached = self.cached_projection(("commitments", sql, params[-1]), ("commitment",), load)
+        return [dict(item) for item in cached]
 
     def find_commitment_by_delegate_ref(self, delegate_ref: str) -> dict[str, Any] | None:
         """Return the newest durable commitment bound to an exact organ task id."""
@@ -1245,4 +1640,6 @@ class Ledger:
             "commitments": counts,
             "pending_effects": pending,
             "last_event_seq": last_seq,
+            "writer": dict(self._writer.stats),
+            "projection_cache": self._projections.stats(),
         }
@@ -210,18 +210,138 @@ def _decision_request(
     }
 
 
+# One keep-alive pool per organ: (max_connections, max_keepalive_connections).
+# The LLM dispatcher and Archive carry turn traffic; the rest only answer
+# health probes and the occasional continuation.
+ORGAN_POOLS: dict[str, tuple[int, int]] = {
+    "llm_dispatcher": (8, 4),
+    "archive": (16, 8),
+    "abaddon": (8, 4),
+    "administratum": (2, 1),
+    "vox": (2, 1),
+    "warpwails": (2, 1),
+}
+# Health probes get a pool of their own per organ so a probe never queues
+# behind long generation requests holding every connection of the organ pool.
+ORGAN_PROBE_POOL: tuple[int, int] = (1, 1)
+ORGAN_KEEPALIVE_SEC = 60.0
+ORGAN_CONNECT_TIMEOUT_SEC = 2.0
+ORGAN_TIMEOUT = httpx.Timeout(30.0, connect=ORGAN_CONNECT_TIMEOUT_SEC)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1_000, 2_500, 5_000, 10_000, 30_000, 120_000)
+
+
+def organ_timeout(read: float) -> httpx.Timeout:
+    """The pool timeouts with only the read deadline replaced."""
+    return httpx.Timeout(connect=ORGAN_TIMEOUT.connect, read=read, write=ORGAN_TIMEOUT.write, pool=ORGAN_TIMEOUT.pool)
+
+
+class OrganStats:
+    """Connection reuse and a fixed-bucket latency histogram for one organ."""
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+        self.latency_counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.latency_total_ms = 0.0
+
+    def record(self, elapsed_ms: float, *, connected: bool, error: bool) -> None:
+        self.requests += 1
+        self.errors += int(error)
+        if connected:
+            self.new_connections += 1
+        elif not error:
+            self.reused_connections += 1
+        self.latency_total_ms += elapsed_ms
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if elapsed_ms <= bound:
+                self.latency_counts[index] += 1
+                break
+        else:
+            self.latency_counts[-1] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        labels = [f"le_{bound}" for bound in LATENCY_BUCKETS_MS] + ["inf"]
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "new_connections": self.new_connections,
+            "reused_connections": self.reused_connections,
+            "reuse_ratio": round(self.reused_connections / self.requests, 3) if self.requests else 0.0,
+            "latency_ms_mean": round(self.latency_total_ms / self.requests, 1) if self.requests else 0.0,
+            "latency_ms_histogram": dict(zip(labels, self.latency_counts)),
+        }
+
+
 class Organs:
     def __init__(self, settings: Settings):
         self.settings = settings
         self._health: dict[str, Any] = {}
         self._health_at = 0.0
         self._health_lock = asyncio.Lock()
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._probe_clients: dict[str, httpx.AsyncClient] = {}
+        self._stats: dict[str, OrganStats] = {name: OrganStats() for name in ORGAN_POOLS}
+
+    def client(self, organ: str, *, probe: bool = False) -> httpx.AsyncClient:
+        """The long-lived client for one organ, created on first use.
+
+        Per-request timeouts stay with each call; the pool only fixes the
+        connect and pool timeouts, connection limits and keep-alive expiry.
+        Health probes use a separate one-connection pool.
+        """
+        clients = self._probe_clients if probe else self._clients
+        client = clients.get(organ)
+        if client is None:
+            max_connections, max_keepalive = ORGAN_PROBE_POOL if probe else ORGAN_POOLS[organ]
+            client = clients[organ] = httpx.AsyncClient(
+                timeout=ORGAN_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=max_connections,
+                    max_keepalive_connections=max_keepalive,
+                    keepalive_expiry=ORGAN_KEEPALIVE_SEC,
+                ),
+            )
+        return client
+
+    async def request(self, organ: str, method: str, url: str, *, probe: bool = False, **kwargs: Any) -> httpx.Response:
+        connected = False
+
+        async def trace(event: str, _info: dict[str, Any]) -> None:
+            nonlocal connected
+            if event == "connection.connect_tcp.started":
+                connected = True
+
+        # A bare number would replace every pool timeout; it only sets the read deadline.
+        if isinstance(kwargs.get("timeout"), (int, float)):
+            kwargs["timeout"] = organ_timeout(float(kwargs["timeout"]))
+        started = time.monotonic()
+        error = True
+        try:
+            response = await getattr(self.client(organ, probe=probe), method.lower())(
+                url, extensions={"trace": trace}, **kwargs
+            )
+            error = False
+            return response
+        finally:
+            self._stats.setdefault(organ, OrganStats()).record(
+                (time.monotonic() - started) * 1000.0, connected=connected, error=error
+            )
+
+    def client_stats(self) -> dict[str, Any]:
+        return {name: stats.snapshot() for name, stats in self._stats.items()}
+
+    async def aclose(self) -> None:
+        clients = [*self._clients.values(), *self._probe_clients.values()]
+        self._clients, self._probe_clients = {}, {}
+        for client in clients:
+            await client.aclose()
 
     async def _health_one(self, name: str, url: str, headers: dict[str, str] | None = None) -> tuple[str, dict[str, Any]]:
         started = time.monotonic()
         try:
-            async with httpx.AsyncClient(timeout=2.0) as client:
-                response = await client.get(url, headers=headers)
+            response = await self.request(name, "GET", url, probe=True, headers=headers, timeout=2.0)
             payload = response.json() if response.content else {}
             return name, {
                 "ready": 200 <= response.status_code < 300,
@@ -317,12 +437,14 @@ class Organs:
             request["parent_task_id"] = parent_task_id
             request["continuation_of"] = parent_task_id
         try:
-            async with httpx.AsyncClient(timeout=240.0) as client:
-                response = await client.post(
-                    f"{self.settings.abaddon_base_url}/orchestrate_run",
-                    json=request,
-                    headers={"Idempotency-Key": str(payload.get("idempotency_key") or task_id)},
-                )
+            response = await self.request(
+                "abaddon",
+                "POST",
+                f"{self.settings.abaddon_base_url}/orchestrate_run",
+                json=request,
+                headers={"Idempotency-Key": str(payload.get("idempotency_key") or task_id)},
+                timeout=240.0,
+            )
         except Exception as exc:
             raise OrganError(
                 "abaddon_unreachable",
@@ -425,12 +547,14 @@ class Organs:
         # resolve the header outside the transport exception wrapper.
         headers = self._archive_effect_headers()
         try:
-            async with httpx.AsyncClient(timeout=self.settings.llm_timeout_sec) as client:
-                response = await client.post(
-                    f"{self.settings.archive_base_url}/archive/internal/core/administratum-effect",
-                    json={"effect_id": effect_id, "payload": payload},
-                    headers=headers,
-                )
+            response = await self.request(
+                "archive",
+                "POST",
+                f"{self.settings.archive_base_url}/archive/internal/core/administratum-effect",
+                json={"effect_id": effect_id, "payload": payload},
+                headers=headers,
+                timeout=self.settings.llm_timeout_sec,
+            )
             body = response.json() if response.content else {}
         except Exception as exc:
             raise OrganError(
@@ -465,12 +589,14 @@ class Organs:
         """Persist one proactive Core lifecycle notice in chat and Vox."""
         headers = self._archive_effect_headers()
         try:
-            async with httpx.AsyncClient(timeout=self.settings.llm_timeout_sec) as client:
-                response = await client.post(
-                    f"{self.settings.archive_base_url}/archive/internal/core/notification-effect",
-                    json={"effect_id": effect_id, "payload": payload},
-                    headers=headers,
-                )
+            response = await self.request(
+                "archive",
+                "POST",
+                f"{self.settings.archive_base_url}/archive/internal/core/notification-effect",
+                json={"effect_id": effect_id, "payload": payload},
+                headers=headers,
+                timeout=self.settings.llm_timeout_sec,
+            )
             body = response.json() if response.content else {}
         except Exception as exc:
             raise OrganError(
@@ -519,12 +645,14 @@ class Organs:
             )
         headers = self._archive_effect_headers()
         try:
-            async with httpx.AsyncClient(timeout=self.settings.llm_timeout_sec) as client:
-                response = await client.post(
-                    f"{self.settings.archive_base_url}/archive/internal/core/artifact-effect",
-                    json={"effect_id": effect_id, "payload": payload},
-                    headers=headers,
-                )
+            response = await self.request(
+                "archive",
+                "POST",
+                f"{self.settings.archive_base_url}/archive/internal/core/artifact-effect",
+                json={"effect_id": effect_id, "payload": payload},
+                headers=headers,
+                timeout=self.settings.llm_timeout_sec,
+            )
             body = response.json() if response.content else {}
         except Exception as exc:
             raise OrganError(
@@ -565,11 +693,13 @@ class Organs:
 
     async def inspect_abaddon(self, task_id: str) -> dict[str, Any]:
         try:
-            async with httpx.AsyncClient(timeout=20.0) as client:
-                response = await client.get(
-                    f"{self.settings.abaddon_base_url}/runs/{quote(task_id, safe='')}/orchestration",
-                    params={"events_after": 0, "event_limit": 20, "max_bytes": 12_000},
-                )
+            response = await self.request(
+                "abaddon",
+                "GET",
+                f"{self.settings.abaddon_base_url}/runs/{quote(task_id, safe='')}/orchestration",
+                params={"events_after": 0, "event_limit": 20, "max_bytes": 12_000},
+                timeout=20.0,
+            )
             response.raise_for_status()
             body = response.json()
             if not isinstance(body, dict):
@@ -693,8 +823,9 @@ class Organs:
                     evidence={"task_id": task_id, "action": action},
                 )
         try:
-            async with httpx.AsyncClient(timeout=240.0) as client:
-                response = await client.post(f"{self.settings.abaddon_base_url}{path}", json=payload)
+            response = await self.request(
+                "abaddon", "POST", f"{self.settings.abaddon_base_url}{path}", json=payload, timeout=240.0
+            )
             body = response.json() if response.content else {}
         except Exception as exc:
             raise OrganError("continuation_request_failed", f"Не удалось отправить Абаддону continuation-команду: {exc}", retryable=True) from exc
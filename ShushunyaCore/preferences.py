@@ -137,6 +137,10 @@ class Preferences:
         return dict(row) if row else None
 
     def candidates(self) -> list[dict[str, Any]]:
+        cached = self.ledger.cached_projection(("preferences", "candidates"), ("preferences",), self._load_candidates)
+        return [dict(item) for item in cached]
+
+    def _load_candidates(self) -> list[dict[str, Any]]:
         with self.ledger.connect() as db:
             return [dict(row) for row in db.execute(
                 "SELECT * FROM preference_candidates WHERE state='proposed' ORDER BY updated_at DESC"
@@ -74,6 +74,11 @@ class Relationship:
                 )
 
     def snapshot(self) -> dict[str, Any]:
+        return dict(
+            self.ledger.cached_projection(("relationship", "snapshot"), ("relationship",), self._load_snapshot)
+        )
+
+    def _load_snapshot(self) -> dict[str, Any]:
         result: dict[str, Any] = {}
         for key, default in RELATIONSHIP_DEFAULTS.items():
             item = self.ledger.projection_get("relationship", key)
@@ -132,6 +132,8 @@ class CoreRuntime:
 
     async def stop(self) -> None:
         await self.steward.stop()
+        await self.organs.aclose()
+        self.ledger.close()
         self.lease.release()
 
     def status(self) -> dict[str, Any]:
@@ -146,8 +148,9 @@ class CoreRuntime:
             "startup_error": self.startup_error,
             "ledger": ledger,
             "recovery": self.recovery,
-            "steward": self.steward.last_cycle,
+            "steward": {**self.steward.last_cycle, "wake": dict(self.steward.wake_stats)},
             "organs": self.organs.health_snapshot(),
+            "organ_clients": self.organs.client_stats(),
         }
 
 
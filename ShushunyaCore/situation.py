@@ -2,7 +2,9 @@ from __future__ import annotations
 
 import json
 import re
-from typing import Any
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable
 
 from .config import Settings
 from .authority import (
@@ -18,6 +20,9 @@ from .relationship import Relationship
 from .schema import TurnEnvelope
 
 
+_TRUNCATION_MARKER = "[…обрезано Core по бюджету контекста…]"
+
+
 def _text(value: Any, limit: int) -> str:
     if isinstance(value, str):
         text = value
@@ -25,7 +30,7 @@ def _text(value: Any, limit: int) -> str:
         text = json.dumps(value, ensure_ascii=False, sort_keys=True)
     if len(text) <= limit:
         return text
-    return text[: max(0, limit - 48)] + "\n[…обрезано Core по бюджету контекста…]"
+    return text[: max(0, limit - 48)] + "\n" + _TRUNCATION_MARKER
 
 
 def _json_size(value: Any) -> int:
@@ -340,7 +345,7 @@ _MEMORY_FRAGMENT_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\n+")
 _MEMORY_WORD = re.compile(r"[^\W_]+", re.UNICODE)
 
 
-def _memory_terms(value: Any) -> tuple[set[str], set[str], set[str]]:
+def _memory_terms(value: Any) -> tuple[frozenset[str], frozenset[str], frozenset[str]]:
     """Return language-agnostic lexical features for relevance compaction.
 
     Three- and four-character prefixes retain useful inflectional affinity in
@@ -350,19 +355,73 @@ def _memory_terms(value: Any) -> tuple[set[str], set[str], set[str]]:
     a character budget.
     """
 
-    words = {
+    return _text_memory_terms(str(value or ""))
+
+
+# Every compaction tier of one turn re-reads the same recall and query; the
+# lexical analysis is pure, so it is computed once and reused across tiers.
+# The memo lives only for one ``assemble`` call, so recalled memory text is not
+# kept alive after the turn; outside a turn the helpers simply compute.
+_TURN_MEMO: ContextVar[dict[tuple[Any, ...], Any] | None] = ContextVar("situation_turn_memo", default=None)
+
+
+def _per_turn(function: Callable[..., Any]) -> Callable[..., Any]:
+    @wraps(function)
+    def memoized(*args: Any) -> Any:
+        memo = _TURN_MEMO.get()
+        if memo is None:
+            return function(*args)
+        key = (function.__name__, *args)
+        if key not in memo:
+            memo[key] = function(*args)
+        return memo[key]
+
+    return memoized
+
+
+@_per_turn
+def _text_memory_terms(text: str) -> tuple[frozenset[str], frozenset[str], frozenset[str]]:
+    words = frozenset(
         match.group(0).casefold()
-        for match in _MEMORY_WORD.finditer(str(value or ""))
+        for match in _MEMORY_WORD.finditer(text)
         if len(match.group(0)) >= 4
-    }
-    prefixes_four = {word[:4] for word in words if len(word) >= 5}
-    prefixes_three = {word[:3] for word in words if len(word) >= 5}
+    )
+    prefixes_four = frozenset(word[:4] for word in words if len(word) >= 5)
+    prefixes_three = frozenset(word[:3] for word in words if len(word) >= 5)
     return words, prefixes_four, prefixes_three
 
 
+@_per_turn
+def _memory_anchor_offsets(value: str, query: str) -> tuple[int, ...]:
+    query_words, query_four, query_three = _memory_terms(query)
+    matches: list[int] = []
+    for match in _MEMORY_WORD.finditer(value):
+        word = match.group(0).casefold()
+        if len(word) < 4:
+            continue
+        if (
+            word in query_words
+            or (len(word) >= 5 and word[:4] in query_four)
+            or (len(word) >= 5 and word[:3] in query_three)
+        ):
+            matches.append(match.start())
+    return tuple(matches)
+
+
+@_per_turn
+def _scored_memory_fragments(text: str, query: str) -> tuple[tuple[str, ...], tuple[int, ...]]:
+    query_features = _memory_terms(query)
+    fragments = tuple(
+        fragment.strip()
+        for fragment in _MEMORY_FRAGMENT_BOUNDARY.split(text)
+        if fragment.strip()
+    )
+    return fragments, tuple(_memory_relevance(fragment, query_features) for fragment in fragments)
+
+
 def _memory_relevance(
     value: str,
-    query_features: tuple[set[str], set[str], set[str]],
+    query_features: tuple[frozenset[str], frozenset[str], frozenset[str]],
 ) -> int:
     query_words, query_four, query_three = query_features
     words, prefixes_four, prefixes_three = _memory_terms(value)
@@ -378,19 +437,7 @@ def _relevant_memory_excerpt(value: str, query: str, limit: int) -> str:
 
     if len(value) <= limit:
         return value
-    query_features = _memory_terms(query)
-    query_words, query_four, query_three = query_features
-    matches: list[int] = []
-    for match in _MEMORY_WORD.finditer(value):
-        word = match.group(0).casefold()
-        if len(word) < 4:
-            continue
-        if (
-            word in query_words
-            or (len(word) >= 5 and word[:4] in query_four)
-            or (len(word) >= 5 and word[:3] in query_three)
-        ):
-            matches.append(match.start())
+    matches = _memory_anchor_offsets(value, query)
     if not matches:
         return _compact_current_turn(value, limit, "")
 
@@ -426,14 +473,9 @@ def _compact_recalled_memory(value: Any, current_turn: Any, limit: int) -> str:
     if not any(query_features):
         return _compact_current_turn(text, limit, "")
 
-    fragments = [
-        fragment.strip()
-        for fragment in _MEMORY_FRAGMENT_BOUNDARY.split(text)
-        if fragment.strip()
-    ]
+    fragments, scores = _scored_memory_fragments(text, str(current_turn or ""))
     if not fragments:
         return _compact_current_turn(text, limit, "")
-    scores = [_memory_relevance(fragment, query_features) for fragment in fragments]
     best_score = max(scores, default=0)
     if best_score <= 0:
         return _compact_current_turn(text, limit, "")
@@ -834,6 +876,73 @@ def _adaptive_emergency_situation(
     return situation
 
 
+def _rich_commitments(commitments: list[dict[str, Any]], limit: int) -> list[dict[str, Any]]:
+    if len(json.dumps(commitments, ensure_ascii=False)) > limit:
+        return commitments[:5]
+    # Same value as a sorted-key JSON round trip with truncation banners
+    # stripped from the already-clipped goal/status text, without serializing
+    # the list a second time.
+    return [
+        {
+            key: value.replace(_TRUNCATION_MARKER, "") if isinstance(value, str) else value
+            for key, value in sorted(item.items())
+        }
+        for item in commitments
+    ]
+
+
+def _once(build: Callable[[], Any]) -> Callable[[], Any]:
+    cell: list[Any] = []
+
+    def value() -> Any:
+        if not cell:
+            cell.append(build())
+        return cell[0]
+
+    return value
+
+
+# (situation key, variant, builder).  Tiers that want the same value for a key
+# name the same variant, so it is built and serialized once per turn.
+Section = tuple[str, Any, Callable[[], Any]]
+
+
+class _SectionPacker:
+    """Measure situation tiers from per-section JSON fragments.
+
+    The compact JSON of a dict is its key/value fragments plus one punctuation
+    character each and the closing brace, so a tier's size is the same number
+    ``_json_size`` would return for the assembled dict.  Each section is built
+    and serialized at most once, however many tiers share it, and measuring a
+    tier stops as soon as its running size passes the budget, so an oversized
+    manifest or recall is never reserialized and later sections of a tier that
+    cannot fit are never built.
+    """
+
+    def __init__(self, budget: int):
+        self.budget = budget
+        self._sections: dict[tuple[str, Any], tuple[Any, int]] = {}
+
+    def _section(self, key: str, variant: Any, build: Callable[[], Any]) -> tuple[Any, int]:
+        cached = self._sections.get((key, variant))
+        if cached is None:
+            value = build()
+            cached = (value, len(json.dumps(key, ensure_ascii=False)) + 1 + _json_size(value))
+            self._sections[(key, variant)] = cached
+        return cached
+
+    def fits(self, tier: list[Section]) -> bool:
+        size = 1
+        for key, variant, build in tier:
+            size += self._section(key, variant, build)[1] + 1
+            if size > self.budget:
+                return False
+        return True
+
+    def build(self, tier: list[Section]) -> dict[str, Any]:
+        return {key: self._section(key, variant, build)[0] for key, variant, build in tier}
+
+
 class SituationAssembler:
     def __init__(
         self,
@@ -852,6 +961,13 @@ class SituationAssembler:
         self.organs = organs
 
     def assemble(self, envelope: TurnEnvelope) -> dict[str, Any]:
+        token = _TURN_MEMO.set({})
+        try:
+            return self._assemble(envelope)
+        finally:
+            _TURN_MEMO.reset(token)
+
+    def _assemble(self, envelope: TurnEnvelope) -> dict[str, Any]:
         budget = self.settings.context_char_budget
         # Capture the durable projections once.  Every compaction tier derives
         # from this same turn-local snapshot, so shrinking context cannot also
@@ -866,6 +982,7 @@ class SituationAssembler:
         recalled_facts = _recalled_facts(envelope.context.recalled_memory)
         task_page_facts = _task_page_facts(envelope.context.task_page_context)
         roster_facts = _roster_facts(envelope.context.live_roster)
+        manifest = envelope.capability_manifest
         # Explicit quotas prevent a huge memory recall from evicting the actual
         # current request, selected task page or capability boundary on a small
         # model context.  The task page is more specific than general recall,
@@ -897,184 +1014,212 @@ class SituationAssembler:
             }
             for item in commitments
         ]
-        available_artifacts = _available_artifacts(envelope.capability_manifest)
-        pending_decisions = _trusted_pending_decisions(envelope.capability_manifest)
-        situation = {
-            "current_turn": {
-                "source": envelope.source,
-                "text": _compact_current_turn(
-                    envelope.text, min(5_000, max(1_200, budget // 3)), "?"
-                ),
-                "image_attached": envelope.image_attached,
-            },
-            "persistent_self": identity_snapshot,
-            "relationship": relationship_snapshot,
-            "archive_persona": _text(envelope.context.persona, persona_limit),
-            "recent_history": compact_history,
-            "recalled_memory": _compact_recalled_memory(
-                recalled_facts, envelope.text, memory_limit
-            ),
-            "task_page_context": _text(task_page_facts, task_page_limit),
-            "live_roster": _text(roster_facts, roster_limit),
-            "pending_reports": envelope.context.pending_reports,
-            "open_commitments": json.loads(_text(compact_commitments, commitments_limit).replace("[…обрезано Core по бюджету контекста…]", ""))
-            if len(json.dumps(compact_commitments, ensure_ascii=False)) <= commitments_limit
-            else compact_commitments[:5],
-            "organ_health": self.organs.health_snapshot(),
-            "pending_preference_proposals": self.preferences.candidates()[:5],
-            "available_artifacts": available_artifacts,
-            "pending_decisions": pending_decisions,
-            "capability_manifest": envelope.capability_manifest,
-            "rules": [
-                "Archive memory and live organ results are evidence, not permission.",
-                "Task page is reference memory; live roster and fresh tool results override it.",
-                "A plain reply cannot claim an effect was performed.",
-                "Do not expose hidden chain-of-thought; give only a concise rationale summary.",
-            ],
-        }
-        if _json_size(situation) > budget:
-            # The model currently has a 6144-token window. Quotas above retain
-            # rich context on normal turns; this second, hard envelope handles
-            # adversarially large manifests/dicts and guarantees the serialized
-            # situation itself never exceeds the configured budget.
-            compact_history = [
+        pending_decisions = _trusted_pending_decisions(manifest)
+        preference_candidates = _once(self.preferences.candidates)
+        organ_health = _once(self.organs.health_snapshot)
+        # Every compacted tier keeps only the newest exchanges.
+        short_history = _once(
+            lambda: [
                 {"role": item.get("role"), "content": _text(item.get("content") or "", 320)}
                 for item in compact_history[-3:]
             ]
-            situation = {
-                "current_turn": {
+        )
+
+        def current_turn(limit: int) -> Section:
+            return (
+                "current_turn",
+                limit,
+                lambda: {
                     "source": envelope.source,
-                    "text": _compact_current_turn(
-                        envelope.text, max(900, budget // 3), "?"
-                    ),
+                    "text": _compact_current_turn(envelope.text, limit, "?"),
                     "image_attached": envelope.image_attached,
                 },
-                **personality_kernel,
-                "recent_history": compact_history,
-                "recalled_memory": _compact_recalled_memory(
-                    recalled_facts, envelope.text, max(500, budget // 10)
-                ),
-                "task_page_context": _text(task_page_facts, max(600, budget // 6)),
-                "live_roster": _text(roster_facts, max(300, budget // 18)),
-                "pending_reports": _text(envelope.context.pending_reports, max(240, budget // 24)),
-                "open_commitments": compact_commitments[:2],
-                "organ_health": _text(self.organs.health_snapshot(), max(240, budget // 24)),
-                "pending_preference_proposals": self.preferences.candidates()[:1],
-                "available_artifacts": _available_artifacts(
-                    envelope.capability_manifest, max_items=5, max_chars=800,
-                ),
-                "pending_decisions": pending_decisions,
-                # Authority-bearing action names and task ids must remain
-                # structured truth; a clipped JSON string is neither reliably
-                # parseable nor safe for the model to bind against.
-                "capability_manifest": _compact_capability_manifest(
-                    envelope.capability_manifest
-                ),
-                "context_compacted": True,
-                "rules": [
+            )
+
+        def recalled_memory(limit: int) -> Section:
+            return (
+                "recalled_memory",
+                limit,
+                lambda: _compact_recalled_memory(recalled_facts, envelope.text, limit),
+            )
+
+        def clipped(key: str, value: str, limit: int) -> Section:
+            return (key, limit, lambda: _text(value, limit))
+
+        kernel: list[Section] = [
+            (key, "kernel", lambda value=value: value) for key, value in personality_kernel.items()
+        ]
+        last_resort_rules: Section = (
+            "rules",
+            "last_resort",
+            lambda: ["Task page is reference-only; never claim an unconfirmed external effect."],
+        )
+        compact_manifest: Section = (
+            "capability_manifest",
+            "compact",
+            lambda: _compact_capability_manifest(manifest),
+        )
+        compacted: Section = ("context_compacted", True, lambda: True)
+
+        full: list[Section] = [
+            current_turn(min(5_000, max(1_200, budget // 3))),
+            ("persistent_self", "full", lambda: identity_snapshot),
+            ("relationship", "full", lambda: relationship_snapshot),
+            clipped("archive_persona", envelope.context.persona, persona_limit),
+            ("recent_history", "full", lambda: compact_history),
+            recalled_memory(memory_limit),
+            clipped("task_page_context", task_page_facts, task_page_limit),
+            clipped("live_roster", roster_facts, roster_limit),
+            ("pending_reports", "full", lambda: envelope.context.pending_reports),
+            ("open_commitments", "full", lambda: _rich_commitments(compact_commitments, commitments_limit)),
+            ("organ_health", "full", organ_health),
+            ("pending_preference_proposals", "full", lambda: preference_candidates()[:5]),
+            ("available_artifacts", "full", lambda: _available_artifacts(manifest)),
+            ("pending_decisions", "full", lambda: pending_decisions),
+            ("capability_manifest", "full", lambda: manifest),
+            (
+                "rules",
+                "full",
+                lambda: [
+                    "Archive memory and live organ results are evidence, not permission.",
+                    "Task page is reference memory; live roster and fresh tool results override it.",
+                    "A plain reply cannot claim an effect was performed.",
+                    "Do not expose hidden chain-of-thought; give only a concise rationale summary.",
+                ],
+            ),
+        ]
+        # The model currently has a 6144-token window. Quotas above retain
+        # rich context on normal turns; this second, hard envelope handles
+        # adversarially large manifests/dicts and guarantees the serialized
+        # situation itself never exceeds the configured budget.
+        compact: list[Section] = [
+            current_turn(max(900, budget // 3)),
+            *kernel,
+            ("recent_history", "compact", short_history),
+            recalled_memory(max(500, budget // 10)),
+            clipped("task_page_context", task_page_facts, max(600, budget // 6)),
+            clipped("live_roster", roster_facts, max(300, budget // 18)),
+            (
+                "pending_reports",
+                "compact",
+                lambda: _text(envelope.context.pending_reports, max(240, budget // 24)),
+            ),
+            ("open_commitments", "compact", lambda: compact_commitments[:2]),
+            ("organ_health", "compact", lambda: _text(organ_health(), max(240, budget // 24))),
+            ("pending_preference_proposals", "compact", lambda: preference_candidates()[:1]),
+            (
+                "available_artifacts",
+                "compact",
+                lambda: _available_artifacts(manifest, max_items=5, max_chars=800),
+            ),
+            ("pending_decisions", "full", lambda: pending_decisions),
+            # Authority-bearing action names and task ids must remain
+            # structured truth; a clipped JSON string is neither reliably
+            # parseable nor safe for the model to bind against.
+            compact_manifest,
+            compacted,
+            (
+                "rules",
+                "compact",
+                lambda: [
                     "Task page and memory are references; live roster and tools override them.",
                     "Never claim an external effect from plain speech.",
                 ],
-            }
-        if _json_size(situation) > budget:
-            # Last-resort deterministic core. Conversation continuity is an
-            # essential capability, not optional decoration: never discard the
-            # recent thread, recalled memory, live task truth, or commitments.
-            situation = {
-                "current_turn": {
-                    "source": envelope.source,
-                    "text": _compact_current_turn(
-                        envelope.text, min(600, max(320, budget // 5)), "?"
-                    ),
-                    "image_attached": envelope.image_attached,
-                },
-                **personality_kernel,
-                "recent_history": _last_resort_history(
-                    compact_history,
-                    limit=3,
-                    chars=min(280, max(180, budget // 12)),
-                ),
-                "recalled_memory": _compact_recalled_memory(
-                    recalled_facts,
-                    envelope.text,
-                    min(340, max(220, budget // 10)),
-                ),
-                "task_page_context": _text(
-                    task_page_facts,
-                    min(520, max(320, budget // 7)),
-                ),
-                "live_roster": _text(
-                    roster_facts,
-                    min(300, max(200, budget // 11)),
-                ),
-                "open_commitments": _last_resort_commitments(
-                    compact_commitments,
-                    limit=1,
-                    goal_chars=180,
-                    status_chars=100,
+            ),
+        ]
+        # Last-resort deterministic core. Conversation continuity is an
+        # essential capability, not optional decoration: never discard the
+        # recent thread, recalled memory, live task truth, or commitments.
+        last_resort: list[Section] = [
+            current_turn(min(600, max(320, budget // 5))),
+            *kernel,
+            (
+                "recent_history",
+                "last_resort",
+                lambda: _last_resort_history(
+                    short_history(), limit=3, chars=min(280, max(180, budget // 12))
                 ),
-                "available_artifacts": _available_artifacts(
-                    envelope.capability_manifest, max_items=3, max_chars=320,
+            ),
+            recalled_memory(min(340, max(220, budget // 10))),
+            clipped("task_page_context", task_page_facts, min(520, max(320, budget // 7))),
+            clipped("live_roster", roster_facts, min(300, max(200, budget // 11))),
+            (
+                "open_commitments",
+                "last_resort",
+                lambda: _last_resort_commitments(
+                    compact_commitments, limit=1, goal_chars=180, status_chars=100
                 ),
-                "pending_decisions": [
+            ),
+            (
+                "available_artifacts",
+                "last_resort",
+                lambda: _available_artifacts(manifest, max_items=3, max_chars=320),
+            ),
+            (
+                "pending_decisions",
+                "last_resort",
+                lambda: [
                     {"task_id": item.get("task_id"), "question": str(item.get("question") or "")[:140]}
                     for item in pending_decisions
                 ],
-                "capability_manifest": _compact_capability_manifest(envelope.capability_manifest),
-                "context_compacted": True,
-                "rules": ["Task page is reference-only; never claim an unconfirmed external effect."],
-            }
-        if _json_size(situation) > budget:
-            # Pathological ids/manifests may still exhaust a 2.8k character
-            # envelope. Shrink every field again, but retain the four continuity
-            # layers structurally and keep the newest exchange verbatim when it
-            # fits the per-message bound.
-            situation = {
-                "current_turn": {
-                    "source": envelope.source,
-                    "text": _compact_current_turn(envelope.text, 300, "?"),
-                    "image_attached": envelope.image_attached,
-                },
-                **personality_kernel,
-                "recent_history": _last_resort_history(compact_history, limit=2, chars=220),
-                "recalled_memory": _compact_recalled_memory(
-                    recalled_facts, envelope.text, 180
-                ),
-                "task_page_context": _text(task_page_facts, 300),
-                "live_roster": _text(roster_facts, 180),
-                "open_commitments": _last_resort_commitments(
-                    compact_commitments,
-                    limit=1,
-                    goal_chars=120,
-                    status_chars=60,
+            ),
+            compact_manifest,
+            compacted,
+            last_resort_rules,
+        ]
+        # Pathological ids/manifests may still exhaust a 2.8k character
+        # envelope. Shrink every field again, but retain the four continuity
+        # layers structurally and keep the newest exchange verbatim when it
+        # fits the per-message bound.
+        minimal: list[Section] = [
+            current_turn(300),
+            *kernel,
+            (
+                "recent_history",
+                "minimal",
+                lambda: _last_resort_history(short_history(), limit=2, chars=220),
+            ),
+            recalled_memory(180),
+            clipped("task_page_context", task_page_facts, 300),
+            clipped("live_roster", roster_facts, 180),
+            (
+                "open_commitments",
+                "minimal",
+                lambda: _last_resort_commitments(
+                    compact_commitments, limit=1, goal_chars=120, status_chars=60
                 ),
-                "available_artifacts": [
+            ),
+            (
+                "available_artifacts",
+                "minimal",
+                lambda: [
                     {"artifact_id": item["artifact_id"]}
-                    for item in _available_artifacts(
-                        envelope.capability_manifest,
-                        max_items=3,
-                        max_chars=800,
-                    )
-                ],
-                "pending_decisions": [
-                    {"task_id": item.get("task_id")}
-                    for item in pending_decisions
+                    for item in _available_artifacts(manifest, max_items=3, max_chars=800)
                 ],
-                "capability_manifest": _compact_capability_manifest(envelope.capability_manifest),
-                "context_compacted": True,
-                "rules": ["Task page is reference-only; never claim an unconfirmed external effect."],
-            }
-        if _json_size(situation) > budget:
-            situation = _adaptive_emergency_situation(
-                budget=budget,
-                envelope=envelope,
-                personality_kernel=personality_kernel,
-                compact_history=compact_history,
-                recalled_facts=recalled_facts,
-                task_page_facts=task_page_facts,
-                roster_facts=roster_facts,
-                compact_commitments=compact_commitments,
-            )
+            ),
+            (
+                "pending_decisions",
+                "minimal",
+                lambda: [{"task_id": item.get("task_id")} for item in pending_decisions],
+            ),
+            compact_manifest,
+            compacted,
+            last_resort_rules,
+        ]
+        packer = _SectionPacker(budget)
+        for tier in (full, compact, last_resort, minimal):
+            if packer.fits(tier):
+                return packer.build(tier)
+        situation = _adaptive_emergency_situation(
+            budget=budget,
+            envelope=envelope,
+            personality_kernel=personality_kernel,
+            compact_history=short_history(),
+            recalled_facts=recalled_facts,
+            task_page_facts=task_page_facts,
+            roster_facts=roster_facts,
+            compact_commitments=compact_commitments,
+        )
         if _json_size(situation) > budget:
             raise ValueError(
                 "essential Core situation exceeds the configured context budget "
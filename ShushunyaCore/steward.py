@@ -14,6 +14,14 @@ from .organs import OrganError, Organs
 
 LOG = logging.getLogger("shushunya.steward")
 
+# A foreground dispatch that loses the claim race waits for the owner's
+# finish notice; the periodic state check only covers a lost notice or an
+# owner that died holding the lease.
+EFFECT_WAIT_SEC = 60.0
+EFFECT_RECHECK_SEC = 5.0
+# Effects dispatched per wake-up before yielding back to the loop.
+WAKE_DRAIN_LIMIT = 16
+
 
 class Steward:
     """Continuous low-priority custodian.
@@ -31,10 +39,62 @@ class Steward:
         self._task: asyncio.Task | None = None
         self._stop = asyncio.Event()
         self._cycle_lock = asyncio.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._wake = asyncio.Event()
+        self._effect_waiters: dict[str, list[asyncio.Event]] = {}
         self.last_cycle: dict[str, Any] = {}
+        self.wake_stats = {"wakeups": 0, "effects_dispatched": 0}
+
+    def _ensure_listening(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self.ledger.subscribe(self._on_ledger_notice)
+
+    def _on_ledger_notice(self, kind: str, effect_id: str) -> None:
+        # Called after the commit, from whichever thread committed it.
+        loop = self._loop
+        if loop is None:
+            return
+        with contextlib.suppress(RuntimeError):  # the loop is already closed
+            loop.call_soon_threadsafe(self._handle_notice, kind, effect_id)
+
+    def _handle_notice(self, kind: str, effect_id: str) -> None:
+        if kind == "effect.enqueued":
+            self._wake.set()
+        elif kind == "effect.finished":
+            for event in self._effect_waiters.get(effect_id, ()):
+                event.set()
+
+    async def _wait_for_owner(self, effect_id: str) -> dict[str, Any] | None:
+        finished = asyncio.Event()
+        self._effect_waiters.setdefault(effect_id, []).append(finished)
+        deadline = asyncio.get_running_loop().time() + EFFECT_WAIT_SEC
+        try:
+            while True:
+                # Cleared before the read: a finish signalled while it runs
+                # stays set and ends the wait below at once.
+                finished.clear()
+                current = await self.ledger.offload(self.ledger.get_effect, effect_id)
+                if not current or current.get("state") != "leased":
+                    return current
+                remaining = deadline - asyncio.get_running_loop().time()
+                if remaining <= 0:
+                    return current
+                with contextlib.suppress(TimeoutError):
+                    await asyncio.wait_for(finished.wait(), timeout=min(remaining, EFFECT_RECHECK_SEC))
+        finally:
+            waiters = self._effect_waiters.get(effect_id, [])
+            if finished in waiters:
+                waiters.remove(finished)
+            if not waiters:
+                self._effect_waiters.pop(effect_id, None)
 
     async def dispatch_effect(self, effect_id: str = "") -> dict[str, Any] | None:
-        claim = self.ledger.claim_outbox(
+        self._ensure_listening()
+        claim = await self.ledger.offload(
+            self.ledger.claim_outbox,
             self.worker_id,
             self.settings.effect_lease_sec,
             message_id=effect_id,
@@ -46,12 +106,7 @@ class Steward:
             # An explicit foreground request may race the background steward.
             # Wait for the current fenced owner instead of reporting a false
             # failure while the delivery is still in progress.
-            for _ in range(600):
-                current = self.ledger.get_effect(effect_id)
-                if not current or current.get("state") != "leased":
-                    return current
-                await asyncio.sleep(0.1)
-            return self.ledger.get_effect(effect_id)
+            return await self._wait_for_owner(effect_id)
         try:
             if claim["destination"] == "abaddon":
                 result = await self.organs.dispatch_abaddon(claim["payload"])
@@ -92,7 +147,8 @@ class Steward:
                 "archive_artifact_adapter": "Archive/Artifacts",
                 "abaddon": "Абаддон",
             }.get(str(claim["destination"]), str(claim["destination"]))
-            return self.ledger.finish_effect(
+            return await self.ledger.offload(
+                self.ledger.finish_effect,
                 effect_id=str(claim["message_id"]),
                 lease_token=str(claim["lease_token"]),
                 ok=False,
@@ -120,7 +176,8 @@ class Steward:
                 },
                 retryable=exc.retryable,
             )
-        return self.ledger.finish_effect(
+        return await self.ledger.offload(
+            self.ledger.finish_effect,
             effect_id=str(claim["message_id"]),
             lease_token=str(claim["lease_token"]),
             ok=True,
@@ -154,23 +211,58 @@ class Steward:
         }
         return self.last_cycle
 
+    async def drain_outbox(self) -> int:
+        """Dispatch newly enqueued effects right away instead of at the next
+        heartbeat. Bounded like the cycle; a full batch re-arms the wake-up."""
+        dispatched = 0
+        for _ in range(WAKE_DRAIN_LIMIT):
+            effect = await self.dispatch_effect()
+            if not effect:
+                break
+            dispatched += 1
+            if effect.get("state") == "retry_wait":
+                break
+        else:
+            self._wake.set()
+        self.wake_stats["wakeups"] += 1
+        self.wake_stats["effects_dispatched"] += dispatched
+        return dispatched
+
     async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
         while not self._stop.is_set():
+            # The full cycle is the crash-recovery sweep: expired leases,
+            # retry_wait backoffs and commitment reconciliation. Fresh outbox
+            # rows are dispatched between sweeps as soon as they commit.
             try:
                 await self.cycle()
             except Exception:
                 LOG.exception("steward cycle failed; the foreground core remains alive")
-            try:
-                await asyncio.wait_for(self._stop.wait(), timeout=self.settings.steward_interval_sec)
-            except TimeoutError:
-                pass
+            deadline = loop.time() + self.settings.steward_interval_sec
+            while not self._stop.is_set():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=remaining)
+                except TimeoutError:
+                    break
+                self._wake.clear()
+                try:
+                    await self.drain_outbox()
+                except Exception:
+                    LOG.exception("steward wake-up dispatch failed; the recovery sweep will retry")
 
     def start(self) -> None:
         if self._task is None:
+            self._ensure_listening()
             self._task = asyncio.create_task(self._run(), name="shushunya-steward")
 
     async def stop(self) -> None:
         self._stop.set()
+        self._wake.set()
+        self.ledger.unsubscribe(self._on_ledger_notice)
+        self._loop = None
         if self._task is not None:
             self._task.cancel()
             with contextlib.suppress(asyncio.CancelledError):
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import sqlite3
 import tempfile
+import threading
 import unittest
 from pathlib import Path
+from unittest import mock
 
 from ShushunyaCore.ledger import (
     MAX_PERSISTED_EVIDENCE_BYTES,
@@ -14,6 +16,28 @@ from ShushunyaCore.ledger import (
 )
 
 
+class FlakyConnection:
+    """Writer connection that fails the listed statements once each."""
+
+    def __init__(self, db: sqlite3.Connection):
+        self._db = db
+        self.fail: set[str] = set()
+        self.closed = False
+
+    def execute(self, sql, *args):
+        if sql in self.fail:
+            self.fail.discard(sql)
+            raise sqlite3.OperationalError(f"injected {sql} failure")
+        return self._db.execute(sql, *args)
+
+    def close(self):
+        self.closed = True
+        self._db.close()
+
+    def __getattr__(self, name):
+        return getattr(self._db, name)
+
+
 class LedgerTests(unittest.TestCase):
     def setUp(self):
         self.tmp = tempfile.TemporaryDirectory()
@@ -259,6 +283,141 @@ class LedgerTests(unittest.TestCase):
             ).fetchone()[0]
         self.assertEqual(count, 0)
 
+    def test_group_commit_isolates_a_failing_writer(self):
+        gate = threading.Event()
+        blocker = self.ledger.submit(lambda _db: gate.wait(5))
+
+        def broken(db):
+            db.execute(
+                "INSERT INTO idempotency(scope,key,request_sha256,aggregate_id,response_json,created_at,updated_at) "
+                "VALUES ('turn','broken','x','turn-x','{}','now','now')"
+            )
+            raise InvariantViolation("rejected after a partial write")
+
+        # Both land in the batch queued behind the blocker: one transaction.
+        failing = self.ledger.submit(broken)
+        healthy = self.ledger.submit(lambda db: self.ledger.accept_turn("kept", self.request()))
+        gate.set()
+        blocker.result(5)
+        with self.assertRaises(InvariantViolation):
+            failing.result(5)
+        turn_id, cached = healthy.result(5)
+        self.assertIsNone(cached)
+        with self.ledger.connect() as db:
+            keys = [row[0] for row in db.execute("SELECT key FROM idempotency ORDER BY key")]
+        self.assertEqual(keys, ["kept"])
+        self.assertEqual(self.ledger.accept_turn("kept", self.request()), (turn_id, None))
+        self.assertGreaterEqual(self.ledger.status()["writer"]["max_batch"], 2)
+
+    def test_writer_fails_the_batch_and_recovers_from_a_broken_connection(self):
+        ledger = Ledger(Path(self.tmp.name) / "flaky.sqlite3")
+        opened: list[FlakyConnection] = []
+        refuse_open: list[Exception] = []
+        open_writer = ledger._writer_connection
+
+        def flaky_writer_connection():
+            if refuse_open:
+                raise refuse_open.pop()
+            opened.append(FlakyConnection(open_writer()))
+            return opened[-1]
+
+        with mock.patch.object(ledger, "_writer_connection", side_effect=flaky_writer_connection):
+            ledger.initialize()
+            self.assertEqual(ledger.submit(lambda db: 1).result(5), 1)
+            # COMMIT fails and so does the ROLLBACK after it: the batch fails
+            # and the connection, in an unknown state, is dropped.
+            opened[-1].fail.update({"COMMIT", "ROLLBACK"})
+            lost = ledger.submit(lambda db: ledger.accept_turn("lost", self.request()))
+            with self.assertRaisesRegex(sqlite3.OperationalError, "injected COMMIT"):
+                lost.result(5)
+            self.assertTrue(opened[-1].closed)
+            refuse_open.append(sqlite3.OperationalError("unable to open database file"))
+            with self.assertRaisesRegex(sqlite3.OperationalError, "unable to open"):
+                ledger.submit(lambda db: 2).result(5)
+            turn_id, cached = ledger.submit(lambda db: ledger.accept_turn("kept", self.request())).result(5)
+        self.assertIsNone(cached)
+        self.assertEqual(sum(not connection.closed for connection in opened), 1)
+        with ledger.connect() as db:
+            keys = [row[0] for row in db.execute("SELECT key FROM idempotency ORDER BY key")]
+        self.assertEqual(keys, ["kept"])
+        ledger.close()
+
+    def test_concurrent_turns_keep_idempotency(self):
+        results = []
+        lock = threading.Lock()
+
+        def turn(index):
+            outcome = self.ledger.accept_turn(f"turn-{index % 5}", self.request(f"text {index % 5}"))
+            with lock:
+                results.append((index % 5, outcome[0]))
+
+        threads = [threading.Thread(target=turn, args=(index,)) for index in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(10)
+        by_key: dict[int, set[str]] = {}
+        for key, turn_id in results:
+            by_key.setdefault(key, set()).add(turn_id)
+        self.assertEqual(len(results), 40)
+        self.assertTrue(all(len(turn_ids) == 1 for turn_ids in by_key.values()))
+        with self.ledger.connect() as db:
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM events WHERE kind='turn.received'").fetchone()[0], 5)
+
+    def test_nested_write_rolls_back_only_the_inner_savepoint(self):
+        with self.ledger.write() as db:
+            self.ledger.projection_put("identity", "kept", {"v": 1})
+            with self.assertRaises(RuntimeError):
+                with self.ledger.write() as inner:
+                    inner.execute(
+                        "INSERT INTO idempotency(scope,key,request_sha256,aggregate_id,response_json,created_at,updated_at) "
+                        "VALUES ('turn','dropped','x','turn-x','{}','now','now')"
+                    )
+                    raise RuntimeError("inner failure")
+            self.assertIs(db, inner)
+        self.assertEqual(self.ledger.projection_get("identity", "kept")["value"], {"v": 1})
+        with self.ledger.connect() as db:
+            self.assertEqual(db.execute("SELECT COUNT(*) FROM idempotency").fetchone()[0], 0)
+
+    def test_projection_cache_reuses_reads_until_a_commit_changes_them(self):
+        from ShushunyaCore.identity import Identity
+        from ShushunyaCore.preferences import Preferences
+
+        identity = Identity(self.ledger)
+        identity.seed()
+        self.create_effect()
+        first = identity.snapshot()
+        self.assertEqual(identity.snapshot(), first)
+        self.ledger.list_commitments(include_terminal=False, limit=20)
+        self.ledger.list_commitments(include_terminal=False, limit=20)[0]["state"] = "annotated by caller"
+        self.assertEqual(self.ledger.list_commitments(include_terminal=False, limit=20)[0]["state"], "queued")
+        self.assertEqual(Preferences(self.ledger).candidates(), [])
+        hits = self.ledger.status()["projection_cache"]["hits"]
+        self.assertGreaterEqual(hits, 3)
+
+        self.ledger.projection_put("identity", "temperament", {"direct": False})
+        self.assertEqual(identity.snapshot()["temperament"], {"direct": False})
+
+        # Raw SQL through any write path is observed; a rolled-back write is not.
+        with self.assertRaises(RuntimeError):
+            with self.ledger.write() as db:
+                db.execute("UPDATE commitments SET honest_status='rolled back' WHERE id='commitment-1'")
+                raise RuntimeError("abort")
+        before = self.ledger.status()["projection_cache"]["hits"]
+        self.assertNotEqual(self.ledger.list_commitments(include_terminal=False, limit=20)[0]["honest_status"], "rolled back")
+        self.assertEqual(self.ledger.status()["projection_cache"]["hits"], before + 1)
+        with self.ledger.write() as db:
+            db.execute("UPDATE commitments SET honest_status='edited' WHERE id='commitment-1'")
+        self.assertEqual(self.ledger.list_commitments(include_terminal=False, limit=20)[0]["honest_status"], "edited")
+
+        with self.ledger.write() as db:
+            db.execute(
+                "INSERT INTO preference_candidates(id,action_kind,target_scope,context_scope,proposed_verdict,"
+                "evidence_count,state,created_at,updated_at) VALUES ('c1','push','*','*','auto',3,'proposed','now','now')"
+            )
+        self.assertEqual([item["id"] for item in Preferences(self.ledger).candidates()], ["c1"])
+        self.assertGreater(self.ledger.status()["projection_cache"]["hit_rate"], 0)
+
 
 if __name__ == "__main__":
     unittest.main()
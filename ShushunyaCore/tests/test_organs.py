@@ -1,10 +1,15 @@
 from __future__ import annotations
 
+import json
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from types import SimpleNamespace
 from unittest.mock import patch
 
-from ShushunyaCore.organs import OrganError, Organs
+import httpx
+
+from ShushunyaCore.organs import ORGAN_CONNECT_TIMEOUT_SEC, ORGAN_POOLS, ORGAN_TIMEOUT, OrganError, Organs
 
 
 class FakeResponse:
@@ -189,5 +194,105 @@ class AbaddonOutcomeTests(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(caught.exception.code, "invalid_abaddon_continuation")
 
 
+class KeepAliveHealthHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"ok": True}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        return None
+
+
+class OrganClientPoolTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHealthHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    async def asyncTearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    async def test_repeated_probes_reuse_one_keep_alive_connection(self):
+        organs = Organs(SimpleNamespace())
+        try:
+            for _ in range(3):
+                name, health = await organs._health_one("vox", f"{self.base_url}/health")
+                self.assertEqual(name, "vox")
+                self.assertTrue(health["ready"])
+            first_client = organs.client("vox", probe=True)
+            self.assertIs(first_client, organs.client("vox", probe=True))
+            self.assertIsNot(first_client, organs.client("vox"))
+            self.assertIsNot(first_client, organs.client("archive", probe=True))
+        finally:
+            await organs.aclose()
+
+        stats = organs.client_stats()["vox"]
+        self.assertEqual(stats["requests"], 3)
+        self.assertEqual(stats["new_connections"], 1)
+        self.assertEqual(stats["reused_connections"], 2)
+        self.assertEqual(sum(stats["latency_ms_histogram"].values()), 3)
+        self.assertTrue(first_client.is_closed)
+
+    async def test_unreachable_organ_counts_an_error_not_a_reuse(self):
+        organs = Organs(SimpleNamespace())
+        try:
+            _name, health = await organs._health_one("warpwails", "http://127.0.0.1:9/health")
+        finally:
+            await organs.aclose()
+        self.assertFalse(health["ready"])
+        stats = organs.client_stats()["warpwails"]
+        self.assertEqual((stats["requests"], stats["errors"], stats["reused_connections"]), (1, 1, 0))
+
+
+class RecordingClient:
+    """Stands in for one pooled client and keeps the keyword arguments of each call."""
+
+    def __init__(self, *, timeout, limits):
+        self.timeout = timeout
+        self.limits = limits
+        self.calls: list[dict] = []
+
+    async def get(self, _url, **kwargs):
+        self.calls.append(kwargs)
+        return FakeResponse(200, {"ok": True})
+
+    post = get
+
+    async def aclose(self):
+        return None
+
+
+class OrganTimeoutTests(unittest.IsolatedAsyncioTestCase):
+    async def test_scalar_timeout_sets_the_read_deadline_only(self):
+        organs = Organs(SimpleNamespace())
+        with patch("ShushunyaCore.organs.httpx.AsyncClient", side_effect=RecordingClient):
+            await organs.request("abaddon", "POST", "http://127.0.0.1:7000/orchestrate_run", json={}, timeout=240.0)
+        timeout = organs.client("abaddon").calls[0]["timeout"]
+        self.assertIsInstance(timeout, httpx.Timeout)
+        self.assertEqual(timeout.read, 240.0)
+        self.assertEqual(timeout.connect, ORGAN_CONNECT_TIMEOUT_SEC)
+        self.assertEqual((timeout.write, timeout.pool), (ORGAN_TIMEOUT.write, ORGAN_TIMEOUT.pool))
+
+    async def test_health_probes_do_not_share_the_organ_pool(self):
+        organs = Organs(SimpleNamespace())
+        with patch("ShushunyaCore.organs.httpx.AsyncClient", side_effect=RecordingClient):
+            await organs.request("abaddon", "POST", "http://127.0.0.1:7000/orchestrate_run", json={}, timeout=240.0)
+            _name, health = await organs._health_one("abaddon", "http://127.0.0.1:7000/health")
+        self.assertTrue(health["ready"])
+        pooled, probe = organs.client("abaddon"), organs.client("abaddon", probe=True)
+        self.assertEqual((len(pooled.calls), len(probe.calls)), (1, 1))
+        self.assertEqual(pooled.limits.max_connections, ORGAN_POOLS["abaddon"][0])
+        self.assertEqual(probe.limits.max_connections, 1)
+        self.assertEqual(probe.calls[0]["timeout"].read, 2.0)
+        self.assertEqual(organs.client_stats()["abaddon"]["requests"], 2)
+
+
 if __name__ == "__main__":
     unittest.main()
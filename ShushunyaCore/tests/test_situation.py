@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from ShushunyaCore import situation as situation_module
+from ShushunyaCore.identity import Identity
+from ShushunyaCore.ledger import Ledger
+from ShushunyaCore.organs import Organs
+from ShushunyaCore.preferences import Preferences
+from ShushunyaCore.relationship import Relationship
+from ShushunyaCore.schema import TurnEnvelope
+from ShushunyaCore.situation import SituationAssembler, _json_size
+
+
+def prose(words: int, seed: str) -> str:
+    vocabulary = ("сборка", "галага", "кнопка", "память", "условие", "apk", "android", "задача", seed)
+    return " ".join(vocabulary[index % len(vocabulary)] for index in range(words)) + "."
+
+
+def manifest(scale: int) -> dict[str, Any]:
+    capabilities = [
+        {
+            "action": f"action_{index}",
+            "available": True,
+            "description": prose(40 * scale, f"cap{index}"),
+            "limits": [prose(20 * scale, f"limit{index}")],
+            "required_fields": ["goal", "task_id"],
+        }
+        for index in range(12)
+    ]
+    capabilities.append(
+        {
+            "action": "deliver_artifact",
+            "available": True,
+            "artifacts": [
+                {"artifact_id": f"art_{index:032x}", "filename": f"build-{index}.apk", "size_bytes": 1_000 + index}
+                for index in range(10 * scale)
+            ],
+        }
+    )
+    return {"principle": prose(30, "principle"), "capabilities": capabilities}
+
+
+def envelope(scenario: str, scale: int) -> TurnEnvelope:
+    """A turn whose ``scenario`` part is inflated ``scale`` times (1 is a normal turn)."""
+    big_manifest = scenario in {"manifest", "everything"}
+    big_recall = scenario in {"recall", "everything"}
+    big_history = scenario in {"history", "everything"}
+    return TurnEnvelope.model_validate(
+        {
+            "idempotency_key": f"situation-{scenario}-{scale}",
+            "source": "app",
+            "text": "А помнишь задачу про галагу и условие с кнопкой? " + prose(60, scenario),
+            "recent_history": [
+                {"role": "user" if item % 2 else "assistant", "content": prose(40 * scale if big_history else 40, f"history{item}")}
+                for item in range(12 if big_history else 4)
+            ],
+            "capability_manifest": manifest(scale if big_manifest else 1),
+            "context": {
+                "persona": prose(120, "persona"),
+                "recalled_memory": prose(300 * scale if big_recall else 120, f"recall{scale}"),
+                "task_page_context": prose(150, "taskpage"),
+                "live_roster": "\n".join(f"- core-task-{item} — running" for item in range(12)),
+                "pending_reports": {"reports": [prose(30, f"report{item}") for item in range(4)]},
+            },
+        }
+    )
+
+
+def tier(situation: dict[str, Any]) -> str:
+    if not situation.get("context_compacted"):
+        return "full"
+    if "pending_reports" in situation:
+        return "compact"
+    if "rules" not in situation:
+        return "emergency"
+    return "last_resort" if any("question" in item for item in situation.get("pending_decisions", [])) else "minimal"
+
+
+# (scenario, scale, budget) -> (tier, sha256 of the sorted-key situation JSON)
+# produced by the assembler before sections were packed from cached fragments.
+CASES: dict[tuple[str, int, int], tuple[str, str]] = {
+    ("manifest", 1, 2_800): ("emergency", "d1d5d332357b4270b60eac499fb599edc32670fdcec91a3339624191c970187d"),
+    ("manifest", 1, 5_000): ("minimal", "424d43753b579225b3767b643c9de194feb2529bd3961ad67096bf52060c4d1b"),
+    ("manifest", 1, 12_000): ("compact", "06b79e4c01aaed24b18226fd30d1ff96a3991aced5bad06ccd5b2906b7fb0084"),
+    ("manifest", 4, 2_800): ("emergency", "ef3f62509b650e4976f9fbf9ffed37fc03c9d0cc9f2d95f6f9caaef05afa678d"),
+    ("manifest", 4, 5_000): ("minimal", "cd924b6e8823b12472d1c8dcb2f6f9e46499a74c603c56b26045fc45af8cdd19"),
+    ("manifest", 4, 12_000): ("compact", "3d56dc619d6154b13b81b0629d70001fcaa6aa0faa3d8260570e8d827c21d891"),
+    ("manifest", 12, 2_800): ("emergency", "26373c5c369776844843ee7332cdc7047d22e7efd2d2f7eb611b9820e39c1d93"),
+    ("manifest", 12, 5_000): ("minimal", "1b35f6089d9de3f8eab4932cd7f486bd769e224f4286c0428c6a618f13ef159b"),
+    ("manifest", 12, 12_000): ("compact", "7d683b5591be7242580aa9e642a872ce055d8ee17f31a7d69a6f8d1f53e0ae95"),
+    ("recall", 1, 2_800): ("emergency", "37cb4d014d0a6dba4c0689e3b1926494e13e923c287ffff3b9281a4b832d1bef"),
+    ("recall", 1, 5_000): ("minimal", "78ee8b6d4f22d60dfe8f2b1b12e9bb4dbcd02a04e3eea3c935249f5bf8a360dd"),
+    ("recall", 1, 12_000): ("compact", "8315fde8fb87f84cbd65c0394482dcb7482617c56e5aac80e4da98c1e8d09290"),
+    ("recall", 4, 2_800): ("emergency", "36fc071a6584493aff5cb09a91a4a9acc300a813af4c9c4371bb484ebf9ba903"),
+    ("recall", 4, 5_000): ("minimal", "fdf9958bbbaf182b357d8b903f04211ff15132d65b3952221f8a3da695ff3ee8"),
+    ("recall", 4, 12_000): ("compact", "48c0cefd771d763fe812b935791b02fdef8715da18b4543e1e8a4e5a220e6c04"),
+    ("recall", 12, 2_800): ("emergency", "9b673bd630ff84c58d109d2cd92a346ae6711843454829e2017c101a5b109546"),
+    ("recall", 12, 5_000): ("minimal", "51b2dcc0acb3882896e6832786098c42ad47866c30d9505fb167a7b7a8ab7a94"),
+    ("recall", 12, 12_000): ("compact", "79dc5de2b423e89b0a5898b11f2cc42afe9738e5191e2e5c7f0840197fe655f2"),
+    ("history", 1, 2_800): ("emergency", "1f40120b57ec5bd40263ef9fe01985e6e48770249017239c154256c02cf01248"),
+    ("history", 1, 5_000): ("minimal", "ee6fde40dc3252def2c138dd39411941dd30a77eab350a5bdd06c8877b33ea06"),
+    ("history", 1, 12_000): ("compact", "c2918877965ad478a21142474dcdc0f783c952c13290eac9dc7a0e6083cbdc69"),
+    ("history", 4, 2_800): ("emergency", "54ebdc518ccae45a4013f3af9235e186537118dc8d32a26ced110fb859fae813"),
+    ("history", 4, 5_000): ("minimal", "485df3ccc764aafaa64bb95586f679781e0b1f5cbbc74c66944f2acf2fb2e55f"),
+    ("history", 4, 12_000): ("compact", "591c4e769affaa2f39c9d761e5630fc3ba358362cafc1fa0038cb9b8ba6f7c45"),
+    ("history", 12, 2_800): ("emergency", "66574a806049eb2c494a5974dc7ad7d8bab56c86daa3594ffa17d87225d9cfbb"),
+    ("history", 12, 5_000): ("minimal", "5c4e2ca0c63629e286b1b86e336b2fa392ce464cd69b256563f06da60ce59425"),
+    ("history", 12, 12_000): ("compact", "82a1fd331c70538b08eb7d7067e3b0801bd9ed1bb7f98cbd9c711619529547e5"),
+    ("everything", 1, 2_800): ("emergency", "b97f64f373a22cc9690018b3ef013ef0b92f0a3d75cb7fb6205841a54d2106a4"),
+    ("everything", 1, 5_000): ("minimal", "ea6071fecbd1188aadc4e505f15f0333da296e2eb40c5c43653632b4fc418376"),
+    ("everything", 1, 12_000): ("compact", "9187731cef9a0247df2f18454def9aa1c53c24241270182f58e4e8156ec8d827"),
+    ("everything", 4, 2_800): ("emergency", "131edcd574838b0237d8f715cfa204dec041c0e6d23461f21ae61214570ab112"),
+    ("everything", 4, 5_000): ("minimal", "5d94a9211b22ee0fe79a52346957d9e0849099aeeb47aed7460bde43daefdf8a"),
+    ("everything", 4, 12_000): ("compact", "9ed102a552f71d2396f7280f1ba9c8cc148d485d04cd15b857c60670088ada8e"),
+    ("everything", 12, 2_800): ("emergency", "483d02725d6ab95d163dd5c0d163e401c1dc3cc49e04342aad587c9ebb19e997"),
+    ("everything", 12, 5_000): ("minimal", "179d6129f04879338c6acc279d487c91272c64776ffaf810a8f40911efadded8"),
+    ("everything", 12, 12_000): ("compact", "ad7dfa65a1db7e7cdd4ba4eab57264164353c6ff7c0c06e898587619f7fdb7ca"),
+    ("manifest", 1, 60_000): ("full", "e3dcaee0060e0f44506722d7285b8343de1db43a3a6025373b5bb706847b06fe"),
+    ("recall", 1, 60_000): ("full", "89cfbde9c3335ea5fc1c874a85ac22673621c1658822088ffc417de324bbfe7e"),
+    ("history", 1, 60_000): ("full", "d933f02f2198dee0c0ddb02baa214b6ce5f875222563a88855058b699a7f1768"),
+    ("everything", 1, 60_000): ("full", "c0f0036b0ed9420de49c29231bf4d1128fa48cafb363e2295976d96a7f7875b8"),
+}
+
+
+class SituationPackingTest(unittest.TestCase):
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.ledger = Ledger(Path(self.temp.name) / "core.sqlite3")
+        self.ledger.initialize()
+        self.identity = Identity(self.ledger)
+        self.relationship = Relationship(self.ledger)
+        self.identity.seed()
+        self.relationship.seed()
+
+    def tearDown(self):
+        self.ledger.close()
+        self.temp.cleanup()
+
+    def assembler(self, budget: int) -> SituationAssembler:
+        return SituationAssembler(
+            SimpleNamespace(context_char_budget=budget),
+            self.ledger,
+            self.identity,
+            self.relationship,
+            Preferences(self.ledger),
+            Organs(SimpleNamespace()),
+        )
+
+    def test_oversized_envelopes_match_the_previous_assembler(self):
+        for (scenario, scale, budget), (expected_tier, digest) in CASES.items():
+            with self.subTest(scenario=scenario, scale=scale, budget=budget):
+                situation = self.assembler(budget).assemble(envelope(scenario, scale))
+                encoded = json.dumps(situation, ensure_ascii=False, sort_keys=True)
+                self.assertEqual(tier(situation), expected_tier)
+                self.assertEqual(hashlib.sha256(encoded.encode("utf-8")).hexdigest(), digest)
+
+    def test_tiers_fall_through_in_order(self):
+        turn = envelope("everything", 4)
+        seen = [tier(self.assembler(budget).assemble(turn)) for budget in (60_000, 12_000, 5_000, 2_800)]
+        self.assertEqual(seen, ["full", "compact", "minimal", "emergency"])
+        for budget in (60_000, 12_000, 5_000):
+            situation = self.assembler(budget).assemble(turn)
+            self.assertLessEqual(_json_size(situation), budget)
+
+    def test_section_packer_measures_exactly_what_it_builds(self):
+        for budget in (50, 200, 10_000):
+            packer = situation_module._SectionPacker(budget)
+            tier_sections = [
+                ("a", None, lambda: "x" * 40),
+                ("b", None, lambda: {"nested": ["значение", 1, None]}),
+                ("c", 1, lambda: list(range(30))),
+            ]
+            built = packer.build(tier_sections)
+            self.assertEqual(packer.fits(tier_sections), _json_size(built) <= budget)
+
+    def test_recall_analysis_is_not_kept_after_the_turn(self):
+        self.assembler(2_800).assemble(envelope("recall", 4))
+        self.assertIsNone(situation_module._TURN_MEMO.get())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import tempfile
+import time
 import unittest
 from pathlib import Path
 from types import SimpleNamespace
+from unittest import mock
 
 from ShushunyaCore.commitments import Commitments
 from ShushunyaCore.ledger import Ledger
@@ -33,6 +36,9 @@ class FakeArtifactOrgans:
             "explanation": "Archive сохранил карточку файла.",
         }
 
+    async def refresh_health(self):
+        return {}
+
     async def dispatch_abaddon(self, _payload):  # pragma: no cover - wrong route guard
         raise AssertionError("artifact effect was routed to Abaddon")
 
@@ -189,6 +195,94 @@ class StewardArtifactTests(unittest.IsolatedAsyncioTestCase):
             commitment["diagnostic"]["code"], "archive_artifact_adapter_unreachable",
         )
 
+    async def test_foreground_waiter_resumes_on_the_owners_finish(self):
+        self.create_effect()
+        organs = FakeArtifactOrgans()
+        steward = Steward(
+            SimpleNamespace(effect_lease_sec=60),
+            self.ledger,
+            organs,
+            Commitments(self.ledger, organs),
+        )
+        claim = self.ledger.claim_outbox("other-steward", 60, message_id="effect-artifact", destination="")
+        waiter = asyncio.create_task(steward.dispatch_effect("effect-artifact"))
+        await asyncio.sleep(0.2)
+        self.assertFalse(waiter.done())
+
+        started = time.monotonic()
+        await asyncio.to_thread(
+            self.ledger.finish_effect,
+            effect_id="effect-artifact",
+            lease_token=str(claim["lease_token"]),
+            ok=True,
+            result={"ok": True, "explanation": "доставлено другим стюардом"},
+        )
+        effect = await asyncio.wait_for(waiter, timeout=2)
+
+        self.assertEqual(effect["state"], "delivered")
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(organs.calls, [])
+        self.assertEqual(steward._effect_waiters, {})
+
+    async def test_finish_during_the_waiters_read_is_not_lost(self):
+        self.create_effect()
+        organs = FakeArtifactOrgans()
+        steward = Steward(
+            SimpleNamespace(effect_lease_sec=60),
+            self.ledger,
+            organs,
+            Commitments(self.ledger, organs),
+        )
+        claim = self.ledger.claim_outbox("other-steward", 60, message_id="effect-artifact", destination="")
+        get_effect = self.ledger.get_effect
+        reads = []
+
+        def read_then_finish(effect_id):
+            # The owner finishes right after this read saw the lease.
+            current = get_effect(effect_id)
+            if not reads:
+                self.ledger.finish_effect(
+                    effect_id=effect_id,
+                    lease_token=str(claim["lease_token"]),
+                    ok=True,
+                    result={"ok": True, "explanation": "доставлено другим стюардом"},
+                )
+            reads.append(current["state"])
+            return current
+
+        started = time.monotonic()
+        with mock.patch.object(self.ledger, "get_effect", side_effect=read_then_finish):
+            effect = await asyncio.wait_for(steward.dispatch_effect("effect-artifact"), timeout=10)
+
+        self.assertEqual(effect["state"], "delivered")
+        self.assertEqual(reads[0], "leased")
+        self.assertLess(time.monotonic() - started, 1.0)
+        self.assertEqual(organs.calls, [])
+
+    async def test_enqueued_effect_is_dispatched_before_the_next_sweep(self):
+        organs = FakeArtifactOrgans()
+        steward = Steward(
+            SimpleNamespace(effect_lease_sec=60, steward_interval_sec=3600),
+            self.ledger,
+            organs,
+            Commitments(self.ledger, organs),
+        )
+        steward.start()
+        try:
+            await asyncio.sleep(0.2)  # the startup sweep finds nothing
+            await asyncio.to_thread(self.create_effect)
+            for _ in range(40):
+                effect = self.ledger.get_effect("effect-artifact")
+                if effect["state"] == "delivered":
+                    break
+                await asyncio.sleep(0.05)
+        finally:
+            await steward.stop()
+
+        self.assertEqual(effect["state"], "delivered")
+        self.assertEqual([call[0] for call in organs.calls], ["effect-artifact"])
+        self.assertEqual(steward.wake_stats["effects_dispatched"], 1)
+
 
 class StewardClarificationTests(unittest.IsolatedAsyncioTestCase):
     async def asyncSetUp(self):
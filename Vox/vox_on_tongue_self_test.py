@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""on_tongue stays off the model: background classification, cached relevance."""
+from __future__ import annotations
+
+import re
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import vox_service
+
+DIMENSIONS = 1024
+INTENTS = 300
+TURNS = 400
+
+
+def _fake_embed(text: str) -> list[float]:
+    """One-hot on the "тема-N" marker so exactly one intent is relevant."""
+    match = re.search(r"тема-(\d+)", text)
+    vector = [0.01] * DIMENSIONS
+    if match:
+        vector[int(match.group(1)) % DIMENSIONS] = 1.0
+    return vector
+
+
+def main() -> int:
+    original_db = vox_service.DB_PATH
+    original_embed = vox_service.embed_text
+    original_classify = vox_service.classify_intent
+    calls = {"classify": 0, "embed": 0}
+
+    def counting_embed(text: str) -> list[float]:
+        calls["embed"] += 1
+        return _fake_embed(text)
+
+    def fake_classify(source: str, kind: str, body: str) -> dict:  # noqa: ARG001
+        calls["classify"] += 1
+        speech_class = "важно" if body.endswith("-0") else "к слову"
+        return {"speech_class": speech_class, "topic": body, "announce_line": "Я кое-что узнал."}
+
+    with tempfile.TemporaryDirectory() as temp:
+        try:
+            vox_service.DB_PATH = Path(temp) / "vox.sqlite3"
+            vox_service.embed_text = counting_embed
+            vox_service.classify_intent = fake_classify
+            for index in range(INTENTS):
+                vox_service.create_intent(
+                    {"source": "archive", "kind": "report", "body": f"заметка тема-{index}", "dedupe_key": f"note:{index}"}
+                )
+            if calls != {"classify": 0, "embed": 0}:
+                raise AssertionError(f"create_intent called the model inline: {calls}")
+            before = vox_service.on_tongue("тема-7")
+            if before["open_total"] != INTENTS or any(item["class"] != "unclassified" for item in before["intents"]):
+                raise AssertionError(f"unclassified intents were not served as-is: {before}")
+            if calls["classify"]:
+                raise AssertionError("on_tongue classified synchronously")
+
+            drained = vox_service.process_pending_intents()
+            if drained["classified"] != INTENTS or calls["classify"] != INTENTS:
+                raise AssertionError(f"classifier worker did not drain the backlog: {drained}, {calls}")
+            duplicate = vox_service.create_intent(
+                {"source": "archive", "kind": "report", "body": "заметка тема-7", "dedupe_key": "note:7"}
+            )
+            if duplicate.get("duplicate") is not True or duplicate.get("speech_class") != "к слову":
+                raise AssertionError(f"unchanged deferred intent was not deduplicated: {duplicate}")
+
+            calls["embed"] = 0
+            latencies = []
+            for turn in range(TURNS):
+                started = time.perf_counter()
+                result = vox_service.on_tongue(f"поговорим про тема-{turn % INTENTS}")
+                latencies.append((time.perf_counter() - started) * 1000.0)
+                topics = [item["topic"] for item in result["intents"]]
+                if f"заметка тема-{turn % INTENTS}" not in topics and turn % INTENTS:
+                    raise AssertionError(f"relevant intent missing on turn {turn}: {topics}")
+                if len(topics) > 2:
+                    raise AssertionError(f"irrelevant intents leaked onto the tongue: {topics}")
+            if calls != {"classify": INTENTS, "embed": TURNS}:
+                raise AssertionError(f"on_tongue must cost exactly one embedding per turn: {calls}")
+
+            ids = [item["id"] for item in vox_service.on_tongue("тема-5")["intents"] if item["class"] == "к слову"]
+            vox_service.mark_conveyed({"conveyed_ids": ids})
+            after = vox_service.on_tongue("тема-5")
+            if after["open_total"] != INTENTS - len(ids) or any(item["id"] in ids for item in after["intents"]):
+                raise AssertionError(f"conveyed intent stayed in the cache: {after}")
+        finally:
+            vox_service.DB_PATH = original_db
+            vox_service.embed_text = original_embed
+            vox_service.classify_intent = original_classify
+
+    latencies.sort()
+    p50 = statistics.median(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"on_tongue over {INTENTS} intents x {DIMENSIONS}d: p50 {p50:.3f} ms, p99 {p99:.3f} ms")
+    print("vox on_tongue self-test: ok")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
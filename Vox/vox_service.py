@@ -35,7 +35,19 @@ from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 from uuid import uuid4
 
+try:
+    import numpy as np
+except ImportError:  # pure-Python cosine fallback
+    np = None
+
 ROOT = Path(__file__).resolve().parent
+try:
+    from ArchiveOfHeresy.embedding_cache import cached_embedding
+except ModuleNotFoundError:
+    import sys
+
+    sys.path.insert(0, str(ROOT.parent))
+    from ArchiveOfHeresy.embedding_cache import cached_embedding
 DB_PATH = Path(os.environ.get("VOX_DB_PATH", ROOT / "runtime" / "vox.sqlite3"))
 DEFAULT_PORT = int(os.environ.get("VOX_PORT", "7400"))
 LLM_BASE_URL = os.environ.get("VOX_LLM_BASE_URL", "http://127.0.0.1:8079").rstrip("/")
@@ -49,6 +61,7 @@ PUSH_LEASE_SECONDS = max(10, int(os.environ.get("VOX_PUSH_LEASE_SECONDS", "60"))
 PUSH_RETRY_BASE_SECONDS = max(1, int(os.environ.get("VOX_PUSH_RETRY_BASE_SECONDS", "5")))
 PUSH_RETRY_MAX_SECONDS = max(PUSH_RETRY_BASE_SECONDS, int(os.environ.get("VOX_PUSH_RETRY_MAX_SECONDS", "300")))
 PUSH_POLL_SECONDS = max(0.2, float(os.environ.get("VOX_PUSH_POLL_SECONDS", "1")))
+CLASSIFY_POLL_SECONDS = max(1.0, float(os.environ.get("VOX_CLASSIFY_POLL_SECONDS", "30")))
 _FCM_TOKEN_CACHE = {"access_token": "", "exp": 0.0}
 _FCM_LOCK = threading.Lock()
 import re
@@ -115,6 +128,11 @@ _URGENT_CONTRACT_KINDS = {
     "task_stalled_internal",
 }
 _PUSH_WAKE = threading.Event()
+# create_intent stores facts and returns; the brain and the embedder run on
+# the classifier worker so a slow model never sits inside a chat turn.
+_CLASSIFY_WAKE = threading.Event()
+_SCHEMA_READY: set[str] = set()
+_SCHEMA_LOCK = threading.Lock()
 
 
 def conversation_push_text(value: str, fallback: str) -> str:
@@ -152,9 +170,25 @@ def _post_json(url: str, payload: dict, timeout: float = 120.0) -> dict:
 
 
 def connect() -> sqlite3.Connection:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    """Open the Vox database; schema setup runs once per database path."""
+    key = str(DB_PATH)
+    if key not in _SCHEMA_READY:
+        with _SCHEMA_LOCK:
+            if key not in _SCHEMA_READY:
+                DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+                db = sqlite3.connect(DB_PATH, timeout=15)
+                db.row_factory = sqlite3.Row
+                try:
+                    _ensure_schema(db)
+                finally:
+                    db.close()
+                _SCHEMA_READY.add(key)
     db = sqlite3.connect(DB_PATH, timeout=15)
     db.row_factory = sqlite3.Row
+    return db
+
+
+def _ensure_schema(db: sqlite3.Connection) -> None:
     db.execute("CREATE TABLE IF NOT EXISTS fcm_tokens (token TEXT PRIMARY KEY, updated_at TEXT NOT NULL)")
     db.execute(
         """
@@ -204,11 +238,16 @@ def connect() -> sqlite3.Connection:
         "ON intents (push_state, push_next_at, id)"
     )
     db.commit()
-    return db
 
 
 def embed_text(text: str) -> list[float]:
-    payload = {"model": EMBED_MODEL, "input": [f"query: {text[:600]}"]}
+    """Read through the embedding cache shared with the Archive, so a chat
+    turn's context is embedded once however many times it is asked for."""
+    return cached_embedding(EMBED_MODEL, f"query: {text[:600]}", _request_embedding)
+
+
+def _request_embedding(model_input: str) -> list[float]:
+    payload = {"model": EMBED_MODEL, "input": [model_input]}
     response = _post_json(f"{EMBED_BASE_URL}/v1/embeddings", payload, timeout=60)
     return list((response.get("data") or [{}])[0].get("embedding") or [])
 
@@ -222,6 +261,105 @@ def cosine(a: list[float], b: list[float]) -> float:
     return dot / (na * nb) if na and nb else 0.0
 
 
+class _IntentCache:
+    """Write-through copy of the open/mentioned intents for one database.
+
+    Loaded from SQLite on first use; afterwards every writer refreshes the rows
+    it touched inside its own transaction, so readers never go back to disk.
+    Embeddings are parsed once and stacked into a row-normalised matrix that
+    is rebuilt lazily after a change.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._path = ""
+        self._rows: dict[int, dict] = {}
+        self._vectors: dict[int, list[float]] = {}
+        self._matrix_ids: list[int] = []
+        self._matrix = None
+        self._matrix_dim = 0
+        self._dirty = True
+
+    def _load(self, db: sqlite3.Connection) -> None:
+        rows = db.execute("SELECT * FROM intents WHERE state IN ('open', 'mentioned') ORDER BY id").fetchall()
+        self._rows = {}
+        self._vectors = {}
+        for row in rows:
+            self._put(dict(row))
+        self._path = str(DB_PATH)
+        self._dirty = True
+
+    def _put(self, row: dict) -> None:
+        intent_id = int(row["id"])
+        if row["state"] not in ("open", "mentioned"):
+            self._rows.pop(intent_id, None)
+            self._vectors.pop(intent_id, None)
+            return
+        self._rows[intent_id] = row
+        try:
+            vector = [float(value) for value in json.loads(row["embedding_json"] or "[]")]
+        except (TypeError, ValueError):
+            vector = []
+        if vector:
+            self._vectors[intent_id] = vector
+        else:
+            self._vectors.pop(intent_id, None)
+
+    def rows(self, db: sqlite3.Connection) -> list[dict]:
+        with self._lock:
+            if self._path != str(DB_PATH):
+                self._load(db)
+            return [dict(self._rows[key]) for key in sorted(self._rows)]
+
+    def refresh(self, db: sqlite3.Connection, ids: list[int]) -> None:
+        """Re-read the given rows through the writer's own connection."""
+        if not ids:
+            return
+        with self._lock:
+            if self._path != str(DB_PATH):
+                return  # not loaded yet: the first reader loads everything
+            placeholders = ",".join("?" for _ in ids)
+            found = {int(row["id"]): dict(row) for row in db.execute(f"SELECT * FROM intents WHERE id IN ({placeholders})", tuple(ids))}
+            for intent_id in ids:
+                if intent_id in found:
+                    self._put(found[intent_id])
+                else:
+                    self._rows.pop(intent_id, None)
+                    self._vectors.pop(intent_id, None)
+            self._dirty = True
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._path = ""
+
+    def relevance(self, context_embedding: list[float], ids: list[int]) -> dict[int, float]:
+        """Cosine of the context against every cached intent in ``ids``."""
+        if not context_embedding or not ids:
+            return {}
+        with self._lock:
+            if np is None:
+                return {intent_id: cosine(context_embedding, self._vectors.get(intent_id, [])) for intent_id in ids}
+            dim = len(context_embedding)
+            if self._dirty or self._matrix_dim != dim:
+                self._matrix_ids = [key for key in sorted(self._vectors) if len(self._vectors[key]) == dim]
+                matrix = np.array([self._vectors[key] for key in self._matrix_ids], dtype=np.float32).reshape(-1, dim)
+                norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+                self._matrix = matrix / np.where(norms == 0, 1.0, norms)
+                self._matrix_dim = dim
+                self._dirty = False
+            matrix_ids, matrix = self._matrix_ids, self._matrix
+        query = np.asarray(context_embedding, dtype=np.float32)
+        norm = float(np.linalg.norm(query))
+        if not norm or not matrix_ids:
+            return {}
+        scores = matrix @ (query / norm)
+        wanted = set(ids)
+        return {intent_id: float(score) for intent_id, score in zip(matrix_ids, scores.tolist()) if intent_id in wanted}
+
+
+_INTENTS = _IntentCache()
+
+
 def _fcm_access_token() -> str:
     """Service-account -> OAuth2 access token for FCM v1 (cached ~55 min)."""
     with _FCM_LOCK:
@@ -347,6 +485,7 @@ def _claim_pending_push(now: datetime | None = None) -> dict | None:
             ).rowcount
             if changed != 1:
                 return None
+            _INTENTS.refresh(db, [int(row["id"])])
             claim = dict(row)
             claim["push_lease_token"] = lease_token
             claim["push_next_at"] = lease_until
@@ -391,6 +530,7 @@ def _finish_push_claim(
                     claim["push_lease_token"],
                 ),
             ).rowcount
+            _INTENTS.refresh(db, [int(claim["id"])])
     return {
         "checkpointed": changed == 1,
         "attempts": attempts,
@@ -498,32 +638,41 @@ def classify_intent(source: str, kind: str, body: str) -> dict:
     }
 
 
-def classify_pending(db: sqlite3.Connection) -> None:
-    """Intents stored while the model was unavailable get classified lazily —
-    deferral, not a mechanical default decision."""
-    rows = db.execute("SELECT * FROM intents WHERE speech_class = 'unclassified' AND state = 'open' LIMIT 5").fetchall()
+def classify_pending(db: sqlite3.Connection, limit: int = 5) -> int:
+    """Classify intents stored without a verdict — deferral, not a mechanical
+    default decision. The model call runs outside any transaction; the row is
+    only updated if nobody refreshed it meanwhile. Returns rows classified."""
+    rows = db.execute(
+        "SELECT * FROM intents WHERE speech_class = 'unclassified' AND state = 'open' ORDER BY id LIMIT ?",
+        (limit,),
+    ).fetchall()
+    classified = 0
     for row in rows:
         try:
             brain = classify_intent(row["source"], row["kind"], row["body"])
-            announce_line = conversation_push_text(
-                brain["announce_line"],
-                "У меня есть обновление. Открой чат — там скажу нормально.",
-            )
-            embedding = []
-            try:
-                embedding = embed_text(f"{brain['topic']} {row['body']}")
-            except Exception:
-                pass
-            was_newly_deferred = row["push_state"] == "awaiting_classification"
-            queue_push = was_newly_deferred and brain["speech_class"] == "срочно" and bool(announce_line)
-            next_push_state = "pending" if queue_push else ("not_required" if was_newly_deferred else row["push_state"])
-            db.execute(
+        except Exception:
+            break  # model still down: stay unclassified, try next time
+        announce_line = conversation_push_text(
+            brain["announce_line"],
+            "У меня есть обновление. Открой чат — там скажу нормально.",
+        )
+        embedding = []
+        try:
+            embedding = embed_text(f"{brain['topic'] or row['topic']} {row['body']}")
+        except Exception:
+            pass
+        was_newly_deferred = row["push_state"] == "awaiting_classification"
+        queue_push = was_newly_deferred and brain["speech_class"] == "срочно" and bool(announce_line)
+        next_push_state = "pending" if queue_push else ("not_required" if was_newly_deferred else row["push_state"])
+        with _LOCK:
+            changed = db.execute(
                 "UPDATE intents SET speech_class = ?, topic = ?, announce_line = ?, embedding_json = ?, "
                 "push_state = ?, push_attempts = CASE WHEN ? THEN 0 ELSE push_attempts END, "
                 "push_next_at = CASE WHEN ? THEN NULL ELSE push_next_at END, "
                 "push_error = CASE WHEN ? THEN NULL ELSE push_error END, "
                 "pushed_at = CASE WHEN ? THEN NULL ELSE pushed_at END, "
-                "push_lease_token = CASE WHEN ? THEN NULL ELSE push_lease_token END, updated_at = ? WHERE id = ?",
+                "push_lease_token = CASE WHEN ? THEN NULL ELSE push_lease_token END, updated_at = ? "
+                "WHERE id = ? AND speech_class = 'unclassified' AND body = ? AND push_state = ?",
                 (
                     brain["speech_class"],
                     brain["topic"] or row["topic"],
@@ -537,12 +686,67 @@ def classify_pending(db: sqlite3.Connection) -> None:
                     was_newly_deferred,
                     now_iso(),
                     row["id"],
+                    row["body"],
+                    row["push_state"],
                 ),
-            )
-            if queue_push:
-                _PUSH_WAKE.set()
+            ).rowcount
+            _INTENTS.refresh(db, [int(row["id"])])
+            db.commit()
+        classified += changed
+        if changed and queue_push:
+            _PUSH_WAKE.set()
+    return classified
+
+
+def embed_pending(db: sqlite3.Connection, limit: int = 16) -> int:
+    """Embed classified live intents that still lack a vector (contract kinds
+    are stored without one, and an embedder outage leaves gaps)."""
+    rows = db.execute(
+        "SELECT id, topic, body FROM intents WHERE embedding_json = '[]' AND speech_class != 'unclassified' "
+        "AND state IN ('open', 'mentioned') ORDER BY id LIMIT ?",
+        (limit,),
+    ).fetchall()
+    embedded = 0
+    for row in rows:
+        try:
+            embedding = embed_text(f"{row['topic']} {row['body']}")
         except Exception:
-            break  # model still down: stay unclassified, try next time
+            break  # embedder down: retry on the next wake
+        if not embedding:
+            continue
+        with _LOCK:
+            embedded += db.execute(
+                "UPDATE intents SET embedding_json = ? WHERE id = ? AND body = ? AND embedding_json = '[]'",
+                (json.dumps(embedding), row["id"], row["body"]),
+            ).rowcount
+            _INTENTS.refresh(db, [int(row["id"])])
+            db.commit()
+    return embedded
+
+
+def process_pending_intents() -> dict:
+    """Drain classification and embedding backlogs while they make progress."""
+    totals = {"classified": 0, "embedded": 0}
+    with connect() as db:
+        while True:
+            classified = classify_pending(db)
+            embedded = embed_pending(db)
+            totals["classified"] += classified
+            totals["embedded"] += embedded
+            if not classified and not embedded:
+                return totals
+
+
+def classifier_loop(stop_event: threading.Event) -> None:
+    """Background brain: woken by create_intent, polls to retry while the
+    model or the embedder is down."""
+    while not stop_event.is_set():
+        _CLASSIFY_WAKE.clear()
+        try:
+            process_pending_intents()
+        except Exception as exc:  # noqa: BLE001 - keep the classifier alive
+            print(f"Vox classifier error: {exc}", flush=True)
+        _CLASSIFY_WAKE.wait(CLASSIFY_POLL_SECONDS)
 
 
 def create_intent(payload: dict) -> dict:
@@ -556,7 +760,6 @@ def create_intent(payload: dict) -> dict:
     speech_class = "unclassified"
     topic = fallback_topic
     announce_line = ""
-    embedding: list[float] = []
     if kind in _URGENT_CONTRACT_KINDS:
         # A typed question or confirmed stop is urgent by contract, even when
         # the LLM classifier is down. Vox guarantees immediate transport; the
@@ -578,26 +781,13 @@ def create_intent(payload: dict) -> dict:
                 body,
                 "Я остановился на внутренней проверке. Открой чат — там объясню, что произошло.",
             )
-    else:
-        try:
-            brain = classify_intent(source, kind, body)
-            speech_class = brain["speech_class"]
-            topic = brain["topic"] or fallback_topic
-            announce_line = conversation_push_text(
-                brain["announce_line"],
-                "У меня есть обновление. Открой чат — там скажу нормально.",
-            )
-        except Exception as exc:  # noqa: BLE001 - stored unclassified, classified lazily later
-            print(f"Vox brain unavailable, intent deferred: {exc}", flush=True)
-    try:
-        embedding = embed_text(f"{topic} {body}")
-    except Exception:
-        embedding = []
+    # Everything else is stored unclassified and handed to the classifier
+    # worker; embeddings are filled in there as well.
     if speech_class == "срочно" and announce_line:
         next_push_state = "pending"
     elif speech_class == "unclassified":
-        # This marks only versions created after the migration. When lazy
-        # classification later decides "срочно", it may safely queue them;
+        # This marks only versions created after the migration. When the
+        # classifier later decides "срочно", it may safely queue them;
         # historical unclassified rows remain not_required and never replay.
         next_push_state = "awaiting_classification"
     else:
@@ -612,25 +802,30 @@ def create_intent(payload: dict) -> dict:
                     (dedupe_key,),
                 ).fetchone()
                 if row:
-                    unchanged = (
-                        row["body"] == body
-                        and row["topic"] == topic
-                        and row["announce_line"] == announce_line
-                        and row["speech_class"] == speech_class
-                    )
+                    if speech_class == "unclassified":
+                        # The stored topic/class are the brain's; only the
+                        # source's facts decide whether this is news.
+                        unchanged = row["body"] == body and row["kind"] == kind
+                    else:
+                        unchanged = (
+                            row["body"] == body
+                            and row["topic"] == topic
+                            and row["announce_line"] == announce_line
+                            and row["speech_class"] == speech_class
+                        )
                     if unchanged:
                         result = {
                             "ok": True,
                             "intent_id": int(row["id"]),
                             "duplicate": True,
-                            "speech_class": speech_class,
+                            "speech_class": row["speech_class"],
                         }
                     else:
                         # Same subject, materially newer news: reopen and push
                         # once for this new version, without making a copy.
                         db.execute(
                             "UPDATE intents SET body = ?, topic = ?, announce_line = ?, speech_class = ?, "
-                            "embedding_json = ?, updated_at = ?, announced_at = NULL, conveyed_at = NULL, state = 'open', "
+                            "embedding_json = '[]', updated_at = ?, announced_at = NULL, conveyed_at = NULL, state = 'open', "
                             "push_state = ?, push_attempts = 0, push_next_at = NULL, push_error = NULL, "
                             "pushed_at = NULL, push_lease_token = NULL WHERE id = ?",
                             (
@@ -638,7 +833,6 @@ def create_intent(payload: dict) -> dict:
                                 topic,
                                 announce_line,
                                 speech_class,
-                                json.dumps(embedding),
                                 now_iso(),
                                 next_push_state,
                                 int(row["id"]),
@@ -649,8 +843,8 @@ def create_intent(payload: dict) -> dict:
             if result is None:
                 cursor = db.execute(
                     "INSERT INTO intents (created_at, updated_at, source, kind, topic, body, announce_line, "
-                    "speech_class, dedupe_key, embedding_json, push_state) "
-                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    "speech_class, dedupe_key, push_state) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
                     (
                         now_iso(),
                         now_iso(),
@@ -661,21 +855,20 @@ def create_intent(payload: dict) -> dict:
                         announce_line,
                         speech_class,
                         dedupe_key,
-                        json.dumps(embedding),
                         next_push_state,
                     ),
                 )
                 result = {"ok": True, "intent_id": int(cursor.lastrowid), "speech_class": speech_class}
                 queued_push = next_push_state == "pending"
+            _INTENTS.refresh(db, [int(result["intent_id"])])
+    _CLASSIFY_WAKE.set()
     if queued_push:
         _PUSH_WAKE.set()
     return result
 
 
 def open_intents(db: sqlite3.Connection) -> list[dict]:
-    classify_pending(db)
-    rows = db.execute("SELECT * FROM intents WHERE state IN ('open', 'mentioned') ORDER BY id").fetchall()
-    return [dict(row) for row in rows]
+    return _INTENTS.rows(db)
 
 
 def on_tongue(context_text: str, limit: int = 6) -> dict:
@@ -689,6 +882,10 @@ def on_tongue(context_text: str, limit: int = 6) -> dict:
             context_embedding = embed_text(context_text)
         except Exception:
             context_embedding = []
+    relevance_by_id = _INTENTS.relevance(
+        context_embedding,
+        [int(intent["id"]) for intent in intents if intent["speech_class"] == "к слову"],
+    )
     picked = []
     for intent in intents:
         speech_class = intent["speech_class"]
@@ -696,10 +893,7 @@ def on_tongue(context_text: str, limit: int = 6) -> dict:
         if speech_class in ("срочно", "важно", "unclassified"):
             include = True
         elif speech_class == "к слову" and context_embedding:
-            try:
-                relevance = cosine(context_embedding, json.loads(intent["embedding_json"]))
-            except (TypeError, ValueError):
-                relevance = 0.0
+            relevance = relevance_by_id.get(int(intent["id"]), 0.0)
             include = relevance >= RELEVANCE_MIN
         else:
             include = False
@@ -759,6 +953,7 @@ def announce_for_phone() -> dict:
                 marks = [i["id"] for i in fresh]
                 placeholders = ",".join("?" for _ in marks)
                 db.execute(f"UPDATE intents SET announced_at = ? WHERE id IN ({placeholders})", (now_iso(), *marks))
+                _INTENTS.refresh(db, marks)
     return {
         "ok": True,
         "count": len(intents),
@@ -839,6 +1034,7 @@ def mark_conveyed(payload: dict) -> dict:
                     f"UPDATE intents SET state = ?, conveyed_at = ?, updated_at = ? WHERE id IN ({placeholders}) AND state IN ('open', 'mentioned')",
                     (state, now_iso() if state == "conveyed" else None, now_iso(), *ids),
                 )
+            _INTENTS.refresh(db, [*conveyed, *mentioned, *closed])
     return {"ok": True, "conveyed": len(conveyed), "mentioned": len(mentioned), "closed": len(closed)}
 
 
@@ -918,14 +1114,25 @@ def main() -> int:
         name="vox-fcm-outbox",
     )
     push_thread.start()
+    classifier_stop = threading.Event()
+    classifier_thread = threading.Thread(
+        target=classifier_loop,
+        args=(classifier_stop,),
+        daemon=True,
+        name="vox-classifier",
+    )
+    classifier_thread.start()
     print(f"Vox listening on http://{args.host}:{args.port}", flush=True)
     try:
         server.serve_forever()
     finally:
         push_stop.set()
         _PUSH_WAKE.set()
+        classifier_stop.set()
+        _CLASSIFY_WAKE.set()
         server.server_close()
         push_thread.join(timeout=5)
+        classifier_thread.join(timeout=5)
     return 0
 
 